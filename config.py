@@ -67,5 +67,12 @@ LOCAL_PARSERS = config.get("local", "parsers", fallback="")
 LOCAL_BASIC_TESTS = config.get("local", "basic_tests", fallback="")
 LOCAL_ENHANCED_TESTS = config.get("local", "enhanced_tests", fallback="")
 
+# Fetch import section
+HASH_ALGORITHM = config.get("import", "hash_algorithm", fallback="md5") or "md5"
+HASH_CACHE_PATH = config.get("import", "hash_cache", fallback="")
+
+# Fetch cache section
+CACHE_SIZE = config.getint("cache", "size", fallback=10000)
+
 # Fetch network section
 NETWORK_MASTER_INSTALL_PATH = config.get("network", "master_install_path", fallback="")
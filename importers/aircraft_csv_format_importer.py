@@ -9,6 +9,9 @@ from pepys_import.utils.unit_utils import convert_absolute_angle, convert_distan
 
 
 class AircraftCsvFormatImporter(Importer):
+    SUFFIXES = (".csv",)
+    HEADER_PATTERN = r"^Date\(Uk\)"
+
     def __init__(self):
         """
         Initialisation of the Aircraft CSV Format Importer.
@@ -24,15 +27,6 @@ class AircraftCsvFormatImporter(Importer):
         )
         self.text_label = None
 
-    def can_load_this_type(self, suffix):
-        return suffix.upper() == ".CSV"
-
-    def can_load_this_filename(self, filename):
-        return True
-
-    def can_load_this_header(self, header):
-        return header.startswith("Date(Uk)")
-
     def can_load_this_file(self, file_contents):
         return True
 
@@ -10,6 +10,9 @@ from pepys_import.utils.unit_utils import convert_absolute_angle, convert_distan
 
 
 class ETracImporter(Importer):
+    SUFFIXES = (".txt",)
+    HEADER_PATTERN = "^!Target,MMSI"
+
     def __init__(self):
         super().__init__(
             name="E-Trac Format Importer",
@@ -20,15 +23,6 @@ class ETracImporter(Importer):
         )
         self.text_label = None
 
-    def can_load_this_type(self, suffix):
-        return suffix.upper() == ".TXT"
-
-    def can_load_this_filename(self, filename):
-        return True
-
-    def can_load_this_header(self, header):
-        return header.startswith("!Target,MMSI")
-
     def can_load_this_file(self, file_contents):
         return True
 
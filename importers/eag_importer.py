@@ -13,6 +13,14 @@ from pepys_import.utils.unit_utils import convert_absolute_angle
 
 
 class EAGImporter(Importer):
+    # Criteria for determining that a file is an EAG file:
+    #
+    # filename ends in ".txt"
+    # filename starts with 8-digit integer
+    # in filename, last the chars before ".txt" are "EAG"
+    SUFFIXES = (".txt",)
+    FILENAME_PATTERN = r"(?i)^\d{8}.*EAG\Z"
+
     def __init__(self):
         # The TIME_OFFSET is a value in seconds to be added to
         # the timestamp value calculated from the 'milliseconds since Sunday'
@@ -31,23 +39,6 @@ class EAGImporter(Importer):
             datafile_type="EAG",
         )
 
-    # Criteria for determining that a file is an EAG file:
-    #
-    # filename ends in ".txt"
-    # filename starts with 8-digit integer
-    # in filename, last the chars before ".txt" are "EAG"
-    def can_load_this_type(self, suffix):
-        return suffix.upper() == ".TXT"
-
-    def can_load_this_filename(self, filename):
-        starts_with_8_digit_integer = filename[:8].isdigit()
-        ends_with_eag = filename.upper().endswith("EAG")
-
-        return starts_with_8_digit_integer and ends_with_eag
-
-    def can_load_this_header(self, header):
-        return True
-
     def can_load_this_file(self, file_contents):
         return True
 
@@ -73,7 +64,7 @@ class EAGImporter(Importer):
             )
             return
 
-        for line_number, line in enumerate(tqdm(file_object.lines()), 1):
+        for line_number, line in enumerate(tqdm(file_object.iter_lines()), 1):
             if line.text.strip().startswith("#VALUE"):
                 # Skip line
                 continue
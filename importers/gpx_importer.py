@@ -11,6 +11,8 @@ from pepys_import.utils.unit_utils import convert_absolute_angle, convert_distan
 
 
 class GPXImporter(Importer):
+    SUFFIXES = (".gpx",)
+
     def __init__(self):
         super().__init__(
             name="GPX Format Importer",
@@ -19,16 +21,6 @@ class GPXImporter(Importer):
             datafile_type="GPX",
         )
 
-    def can_load_this_type(self, suffix):
-        return suffix.upper() == ".GPX"
-
-    def can_load_this_filename(self, filename):
-        return True
-
-    def can_load_this_header(self, header):
-        # Can't tell from first line only whether file is a valid GPX file
-        return True
-
     def can_load_this_file(self, file_contents):
         # TODO: Check here to see if we can parse file with XML parser without exceptions raised
         # But note we can't do this from the file_contents variable as lxml
@@ -19,6 +19,11 @@ JCHAT_MODERN = 2
 class JChatImporter(Importer):
     """Imports JChat messages"""
 
+    # The sample data that we have includes some files with .html but
+    # several files have no extension and have a . in the name
+    # so we can't use the file extension
+    HEADER_PATTERN = "^<html>"
+
     def __init__(self):
         super().__init__(
             name="JChat Format Importer",
@@ -30,20 +35,6 @@ class JChatImporter(Importer):
         self.month = datetime.now().month
         self.last_days = 0
 
-    def can_load_this_type(self, suffix):
-        # The sample data that we have includes some files with .html but
-        # several files have no extension and have a . in the name
-        # so we can't use the file extension
-        return True
-
-    def can_load_this_filename(self, filename):
-        return True
-
-    def can_load_this_header(self, header):
-        if header:
-            return header.startswith("<html>")
-        return False
-
     def can_load_this_file(self, file_contents):
         if len(file_contents) < 8:  # Enough to cover the header
             return False
@@ -26,6 +26,8 @@ class Link16Importer(Importer):
     transmitted using Link-16 encoding
     """
 
+    SUFFIXES = (".csv",)
+
     def __init__(self):
         super().__init__(
             name="Link-16 Format Importer",
@@ -36,12 +38,6 @@ class Link16Importer(Importer):
         )
         self.version = 1
 
-    def can_load_this_type(self, suffix):
-        return suffix.upper() == ".CSV"
-
-    def can_load_this_filename(self, filename):
-        return True
-
     def can_load_this_header(self, header):
         # V1 starts w/ PPLI
         # V2 starts w/ Xmt/Rcv
@@ -88,7 +84,7 @@ class Link16Importer(Importer):
         )
 
         # Now do what we'd normally do on load
-        for line_number, line in enumerate(tqdm(file_object.lines()), 1):
+        for line_number, line in enumerate(tqdm(file_object.iter_lines()), 1):
             result = self._load_this_line(data_store, line_number, line, datafile, change_id)
             if result == CANCEL_IMPORT:
                 custom_print_formatted_text(
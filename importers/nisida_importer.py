@@ -36,6 +36,9 @@ POS_SOURCE_TO_NAME = {"GPS": "GPS", "DR": "Dead Recknoning", "IN": "Inertial"}
 
 
 class NisidaImporter(Importer):
+    SUFFIXES = (".txt",)
+    HEADER_PATTERN = "^UNIT/"
+
     def __init__(self):
         super().__init__(
             name="Nisida Format Importer",
@@ -51,15 +54,6 @@ class NisidaImporter(Importer):
 
         self.set_highlighting_level(HighlightLevel.DATABASE)
 
-    def can_load_this_type(self, suffix):
-        return suffix.upper() == ".TXT"
-
-    def can_load_this_filename(self, filename):
-        return True
-
-    def can_load_this_header(self, header):
-        return header.startswith("UNIT/")
-
     def can_load_this_file(self, file_contents):
         return True
 
@@ -9,6 +9,9 @@ from pepys_import.utils.unit_utils import convert_absolute_angle, convert_distan
 
 
 class NMEAImporter(Importer):
+    SUFFIXES = (".log", ".txt")
+    HEADER_PATTERN = r"\$POSL"
+
     def __init__(self):
         super().__init__(
             name="NMEA File Format Importer",
@@ -35,15 +38,6 @@ class NMEAImporter(Importer):
         self.lon_token = None
         self.location = None
 
-    def can_load_this_type(self, suffix):
-        return suffix.upper() == ".LOG" or suffix.upper() == ".TXT"
-
-    def can_load_this_filename(self, filename):
-        return True
-
-    def can_load_this_header(self, header):
-        return "$POSL" in header
-
     def can_load_this_file(self, file_contents):
         # Need to check this isn't WECDIS (Which is derived from this format)
         contents_string = " ".join(file_contents[0:100])
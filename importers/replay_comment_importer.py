@@ -5,6 +5,9 @@ from pepys_import.file.importer import Importer
 
 
 class ReplayCommentImporter(Importer):
+    SUFFIXES = (".rep",)
+    PARSE_IN_WORKER = True
+
     def __init__(self):
         super().__init__(
             name="Replay Comment Importer",
@@ -15,15 +18,6 @@ class ReplayCommentImporter(Importer):
         self.text_label = None
         self.depth = 0.0
 
-    def can_load_this_type(self, suffix):
-        return suffix.upper() == ".REP"
-
-    def can_load_this_filename(self, filename):
-        return True
-
-    def can_load_this_header(self, header):
-        return True
-
     def can_load_this_file(self, file_contents):
         return True
 
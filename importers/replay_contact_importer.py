@@ -12,6 +12,9 @@ from pepys_import.utils.unit_utils import (
 
 
 class ReplayContactImporter(Importer):
+    SUFFIXES = (".rep", ".dsf")
+    PARSE_IN_WORKER = True
+
     def __init__(self):
         super().__init__(
             name="Replay Contact Importer",
@@ -22,15 +25,6 @@ class ReplayContactImporter(Importer):
         self.text_label = None
         self.depth = 0.0
 
-    def can_load_this_type(self, suffix):
-        return suffix.upper() in [".REP", ".DSF"]
-
-    def can_load_this_filename(self, filename):
-        return True
-
-    def can_load_this_header(self, header):
-        return True
-
     def can_load_this_file(self, file_contents):
         return True
 
@@ -197,9 +191,11 @@ class ReplayContactImporter(Importer):
                 data_store, platform_name=vessel_name_token.text, change_id=change_id
             )
             vessel_name_token.record(self.name, "vessel name", vessel_name_token.text)
-            sensor = platform.get_sensor(
+            sensor = self.get_cached_sensor(
                 data_store=data_store,
                 sensor_name=sensor_name.text,
+                sensor_type=None,
+                platform_id=platform.platform_id,
                 change_id=change_id,
             )
 
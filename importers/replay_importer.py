@@ -4,6 +4,9 @@ from pepys_import.file.importer import Importer
 
 
 class ReplayImporter(Importer):
+    SUFFIXES = (".rep", ".dsf")
+    PARSE_IN_WORKER = True
+
     def __init__(self):
         super().__init__(
             name="Replay File Format Importer",
@@ -21,15 +24,6 @@ class ReplayImporter(Importer):
         # self.set_highlighting_level(HighlightLevel.DATABASE)
         # (default is HTML recording)
 
-    def can_load_this_type(self, suffix):
-        return suffix.upper() == ".REP" or suffix.upper() == ".DSF"
-
-    def can_load_this_filename(self, filename):
-        return True
-
-    def can_load_this_header(self, header):
-        return True
-
     def can_load_this_file(self, file_contents):
         return True
 
@@ -25,6 +25,9 @@ class MsgType(str, Enum):
 
 
 class WecdisImporter(Importer):
+    SUFFIXES = (".log", ".txt")
+    HEADER_PATTERN = r"\$POSL"
+
     def __init__(self):
         super().__init__(
             name="WECDIS File Format Importer",
@@ -42,15 +45,6 @@ class WecdisImporter(Importer):
         self.elevation = None
         self.set_highlighting_level(HighlightLevel.NONE)
 
-    def can_load_this_type(self, suffix):
-        return suffix.upper() == ".LOG" or suffix.upper() == ".TXT"
-
-    def can_load_this_filename(self, filename):
-        return True
-
-    def can_load_this_header(self, header):
-        return "$POSL" in header
-
     def can_load_this_file(self, file_contents):
         # Need to differentiate from general NMEA - so check charts/version available
         contents_string = " ".join(file_contents[0:100])
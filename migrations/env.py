@@ -68,9 +68,18 @@ def exclude_tables_from_config(config_):
 
 exclude_tables = exclude_tables_from_config(config.get_section("alembic:exclude"))
 
+# Tables created by the stored procedure files rather than the models
+stored_procedure_tables = [
+    "DashboardCoverage",
+    "DashboardCoverageDirty",
+    "DashboardCoverageChanges",
+]
+
 
 def include_object_postgres(object_, name, type_, reflected, compare_to):
-    if type_ == "table" and (
+    if type_ == "table" and name in stored_procedure_tables:
+        return False
+    elif type_ == "table" and (
         name in exclude_tables
         or name.startswith("idx_")
         or name.startswith("virts_")
@@ -0,0 +1,60 @@
+"""Add dashboard coverage summary
+
+Revision ID: 02d2c10f9ca2
+Revises: a5a4bc1f7156
+Create Date: 2026-10-18 09:12:41.518307+00:00
+
+"""
+import os
+
+from alembic import op
+from sqlalchemy.orm.session import Session
+from sqlalchemy.sql.expression import text
+
+from paths import PEPYS_IMPORT_DIRECTORY
+
+STORED_PROC_PATH = os.path.join(PEPYS_IMPORT_DIRECTORY, "database", "postgres_stored_procedures")
+
+
+# revision identifiers, used by Alembic.
+revision = "02d2c10f9ca2"
+down_revision = "a5a4bc1f7156"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    session = Session(bind=bind)
+
+    stored_procedure_files = [
+        os.path.join(STORED_PROC_PATH, "dashboard_coverage.sql"),
+        os.path.join(STORED_PROC_PATH, "dashboard_stats.sql"),
+    ]
+
+    for filename in stored_procedure_files:
+        with open(filename) as f:
+            procedure_definition = f.read()
+
+        session.execute(text(procedure_definition))
+
+    # Summarise the States which are already in the database
+    session.execute(text("select pepys.rebuild_dashboard_coverage();"))
+
+
+def downgrade():
+    bind = op.get_bind()
+    session = Session(bind=bind)
+
+    session.execute("drop function if exists pepys.dashboard_stats;")
+    session.execute('drop trigger if exists dashboard_coverage_states_insert on pepys."States";')
+    session.execute('drop trigger if exists dashboard_coverage_states_update on pepys."States";')
+    session.execute('drop trigger if exists dashboard_coverage_states_delete on pepys."States";')
+    session.execute('drop trigger if exists dashboard_coverage_sensors_update on pepys."Sensors";')
+    session.execute('drop trigger if exists dashboard_coverage_sensors_delete on pepys."Sensors";')
+    session.execute("drop function if exists pepys.rebuild_dashboard_coverage;")
+    session.execute("drop function if exists pepys.refresh_dashboard_coverage;")
+    session.execute("drop function if exists pepys.mark_dashboard_coverage_dirty;")
+    session.execute("drop function if exists pepys.dashboard_coverage_gap_seconds;")
+    session.execute('drop table if exists pepys."DashboardCoverageDirty";')
+    session.execute('drop table if exists pepys."DashboardCoverage";')
@@ -0,0 +1,48 @@
+"""Add dashboard coverage changes
+
+Revision ID: 620b284e90b2
+Revises: 02d2c10f9ca2
+Create Date: 2026-10-18 11:40:07.203164+00:00
+
+"""
+import os
+
+from alembic import op
+from sqlalchemy.orm.session import Session
+from sqlalchemy.sql.expression import text
+
+from paths import PEPYS_IMPORT_DIRECTORY
+
+STORED_PROC_PATH = os.path.join(PEPYS_IMPORT_DIRECTORY, "database", "postgres_stored_procedures")
+
+
+# revision identifiers, used by Alembic.
+revision = "620b284e90b2"
+down_revision = "02d2c10f9ca2"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    bind = op.get_bind()
+    session = Session(bind=bind)
+
+    with open(os.path.join(STORED_PROC_PATH, "dashboard_changes.sql")) as f:
+        procedure_definition = f.read()
+
+    session.execute(text(procedure_definition))
+
+
+def downgrade():
+    bind = op.get_bind()
+    session = Session(bind=bind)
+
+    session.execute("drop function if exists pepys.dashboard_changes;")
+    session.execute(
+        'drop trigger if exists dashboard_coverage_changes_insert on pepys."DashboardCoverage";'
+    )
+    session.execute(
+        'drop trigger if exists dashboard_coverage_changes_delete on pepys."DashboardCoverage";'
+    )
+    session.execute("drop function if exists pepys.record_dashboard_coverage_change;")
+    session.execute('drop table if exists pepys."DashboardCoverageChanges";')
@@ -7,7 +7,6 @@ from getpass import getuser
 from alembic import command
 from alembic.config import Config
 from prompt_toolkit import prompt
-from waitress import serve
 
 import config
 from paths import MIGRATIONS_DIRECTORY, ROOT_DIRECTORY
@@ -21,6 +20,7 @@ from pepys_admin.utils import redirect_stdout_to_file_and_screen
 from pepys_admin.view_data_cli import ViewDataShell
 from pepys_import.core.store import constants
 from pepys_import.core.store.db_status import TableTypes
+from pepys_import.utils.cache_utils import report_cache_statistics
 from pepys_import.utils.data_store_utils import is_schema_created
 from pepys_import.utils.error_handling import handle_status_errors
 from pepys_import.utils.text_formatting_utils import (
@@ -29,6 +29,7 @@ from pepys_import.utils.text_formatting_utils import (
     format_table,
 )
 from pepys_timeline.app import create_app
+from pepys_timeline.server import serve_timeline
 
 DIR_PATH = os.path.dirname(os.path.abspath(__file__))
 
@@ -92,7 +93,7 @@ class AdminShell(BaseShell):
         # Open the URL in the web browser just before we call run()
         # as the run call is blocking, so nothing else can run after it
         webbrowser.open("http://localhost:5000")
-        serve(app, host="0.0.0.0", port=5000)
+        serve_timeline(app, host="0.0.0.0", port=5000)
 
         # This is the code to run it through the Flask server, which works
         # fine, but prints a big warning message about how it shouldn't be used
@@ -163,6 +164,10 @@ class AdminShell(BaseShell):
                 formatted_text = format_table("## Reference", table_string=report)
                 custom_print_formatted_text(formatted_text)
 
+            report = report_cache_statistics(self.data_store.get_cache_statistics())
+            formatted_text = format_table("## Caches", table_string=report)
+            custom_print_formatted_text(formatted_text)
+
         print("## Database Version")
         try:
             command.current(self.cfg, verbose=True)
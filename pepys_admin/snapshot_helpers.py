@@ -1,5 +1,6 @@
 import inspect
 from datetime import datetime
+from itertools import islice
 
 from geoalchemy2.elements import WKTElement
 from iterfzf import iterfzf
@@ -10,6 +11,9 @@ from sqlalchemy.sql.functions import func
 from pepys_import.core.store import sqlite_db
 from pepys_import.core.store.db_status import TableTypes
 
+# Number of measurement entries copied at once when exporting a snapshot
+MEASUREMENT_BATCH_SIZE = 10000
+
 
 def row_to_dict(table_object, data_store):
     """Converts all entities of a table into a dict of {column_name: value}s.
@@ -160,39 +164,63 @@ def export_all_measurement_tables(source_store, destination_store):
                 export_measurement_table_with_filter(source_store, destination_store, table)
 
 
-def export_measurement_table_with_filter(source_store, destination_store, table, filter=None):
+def export_measurement_table_with_filter(
+    source_store, destination_store, table, filter=None, batch_size=MEASUREMENT_BATCH_SIZE
+):
+    """Copies the entries of a measurement table from :code:`source_store` to
+    :code:`destination_store`, optionally filtered by :code:`filter`.
+
+    The entries are streamed from the source database (using a server-side cursor on Postgres)
+    and inserted in batches of :code:`batch_size`, so only one batch is held in memory at a time,
+    however large the table is.
+
+    :param source_store: A :class:`DataStore` object to fetch objects
+    :type source_store: DataStore
+    :param destination_store: A :class:`DataStore` object to copy the objects from source_store
+    :type destination_store: DataStore
+    :param table: A measurement table object, or its name
+    :type table: sqlalchemy.ext.declarative.DeclarativeMeta or str
+    :param filter: Function taking the table object and a query, returning the filtered query
+    :type filter: Callable
+    :param batch_size: Number of entries fetched and inserted at once
+    :type batch_size: int
+    :return:
+    """
     if isinstance(table, str):
         table_object = getattr(source_store.db_classes, table)
     else:
         table_object = table
 
-    dict_values = []
-    query = source_store.session.query(table_object)
-
-    if filter is not None:
-        query = filter(table_object, query)
-
-    results = query.all()
-
-    if len(results) == 0:
-        return
-
+    # Query the attributes rather than the objects, so the rows don't have to be loaded into
+    # the session. Some attributes have different names to their columns, eg. _speed and speed
     data_attributes = []
     for col in table_object.__table__.columns:
         prop = getattr(table_object, col.name).property
         data_attributes.append(prop.key)
 
-    for row in results:
-        d = {}
-        for attrib in data_attributes:
-            d[attrib] = getattr(row, attrib)
-        dict_values.append(d)
+    query = source_store.session.query(
+        *[getattr(table_object, attrib) for attrib in data_attributes]
+    )
+
+    if filter is not None:
+        query = filter(table_object, query)
+
+    rows = iter(query.yield_per(batch_size))
+    object_ = find_sqlite_table_object(table_object, source_store)
+    exported = 0
+    while True:
+        dict_values = [dict(zip(data_attributes, row)) for row in islice(rows, batch_size)]
+        if len(dict_values) == 0:
+            break
+
+        with destination_store.session_scope():
+            destination_store.session.bulk_insert_mappings(object_, dict_values)
 
-    object_ = find_sqlite_table_object(table, source_store)
-    with destination_store.session_scope():
-        destination_store.session.bulk_insert_mappings(object_, dict_values)
+        exported += len(dict_values)
+        print(f"Exported {exported} entries from {table_object.__name__}", end="\r")
 
-    print(f"Exported {len(results)} entries from {table.__name__}")
+    if exported > 0:
+        print(f"Exported {exported} entries from {table_object.__name__}")
 
 
 def export_measurement_tables_filtered_by_time(
@@ -11,6 +11,7 @@ from pepys_import.file.file_processor import FileProcessor
 from pepys_import.resolvers.command_line_resolver import CommandLineResolver
 from pepys_import.resolvers.default_resolver import DefaultResolver
 from pepys_import.utils.data_store_utils import is_schema_created
+from pepys_import.utils.datafile_utils import new_hasher
 from pepys_import.utils.error_handling import handle_database_errors
 from pepys_import.utils.text_formatting_utils import (
     custom_print_formatted_text,
@@ -42,6 +43,15 @@ def main():  # pragma: no cover
         "in the user's home folder. No actions will affect the database configured in the Pepys config file."
     )
     validation_help = "Skip the validation steps"
+    workers_help = (
+        "Number of worker processes to use for detecting which importers can load each file, "
+        "and for parsing and validating the files whose importers support it. Files are always "
+        "committed one at a time, in order (The default value is 1)"
+    )
+    no_provenance_help = (
+        "Import without recording extraction provenance: importers get plain string tokens, "
+        "no highlighted HTML files are written and no extractions are stored in the database"
+    )
     parser.add_argument("--path", help=path_help, required=False, default=DIRECTORY_PATH)
     parser.add_argument(
         "--archive",
@@ -66,6 +76,28 @@ def main():  # pragma: no cover
         action="store_true",
         default=False,
     )
+    parser.add_argument("--workers", help=workers_help, type=int, required=False, default=1)
+    full_table_status_help = (
+        "Report what each file added by counting the rows in every table before and after "
+        "importing it, rather than from the rows the import added. This is much slower "
+        "on large databases"
+    )
+    parser.add_argument(
+        "--no-provenance",
+        help=no_provenance_help,
+        dest="no_provenance",
+        required=False,
+        action="store_true",
+        default=False,
+    )
+    parser.add_argument(
+        "--full-table-status",
+        help=full_table_status_help,
+        dest="full_table_status",
+        required=False,
+        action="store_true",
+        default=False,
+    )
     args = parser.parse_args()
     process(
         path=args.path,
@@ -74,6 +106,9 @@ def main():  # pragma: no cover
         resolver=args.resolver,
         skip_validation=args.skip_validation,
         training=args.training,
+        workers=args.workers,
+        no_provenance=args.no_provenance,
+        full_table_status=args.full_table_status,
     )
 
 
@@ -84,6 +119,9 @@ def process(
     resolver="command-line",
     training=False,
     skip_validation=None,
+    workers=1,
+    no_provenance=False,
+    full_table_status=False,
 ):
     if resolver == "command-line":
         resolver_obj = CommandLineResolver()
@@ -153,11 +191,23 @@ def process(
             data_store.populate_reference()
             data_store.populate_metadata()
 
+    # Check the hash algorithm from the config file is valid before starting
+    try:
+        new_hasher(config.HASH_ALGORITHM)
+    except ValueError as e:
+        custom_print_formatted_text(format_error_message(str(e)))
+        return
+
     processor = FileProcessor(
         archive=archive,
         skip_validation=skip_validation,
         archive_path=config.ARCHIVE_PATH,
         local_parsers=config.LOCAL_PARSERS,
+        workers=workers,
+        no_provenance=no_provenance,
+        hash_algorithm=config.HASH_ALGORITHM,
+        hash_cache_path=config.HASH_CACHE_PATH or None,
+        full_table_status=full_table_status,
     )
     processor.load_importers_dynamically()
 
@@ -1,5 +1,31 @@
+import re
+
 from shapely import wkb
 
+# Matches a Well-Known Text point, optionally with an SRID as in Extended Well-Known Text
+# (eg. "SRID=4326;POINT(-1.5 50.5)"). Any Z or M coordinates are matched but not captured.
+WKT_POINT_REGEX = re.compile(
+    r"^\s*(?:SRID=(\d+)\s*;)?\s*POINT\s*(?:ZM|Z|M)?\s*\(\s*(\S+)\s+([^\s)]+)[^)]*\)\s*$",
+    re.IGNORECASE,
+)
+
+
+def parse_wkt_point(wkt_string):
+    """Returns the longitude and latitude of a Well-Known Text point
+
+    :param wkt_string: Well-Known Text of a point, with no SRID or an SRID of 4326
+    :type wkt_string: String
+    :return: Longitude and latitude, in decimal degrees
+    :rtype: Tuple[float, float]
+    """
+    match = WKT_POINT_REGEX.match(wkt_string)
+    if match is None:
+        raise ValueError(f"Not a Well-Known Text point: {wkt_string!r}")
+    srid, longitude, latitude = match.groups()
+    if srid is not None and int(srid) != 4326:
+        raise ValueError(f"Point isn't in longitude and latitude (SRID 4326): {wkt_string!r}")
+    return float(longitude), float(latitude)
+
 
 class Location:
     def __init__(self, errors=None, error_type=None):
@@ -295,13 +321,10 @@ class Location:
     def set_from_wkt_string(self, wkt_string):
         """Sets the location from a Well-Known Text string
 
-        :param wkt_string: Well-Known Text
+        :param wkt_string: Well-Known Text of a point, with no SRID or an SRID of 4326
         :type wkt_string: String
         """
-        longitude, latitude = wkt_string[16:-1].split()
-
-        self._latitude = float(latitude)
-        self._longitude = float(longitude)
+        self._longitude, self._latitude = parse_wkt_point(wkt_string)
 
     def check_valid(self):
         """Checks whether the location is valid (ie. has both a latitude and a longitude)
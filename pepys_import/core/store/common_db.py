@@ -4,7 +4,6 @@ from prompt_toolkit import prompt
 from prompt_toolkit.validation import Validator
 from sqlalchemy.ext.associationproxy import association_proxy
 from sqlalchemy.ext.hybrid import hybrid_property
-from sqlalchemy.inspection import inspect
 from sqlalchemy.orm import backref, declared_attr, relationship
 from tqdm import tqdm
 
@@ -12,13 +11,22 @@ import config
 from pepys_import.core.formats import unit_registry
 from pepys_import.core.formats.location import Location
 from pepys_import.core.store import constants
+from pepys_import.core.store.db_status import TableTypes
+from pepys_import.core.store.table_summary import AddedRowsSummary, TableSummarySet
 from pepys_import.core.validators import constants as validation_constants
 from pepys_import.core.validators.basic_validator import BasicValidator
 from pepys_import.core.validators.enhanced_validator import EnhancedValidator
 from pepys_import.utils.data_store_utils import chunked_list, shorten_uuid
 from pepys_import.utils.import_utils import import_validators
-from pepys_import.utils.sqlalchemy_utils import get_lowest_privacy, get_primary_key_for_table
+from pepys_import.utils.sqlalchemy_utils import (
+    get_lowest_privacy,
+    get_primary_key_for_table,
+    insert_columns,
+    insert_objects,
+    insert_rows,
+)
 from pepys_import.utils.text_formatting_utils import format_error_menu
+from pepys_import.utils.unit_utils import magnitude_in_units
 
 LOCAL_BASIC_VALIDATORS = []
 LOCAL_ENHANCED_VALIDATORS = []
@@ -678,31 +686,13 @@ class DatafileMixin:
         return association_proxy("datafile_type", "name")
 
     def flush_extracted_tokens(self):
-        """Flush the current list of extracted tokens out to the dict linking measurement
-        objects to tokens, ready for writing to the database at the end of the import.
+        """Assign the extractions recorded since the last flush to the current measurement
+        object, ready for writing to the database at the end of the import.
 
         This should be called when all the extractions have been done for a _single_ measurement
         object (State/Contact etc). Often this will be at the end of the `_load_this_line()` method,
         but in more complex importers it may be needed elsewhere."""
-        if len(self.pending_extracted_tokens) == 0:
-            return
-
-        # If there aren't any tokens recorded for this measurement object already
-        # then put the list into the dict. If there are already tokens recorded, then append the list
-        # to the list that's already in the dict
-        if (
-            self.measurement_object_to_tokens_list.get(self.current_measurement_object, None)
-            is None
-        ):
-            self.measurement_object_to_tokens_list[
-                self.current_measurement_object
-            ] = self.pending_extracted_tokens
-        else:
-            self.measurement_object_to_tokens_list[
-                self.current_measurement_object
-            ] += self.pending_extracted_tokens
-
-        self.pending_extracted_tokens = []
+        self.extraction_buffer.assign(self.current_measurement_object)
 
     def create_state(self, data_store, platform, sensor, timestamp, parser_name):
         """Creates a new State object to record information on the state of a particular
@@ -886,6 +876,7 @@ class DatafileMixin:
         errors=None,
         parser="Default",
         skip_validation=False,
+        ask_skipping_validator=True,
     ):
 
         # If there is no parsing error, it will return None. If that's the case,
@@ -917,7 +908,8 @@ class DatafileMixin:
                 return (True, failed_validators)
             return (False, failed_validators)
         elif validation_level == validation_constants.ENHANCED_LEVEL:
-            ask_skipping_validator = True
+            # The user is asked whether to skip the enhanced validators when they fail, unless
+            # ask_skipping_validator is False (e.g. when validating outside the main process)
             skip_validator = False
             # Create validator objects here, so we're only creating them once
             bv = BasicValidator(parser)
@@ -926,9 +918,12 @@ class DatafileMixin:
             local_ev_objects = [ev() for ev in LOCAL_ENHANCED_VALIDATORS]
             print(f"Running enhanced validation for {parser}")
             for objects in self.measurements[parser].values():
+                # The standard enhanced validator checks the whole list of objects at once,
+                # giving the errors for each object that fails
+                track_errors = {} if skip_validator else ev.validate_track(objects, parser)
                 # Run the basic validators (standard one, plus configured local ones)
                 prev_object_dict = dict()
-                for curr_object in tqdm(objects):
+                for index, curr_object in enumerate(tqdm(objects)):
                     if not bv.validate(curr_object, errors):
                         failed_validators.append(bv.name)
                     for local_bv in local_bv_objects:
@@ -940,7 +935,8 @@ class DatafileMixin:
 
                     # Run the enhanced validators (standard one, plus configured local ones)
                     if not skip_validator:
-                        if not ev.validate(curr_object, errors, parser, prev_object):
+                        if index in track_errors:
+                            errors.extend(track_errors[index])
                             failed_validators.append(ev.name)
                             if ask_skipping_validator:
                                 (
@@ -975,10 +971,54 @@ class DatafileMixin:
         else:
             raise ValueError(f"Invalid Validation Level {validation_level}")
 
+    def get_measurement_status(self, data_store, exclude=None):
+        """
+        Provides a summary of the measurements extracted from this datafile, worked out from
+        the measurement objects, with the same tables in the same order as
+        :meth:`DataStore.get_status` for measurement tables. Once the measurements have been
+        committed it also includes the creation date of the last one added to each table.
+
+        :param data_store: DataStore the datafile belongs to
+        :type data_store: DataStore
+        :param exclude: List of table names to exclude from the report
+        :type exclude: List
+        :return: The summary of the measurements, made of AddedRowsSummary objects
+        :rtype: TableSummarySet
+        """
+        if exclude is None:
+            exclude = []
+        number_of_rows = {}
+        created_dates = {}
+        for parser in self.measurements:
+            for objects in self.measurements[parser].values():
+                for obj in objects:
+                    table_name = obj.__tablename__
+                    number_of_rows[table_name] = number_of_rows.get(table_name, 0) + 1
+                    created_date = obj.created_date
+                    if created_date is not None and (
+                        table_name not in created_dates or created_date > created_dates[table_name]
+                    ):
+                        created_dates[table_name] = created_date
+
+        return TableSummarySet(
+            [
+                AddedRowsSummary(
+                    table.__tablename__,
+                    number_of_rows.get(table.__tablename__, 0),
+                    created_dates.get(table.__tablename__),
+                )
+                for table in data_store.meta_classes[TableTypes.MEASUREMENT]
+                if table.__tablename__ not in exclude
+            ]
+        )
+
     def commit(self, data_store, change_id):
         # Since measurements are saved by their importer names, iterate over each key
         # and save its measurement objects.
         extraction_log = list()
+        log_table = data_store.db_classes.Log.__table__
+        # On PostgreSQL the rows are written with COPY, which is much faster than INSERTs
+        use_copy = data_store.db_type == "postgres"
         for parser in self.measurements:
             total_objects = 0
             print(f"Submitting measurements extracted by {parser}.")
@@ -986,51 +1026,40 @@ class DatafileMixin:
                 total_objects += len(objects)
 
                 # Split the list of objects to submit to the database into chunks
-                # of 1000 objects each and submit in those chunks
-                # This is because bulk_save_objects has no progress bar, so to get
-                # a proper progress bar for submitting we need to chunk them
-                # (making it a bit less efficient, but giving the user more
-                # insight into the process)
+                # of 1000 objects each and submit in those chunks, to give a progress bar
                 for chunk_objects in tqdm(chunked_list(objects, size=1000)):
-                    # Bulk save table objects; state, etc.
-                    data_store.session.bulk_save_objects(chunk_objects, return_defaults=True)
+                    # Insert the table objects (state, etc.) with one executemany INSERT (or
+                    # COPY) per table. Their primary keys are generated before they're inserted, so
+                    # the Logs don't need anything to be read back from the database
+                    primary_keys = insert_objects(
+                        data_store.session, chunk_objects, use_copy=use_copy
+                    )
                     # Log saved objects
-                    data_store.session.bulk_insert_mappings(
-                        data_store.db_classes.Log,
+                    insert_rows(
+                        data_store.session,
+                        log_table,
                         [
-                            dict(
-                                table=t.__tablename__,
-                                id=inspect(t).identity[0],
-                                change_id=change_id,
-                            )
-                            for t in chunk_objects
+                            dict(table=t.__tablename__, id=primary_key, change_id=change_id)
+                            for t, primary_key in zip(chunk_objects, primary_keys)
                         ],
+                        use_copy=use_copy,
                     )
 
             extraction_log.append(f"{total_objects} measurements extracted by {parser}.")
 
-        # Loop through the dict linking measurement objects to lists of extraction tokens
-        # and fill in more details on the extraction tokens, then join all the lists together
-        # ready for insert into the database
-        extraction_data = []
-        for measurement_obj, tokens_data in self.measurement_object_to_tokens_list.items():
-            if measurement_obj is None:
-                continue
-            for entry in tokens_data:
-                entry_id = getattr(measurement_obj, get_primary_key_for_table(measurement_obj))
-                entry["entry_id"] = entry_id
-                entry["destination_table"] = measurement_obj.__table__.name
-                entry["datafile_id"] = self.datafile_id
-            extraction_data += tokens_data
-
+        # The measurement objects have all been given their primary keys now, so the rows for
+        # the extractions can be created and written in one go
         print("Submitting extraction data")
-        for chunk_extraction_data in tqdm(chunked_list(extraction_data, size=1000)):
-            data_store.session.bulk_insert_mappings(
-                data_store.db_classes.Extraction, chunk_extraction_data
-            )
+        insert_columns(
+            data_store.session,
+            data_store.db_classes.Extraction.__table__,
+            self.extraction_buffer.columns(self.datafile_id),
+            use_copy=use_copy,
+        )
+        self.extraction_buffer.clear()
 
-        self.measurement_object_to_tokens_list = {}
-        self.pending_extracted_tokens = []
+        # Summarise the new States for the dashboard while they're still cached by the database
+        data_store.refresh_dashboard_coverage()
 
         return extraction_log
 
@@ -1068,7 +1097,41 @@ class TaggedItemMixin:
         return association_proxy("tagged_by", "name")
 
 
-class StateMixin:
+class RawValuesMixin:
+    # Names of the properties of each class which can be set by set_raw_values
+    _raw_value_names = dict()
+
+    def set_raw_values(self, **values):
+        """
+        Sets measurement properties (such as speed and heading) from plain values in the form
+        they are stored in: numbers in metres, metres per second, hertz and radians (for
+        angles), and Well-Known Text for locations. This skips the unit checks and conversions
+        done when the properties are set to Quantities, so an importer can convert a whole
+        column of values at once with
+        :func:`pepys_import.utils.unit_utils.magnitudes_in_units` and then set them quickly.
+        The properties still return Quantities.
+
+        :param values: Values keyed by property name (eg. speed=2.5, heading=1.2)
+        """
+        cls = type(self)
+        names = RawValuesMixin._raw_value_names.get(cls)
+        if names is None:
+            # Properties which wrap a column of the same name starting with an underscore
+            names = {
+                name
+                for base in cls.__mro__
+                for name, value in vars(base).items()
+                if isinstance(value, hybrid_property) and hasattr(cls, "_" + name)
+            }
+            RawValuesMixin._raw_value_names[cls] = names
+
+        for name, value in values.items():
+            if name not in names:
+                raise AttributeError(f"{cls.__name__} has no measurement property '{name}'")
+            setattr(self, "_" + name, value)
+
+
+class StateMixin(RawValuesMixin):
     _default_preview_fields = ["time", "sensor_name", "speed"]
 
     @declared_attr
@@ -1121,21 +1184,9 @@ class StateMixin:
 
     @speed.setter
     def speed(self, speed):
-        if speed is None:
-            self._speed = None
-            return
-
         # Check the given speed is a Quantity with a dimension of 'length / time'
-        try:
-            if not speed.check("[length]/[time]"):
-                raise ValueError(
-                    "Speed must be a Quantity with a dimensionality of [length]/[time]"
-                )
-        except AttributeError:
-            raise TypeError("Speed must be a Quantity")
-
-        # Set the actual speed attribute to the given value converted to metres per second
-        self._speed = speed.to(unit_registry.metre / unit_registry.second).magnitude
+        # and set the actual speed attribute to the given value converted to metres per second
+        self._speed = magnitude_in_units(speed, "metre / second", "Speed", "[length]/[time]")
 
     @speed.expression
     def speed(self):
@@ -1157,24 +1208,10 @@ class StateMixin:
 
     @heading.setter
     def heading(self, heading):
-        if heading is None:
-            self._heading = None
-            return
-
         # Check the given heading is a Quantity with a dimension of '' and units of
         # degrees or radians
-        try:
-            if not heading.check(""):
-                raise ValueError(
-                    "Heading must be a Quantity with a dimensionality of '' (ie. nothing)"
-                )
-            if not (heading.units == unit_registry.degree or heading.units == unit_registry.radian):
-                raise ValueError("Heading must be a Quantity with angular units (degree or radian)")
-        except AttributeError:
-            raise TypeError("Heading must be a Quantity")
-
-        # Set the actual heading attribute to the given value converted to radians
-        self._heading = heading.to(unit_registry.radian).magnitude
+        # and set the actual heading attribute to the given value converted to radians
+        self._heading = magnitude_in_units(heading, "radian", "Heading", "", angular=True)
 
     @heading.expression
     def heading(self):
@@ -1194,31 +1231,17 @@ class StateMixin:
 
     @course.setter
     def course(self, course):
-        if course is None:
-            self._course = None
-            return
-
         # Check the given course is a Quantity with a dimension of '' and units of
         # degrees or radians
-        try:
-            if not course.check(""):
-                raise ValueError(
-                    "Course must be a Quantity with a dimensionality of '' (ie. nothing)"
-                )
-            if not (course.units == unit_registry.degree or course.units == unit_registry.radian):
-                raise ValueError("Course must be a Quantity with angular units (degree or radian)")
-        except AttributeError:
-            raise TypeError("Course must be a Quantity")
-
-        # Set the actual course attribute to the given value converted to radians
-        self._course = course.to(unit_registry.radian).magnitude
+        # and set the actual course attribute to the given value converted to radians
+        self._course = magnitude_in_units(course, "radian", "Course", "", angular=True)
 
     @course.expression
     def course(self):
         return self._course
 
 
-class ContactMixin:
+class ContactMixin(RawValuesMixin):
     _default_preview_fields = ["time", "name", "bearing"]
 
     @declared_attr
@@ -1279,24 +1302,10 @@ class ContactMixin:
 
     @bearing.setter
     def bearing(self, bearing):
-        if bearing is None:
-            self._bearing = None
-            return
-
         # Check the given bearing is a Quantity with a dimension of '' and units of
         # degrees or radians
-        try:
-            if not bearing.check(""):
-                raise ValueError(
-                    "Bearing must be a Quantity with a dimensionality of '' (ie. nothing)"
-                )
-            if not (bearing.units == unit_registry.degree or bearing.units == unit_registry.radian):
-                raise ValueError("Bearing must be a Quantity with angular units (degree or radian)")
-        except AttributeError:
-            raise TypeError("Bearing must be a Quantity")
-
-        # Set the actual bearing attribute to the given value converted to radians
-        self._bearing = bearing.to(unit_registry.radian).magnitude
+        # and set the actual bearing attribute to the given value converted to radians
+        self._bearing = magnitude_in_units(bearing, "radian", "Bearing", "", angular=True)
 
     @bearing.expression
     def bearing(self):
@@ -1316,29 +1325,12 @@ class ContactMixin:
 
     @rel_bearing.setter
     def rel_bearing(self, rel_bearing):
-        if rel_bearing is None:
-            self._rel_bearing = None
-            return
-
         # Check the given bearing is a Quantity with a dimension of '' and units of
         # degrees or radians
-        try:
-            if not rel_bearing.check(""):
-                raise ValueError(
-                    "Relative Bearing must be a Quantity with a dimensionality of '' (ie. nothing)"
-                )
-            if not (
-                rel_bearing.units == unit_registry.degree
-                or rel_bearing.units == unit_registry.radian
-            ):
-                raise ValueError(
-                    "Relative Bearing must be a Quantity with angular units (degree or radian)"
-                )
-        except AttributeError:
-            raise TypeError("Relative Bearing must be a Quantity")
-
-        # Set the actual bearing attribute to the given value converted to radians
-        self._rel_bearing = rel_bearing.to(unit_registry.radian).magnitude
+        # and set the actual bearing attribute to the given value converted to radians
+        self._rel_bearing = magnitude_in_units(
+            rel_bearing, "radian", "Relative Bearing", "", angular=True
+        )
 
     @rel_bearing.expression
     def rel_bearing(self):
@@ -1358,29 +1350,12 @@ class ContactMixin:
 
     @ambig_bearing.setter
     def ambig_bearing(self, ambig_bearing):
-        if ambig_bearing is None:
-            self._ambig_bearing = None
-            return
-
         # Check the given bearing is a Quantity with a dimension of '' and units of
         # degrees or radians
-        try:
-            if not ambig_bearing.check(""):
-                raise ValueError(
-                    "Ambig Bearing must be a Quantity with a dimensionality of '' (ie. nothing)"
-                )
-            if not (
-                ambig_bearing.units == unit_registry.degree
-                or ambig_bearing.units == unit_registry.radian
-            ):
-                raise ValueError(
-                    "Ambig Bearing must be a Quantity with angular units (degree or radian)"
-                )
-        except AttributeError:
-            raise TypeError("Ambig Bearing must be a Quantity")
-
-        # Set the actual bearing attribute to the given value converted to radians
-        self._ambig_bearing = ambig_bearing.to(unit_registry.radian).magnitude
+        # and set the actual bearing attribute to the given value converted to radians
+        self._ambig_bearing = magnitude_in_units(
+            ambig_bearing, "radian", "Ambig Bearing", "", angular=True
+        )
 
     @ambig_bearing.expression
     def ambig_bearing(self):
@@ -1400,22 +1375,10 @@ class ContactMixin:
 
     @mla.setter
     def mla(self, mla):
-        if mla is None:
-            self._mla = None
-            return
-
         # Check the given bearing is a Quantity with a dimension of '' and units of
         # degrees or radians
-        try:
-            if not mla.check(""):
-                raise ValueError("MLA must be a Quantity with a dimensionality of '' (ie. nothing)")
-            if not (mla.units == unit_registry.degree or mla.units == unit_registry.radian):
-                raise ValueError("MLA must be a Quantity with angular units (degree or radian)")
-        except AttributeError:
-            raise TypeError("MLA must be a Quantity")
-
-        # Set the actual bearing attribute to the given value converted to radians
-        self._mla = mla.to(unit_registry.radian).magnitude
+        # and set the actual bearing attribute to the given value converted to radians
+        self._mla = magnitude_in_units(mla, "radian", "MLA", "", angular=True)
 
     @mla.expression
     def mla(self):
@@ -1435,19 +1398,9 @@ class ContactMixin:
 
     @soa.setter
     def soa(self, soa):
-        if soa is None:
-            self._soa = None
-            return
-
         # Check the given soa is a Quantity with a dimension of 'length / time'
-        try:
-            if not soa.check("[length]/[time]"):
-                raise ValueError("SOA must be a Quantity with a dimensionality of [length]/[time]")
-        except AttributeError:
-            raise TypeError("SOA must be a Quantity")
-
-        # Set the actual soa attribute to the given value converted to metres per second
-        self._soa = soa.to(unit_registry.metre / unit_registry.second).magnitude
+        # and set the actual soa attribute to the given value converted to metres per second
+        self._soa = magnitude_in_units(soa, "metre / second", "SOA", "[length]/[time]")
 
     @soa.expression
     def soa(self):
@@ -1467,29 +1420,12 @@ class ContactMixin:
 
     @orientation.setter
     def orientation(self, orientation):
-        if orientation is None:
-            self._orientation = None
-            return
-
         # Check the given orientation is a Quantity with a dimension of '' and units of
         # degrees or radians
-        try:
-            if not orientation.check(""):
-                raise ValueError(
-                    "Orientation must be a Quantity with a dimensionality of '' (ie. nothing)"
-                )
-            if not (
-                orientation.units == unit_registry.degree
-                or orientation.units == unit_registry.radian
-            ):
-                raise ValueError(
-                    "Orientation must be a Quantity with angular units (degree or radian)"
-                )
-        except AttributeError:
-            raise TypeError("Orientation must be a Quantity")
-
-        # Set the actual bearing attribute to the given value converted to radians
-        self._orientation = orientation.to(unit_registry.radian).magnitude
+        # and set the actual bearing attribute to the given value converted to radians
+        self._orientation = magnitude_in_units(
+            orientation, "radian", "Orientation", "", angular=True
+        )
 
     @orientation.expression
     def orientation(self):
@@ -1509,19 +1445,9 @@ class ContactMixin:
 
     @major.setter
     def major(self, major):
-        if major is None:
-            self._major = None
-            return
-
         # Check the given major is a Quantity with a dimension of 'length'
-        try:
-            if not major.check("[length]"):
-                raise ValueError("Major must be a Quantity with a dimensionality of [length]")
-        except AttributeError:
-            raise TypeError("Major must be a Quantity")
-
-        # Set the actual major attribute to the given value converted to metres
-        self._major = major.to(unit_registry.metre).magnitude
+        # and set the actual major attribute to the given value converted to metres
+        self._major = magnitude_in_units(major, "metre", "Major", "[length]")
 
     @major.expression
     def major(self):
@@ -1541,19 +1467,9 @@ class ContactMixin:
 
     @minor.setter
     def minor(self, minor):
-        if minor is None:
-            self._minor = None
-            return
-
         # Check the given minor is a Quantity with a dimension of 'length'
-        try:
-            if not minor.check("[length]"):
-                raise ValueError("Minor must be a Quantity with a dimensionality of [length]")
-        except AttributeError:
-            raise TypeError("Minor must be a Quantity")
-
-        # Set the actual minor attribute to the given value converted to metres
-        self._minor = minor.to(unit_registry.metre).magnitude
+        # and set the actual minor attribute to the given value converted to metres
+        self._minor = magnitude_in_units(minor, "metre", "Minor", "[length]")
 
     @minor.expression
     def minor(self):
@@ -1573,19 +1489,9 @@ class ContactMixin:
 
     @range.setter
     def range(self, range):
-        if range is None:
-            self._range = None
-            return
-
         # Check the given range is a Quantity with a dimension of 'length'
-        try:
-            if not range.check("[length]"):
-                raise ValueError("Range must be a Quantity with a dimensionality of [length]")
-        except AttributeError:
-            raise TypeError("Range must be a Quantity")
-
-        # Set the actual range attribute to the given value converted to metres
-        self._range = range.to(unit_registry.metre).magnitude
+        # and set the actual range attribute to the given value converted to metres
+        self._range = magnitude_in_units(range, "metre", "Range", "[length]")
 
     @range.expression
     def range(self):
@@ -1605,19 +1511,9 @@ class ContactMixin:
 
     @freq.setter
     def freq(self, freq):
-        if freq is None:
-            self._freq = None
-            return
-
         # Check the given freq is a Quantity with a dimension of 'time^-1' (ie. 'per unit time')
-        try:
-            if not freq.check("[time]^-1"):
-                raise ValueError("Freq must be a Quantity with a dimensionality of [time]^-1")
-        except AttributeError:
-            raise TypeError("Freq must be a Quantity")
-
-        # Set the actual freq attribute to the given value converted to hertz
-        self._freq = freq.to(unit_registry.hertz).magnitude
+        # and set the actual freq attribute to the given value converted to hertz
+        self._freq = magnitude_in_units(freq, "hertz", "Freq", "[time]^-1")
 
     @freq.expression
     def freq(self):
@@ -1866,19 +1762,9 @@ class ElevationPropertyMixin:
 
     @elevation.setter
     def elevation(self, elevation):
-        if elevation is None:
-            self._elevation = None
-            return
-
         # Check the given elevation is a Quantity with a dimension of 'length'
-        try:
-            if not elevation.check("[length]"):
-                raise ValueError("Elevation must be a Quantity with a dimensionality of [length]")
-        except AttributeError:
-            raise TypeError("Elevation must be a Quantity")
-
-        # Set the actual elevation attribute to the given value converted to metres
-        self._elevation = elevation.to(unit_registry.metre).magnitude
+        # and set the actual elevation attribute to the given value converted to metres
+        self._elevation = magnitude_in_units(elevation, "metre", "Elevation", "[length]")
 
     @elevation.expression
     def elevation(self):
@@ -1918,7 +1804,7 @@ class LocationPropertyMixin:
         return self._location
 
 
-class ActivationMixin:
+class ActivationMixin(RawValuesMixin):
     _default_preview_fields = ["name", "sensor_name", "start", "end"]
 
     @declared_attr
@@ -1962,19 +1848,9 @@ class ActivationMixin:
 
     @min_range.setter
     def min_range(self, min_range):
-        if min_range is None:
-            self._min_range = None
-            return
-
         # Check the given min_range is a Quantity with a dimension of 'length'
-        try:
-            if not min_range.check("[length]"):
-                raise ValueError("min_range must be a Quantity with a dimensionality of [length]")
-        except AttributeError:
-            raise TypeError("min_range must be a Quantity")
-
-        # Set the actual min_range attribute to the given value converted to metres
-        self._min_range = min_range.to(unit_registry.metre).magnitude
+        # and set the actual min_range attribute to the given value converted to metres
+        self._min_range = magnitude_in_units(min_range, "metre", "min_range", "[length]")
 
     @min_range.expression
     def min_range(self):
@@ -1993,19 +1869,9 @@ class ActivationMixin:
 
     @max_range.setter
     def max_range(self, max_range):
-        if max_range is None:
-            self._max_range = None
-            return
-
         # Check the given max_range is a Quantity with a dimension of 'length'
-        try:
-            if not max_range.check("[length]"):
-                raise ValueError("max_range must be a Quantity with a dimensionality of [length]")
-        except AttributeError:
-            raise TypeError("max_range must be a Quantity")
-
-        # Set the actual max_range attribute to the given value converted to metres
-        self._max_range = max_range.to(unit_registry.metre).magnitude
+        # and set the actual max_range attribute to the given value converted to metres
+        self._max_range = magnitude_in_units(max_range, "metre", "max_range", "[length]")
 
     @max_range.expression
     def max_range(self):
@@ -2025,28 +1891,10 @@ class ActivationMixin:
 
     @left_arc.setter
     def left_arc(self, left_arc):
-        if left_arc is None:
-            self._left_arc = None
-            return
-
         # Check the given left_arc is a Quantity with a dimension of '' and units of
         # degrees or radians
-        try:
-            if not left_arc.check(""):
-                raise ValueError(
-                    "left_arc must be a Quantity with a dimensionality of '' (ie. nothing)"
-                )
-            if not (
-                left_arc.units == unit_registry.degree or left_arc.units == unit_registry.radian
-            ):
-                raise ValueError(
-                    "left_arc must be a Quantity with angular units (degree or radian)"
-                )
-        except AttributeError:
-            raise TypeError("left_arc must be a Quantity")
-
-        # Set the actual left_arc attribute to the given value converted to radians
-        self._left_arc = left_arc.to(unit_registry.radian).magnitude
+        # and set the actual left_arc attribute to the given value converted to radians
+        self._left_arc = magnitude_in_units(left_arc, "radian", "left_arc", "", angular=True)
 
     @left_arc.expression
     def left_arc(self):
@@ -2066,28 +1914,10 @@ class ActivationMixin:
 
     @right_arc.setter
     def right_arc(self, right_arc):
-        if right_arc is None:
-            self._right_arc = None
-            return
-
         # Check the given right_arc is a Quantity with a dimension of '' and units of
         # degrees or radians
-        try:
-            if not right_arc.check(""):
-                raise ValueError(
-                    "right_arc must be a Quantity with a dimensionality of '' (ie. nothing)"
-                )
-            if not (
-                right_arc.units == unit_registry.degree or right_arc.units == unit_registry.radian
-            ):
-                raise ValueError(
-                    "right_arc must be a Quantity with angular units (degree or radian)"
-                )
-        except AttributeError:
-            raise TypeError("right_arc must be a Quantity")
-
-        # Set the actual right_arc attribute to the given value converted to radians
-        self._right_arc = right_arc.to(unit_registry.radian).magnitude
+        # and set the actual right_arc attribute to the given value converted to radians
+        self._right_arc = magnitude_in_units(right_arc, "radian", "right_arc", "", angular=True)
 
     @right_arc.expression
     def right_arc(self):
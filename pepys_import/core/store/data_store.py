@@ -10,7 +10,7 @@ from importlib import import_module
 import pint
 import sqlalchemy
 from packaging import version
-from sqlalchemy import create_engine, inspect
+from sqlalchemy import create_engine, inspect, select
 from sqlalchemy.event import listen
 from sqlalchemy.exc import ArgumentError, OperationalError
 from sqlalchemy.orm import scoped_session, sessionmaker, undefer
@@ -28,9 +28,11 @@ from pepys_import.core.formats.location import Location
 from pepys_import.core.store import constants
 from pepys_import.resolvers.default_resolver import DefaultResolver
 from pepys_import.utils.branding_util import show_software_meta_info, show_welcome_banner
+from pepys_import.utils.cache_utils import LRUCache
 from pepys_import.utils.data_store_utils import (
     MissingDataException,
     cache_results_if_not_none,
+    chunked_list,
     convert_edit_dict_columns,
     convert_objects_to_ids,
     create_alembic_version_table,
@@ -54,7 +56,7 @@ from ...utils.table_name_utils import table_name_to_class_name
 from ...utils.text_formatting_utils import custom_print_formatted_text, format_error_message
 from .db_base import BasePostGIS, BaseSpatiaLite
 from .db_status import TableTypes
-from .table_summary import TableSummary, TableSummarySet
+from .table_summary import AddedRowsSummary, TableSummary, TableSummarySet
 
 DEFAULT_DATA_PATH = os.path.join(PEPYS_IMPORT_DIRECTORY, "database", "default_data")
 USER = getuser()  # Login name of the current user
@@ -91,6 +93,7 @@ class DataStore:
         welcome_text="Pepys_import",
         show_status=True,
         error_on_db_version_mismatch=False,
+        cache_size=None,
     ):
 
         self.missing_data_resolver = missing_data_resolver
@@ -108,36 +111,53 @@ class DataStore:
         # use session_scope() to create a new session
         self.session = None
 
-        # dictionaries, to cache platform name
-        self._platform_dict_on_sensor_id = dict()
-        self._platform_dict_on_platform_id = dict()
+        # Caches of the results of database lookups, keyed by cache name. Each cache is an LRUCache
+        # holding at most cache_size entries, so long-running sessions don't use ever more memory.
+        # The statistics for each cache are given by get_cache_statistics
+        self.cache_size = config.CACHE_SIZE if cache_size is None else cache_size
+        self._caches = dict()
 
-        # dictionary to cache platform object based on name
-        self._platform_cache = dict()
+        # caches of platform name
+        self._platform_dict_on_sensor_id = self._create_cache("platform_dict_on_sensor_id")
+        self._platform_dict_on_platform_id = self._create_cache("platform_dict_on_platform_id")
 
-        # dictionary to cache sensor based on sensor_name and platform_id
-        self._sensor_cache = dict()
+        # cache of platform_id based on the (lower-case) name, nationality and identifier
+        # searched for by find_platform. It lasts for the lifetime of the DataStore, so is shared by
+        # all the files processed in a run, and is cleared by clear_platform_and_sensor_caches
+        self._platform_cache = self._create_cache("platform")
 
-        # dictionary to cache datafile based on datafile_name
-        self._datafile_cache = dict()
+        # cache of sensor based on sensor_name and platform_id
+        self._sensor_cache = self._create_cache("sensor")
 
-        # dictionaries, to cache sensor name
-        self._sensor_dict_on_sensor_id = dict()
+        # cache of datafile based on datafile_name
+        self._datafile_cache = self._create_cache("datafile")
 
-        # dictionary, to cache comment type name
-        self._comment_type_name_dict_on_comment_type_id = dict()
+        # cache of sensor name
+        self._sensor_dict_on_sensor_id = self._create_cache("sensor_dict_on_sensor_id")
 
-        self._search_privacy_cache = dict()
-        self._search_platform_type_cache = dict()
-        self._search_force_type_cache = dict()
-        self._search_sensor_type_cache = dict()
-        self._search_sensor_cache = dict()
-        self._search_nationality_cache = dict()
-        self._search_datafile_from_id_cache = dict()
-        self._search_datafile_cache = dict()
-        self._search_datafile_type_cache = dict()
-        self._search_geometry_type_cache = dict()
-        self._search_geometry_subtype_cache = dict()
+        # cache of comment type name
+        self._comment_type_name_dict_on_comment_type_id = self._create_cache(
+            "comment_type_name_dict_on_comment_type_id"
+        )
+
+        # caches used by the search methods decorated with cache_results_if_not_none
+        self._search_privacy_cache = self._create_cache("search_privacy")
+        self._search_platform_type_cache = self._create_cache("search_platform_type")
+        self._search_force_type_cache = self._create_cache("search_force_type")
+        self._search_sensor_type_cache = self._create_cache("search_sensor_type")
+        self._search_sensor_cache = self._create_cache("search_sensor")
+        self._search_nationality_cache = self._create_cache("search_nationality")
+        self._search_datafile_from_id_cache = self._create_cache("search_datafile_from_id")
+        self._search_datafile_cache = self._create_cache("search_datafile")
+        self._search_datafile_type_cache = self._create_cache("search_datafile_type")
+        self._search_geometry_type_cache = self._create_cache("search_geometry_type")
+        self._search_geometry_subtype_cache = self._create_cache("search_geometry_subtype")
+
+        # Primary keys of the rows added under each change, keyed by change ID and then by
+        # table name. These are recorded as the Logs entries for the rows are made, so the rows
+        # added by an import can be reported without querying whole tables (see get_added_status).
+        # Only the changes inside recording_added_rows are recorded
+        self.added_row_ids = dict()
 
         if db_type == "postgres":
             self.db_classes = import_module("pepys_import.core.store.postgres_db")
@@ -275,6 +295,21 @@ class DataStore:
         finally:
             self.session.close()
 
+    @contextmanager
+    def recording_added_rows(self, change_id):
+        """Record the primary keys of the rows added under a change while in this context, so
+        they can be reported by :meth:`get_added_status`. They are forgotten at the end of the
+        context, even if an exception is raised.
+
+        :param change_id: ID of the :class:`Change` object to record the added rows of
+        :type change_id: Integer or UUID
+        """
+        self.added_row_ids[change_id] = dict()
+        try:
+            yield
+        finally:
+            self.added_row_ids.pop(change_id, None)
+
     def check_network_version(self):
         if config.NETWORK_MASTER_INSTALL_PATH != "":
             network_version = read_version_from_pepys_install(config.NETWORK_MASTER_INSTALL_PATH)
@@ -983,25 +1018,79 @@ class DataStore:
         If only the platform_name is given, then it searches synonyms ONLY. If all details
         are given then it searches for all the details in the database
 
-        It does not currently use a cache.
+        The IDs of platforms that are found are cached, so later searches for the same details
+        (for example, when importing the next file in a folder) don't need to query the
+        Synonyms and Platforms tables. Searches that don't find a platform aren't cached, so
+        the resolver is asked about them as before.
         """
-        # TODO: Add caching here if things get slow
-
         # Must have a name regardless what sort of search we're doing
         if name is None:
             return None
 
+        cache_key = (name.lower(), lowercase_or_none(nationality), lowercase_or_none(identifier))
+        cached_id = self._platform_cache.get(cache_key)
+        if cached_id is not None:
+            platform = self.session.get(self.db_classes.Platform, cached_id)
+            if platform is not None:
+                return platform
+            # The platform has been removed since it was cached, so search again
+            del self._platform_cache[cache_key]
+
         if (nationality is None) and (identifier is None):
             # No nat or identifier, so just search synonyms
-            synonym_result = self.synonym_search(
+            platform = self.synonym_search(
                 name=name,
                 table=self.db_classes.Platform,
                 pk_field=self.db_classes.Platform.platform_id,
             )
-            return synonym_result
         else:
             # Got all details, so search for all details and return results
-            return self.search_platform(name, nationality, identifier)
+            platform = self.search_platform(name, nationality, identifier)
+
+        if platform is not None:
+            self._platform_cache[cache_key] = platform.platform_id
+        return platform
+
+    def _create_cache(self, name):
+        cache = LRUCache(name, self.cache_size)
+        self._caches[name] = cache
+        return cache
+
+    def get_cache_statistics(self):
+        """
+        Returns the statistics for each of the caches of database lookups
+
+        :return: List of dictionaries, one for each cache, with the name, current size, maximum
+            size, and the number of hits, misses and evictions (see LRUCache.statistics)
+        :rtype: List
+        """
+        return [cache.statistics() for cache in self._caches.values()]
+
+    def clear_caches(self, reset_statistics=False):
+        """
+        Clears all the caches of database lookups. This should be called if the database is
+        changed other than through this DataStore, so that out of date results aren't returned.
+
+        :param reset_statistics: If True, also reset the hit, miss and eviction counts
+        :type reset_statistics: bool
+        """
+        for cache in self._caches.values():
+            cache.clear()
+            if reset_statistics:
+                cache.reset_statistics()
+
+    def clear_platform_and_sensor_caches(self):
+        """
+        Clears the caches of platforms and sensors found, and of their names.
+
+        This must be called whenever platforms or sensors are merged, edited or deleted, so that
+        later searches don't return out of date results.
+        """
+        self._platform_cache.clear()
+        self._sensor_cache.clear()
+        self._platform_dict_on_sensor_id.clear()
+        self._platform_dict_on_platform_id.clear()
+        self._sensor_dict_on_sensor_id.clear()
 
     def get_platform(
         self,
@@ -1141,6 +1230,39 @@ class DataStore:
             change_id=change_id,
         )
 
+    def get_sensor(self, platform_id, sensor_name=None, sensor_type=None, change_id=None):
+        """
+        Lookup or create a sensor of this name for the :class:`Platform` with the given ID.
+        It uses :meth:`Platform.get_sensor`, but looks for an existing sensor with this name
+        first, so the platform doesn't need to be queried if the sensor already exists.
+
+        :param platform_id: Primary key of the :class:`Platform` the sensor belongs to
+        :type platform_id: UUID
+        :param sensor_name: Name of :class:`Sensor`
+        :type sensor_name: String
+        :param sensor_type: Type of :class:`Sensor`
+        :type sensor_type: String
+        :param change_id: ID of the :class:`Change` object
+        :type change_id: Integer or UUID
+        :return: Created :class:`Sensor` entity
+        :rtype: Sensor
+        """
+        sensor = self.db_classes.Sensor.find_sensor(self, sensor_name, platform_id)
+        if sensor:
+            return sensor
+
+        platform = (
+            self.session.query(self.db_classes.Platform)
+            .filter(self.db_classes.Platform.platform_id == platform_id)
+            .first()
+        )
+        return platform.get_sensor(
+            data_store=self,
+            sensor_name=sensor_name,
+            sensor_type=sensor_type,
+            change_id=change_id,
+        )
+
     def get_platform_name_from_quad(self, quadgraph):
         platform = (
             self.session.query(self.db_classes.Platform)
@@ -1179,6 +1301,50 @@ class DataStore:
 
         return table_summaries_set
 
+    def get_added_status(self, table_type, change_id, exclude=None):
+        """
+        Provides a summary of the rows added to the tables of the given type under the given
+        change, with the same tables in the same order as :meth:`get_status`.
+
+        Only the rows whose Logs entries were made by this :class:`DataStore` inside
+        :meth:`recording_added_rows` for the change are included, and they are looked up by
+        their primary keys, so this doesn't query the whole of each table like
+        :meth:`get_status` does.
+
+        :param table_type: one of Table Types
+        :type table_type: Enum
+        :param change_id: ID of the :class:`Change` object the rows were added under
+        :type change_id: Integer or UUID
+        :param exclude: List of table names to exclude from the report
+        :type exclude: List
+        :return: The summary of the rows added, made of AddedRowsSummary objects
+        :rtype: TableSummarySet
+        """
+        if exclude is None:
+            exclude = []
+        added_row_ids = self.added_row_ids.get(change_id, {})
+        table_summaries = []
+        for table_object in list(self.meta_classes[table_type]):
+            table_name = table_object.__tablename__
+            if table_name in exclude:
+                continue
+            row_ids = added_row_ids.get(table_name, [])
+            created_date = None
+            names = []
+            if row_ids:
+                primary_key = getattr(table_object, get_primary_key_for_table(table_object))
+                columns = [table_object.created_date]
+                if table_name in [constants.SENSOR, constants.PLATFORM]:
+                    columns.append(table_object.name)
+                for chunk_row_ids in chunked_list(row_ids, size=500):
+                    for row in self.session.query(*columns).filter(primary_key.in_(chunk_row_ids)):
+                        if created_date is None or row[0] > created_date:
+                            created_date = row[0]
+                        if len(row) > 1:
+                            names.append(row[1])
+            table_summaries.append(AddedRowsSummary(table_name, len(row_ids), created_date, names))
+        return TableSummarySet(table_summaries)
+
     def search_comment_type(self, name):
         """Search for any comment type featuring this name"""
         return (
@@ -1537,6 +1703,10 @@ class DataStore:
         self.session.add(log)
         self.session.flush()
 
+        # Logs entries without a field are for new rows, rather than edits to existing rows
+        if field is None and change_id in self.added_row_ids:
+            self.added_row_ids[change_id].setdefault(table, []).append(row_id)
+
         return log
 
     def add_to_changes(self, user, modified, reason):
@@ -1600,8 +1770,9 @@ class DataStore:
         """
         if comment_type_id:
             # return from cache
-            if comment_type_id in self._comment_type_name_dict_on_comment_type_id:
-                return self._comment_type_name_dict_on_comment_type_id[comment_type_id]
+            cached_name = self._comment_type_name_dict_on_comment_type_id.get(comment_type_id)
+            if cached_name is not None:
+                return cached_name
             comment_type = (
                 self.session.query(self.db_classes.CommentType)
                 .filter(self.db_classes.CommentType.comment_type_id == comment_type_id)
@@ -1616,8 +1787,9 @@ class DataStore:
 
     def get_cached_sensor_name(self, sensor_id):
         # return from cache
-        if sensor_id in self._sensor_dict_on_sensor_id:
-            return self._sensor_dict_on_sensor_id[sensor_id]
+        cached_name = self._sensor_dict_on_sensor_id.get(sensor_id)
+        if cached_name is not None:
+            return cached_name
         sensor = (
             self.session.query(self.db_classes.Sensor)
             .filter(self.db_classes.Sensor.sensor_id == sensor_id)
@@ -1649,8 +1821,9 @@ class DataStore:
 
         if sensor_id:
             # return from cache
-            if sensor_id in self._platform_dict_on_sensor_id:
-                return self._platform_dict_on_sensor_id[sensor_id]
+            cached_name = self._platform_dict_on_sensor_id.get(sensor_id)
+            if cached_name is not None:
+                return cached_name
             sensor = (
                 self.session.query(self.db_classes.Sensor)
                 .filter(self.db_classes.Sensor.sensor_id == sensor_id)
@@ -1664,8 +1837,9 @@ class DataStore:
 
         if platform_id:
             # return from cache
-            if platform_id in self._platform_dict_on_platform_id:
-                return self._platform_dict_on_platform_id[platform_id]
+            cached_name = self._platform_dict_on_platform_id.get(platform_id)
+            if cached_name is not None:
+                return cached_name
             platform = (
                 self.session.query(self.db_classes.Platform)
                 .filter(self.db_classes.Platform.platform_id == platform_id)
@@ -1941,6 +2115,23 @@ class DataStore:
             return True
         return False
 
+    def get_loaded_datafiles(self):
+        """
+        Gets the size and hash of all the datafiles that have been loaded, with a single query,
+        so that files can be checked against them without querying the database for each file.
+
+        :return: Dictionary mapping (size, hash) tuples to (reference, created_date) tuples
+        :rtype: dict
+        """
+        Datafile = self.db_classes.Datafile
+        query = self.session.query(
+            Datafile.size, Datafile.hash, Datafile.reference, Datafile.created_date
+        )
+        return {
+            (size, file_hash): (reference, created_date)
+            for size, file_hash, reference, created_date in query
+        }
+
     def is_empty(self):
         """Returns True if sample table (Privacy) is empty, False otherwise"""
         reference = self.session.query(self.db_classes.Privacy).first()
@@ -1956,6 +2147,72 @@ class DataStore:
             .all()
         )
 
+    def remove_logged_rows(self, change_id, table_type, delete_rows=True):
+        """
+        Deletes the rows of tables of the given type which are recorded in the Logs table under
+        the given change, along with their Logs entries. This is used to roll back an import.
+
+        The rows are deleted with one DELETE statement per table, selecting the rows to delete
+        with a subquery on the Logs table, rather than loading the Logs entries and deleting each
+        row separately.
+
+        :param change_id: ID of the :class:`Change`
+        :type change_id: UUID
+        :param table_type: Type of the tables to delete rows from
+        :type table_type: TableTypes
+        :param delete_rows: If False, only the Logs entries are deleted. This is used when the
+            rows have already been deleted in another way (for example, measurements, which are
+            deleted along with their Datafile)
+        :type delete_rows: bool
+        """
+        Log = self.db_classes.Log
+        table_names = {table.__tablename__ for table in self.meta_classes[table_type]}
+        logged_table_names = {
+            table_name
+            for (table_name,) in self.session.query(Log.table)
+            .filter(Log.change_id == change_id)
+            .distinct()
+            if table_name in table_names
+        }
+        if not logged_table_names:
+            return
+
+        if delete_rows:
+            if self.db_type == "sqlite":
+                meta = BaseSpatiaLite.metadata
+            else:
+                meta = BasePostGIS.metadata
+            # Delete from the tables in reverse order of their dependencies, so rows are deleted
+            # before any rows that they refer to
+            for table in reversed(meta.sorted_tables):
+                if table.name not in logged_table_names:
+                    continue
+                table_obj = getattr(self.db_classes, table_name_to_class_name(table.name))
+                primary_key = getattr(table_obj, get_primary_key_for_table(table_obj))
+                logged_ids = select(Log.id).where(
+                    Log.change_id == change_id, Log.table == table.name
+                )
+                self.session.query(table_obj).filter(primary_key.in_(logged_ids)).delete(
+                    synchronize_session="fetch"
+                )
+
+        self.session.query(Log).filter(
+            Log.change_id == change_id, Log.table.in_(logged_table_names)
+        ).delete(synchronize_session="evaluate")
+
+    def refresh_dashboard_coverage(self):
+        """
+        Brings the summary of the periods covered by each platform's States up to date, for the
+        hours in which States have been added, changed or removed since it was last refreshed.
+
+        The summary is used by the dashboard_stats stored procedure, which falls back to
+        querying the States for any hours which haven't been refreshed. It only exists on
+        PostgreSQL, so this does nothing on SQLite.
+        """
+        if self.db_type != "postgres":
+            return
+        self.session.execute(text("SELECT pepys.refresh_dashboard_coverage()"))
+
     def _check_master_id(self, table_obj, master_id):
         master_obj = (
             self.session.query(table_obj)
@@ -2214,6 +2471,8 @@ class DataStore:
         else:
             return False
 
+        self.clear_platform_and_sensor_caches()
+
         if callable(set_percentage):
             set_percentage(100)
         return True
@@ -2302,6 +2561,7 @@ class DataStore:
         for s in to_delete:
             self.session.delete(s)
         self.session.flush()
+        self.clear_platform_and_sensor_caches()
 
     def edit_items(self, items, edit_dict, table_object):
         """
@@ -2345,6 +2605,8 @@ class DataStore:
                     change_id=change_id,
                 )
 
+        self.clear_platform_and_sensor_caches()
+
     def add_item(self, table_object, edit_dict):
         change_id = self.add_to_changes(
             user=USER,
@@ -2480,6 +2742,7 @@ class DataStore:
             getattr(table_obj, get_primary_key_for_table(table_obj)).in_(id_list)
         ).delete(synchronize_session="fetch")
         self.session.flush()
+        self.clear_platform_and_sensor_caches()
 
     def convert_ids_to_objects(self, ids, table_obj):
         if ids is None:
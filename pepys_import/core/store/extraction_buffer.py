@@ -0,0 +1,133 @@
+from pepys_import.utils.sqlalchemy_utils import get_primary_key_for_table
+
+
+class ExtractionBuffer:
+    """
+    Buffer of the extractions recorded while importing a file with the DATABASE highlighting
+    level, ready to be written to the Extractions table.
+
+    The details of each extraction are stored in a separate list per column, rather than as a
+    dict per extraction. Extractions are recorded first, and are then assigned to the measurement
+    object (State, Contact etc) they were used to create when `assign` is called. Only one entry
+    is stored for each assignment, and the ID of the measurement object is only looked up when
+    the columns to write are created by `columns`, after the measurement objects have been
+    given their primary keys.
+    """
+
+    COLUMNS = ("text", "interpreted_value", "text_location", "importer", "field")
+
+    def __init__(self):
+        self.text = []
+        self.interpreted_value = []
+        self.text_location = []
+        self.importer = []
+        self.field = []
+        # List of (measurement object, index of first extraction, index after last extraction)
+        self.assignments = []
+        # Number of extractions that have been assigned to a measurement object
+        self.assigned_count = 0
+
+    def __len__(self):
+        return len(self.text)
+
+    @property
+    def pending_count(self):
+        """Number of extractions that haven't been assigned to a measurement object yet"""
+        return len(self.text) - self.assigned_count
+
+    def record(self, text, interpreted_value, text_location, importer, field):
+        """
+        Records an extraction
+
+        :param text: The text that was extracted
+        :type text: String
+        :param interpreted_value: The value that the text was interpreted as
+        :type interpreted_value: String
+        :param text_location: Character ranges of the text in the file (eg. "0-10,12-15")
+        :type text_location: String
+        :param importer: Name of the importer that extracted the text
+        :type importer: String
+        :param field: The field that the text was interpreted as (eg. "speed")
+        :type field: String
+        """
+        self.text.append(text)
+        self.interpreted_value.append(interpreted_value)
+        self.text_location.append(text_location)
+        self.importer.append(importer)
+        self.field.append(field)
+
+    def assign(self, measurement_object):
+        """
+        Assigns all the extractions recorded since the last call to the given measurement
+        object. If the measurement object is None then the extractions are discarded.
+
+        :param measurement_object: Measurement object created from the extractions
+        :type measurement_object: State, Contact, Comment, Geometry1 or Activation
+        """
+        end = len(self.text)
+        if end == self.assigned_count:
+            return
+        if measurement_object is None:
+            self.discard_pending()
+            return
+        self.assignments.append((measurement_object, self.assigned_count, end))
+        self.assigned_count = end
+
+    def discard_pending(self):
+        """Discards the extractions that haven't been assigned to a measurement object"""
+        for column in self.COLUMNS:
+            del getattr(self, column)[self.assigned_count :]
+
+    def pending_rows(self):
+        """
+        Returns the extractions that haven't been assigned to a measurement object
+
+        :return: List of dicts, keyed by column name
+        :rtype: List
+        """
+        return [
+            dict(zip(self.COLUMNS, values))
+            for values in zip(
+                *(getattr(self, column)[self.assigned_count :] for column in self.COLUMNS)
+            )
+        ]
+
+    def columns(self, datafile_id):
+        """
+        Returns the columns of the Extractions table for all the extractions that have been
+        assigned to measurement objects, ready to be written with `insert_columns`. This must be
+        called after the measurement objects have been given their primary keys.
+
+        :param datafile_id: ID of the :class:`Datafile` that the extractions are from
+        :type datafile_id: UUID
+        :return: Dict of lists of values, keyed by column name
+        :rtype: Dict
+        """
+        end = self.assigned_count
+        entry_ids = []
+        destination_tables = []
+        primary_keys = {}
+        for measurement_object, start, stop in self.assignments:
+            class_ = type(measurement_object)
+            primary_key = primary_keys.get(class_)
+            if primary_key is None:
+                primary_key = get_primary_key_for_table(measurement_object)
+                primary_keys[class_] = primary_key
+            count = stop - start
+            entry_ids.extend([getattr(measurement_object, primary_key)] * count)
+            # The table name is a subclass of str, which the database drivers are slower to
+            # handle than plain strings
+            destination_tables.extend([str(measurement_object.__table__.name)] * count)
+
+        columns = {column: getattr(self, column)[:end] for column in self.COLUMNS}
+        columns["entry_id"] = entry_ids
+        columns["destination_table"] = destination_tables
+        columns["datafile_id"] = [datafile_id] * end
+        return columns
+
+    def clear(self):
+        """Removes all the extractions from the buffer"""
+        for column in self.COLUMNS:
+            getattr(self, column).clear()
+        self.assignments = []
+        self.assigned_count = 0
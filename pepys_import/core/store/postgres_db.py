@@ -42,6 +42,7 @@ from pepys_import.core.store.common_db import (
 )
 from pepys_import.core.store.db_base import BasePostGIS
 from pepys_import.core.store.db_status import TableTypes
+from pepys_import.core.store.extraction_buffer import ExtractionBuffer
 
 
 # Metadata Tables
@@ -293,8 +294,7 @@ class Datafile(BasePostGIS, DatafileMixin):
         super().__init__(*args, **kwargs)
         self.measurements = dict()
         self.highlighted_file = None
-        self.pending_extracted_tokens = []
-        self.measurement_object_to_tokens_list = {}
+        self.extraction_buffer = ExtractionBuffer()
         self.current_measurement_object = None
 
     __tablename__ = constants.DATAFILE
@@ -42,6 +42,7 @@ from pepys_import.core.store.common_db import (
 )
 from pepys_import.core.store.db_base import BaseSpatiaLite
 from pepys_import.core.store.db_status import TableTypes
+from pepys_import.core.store.extraction_buffer import ExtractionBuffer
 from pepys_import.utils.sqlalchemy_utils import UUIDType
 
 
@@ -294,8 +295,7 @@ class Datafile(BaseSpatiaLite, DatafileMixin):
         super().__init__(*args, **kwargs)
         self.measurements = dict()
         self.highlighted_file = None
-        self.pending_extracted_tokens = []
-        self.measurement_object_to_tokens_list = {}
+        self.extraction_buffer = ExtractionBuffer()
         self.current_measurement_object = None
 
     __tablename__ = constants.DATAFILE
@@ -44,6 +44,29 @@ class TableSummary:
                 ]
 
 
+class AddedRowsSummary:
+    """
+    A summary of the rows added to a table, with the same attributes as TableSummary so that
+    it can be reported by a TableSummarySet. It is made from the rows that were added (for
+    example by an import), so unlike TableSummary it doesn't need to query the whole table.
+
+    :param table_name: Name of the table
+    :type table_name: String
+    :param number_of_rows: Number of rows added
+    :type number_of_rows: Integer
+    :param created_date: Creation date of the last row added
+    :type created_date: datetime
+    :param names: Names of the rows added, for the Sensors and Platforms tables
+    :type names: List
+    """
+
+    def __init__(self, table_name, number_of_rows, created_date=None, names=None):
+        self.table_name = table_name
+        self.number_of_rows = number_of_rows
+        self.created_date = "-" if created_date is None else str(created_date)
+        self.names = names or []
+
+
 class TableSummarySet:
     """A collection of TableSummary elements."""
 
@@ -141,3 +164,17 @@ class TableSummarySet:
             return self.show_delta_of_rows_added(other)
 
         return self.report_metadata_names(differences)
+
+    def report_added_metadata(self):
+        """Produce a pretty-printed report of the metadata rows added, for a TableSummarySet of
+        AddedRowsSummary objects. In the same way as show_delta_of_rows_added_metadata, this
+        shows the names of the new sensors and platforms, or the number of rows added to each
+        table if there are too many names to show.
+
+        :return: String of text
+        """
+        if any(len(table.names) > 6 for table in self.table_summaries):
+            return self.report()
+        return self.report_metadata_names(
+            [(table.table_name, table.names) for table in self.table_summaries]
+        )
@@ -1,10 +1,23 @@
+from datetime import timezone
+
+import numpy as np
+
 from pepys_import.core.formats import unit_registry
+from pepys_import.core.formats.location import parse_wkt_point
 from pepys_import.utils.unit_utils import (
     acceptable_bearing_error,
     bearing_between_two_points,
     distance_between_two_points_haversine,
 )
 
+# Largest acceptable difference between the bearing between two locations and the heading
+# or course, in degrees
+BEARING_DELTA = 90
+# Radius of the earth, as used by distance_between_two_points_haversine
+EARTH_RADIUS_METRES = 6371000
+# Allowance for rounding differences between the NumPy checks and the checks in validate
+TOLERANCE = 1e-6
+
 
 class EnhancedValidator:
     """Enhanced validator serve to verify the lat/long, in addition to the course/speed/heading"""
@@ -12,6 +25,128 @@ class EnhancedValidator:
     def __init__(self):
         self.name = "Enhanced Validator"
 
+    def validate_track(self, objects, parser_name):
+        """Validates a whole list of measurement objects, such as the objects for one platform
+        in Datafile.measurements, giving the same errors as calling :meth:`validate` on each
+        object with the previous object for the same platform.
+
+        The latitudes, longitudes, times, speeds, headings and courses of all the objects are
+        put into NumPy arrays, and the bearing and speed checks are done for the whole list at
+        once. Only the objects which might fail those checks are then passed to
+        :meth:`validate`, so the errors are exactly the same as it gives.
+
+        :param objects: Measurement objects, in the order they were created
+        :type objects: List
+        :param parser_name: Name of the parser, used in the error messages
+        :type parser_name: String
+        :return: Map of the index of each object which fails validation to its list of errors
+        :rtype: Dict
+        """
+        count = len(objects)
+        latitudes = np.full(count, np.nan)
+        longitudes = np.full(count, np.nan)
+        speeds = np.full(count, np.nan)
+        headings = np.full(count, np.nan)
+        courses = np.full(count, np.nan)
+        times = []
+        # Index of the previous object for the same platform, or -1 if there isn't one
+        previous = np.full(count, -1, dtype=np.int64)
+        last_index_by_platform = dict()
+
+        for index, current_object in enumerate(objects):
+            # The raw column values are used, rather than the properties which wrap
+            # them in Quantity and Location objects, as that is much faster
+            values = current_object.__dict__
+            location = values.get("_location")
+            if isinstance(location, str):
+                longitudes[index], latitudes[index] = parse_wkt_point(location)
+            elif location is not None:
+                location = current_object.location
+                latitudes[index] = location.latitude
+                longitudes[index] = location.longitude
+            for array, attribute in (
+                (speeds, "_speed"),
+                (headings, "_heading"),
+                (courses, "_course"),
+            ):
+                value = values.get(attribute)
+                if value is not None:
+                    array[index] = value
+            time = current_object.time
+            if time.tzinfo is not None:
+                # NumPy doesn't support timezone-aware datetimes, so they are converted to UTC
+                time = time.astimezone(timezone.utc).replace(tzinfo=None)
+            times.append(time)
+
+            platform_name = current_object.platform_name
+            previous[index] = last_index_by_platform.get(platform_name, -1)
+            last_index_by_platform[platform_name] = index
+
+        # As in validate, objects whose speed and course are both exactly zero aren't checked
+        both_zero = (speeds == 0) & (courses == 0)
+        if both_zero.any():
+            print(
+                f"Both course and speed are exactly zero for {np.count_nonzero(both_zero)} "
+                "measurements. Skipping the enhanced validator for them..."
+            )
+
+        # Pairs of each object and the previous object for the same platform,
+        # where both have a location
+        current = np.flatnonzero((previous >= 0) & ~both_zero)
+        prev = previous[current]
+        has_locations = ~np.isnan(latitudes[current]) & ~np.isnan(latitudes[prev])
+        current = current[has_locations]
+        prev = prev[has_locations]
+
+        latitude_1 = np.radians(latitudes[prev])
+        latitude_2 = np.radians(latitudes[current])
+        longitude_1 = np.radians(longitudes[prev])
+        longitude_2 = np.radians(longitudes[current])
+        diff_longitude = longitude_2 - longitude_1
+        diff_latitude = latitude_2 - latitude_1
+
+        # Bearing check, only made if the platform has moved
+        y = np.sin(diff_longitude) * np.cos(latitude_2)
+        x = np.cos(latitude_1) * np.sin(latitude_2) - np.sin(latitude_1) * np.cos(
+            latitude_2
+        ) * np.cos(diff_longitude)
+        bearings = (np.degrees(np.arctan2(y, x)) + 360) % 360
+        moved = (latitude_1 != latitude_2) | (longitude_1 != longitude_2)
+        might_fail = np.zeros(len(current), dtype=bool)
+        for angles in (headings[current], courses[current]):
+            # A heading or course of exactly zero isn't checked, as in validate
+            checked = moved & ~np.isnan(angles) & (angles != 0)
+            diff = 180 - np.abs(np.abs(np.degrees(angles) - bearings) - 180)
+            # Differences very close to the limit are left to validate to decide, so rounding
+            # differences can't give different results
+            might_fail |= checked & (diff > BEARING_DELTA - TOLERANCE)
+
+        # Speed check, using the same time difference as calculate_time (which is the seconds
+        # part of the difference, ignoring whole days)
+        time_deltas = np.array(times, dtype="datetime64[us]")
+        microseconds = (time_deltas[current] - time_deltas[prev]).astype(np.int64)
+        seconds = (microseconds // 1000000) % 86400
+        a = (
+            np.sin(diff_latitude / 2) ** 2
+            + np.cos(latitude_1) * np.cos(latitude_2) * np.sin(diff_longitude / 2) ** 2
+        )
+        distances = 2 * np.arcsin(np.sqrt(a)) * EARTH_RADIUS_METRES
+        measured_speeds = speeds[current]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            calculated_speeds = distances / seconds
+        margin = TOLERANCE * (np.abs(measured_speeds) * 10 + 1)
+        within_limits = (measured_speeds / 10 + margin <= calculated_speeds) & (
+            calculated_speeds <= measured_speeds * 10 - margin
+        )
+        might_fail |= (seconds != 0) & ~np.isnan(measured_speeds) & ~within_limits
+
+        track_errors = dict()
+        for index, prev_index in zip(current[might_fail], prev[might_fail]):
+            object_errors = []
+            if not self.validate(objects[index], object_errors, parser_name, objects[prev_index]):
+                track_errors[int(index)] = object_errors
+        return track_errors
+
     def validate(self, current_object, errors, parser_name, prev_object=None):
         orig_errors_length = len(errors)
 
@@ -108,7 +243,7 @@ class EnhancedValidator:
         """
         number_of_errors = len(errors)
         bearing = bearing_between_two_points(prev_location, curr_location)
-        delta = 90
+        delta = BEARING_DELTA
         if heading:
             heading_in_degrees = heading.to(unit_registry.degree)
             if not acceptable_bearing_error(heading_in_degrees, bearing, delta):
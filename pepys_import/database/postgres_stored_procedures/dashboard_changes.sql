@@ -0,0 +1,115 @@
+--creating table recording when each hour of pepys."DashboardCoverage" last changed, used by pepys.dashboard_changes
+--
+--Each row holds the ID of the transaction which last refreshed the runs for a platform's hour. A
+--dashboard which last polled when every transaction before a given ID had finished (its
+--watermark, from txid_snapshot_xmin(txid_current_snapshot())) only needs the participations
+--with hours changed by that transaction or a later one.
+--
+--Rows are never removed, so the table grows without limit: it keeps one row for every hour of
+--each platform which has ever been summarised, including hours whose States have all since been
+--deleted (or moved to another platform). The row for such an hour is what tells dashboards to
+--remove its runs, so it can't be pruned without making older watermarks miss the change. It is
+--no larger than pepys."DashboardCoverage" plus one row for each hour which has lost all its States.
+create table if not exists pepys."DashboardCoverageChanges" (
+	platform_id uuid not null,
+	bucket_start timestamp without time zone not null,
+	txid bigint not null,
+	primary key (platform_id, bucket_start)
+);
+
+--creating pepys.record_dashboard_coverage_change trigger function
+create or replace function pepys.record_dashboard_coverage_change()
+returns trigger
+as
+$$
+begin
+	insert into pepys."DashboardCoverageChanges" (platform_id, bucket_start, txid)
+	select distinct
+		cc.platform_id,
+		cc.bucket_start,
+		txid_current()
+	from
+		changed_coverage cc
+	on conflict (platform_id, bucket_start) do update
+		set txid = excluded.txid;
+	return null;
+end;
+$$
+language plpgsql;
+
+--creating triggers recording changed hours. Only the transaction refreshing pepys."DashboardCoverage"
+--writes to it, so these don't wait on other transactions
+drop trigger if exists dashboard_coverage_changes_insert on pepys."DashboardCoverage";
+create trigger dashboard_coverage_changes_insert
+	after insert on pepys."DashboardCoverage"
+	referencing new table as changed_coverage
+	for each statement execute procedure pepys.record_dashboard_coverage_change();
+
+drop trigger if exists dashboard_coverage_changes_delete on pepys."DashboardCoverage";
+create trigger dashboard_coverage_changes_delete
+	after delete on pepys."DashboardCoverage"
+	referencing old table as changed_coverage
+	for each statement execute procedure pepys.record_dashboard_coverage_change();
+
+--droping existing pepys.dashboard_changes function
+drop function if exists pepys.dashboard_changes;
+
+--creating pepys.dashboard_changes function
+--Returns the positions (from 1) in the input of the participations which may have changed since
+--the given watermark: those with hours refreshed since then, or waiting to be refreshed
+create function pepys.dashboard_changes(
+	ui_inp_ser_plat_json text,
+	ui_inp_since bigint)
+returns table (
+	resp_ser_idx bigint)
+as
+$$
+begin
+	return query
+with
+serial_participants_json as (
+	select
+		json_array_elements(ui_inp_ser_plat_json::json) spj
+),
+participating_platforms as (
+	select
+		row_number() over () ser_idx,
+		(spj->>'platform_id')::uuid platform_id,
+		(spj->>'start')::timestamp serial_participant_start,
+		(spj->>'end')::timestamp serial_participant_end
+	from
+		serial_participants_json
+)
+select
+	pp.ser_idx
+from
+	participating_platforms pp
+where
+	exists (select 1
+			from
+				pepys."DashboardCoverageChanges" c
+			where
+				c.platform_id = pp.platform_id
+					and
+				c.bucket_start >= date_trunc('hour', pp.serial_participant_start)
+					and
+				c.bucket_start <= pp.serial_participant_end
+					and
+				c.txid >= ui_inp_since
+		)
+		or
+	exists (select 1
+			from
+				pepys."DashboardCoverageDirty" d
+			where
+				d.platform_id = pp.platform_id
+					and
+				d.bucket_start >= date_trunc('hour', pp.serial_participant_start)
+					and
+				d.bucket_start <= pp.serial_participant_end
+		)
+order by
+	pp.ser_idx;
+end;
+$$
+language plpgsql;
@@ -0,0 +1,285 @@
+--creating tables summarising the periods covered by each platform's States, used by pepys.dashboard_stats
+--
+--pepys."DashboardCoverage" holds the runs of States for each platform within each hour, where
+--each State in a run is at most pepys.dashboard_coverage_gap_seconds() after the previous one.
+--Triggers on pepys."States" and pepys."Sensors" record the hours whose runs are out of date in
+--pepys."DashboardCoverageDirty", and pepys.refresh_dashboard_coverage() recalculates them.
+--pepys.dashboard_stats uses the runs for periods with no out of date hours, and the States
+--for any others.
+create table if not exists pepys."DashboardCoverage" (
+	platform_id uuid not null,
+	bucket_start timestamp without time zone not null,
+	start_time timestamp without time zone not null,
+	end_time timestamp without time zone not null,
+	start_created timestamp without time zone,
+	end_created timestamp without time zone
+);
+create index if not exists "ix_DashboardCoverage_platform_id_start_time"
+	on pepys."DashboardCoverage" (platform_id, start_time);
+create index if not exists "ix_DashboardCoverage_platform_id_bucket_start"
+	on pepys."DashboardCoverage" (platform_id, bucket_start);
+
+--No primary key, so that transactions marking the same hour don't wait for each other
+create table if not exists pepys."DashboardCoverageDirty" (
+	platform_id uuid not null,
+	bucket_start timestamp without time zone not null
+);
+create index if not exists "ix_DashboardCoverageDirty_platform_id_bucket_start"
+	on pepys."DashboardCoverageDirty" (platform_id, bucket_start);
+
+--creating pepys.dashboard_coverage_gap_seconds function
+--Largest number of seconds between two States in the same run. The runs can only be used for
+--participations with a gap_seconds at least this large.
+create or replace function pepys.dashboard_coverage_gap_seconds()
+returns integer
+as
+$$
+	select 5;
+$$
+language sql immutable;
+
+--creating pepys.mark_dashboard_coverage_dirty trigger function
+create or replace function pepys.mark_dashboard_coverage_dirty()
+returns trigger
+as
+$$
+begin
+	if TG_TABLE_NAME = 'States' then
+		if TG_OP in ('INSERT', 'UPDATE') then
+			insert into pepys."DashboardCoverageDirty" (platform_id, bucket_start)
+			select distinct
+				se.host,
+				date_trunc('hour', ns.time)
+			from
+				new_states ns
+					inner join
+				pepys."Sensors" se
+						on se.sensor_id = ns.sensor_id;
+		end if;
+		if TG_OP in ('DELETE', 'UPDATE') then
+			insert into pepys."DashboardCoverageDirty" (platform_id, bucket_start)
+			select distinct
+				se.host,
+				date_trunc('hour', os.time)
+			from
+				old_states os
+					inner join
+				pepys."Sensors" se
+						on se.sensor_id = os.sensor_id;
+		end if;
+	else
+		--A sensor has been deleted or moved to another platform. The States of deleted sensors
+		--can't be found any more, so all the hours summarised for the old platform are marked
+		if TG_OP = 'DELETE' then
+			insert into pepys."DashboardCoverageDirty" (platform_id, bucket_start)
+			select distinct
+				dc.platform_id,
+				dc.bucket_start
+			from
+				pepys."DashboardCoverage" dc
+			where
+				dc.platform_id in (select host from old_sensors);
+		elsif TG_OP = 'UPDATE' then
+			insert into pepys."DashboardCoverageDirty" (platform_id, bucket_start)
+			select distinct
+				dc.platform_id,
+				dc.bucket_start
+			from
+				pepys."DashboardCoverage" dc
+			where
+				dc.platform_id in (select
+									os.host
+								from
+									old_sensors os
+										inner join
+									new_sensors ns
+											on ns.sensor_id = os.sensor_id
+											and ns.host is distinct from os.host);
+			insert into pepys."DashboardCoverageDirty" (platform_id, bucket_start)
+			select distinct
+				ns.host,
+				date_trunc('hour', s.time)
+			from
+				new_sensors ns
+					inner join
+				old_sensors os
+						on os.sensor_id = ns.sensor_id
+						and os.host is distinct from ns.host
+					inner join
+				pepys."States" s
+						on s.sensor_id = ns.sensor_id;
+		end if;
+	end if;
+	return null;
+end;
+$$
+language plpgsql;
+
+--creating triggers marking hours as out of date. Triggers with transition tables can only be for
+--one event, so there is one trigger for each event
+drop trigger if exists dashboard_coverage_states_insert on pepys."States";
+create trigger dashboard_coverage_states_insert
+	after insert on pepys."States"
+	referencing new table as new_states
+	for each statement execute procedure pepys.mark_dashboard_coverage_dirty();
+
+drop trigger if exists dashboard_coverage_states_update on pepys."States";
+create trigger dashboard_coverage_states_update
+	after update on pepys."States"
+	referencing old table as old_states new table as new_states
+	for each statement execute procedure pepys.mark_dashboard_coverage_dirty();
+
+drop trigger if exists dashboard_coverage_states_delete on pepys."States";
+create trigger dashboard_coverage_states_delete
+	after delete on pepys."States"
+	referencing old table as old_states
+	for each statement execute procedure pepys.mark_dashboard_coverage_dirty();
+
+drop trigger if exists dashboard_coverage_sensors_update on pepys."Sensors";
+create trigger dashboard_coverage_sensors_update
+	after update on pepys."Sensors"
+	referencing old table as old_sensors new table as new_sensors
+	for each statement execute procedure pepys.mark_dashboard_coverage_dirty();
+
+drop trigger if exists dashboard_coverage_sensors_delete on pepys."Sensors";
+create trigger dashboard_coverage_sensors_delete
+	after delete on pepys."Sensors"
+	referencing old table as old_sensors
+	for each statement execute procedure pepys.mark_dashboard_coverage_dirty();
+
+--creating pepys.refresh_dashboard_coverage function
+--Recalculates the runs for all the hours marked as out of date, returning the number of runs
+--written. Only one transaction refreshes at a time: if another transaction is already
+--refreshing, this returns straight away and the hours are left for the next refresh.
+create or replace function pepys.refresh_dashboard_coverage()
+returns integer
+as
+$$
+declare
+	runs_written integer;
+begin
+	if not pg_try_advisory_xact_lock(hashtext('pepys.refresh_dashboard_coverage')) then
+		return 0;
+	end if;
+
+	with
+	dirty as (
+		delete from
+			pepys."DashboardCoverageDirty"
+		returning
+			platform_id,
+			bucket_start
+	),
+	buckets as (
+		select distinct
+			platform_id,
+			bucket_start
+		from
+			dirty
+	),
+	removed as (
+		delete from
+			pepys."DashboardCoverage" dc
+		using
+			buckets b
+		where
+			dc.platform_id = b.platform_id
+				and
+			dc.bucket_start = b.bucket_start
+	),
+	state_times as (
+		select
+			b.platform_id,
+			b.bucket_start,
+			s.time,
+			max(s.created_date) created_date
+		from
+			buckets b
+				inner join
+			pepys."Sensors" se
+					on se.host = b.platform_id
+				inner join
+			pepys."States" s
+					on s.sensor_id = se.sensor_id
+					and s.time >= b.bucket_start
+					and s.time < b.bucket_start + interval '1 hour'
+		group by
+			b.platform_id,
+			b.bucket_start,
+			s.time
+	),
+	run_starts as (
+		select
+			st.platform_id,
+			st.bucket_start,
+			st.time,
+			st.created_date,
+			case
+				when
+					st.time - lag(st.time) over w
+						<= pepys.dashboard_coverage_gap_seconds() * interval '1 second'
+				then
+					0
+				else
+					1
+			end new_run
+		from
+			state_times st
+		window w as (partition by st.platform_id, st.bucket_start order by st.time asc)
+	),
+	run_numbers as (
+		select
+			rs.*,
+			sum(rs.new_run) over (partition by rs.platform_id, rs.bucket_start order by rs.time asc) run_no
+		from
+			run_starts rs
+	)
+	insert into pepys."DashboardCoverage" (
+		platform_id,
+		bucket_start,
+		start_time,
+		end_time,
+		start_created,
+		end_created)
+	select
+		rn.platform_id,
+		rn.bucket_start,
+		min(rn.time),
+		max(rn.time),
+		(array_agg(rn.created_date order by rn.time asc))[1],
+		(array_agg(rn.created_date order by rn.time desc))[1]
+	from
+		run_numbers rn
+	group by
+		rn.platform_id,
+		rn.bucket_start,
+		rn.run_no;
+
+	get diagnostics runs_written = row_count;
+	return runs_written;
+end;
+$$
+language plpgsql;
+
+--creating pepys.rebuild_dashboard_coverage function
+--Recalculates the runs for every hour with States, such as after upgrading a database
+create or replace function pepys.rebuild_dashboard_coverage()
+returns integer
+as
+$$
+begin
+	perform pg_advisory_xact_lock(hashtext('pepys.refresh_dashboard_coverage'));
+	delete from pepys."DashboardCoverage";
+	insert into pepys."DashboardCoverageDirty" (platform_id, bucket_start)
+	select distinct
+		se.host,
+		date_trunc('hour', s.time)
+	from
+		pepys."States" s
+			inner join
+		pepys."Sensors" se
+				on se.sensor_id = s.sensor_id;
+	return pepys.refresh_dashboard_coverage();
+end;
+$$
+language plpgsql;
@@ -34,7 +34,7 @@ serial_participants_json as (
 	from
 		serial_participants_input_json
 ),
-participating_platforms as (
+participation_inputs as (
 	select
 		row_number() over () ser_idx,
 		(spj->>'serial_id')::uuid serial_id,
@@ -45,6 +45,28 @@ participating_platforms as (
 	from
 		serial_participants_json
 ),
+participating_platforms as ( --Participations are summarised if they can use pepys."DashboardCoverage"
+	select
+		ptin.*,
+		coalesce(ptin.gap_seconds >= pepys.dashboard_coverage_gap_seconds()
+					and
+				ptin.serial_participant_end - ptin.serial_participant_start
+					>= pepys.dashboard_coverage_gap_seconds() * interval '1 second',
+				false)
+			and
+		not exists (select 1
+					from
+						pepys."DashboardCoverageDirty" d
+					where
+						d.platform_id = ptin.platform_id
+							and
+						d.bucket_start >= date_trunc('hour', ptin.serial_participant_start)
+							and
+						d.bucket_start <= ptin.serial_participant_end
+				) summarised
+	from
+		participation_inputs ptin
+),
 sensors_involved as (
 	select
 		s.sensor_id,
@@ -59,6 +81,8 @@ sensors_involved as (
 			inner join
 		pepys."Sensors" s
 				on s.host = pp.platform_id
+	where
+		not pp.summarised
 ),
 states_involved as (
 	select 
@@ -71,12 +95,12 @@ states_involved as (
 		s.time >= (select 
 					min(serial_participant_start) 
 				from 
-					participating_platforms)
+					sensors_involved)
 			and
 		s.time <= (select 
 					max(serial_participant_end) 
 				from 
-					participating_platforms)
+					sensors_involved)
 			and
 		sensor_id in (select 
 						sensor_id 
@@ -108,6 +132,117 @@ state_time_rankings as (
 		si.serial_id,
 		si.ser_idx
 ),
+coverage_involved as ( --Runs of summarised participations, clipped to the participation
+	select
+		greatest(dc.start_time, pp.serial_participant_start) start_time,
+		least(dc.end_time, pp.serial_participant_end) end_time,
+		case
+			when
+				dc.start_time >= pp.serial_participant_start
+			then
+				dc.start_created
+			else
+				(select
+					max(s.created_date)
+				from
+					pepys."States" s
+						inner join
+					pepys."Sensors" se
+							on se.sensor_id = s.sensor_id
+				where
+					se.host = pp.platform_id
+						and
+					s.time = pp.serial_participant_start)
+		end start_created,
+		case
+			when
+				dc.end_time <= pp.serial_participant_end
+			then
+				dc.end_created
+			else
+				(select
+					max(s.created_date)
+				from
+					pepys."States" s
+						inner join
+					pepys."Sensors" se
+							on se.sensor_id = s.sensor_id
+				where
+					se.host = pp.platform_id
+						and
+					s.time = pp.serial_participant_end)
+		end end_created,
+		pp.platform_id,
+		pp.gap_seconds,
+		pp.serial_id,
+		pp.ser_idx
+	from
+		participating_platforms pp
+			inner join
+		pepys."DashboardCoverage" dc
+				on dc.platform_id = pp.platform_id
+				and pp.summarised
+				--Runs are within an hour, so none starting earlier than this can reach the participation
+				and dc.start_time > pp.serial_participant_start - interval '1 hour'
+				and dc.start_time <= pp.serial_participant_end
+				and dc.end_time >= pp.serial_participant_start
+),
+coverage_points as ( --Ends of the runs, standing in for the States of summarised participations
+	select
+		cp.time,
+		max(cp.created_date) created_date,
+		cp.platform_id,
+		cp.gap_seconds,
+		cp.serial_id,
+		cp.ser_idx
+	from
+		(select
+			start_time "time",
+			start_created created_date,
+			platform_id,
+			gap_seconds,
+			serial_id,
+			ser_idx
+		from
+			coverage_involved
+		union all
+		select
+			end_time "time",
+			end_created created_date,
+			platform_id,
+			gap_seconds,
+			serial_id,
+			ser_idx
+		from
+			coverage_involved) cp
+	group by
+		cp.time,
+		cp.platform_id,
+		cp.gap_seconds,
+		cp.serial_id,
+		cp.ser_idx
+),
+state_points as (
+	select
+		time,
+		created_date,
+		platform_id,
+		gap_seconds,
+		serial_id,
+		ser_idx
+	from
+		state_time_rankings
+	union all
+	select
+		time,
+		created_date,
+		platform_id,
+		gap_seconds,
+		serial_id,
+		ser_idx
+	from
+		coverage_points
+),
 participation_sans_activity as (
 	select
 		si.serial_participant_start start_time,
@@ -120,7 +255,7 @@ participation_sans_activity as (
 	where
 		not exists (select 1
 					from 
-						state_time_rankings s
+						state_points s
 					where 
 						s.serial_id = si.serial_id
 							and 
@@ -150,6 +285,25 @@ inner_gaps as (
 				and s.ser_idx=e.ser_idx
 				and s.rowno=e.rowno-1
 				and e.time-s.time > s.gap_seconds *  interval '1 second'
+	union all
+	select --Gaps between the runs of summarised participations
+		ci.prev_end_time start_time,
+		ci.start_time end_time,
+		ci.platform_id,
+		ci.serial_id,
+		ci.ser_idx
+	from
+		(select
+			start_time,
+			lag(end_time) over (partition by serial_id, platform_id, ser_idx order by start_time asc) prev_end_time,
+			platform_id,
+			gap_seconds,
+			serial_id,
+			ser_idx
+		from
+			coverage_involved) ci
+	where
+		ci.start_time - ci.prev_end_time > ci.gap_seconds * interval '1 second'
 ),
 edge_cases as ( --Identify boundary cases for all platform, serial combination
 	select
@@ -159,7 +313,7 @@ edge_cases as ( --Identify boundary cases for all platform, serial combination
 		min(str.time) start_time, --Start
 		max(str.time) end_time --End
 	from
-		state_time_rankings str
+		state_points str
 	group by
 		str.platform_id,
 		str.serial_id,
@@ -281,7 +435,7 @@ act_with_same_part_and_gap_start as (
 	from
 		consolidated_gap_ranks cg
 			inner join
-		state_time_rankings s
+		state_points s
 				on cg.serial_id = s.serial_id
 				and cg.ser_idx = s.ser_idx
 				and cg.platform_id = s.platform_id
@@ -304,7 +458,7 @@ act_with_same_part_and_gap_end as (
 	from
 		consolidated_gap_ranks cg
 			inner join
-		state_time_rankings s
+		state_points s
 				on cg.serial_id = s.serial_id
 				and cg.ser_idx = s.ser_idx
 				and cg.platform_id = s.platform_id
@@ -466,11 +620,11 @@ consolidated_coverage_with_created as (
 	from
 		consolidated_coverage cc
 			left join
-		state_time_rankings strstart
+		state_points strstart
 				on (cc.platform_id, cc.serial_id, cc.ser_idx, cc.start_time)
 					=(strstart.platform_id, strstart.serial_id, strstart.ser_idx, strstart.time)
 			left join
-		state_time_rankings strend
+		state_points strend
 				on (cc.platform_id, cc.serial_id, cc.ser_idx, cc.end_time)
 					=(strend.platform_id, strend.serial_id, strend.ser_idx, strend.time)
 ),
@@ -1,7 +1,12 @@
 import inspect
+import itertools
 import json
+import multiprocessing
 import os
 import shutil
+import tempfile
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from getpass import getuser
 from stat import S_IREAD
@@ -12,16 +17,29 @@ from prompt_toolkit.validation import Validator
 
 from paths import IMPORTERS_DIRECTORY
 from pepys_import import __build_timestamp__, __version__
-from pepys_import.core.store import constants
+from pepys_import.core.store import common_db, constants
 from pepys_import.core.store.data_store import DataStore
 from pepys_import.core.store.db_status import TableTypes
 from pepys_import.file.highlighter.highlighter import HighlightedFile
+from pepys_import.file.highlighter.plain_file import PlainFile
 from pepys_import.file.importer import Importer
+from pepys_import.file.importer_index import ImporterIndex
+from pepys_import.file.staging import (
+    StagedFile,
+    StagingDataStore,
+    capture_output,
+    print_captured_output,
+)
 from pepys_import.resolvers.command_line_resolver import CommandLineResolver
-from pepys_import.utils.datafile_utils import hash_file
+from pepys_import.utils.datafile_utils import (
+    BUFFER_SIZE,
+    HashCache,
+    hash_contents,
+    hash_file,
+    hash_file_start,
+    new_hasher,
+)
 from pepys_import.utils.import_utils import import_module_, sort_files
-from pepys_import.utils.sqlalchemy_utils import get_primary_key_for_table
-from pepys_import.utils.table_name_utils import table_name_to_class_name
 from pepys_import.utils.text_formatting_utils import (
     custom_print_formatted_text,
     format_error_message,
@@ -31,6 +49,97 @@ from pepys_import.utils.text_formatting_utils import (
 
 USER = getuser()
 
+# Maximum size of file (in bytes) to keep in memory after reading it to detect the importers
+MAX_KEPT_FILE_SIZE = 100000000
+
+# FileProcessor and database classes used by a worker process, set by _init_worker
+_worker_file_processor = None
+_worker_db_classes = None
+
+
+def detect_importers(importers, full_path, keep_contents=False, hash_algorithm="md5"):
+    """Run the detection checks of each importer against the given file
+
+    The suffix and filename checks are run first, using the importer index, so files
+    which no importer can load aren't opened. Then only the first line is read for the header
+    checks, and the whole file is only read if there are importers left after those. The same
+    contents are used for the contents checks, and for the file size and hash.
+
+    :param importers: Index of the importers to check, or a list of importers
+    :type importers: ImporterIndex
+    :param full_path: Full path of the file
+    :type full_path: String
+    :param keep_contents: Whether to return the contents of the file, so they can be used
+                          when importing the file rather than reading it again
+    :type keep_contents: bool
+    :param hash_algorithm: Name of the algorithm used to hash the file
+    :type hash_algorithm: String
+    :return: None if no importers can load the file, otherwise a tuple of
+             (indices of the importers that can load the file, file size, file hash,
+             file contents as bytes or None if they weren't kept)
+    :rtype: tuple
+    """
+    if not isinstance(importers, ImporterIndex):
+        importers = ImporterIndex(importers)
+
+    # start with the file suffix and filename
+    importer_indices = importers.importers_for_name(os.path.basename(full_path))
+
+    # tests are starting to get expensive. Check
+    # we have some file importers left
+    if not importer_indices:
+        return None
+
+    # now the first line, if any of the importers left check it
+    if importers.needs_header(importer_indices):
+        try:
+            first_line = FileProcessor.get_first_line(full_path)
+        except Exception:
+            # Can't read the file, so skip it
+            return None
+        if first_line is None:
+            # Not a text file
+            return None
+        importer_indices = importers.filter_by_header(importer_indices, first_line)
+        if not importer_indices:
+            return None
+
+    # Read the file, for the remaining checks
+    try:
+        file_bytes = FileProcessor.read_file_bytes(full_path)
+        lines = FileProcessor.decode_file_contents(file_bytes)
+    except Exception:
+        # Can't get the file contents - eg. because it's not a proper
+        # unicode text file (This can occur for binary files in the same folders)
+        # So skip the file
+        return None
+
+    # lastly the contents
+    importer_indices = [
+        index for index in importer_indices if importers.importers[index].can_load_this_file(lines)
+    ]
+    if not importer_indices:
+        return None
+
+    # Very large files aren't kept in memory while they're being imported,
+    # and are read again as they are parsed instead
+    if not keep_contents or len(file_bytes) > MAX_KEPT_FILE_SIZE:
+        file_bytes_to_keep = None
+    else:
+        file_bytes_to_keep = file_bytes
+    file_hash = hash_contents(file_bytes, hash_algorithm)
+    return importer_indices, len(file_bytes), file_hash, file_bytes_to_keep
+
+
+def _init_worker(file_processor, db_classes):
+    global _worker_file_processor, _worker_db_classes
+    _worker_file_processor = file_processor
+    _worker_db_classes = db_classes
+
+
+def _stage_file_in_worker(full_path):
+    return _worker_file_processor.stage_file(full_path, _worker_db_classes)
+
 
 class FileProcessor:
     def __init__(
@@ -40,8 +149,15 @@ class FileProcessor:
         skip_validation=False,
         archive_path=None,
         local_parsers=None,
+        workers=1,
+        no_provenance=False,
+        hash_algorithm="md5",
+        hash_cache_path=None,
+        full_table_status=False,
     ):
         self.importers = []
+        # Index of the importers, used to find the importers that might load each file
+        self.importer_index = ImporterIndex(self.importers)
         # Register local importers if any exists
         if local_parsers:
             if not os.path.exists(local_parsers):
@@ -79,6 +195,25 @@ class FileProcessor:
                     )
 
         self.skip_validation = skip_validation
+        self.workers = workers
+        self.no_provenance = no_provenance
+
+        # Used to hash files, to check whether they have been loaded before. If a path to a hash
+        # cache file is given then hashes are cached there, so unchanged files aren't read again
+        new_hasher(hash_algorithm)  # Check the algorithm is valid (and available) up front
+        self.hash_algorithm = hash_algorithm
+        self.hash_cache = HashCache(hash_cache_path) if hash_cache_path else None
+
+        # The reports of what each file added are normally worked out from the rows the import
+        # added. If full_table_status is True they are worked out by comparing the number of
+        # rows in every table before and after the import, as in older versions of Pepys, which
+        # is much slower on large databases
+        self.full_table_status = full_table_status
+
+        # Details of the files already loaded into the database, keyed by (size, hash),
+        # and the set of sizes of those files, loaded at the start of process_files
+        self.loaded_datafiles = None
+        self.loaded_datafile_sizes = None
 
     def process(self, path: str, data_store: DataStore = None, descend_tree: bool = True):
         """Process the data in the given path
@@ -146,14 +281,8 @@ class FileProcessor:
                 filename = os.path.abspath(path)
                 current_path = os.path.dirname(path)
 
-                processed_ctr = self.process_file(
-                    filename,
-                    current_path,
-                    data_store,
-                    processed_ctr,
-                    import_summary,
-                    file_number=1,
-                    total_files=1,
+                processed_ctr = self.process_files(
+                    [(filename, current_path)], data_store, processed_ctr, import_summary
                 )
             self.display_import_summary(import_summary)
             print(f"Files got processed: {processed_ctr} times")
@@ -178,36 +307,347 @@ class FileProcessor:
                 for current_path, folders, files in os.walk(abs_path):
                     for file in sort_files(files):
                         files_and_paths.append((file, current_path))
-
-                for i, (file, current_path) in enumerate(files_and_paths, start=1):
-                    processed_ctr = self.process_file(
-                        file,
-                        current_path,
-                        data_store,
-                        processed_ctr,
-                        import_summary,
-                        file_number=i,
-                        total_files=len(files_and_paths),
-                    )
             else:
                 # loop through this path
-                files_in_folder = [
-                    file for file in sort_files(os.scandir(abs_path)) if file.is_file()
+                files_and_paths = [
+                    (file, abs_path) for file in sort_files(os.scandir(abs_path)) if file.is_file()
                 ]
 
-                for i, file in enumerate(files_in_folder, start=1):
+            processed_ctr = self.process_files(
+                files_and_paths, data_store, processed_ctr, import_summary
+            )
+
+        self.display_import_summary(import_summary)
+        print(f"Files got processed: {processed_ctr} times")
+
+    def process_files(self, files_and_paths, data_store, processed_ctr, import_summary):
+        """Process each of the given files in order
+
+        If more than one worker is configured, then each file is detected (checking which
+        importers can load it, and hashing it) in a pool of worker processes. Files whose
+        importers all set PARSE_IN_WORKER are also parsed and validated in the worker processes
+        (see stage_file). The platforms, sensors and comment types they refer to are then
+        resolved, and the files are committed, in this process in the original file order, so
+        the output and the import summary are the same as when processing serially.
+
+        :param files_and_paths: List of (file, folder path) tuples to process
+        :type files_and_paths: List
+        :param data_store: Database
+        :type data_store: DataStore
+        :param processed_ctr: Count of times files have been processed so far
+        :type processed_ctr: int
+        :param import_summary: Dict to store succeeded/failed/skipped details in
+        :type import_summary: dict
+        :return: Updated count of times files have been processed
+        :rtype: int
+        """
+        self.load_loaded_datafiles(data_store)
+        # Rebuild the index if importers have been added to the list of importers directly,
+        # rather than through register_importer or load_importers_dynamically
+        if self.importer_index.importers != self.importers:
+            self.update_importer_index()
+
+        try:
+            return self._process_files(files_and_paths, data_store, processed_ctr, import_summary)
+        finally:
+            if self.hash_cache is not None:
+                self.hash_cache.save()
+
+    def _process_files(self, files_and_paths, data_store, processed_ctr, import_summary):
+        total_files = len(files_and_paths)
+        mp_context = self._get_worker_context(total_files)
+
+        if mp_context is None:
+            for i, (file, current_path) in enumerate(files_and_paths, start=1):
+                processed_ctr = self.process_file(
+                    file,
+                    current_path,
+                    data_store,
+                    processed_ctr,
+                    import_summary,
+                    file_number=i,
+                    total_files=total_files,
+                )
+            return processed_ctr
+
+        full_paths = [
+            os.path.join(current_path, os.path.basename(file))
+            for file, current_path in files_and_paths
+        ]
+        # Don't send files that have already been loaded to the workers
+        loaded_datafiles = [self.find_loaded_datafile(full_path) for full_path in full_paths]
+        paths_to_stage = [
+            full_path
+            for full_path, loaded_datafile in zip(full_paths, loaded_datafiles)
+            if loaded_datafile is None
+        ]
+        with ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=mp_context,
+            initializer=_init_worker,
+            initargs=(self, data_store.db_classes),
+        ) as executor:
+            staged_results = self._stage_files_in_workers(executor, paths_to_stage)
+            try:
+                for i, ((file, current_path), loaded_datafile) in enumerate(
+                    zip(files_and_paths, loaded_datafiles), start=1
+                ):
+                    if loaded_datafile is not None:
+                        self.print_already_loaded(loaded_datafile)
+                        continue
+                    detection, staged_file = next(staged_results)
+                    if detection is None:
+                        continue
+                    # A copy of this file may have been imported earlier in this run, after the
+                    # check above, so check again with the hash the worker calculated
+                    _, file_size, file_hash, _ = detection
+                    loaded_datafile = self.loaded_datafiles.get((file_size, file_hash))
+                    if loaded_datafile is not None:
+                        self.print_already_loaded(loaded_datafile)
+                        if staged_file is not None:
+                            staged_file.discard()
+                        continue
                     processed_ctr = self.process_file(
                         file,
-                        abs_path,
+                        current_path,
                         data_store,
                         processed_ctr,
                         import_summary,
                         file_number=i,
-                        total_files=len(files_in_folder),
+                        total_files=total_files,
+                        detection=detection,
+                        staged_file=staged_file,
                     )
+            finally:
+                staged_results.close()
+        return processed_ctr
 
-        self.display_import_summary(import_summary)
-        print(f"Files got processed: {processed_ctr} times")
+    def _stage_files_in_workers(self, executor, full_paths):
+        """Stages the given files in the worker processes (see stage_file), yielding the
+        (detection, staged file) results in the same order as the files were given.
+
+        Only twice as many files as there are workers are staged ahead of the file whose
+        results were yielded last, so the parsed files don't build up in memory if they are
+        parsed more quickly than they can be committed. If a worker fails, the detection
+        is run again in this process, and the file is parsed here."""
+
+        def submit(full_path):
+            try:
+                return executor.submit(_stage_file_in_worker, full_path)
+            except Exception:
+                # The pool is broken, so the file will be processed here
+                return None
+
+        full_paths = iter(full_paths)
+        pending = deque(
+            (full_path, submit(full_path))
+            for full_path in itertools.islice(full_paths, self.workers * 2)
+        )
+        try:
+            while pending:
+                full_path, future = pending.popleft()
+                next_path = next(full_paths, None)
+                if next_path is not None:
+                    pending.append((next_path, submit(next_path)))
+                result = None
+                if future is not None:
+                    try:
+                        result = future.result()
+                    except Exception:
+                        pass
+                if result is None:
+                    result = (
+                        detect_importers(
+                            self.importer_index,
+                            full_path,
+                            keep_contents=True,
+                            hash_algorithm=self.hash_algorithm,
+                        ),
+                        None,
+                    )
+                yield result
+        finally:
+            # Remove the highlighted files of any files that were staged but won't be imported
+            for _, future in pending:
+                if future is None or future.cancel():
+                    continue
+                try:
+                    _, staged_file = future.result()
+                except Exception:
+                    continue
+                if staged_file is not None:
+                    staged_file.discard()
+
+    def stage_file(self, full_path, db_classes):
+        """Detects the importers that can load the given file and, if they all set
+        PARSE_IN_WORKER, parses and validates the file against a :class:`StagingDataStore`,
+        ready to be loaded into the database by process_file. This is run in the worker
+        processes, so the user isn't asked anything: if validating the file needs the user to
+        decide what to do, it is validated again in the main process.
+
+        The highlighted file is written to a temporary file in the reports folder, which is
+        moved into place when the file is imported.
+
+        :param full_path: Full path of the file
+        :type full_path: String
+        :param db_classes: Database classes of the DataStore the file will be imported into
+        :type db_classes: module
+        :return: Tuple of (detection, StagedFile), where the detection is as returned by
+                 detect_importers. The StagedFile is None if the file needs to be parsed in
+                 the main process, in which case the detection includes the file contents
+                 (unless the file is too large), so the file doesn't need to be read again
+        :rtype: tuple
+        """
+        detection = detect_importers(
+            self.importer_index,
+            full_path,
+            keep_contents=True,
+            hash_algorithm=self.hash_algorithm,
+        )
+        if detection is None:
+            return None, None
+        importer_indices, file_size, file_hash, file_contents = detection
+        importers = [self.importers[index] for index in importer_indices]
+        if not all(importer.PARSE_IN_WORKER for importer in importers):
+            return detection, None
+
+        try:
+            staged_file = self._stage_file(full_path, file_contents, importers, db_classes)
+        except Exception:
+            # Parse the file in the main process instead, where any problems are reported
+            # in the usual way
+            return detection, None
+        return (importer_indices, file_size, file_hash, None), staged_file
+
+    def _stage_file(self, full_path, file_contents, importers, db_classes):
+        basename = os.path.basename(full_path)
+        filename, _ = os.path.splitext(basename)
+        data_store = StagingDataStore(db_classes)
+        datafile = data_store.create_datafile()
+        if self.no_provenance:
+            highlighted_file = PlainFile(full_path, file_contents=file_contents)
+        else:
+            highlighted_file = HighlightedFile(full_path, file_contents=file_contents)
+        highlighted_file.datafile = datafile
+        datafile.highlighted_file = highlighted_file
+
+        highlighted_path = None
+        try:
+            with capture_output() as (stdout, stderr):
+                for importer in importers:
+                    importer.load_this_file(
+                        data_store, full_path, highlighted_file, datafile, change_id=None
+                    )
+                if not self.no_provenance:
+                    descriptor, highlighted_path = tempfile.mkstemp(
+                        prefix=f"{filename}_highlighted.", suffix=".tmp", dir=self.directory_path
+                    )
+                    os.close(descriptor)
+                    print(f"Writing highlighted file for {basename}")
+                    highlighted_file.export(highlighted_path, include_key=True)
+                    # Nothing is exported if nothing was highlighted
+                    if os.path.getsize(highlighted_path) == 0:
+                        os.remove(highlighted_path)
+                        highlighted_path = None
+            staged_file = StagedFile(
+                data_store,
+                datafile,
+                importers,
+                (stdout.getvalue(), stderr.getvalue()),
+                highlighted_path,
+            )
+
+            # Local validators could depend on anything, so they are only run in the main process
+            if common_db.LOCAL_BASIC_VALIDATORS or common_db.LOCAL_ENHANCED_VALIDATORS:
+                return staged_file
+            for importer in importers:
+                validation_errors = []
+                with capture_output() as (stdout, stderr):
+                    _, failed_validators = datafile.validate(
+                        validation_level=importer.validation_level,
+                        errors=validation_errors,
+                        parser=importer.short_name,
+                        skip_validation=self.skip_validation,
+                        ask_skipping_validator=False,
+                    )
+                if not validation_errors and not failed_validators:
+                    staged_file.validation_outputs[importer.short_name] = (
+                        stdout.getvalue(),
+                        stderr.getvalue(),
+                    )
+        except Exception:
+            if highlighted_path is not None:
+                os.remove(highlighted_path)
+            raise
+        return staged_file
+
+    def load_loaded_datafiles(self, data_store):
+        """Loads the sizes and hashes of all the files that have already been loaded into
+        the database, so that files can be checked against them without reading the file
+        contents or querying the database for each file
+
+        :param data_store: Database
+        :type data_store: DataStore
+        """
+        self.loaded_datafiles = data_store.get_loaded_datafiles()
+        self.loaded_datafile_sizes = {size for size, _ in self.loaded_datafiles}
+
+    def find_loaded_datafile(self, full_path):
+        """Checks whether the given file has already been loaded into the database
+
+        Only files with the same size as a loaded file need to be hashed, so most files don't
+        need to be read at all. Hashes are also taken from the hash cache, if there is one,
+        so unchanged files aren't read again either
+
+        :param full_path: Full path of the file
+        :type full_path: String
+        :return: None if the file hasn't been loaded, otherwise a tuple of the
+                 (reference, created_date) of the loaded datafile
+        :rtype: tuple
+        """
+        try:
+            file_size = os.path.getsize(full_path)
+        except OSError:
+            return None
+        if file_size not in self.loaded_datafile_sizes:
+            return None
+
+        if self.hash_cache is not None:
+            file_hash = self.hash_cache.get(full_path, self.hash_algorithm)
+        else:
+            file_hash = hash_file(full_path, self.hash_algorithm)
+        loaded_datafile = self.loaded_datafiles.get((file_size, file_hash))
+
+        # Older versions of Pepys only hashed the start of the file with MD5, so check for
+        # that hash too if it could be different, so those files aren't imported again
+        if loaded_datafile is None and (self.hash_algorithm != "md5" or file_size > BUFFER_SIZE):
+            loaded_datafile = self.loaded_datafiles.get((file_size, hash_file_start(full_path)))
+        return loaded_datafile
+
+    @staticmethod
+    def print_already_loaded(loaded_datafile):
+        reference, created_date = loaded_datafile
+        print(
+            f"'{reference}' was already loaded at {created_date:%Y-%m-%d %H:%M}! Skipping the file."
+        )
+
+    def _get_worker_context(self, total_files):
+        """Returns the multiprocessing context to use for the worker processes, or None if
+        the files should be processed serially"""
+        if self.workers <= 1 or total_files <= 1:
+            return None
+        # The workers need their own copies of the importers, and importers loaded dynamically
+        # (or defined inside functions) can't be pickled to send to a spawned process, so the
+        # pool is only used where processes can be forked
+        if "fork" not in multiprocessing.get_all_start_methods():
+            custom_print_formatted_text(
+                format_error_message(
+                    "Multiple workers are not supported on this platform. "
+                    "Files will be processed one at a time."
+                )
+            )
+            return None
+        return multiprocessing.get_context("fork")
 
     def process_file(
         self,
@@ -218,82 +658,66 @@ class FileProcessor:
         import_summary,
         file_number,
         total_files,
+        detection=None,
+        staged_file=None,
     ):
         # file may have full path, therefore extract basename and split it
         basename = os.path.basename(file_object)
-        filename, file_extension = os.path.splitext(basename)
+        filename, _ = os.path.splitext(basename)
 
         if basename == ".DS_Store":
             return processed_ctr
 
-        # make copy of list of importers
-        good_importers = self.importers.copy()
-
         full_path = os.path.join(current_path, basename)
-        # print("Checking:" + str(full_path))
-
-        # start with file suffixes
-        tmp_importers = good_importers.copy()
-        for importer in tmp_importers:
-            # print("Checking suffix:" + str(importer))
-            if not importer.can_load_this_type(file_extension):
-                good_importers.remove(importer)
-
-        # now the filename
-        tmp_importers = good_importers.copy()
-        for importer in tmp_importers:
-            # print("Checking filename:" + str(importer))
-            if not importer.can_load_this_filename(filename):
-                good_importers.remove(importer)
-
-        # tests are starting to get expensive. Check
-        # we have some file importers left
-        if len(good_importers) > 0:
-
-            # now the first line
-            tmp_importers = good_importers.copy()
-            first_line = self.get_first_line(full_path)
-            for importer in tmp_importers:
-                # print("Checking first_line:" + str(importer))
-                if not importer.can_load_this_header(first_line):
-                    good_importers.remove(importer)
-
-            # Create a HighlightedFile instance for the file
-            highlighted_file = HighlightedFile(full_path)
-
-            # Get the file contents, for the final check
-            try:
-                file_contents = self.get_file_contents(full_path)
-            except Exception:
-                # Can't get the file contents - eg. because it's not a proper
-                # unicode text file (This can occur for binary files in the same folders)
-                # So skip the file
-                return processed_ctr
-
-            # lastly the contents
-            tmp_importers = good_importers.copy()
-            for importer in tmp_importers:
-                if not importer.can_load_this_file(file_contents):
-                    good_importers.remove(importer)
 
-            # if good importers list is empty, return processed_ctr,
-            # which means the file is not processed
-            if not good_importers:
+        # The detection may already have been run in a worker process (see process_files),
+        # otherwise check whether the file has been loaded before, and run it here
+        if detection is None:
+            loaded_datafile = self.find_loaded_datafile(full_path)
+            if loaded_datafile is not None:
+                self.print_already_loaded(loaded_datafile)
                 return processed_ctr
+            detection = detect_importers(
+                self.importer_index,
+                full_path,
+                keep_contents=True,
+                hash_algorithm=self.hash_algorithm,
+            )
 
-            # If the file is loaded before, return processed_ctr,
-            # which means the file is not processed again
-            file_size = os.path.getsize(full_path)
-            file_hash = hash_file(full_path)
-            if data_store.is_datafile_loaded_before(file_size, file_hash):
-                return processed_ctr
+        # if no importers can load this file, return processed_ctr,
+        # which means the file is not processed
+        if detection is None:
+            return processed_ctr
+        importer_indices, file_size, file_hash, file_contents = detection
+        good_importers = [self.importers[index] for index in importer_indices]
+
+        if self.hash_cache is not None:
+            self.hash_cache.set(full_path, file_hash, self.hash_algorithm)
+
+        if staged_file is not None:
+            # The file has already been parsed in a worker process (see process_files),
+            # which has written the highlighted file too
+            highlighted_file = None
+            if not self.no_provenance:
+                staged_file.save_highlighted_file(
+                    os.path.join(self.directory_path, f"{filename}_highlighted.html")
+                )
+        # Create a HighlightedFile instance for the file, or a PlainFile instance
+        # if we're not keeping track of where the imported data came from
+        elif self.no_provenance:
+            highlighted_file = PlainFile(full_path, file_contents=file_contents)
+        else:
+            highlighted_file = HighlightedFile(full_path, file_contents=file_contents)
 
-            reason = f"Importing '{basename}' using Pepys {__version__}"
-            # ok, let these importers handle the file
-            if __build_timestamp__ is not None:
-                reason += f", built on {__build_timestamp__}"
+        reason = f"Importing '{basename}' using Pepys {__version__}"
+        # ok, let these importers handle the file
+        if __build_timestamp__ is not None:
+            reason += f", built on {__build_timestamp__}"
 
-            change = data_store.add_to_changes(user=USER, modified=datetime.utcnow(), reason=reason)
+        change = data_store.add_to_changes(user=USER, modified=datetime.utcnow(), reason=reason)
+        # Keep track of the rows added under this change while the file is imported, so they
+        # can be included in the metadata report
+        with data_store.recording_added_rows(change.change_id):
             privacy = None
             for importer in good_importers:
                 if importer.default_privacy:
@@ -307,10 +731,13 @@ class FileProcessor:
                 constants.LOG,
             ]
 
-            metadata_summaries_before = data_store.get_status(TableTypes.METADATA, exclude=exclude)
-            measurement_summaries_before = data_store.get_status(
-                TableTypes.MEASUREMENT, exclude=exclude
-            )
+            if self.full_table_status:
+                metadata_summaries_before = data_store.get_status(
+                    TableTypes.METADATA, exclude=exclude
+                )
+                measurement_summaries_before = data_store.get_status(
+                    TableTypes.MEASUREMENT, exclude=exclude
+                )
 
             # This will produce a header with a progress counter
             # Be aware that the denominator is the count of all files in the path to be imported
@@ -332,27 +759,34 @@ class FileProcessor:
                 privacy=privacy,
             )
 
-            highlighted_file.datafile = datafile
-            datafile.highlighted_file = highlighted_file
-
             # Update change object
             change.datafile_id = datafile.datafile_id
             data_store.session.flush()
 
-            # Run all parsers
-            for importer in good_importers:
-                processed_ctr += 1
-                importer.load_this_file(
-                    data_store, full_path, highlighted_file, datafile, change.change_id
-                )
+            if staged_file is not None:
+                # Resolve the platforms etc the parsed measurements refer to, and add them
+                # to the datafile
+                processed_ctr += len(good_importers)
+                staged_file.load(data_store, datafile, good_importers, change.change_id)
+            else:
+                highlighted_file.datafile = datafile
+                datafile.highlighted_file = highlighted_file
+
+                # Run all parsers
+                for importer in good_importers:
+                    processed_ctr += 1
+                    importer.load_this_file(
+                        data_store, full_path, highlighted_file, datafile, change.change_id
+                    )
 
-            # Write highlighted output to file
-            highlighted_output_path = os.path.join(
-                self.directory_path, f"{filename}_highlighted.html"
-            )
+                # Write highlighted output to file
+                if not self.no_provenance:
+                    highlighted_output_path = os.path.join(
+                        self.directory_path, f"{filename}_highlighted.html"
+                    )
 
-            print(f"Writing highlighted file for {basename}")
-            highlighted_file.export(highlighted_output_path, include_key=True)
+                    print(f"Writing highlighted file for {basename}")
+                    highlighted_file.export(highlighted_output_path, include_key=True)
 
             # Run all validation tests
             errors = list()
@@ -367,12 +801,17 @@ class FileProcessor:
                 # Call related validation tests, extend global errors lists if the
                 # importer has errors
                 validation_errors = []
-                validated, failed_validators = datafile.validate(
-                    validation_level=importer.validation_level,
-                    errors=validation_errors,
-                    parser=importer.short_name,
-                    skip_validation=self.skip_validation,
-                )
+                if staged_file is not None and staged_file.validated(importer.short_name, datafile):
+                    # The measurements passed validation in the worker process
+                    print_captured_output(staged_file.validation_outputs[importer.short_name])
+                    failed_validators = []
+                else:
+                    validated, failed_validators = datafile.validate(
+                        validation_level=importer.validation_level,
+                        errors=validation_errors,
+                        parser=importer.short_name,
+                        skip_validation=self.skip_validation,
+                    )
                 # Add the list of failed validators from that importer to
                 # the overall list of validators with errors for this file
                 validators_with_errors.extend(failed_validators)
@@ -391,21 +830,29 @@ class FileProcessor:
                 summary_details["filename"] = basename
 
                 log = datafile.commit(data_store, change.change_id)
-                metadata_summaries_after = data_store.get_status(
-                    TableTypes.METADATA, exclude=exclude
-                )
-                measurement_summaries_after = data_store.get_status(
-                    TableTypes.MEASUREMENT, exclude=exclude
-                )
-                metadata_report = metadata_summaries_after.show_delta_of_rows_added_metadata(
-                    metadata_summaries_before
-                )
+                if self.full_table_status:
+                    metadata_summaries_after = data_store.get_status(
+                        TableTypes.METADATA, exclude=exclude
+                    )
+                    measurement_summaries_after = data_store.get_status(
+                        TableTypes.MEASUREMENT, exclude=exclude
+                    )
+                    metadata_report = metadata_summaries_after.show_delta_of_rows_added_metadata(
+                        metadata_summaries_before
+                    )
+                    measurement_report = measurement_summaries_after.show_delta_of_rows_added(
+                        measurement_summaries_before
+                    )
+                else:
+                    metadata_report = data_store.get_added_status(
+                        TableTypes.METADATA, change.change_id, exclude=exclude
+                    ).report_added_metadata()
+                    measurement_report = datafile.get_measurement_status(
+                        data_store, exclude=exclude
+                    ).report()
                 formatted_text = format_table("METADATA REPORT", table_string=metadata_report)
                 custom_print_formatted_text(formatted_text)
 
-                measurement_report = measurement_summaries_after.show_delta_of_rows_added(
-                    measurement_summaries_before
-                )
                 formatted_text = format_table("MEASUREMENT REPORT", table_string=measurement_report)
                 custom_print_formatted_text(formatted_text)
                 if isinstance(data_store.missing_data_resolver, CommandLineResolver):
@@ -424,7 +871,12 @@ class FileProcessor:
                     # Set log to an empty list because measurements are deleted
                     log = []
                 elif choice == "2":  # Import metadata and measurements
-                    pass
+                    # Keep track of the datafile, so any copies of this file are skipped
+                    self.loaded_datafiles[(file_size, file_hash)] = (
+                        datafile.reference,
+                        datafile.created_date,
+                    )
+                    self.loaded_datafile_sizes.add(file_size)
                 else:  # Don't import data from this file.
                     # Remove metadata and measurement
                     self._remove_measurement_and_metadata(data_store, datafile, change.change_id)
@@ -448,12 +900,17 @@ class FileProcessor:
                 import_summary["succeeded"].append(summary_details)
 
             else:
-                metadata_summaries_after = data_store.get_status(
-                    TableTypes.METADATA, exclude=exclude
-                )
-                metadata_report = metadata_summaries_after.show_delta_of_rows_added_metadata(
-                    metadata_summaries_before
-                )
+                if self.full_table_status:
+                    metadata_summaries_after = data_store.get_status(
+                        TableTypes.METADATA, exclude=exclude
+                    )
+                    metadata_report = metadata_summaries_after.show_delta_of_rows_added_metadata(
+                        metadata_summaries_before
+                    )
+                else:
+                    metadata_report = data_store.get_added_status(
+                        TableTypes.METADATA, change.change_id, exclude=exclude
+                    ).report_added_metadata()
                 formatted_text = format_table("METADATA REPORT", table_string=metadata_report)
                 custom_print_formatted_text(formatted_text)
                 if isinstance(data_store.missing_data_resolver, CommandLineResolver):
@@ -493,6 +950,8 @@ class FileProcessor:
         self._remove_measurements(data_store, datafile, change_id)
         # Remove metadata entities
         self._remove_metadata(data_store, change_id)
+        # Remove the removed States from the dashboard's summary
+        data_store.refresh_dashboard_coverage()
 
     @staticmethod
     def _remove_measurements(data_store, datafile, change_id):
@@ -503,25 +962,15 @@ class FileProcessor:
         spinner.start()
         data_store.session.delete(datafile)
         # Remove log objects
-        objects_from_logs = data_store.get_logs_by_change_id(change_id)
-        for obj in objects_from_logs:
-            table_cls = getattr(data_store.db_classes, table_name_to_class_name(obj.table))
-            if table_cls.table_type == TableTypes.MEASUREMENT:
-                data_store.session.delete(obj)
+        data_store.remove_logged_rows(change_id, TableTypes.MEASUREMENT, delete_rows=False)
         spinner.succeed("Measurements cleared")
 
     @staticmethod
     def _remove_metadata(data_store, change_id):
         spinner = Halo(text="@ Clearing metadata", spinner="dots")
         spinner.start()
-        objects_from_logs = data_store.get_logs_by_change_id(change_id)
-        for obj in objects_from_logs:
-            table_cls = getattr(data_store.db_classes, table_name_to_class_name(obj.table))
-            if table_cls.table_type == TableTypes.METADATA:
-                primary_key_field = getattr(table_cls, get_primary_key_for_table(table_cls))
-                data_store.session.query(table_cls).filter(primary_key_field == obj.id).delete()
-                # Remove Logs entity
-                data_store.session.delete(obj)
+        data_store.remove_logged_rows(change_id, TableTypes.METADATA)
+        data_store.clear_platform_and_sensor_caches()
         spinner.succeed("Metadata cleared")
 
     @staticmethod
@@ -569,6 +1018,7 @@ class FileProcessor:
 
         """
         self.importers.append(importer)
+        self.update_importer_index()
 
     def load_importers_dynamically(self, path=IMPORTERS_DIRECTORY):
         """Dynamically adds all the importers in the given path.
@@ -589,6 +1039,12 @@ class FileProcessor:
                             # Create an object of the class, add it to importers
                             obj = class_()
                             self.importers.append(obj)
+            self.update_importer_index()
+
+    def update_importer_index(self):
+        """Builds the index of the importers, which is used to find the importers which might
+        be able to load each file, without checking every importer against every file"""
+        self.importer_index = ImporterIndex(self.importers)
 
     @staticmethod
     def get_first_line(file_path: str):
@@ -612,6 +1068,33 @@ class FileProcessor:
             lines = file.read().split("\n")
         return lines
 
+    @staticmethod
+    def read_file_bytes(full_path: str):
+        """Read the whole of the given file as bytes
+
+        :param full_path: Full file path
+        :type full_path: String
+        :return: Contents of the file
+        :rtype: bytes
+        """
+        with open(full_path, "rb") as file:
+            return file.read()
+
+    @staticmethod
+    def decode_file_contents(file_bytes: bytes):
+        """Decode the contents of a file into a list of lines, in the same way
+        as `get_file_contents` does when reading the file
+
+        :param file_bytes: Contents of the file
+        :type file_bytes: bytes
+        :return: List of lines of the file
+        :rtype: List
+        """
+        text = file_bytes.decode("windows-1252")
+        # Translate line endings in the same way as reading a file in text mode does
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+        return text.split("\n")
+
     @staticmethod
     def _input_validator(options):
         def is_valid(option):
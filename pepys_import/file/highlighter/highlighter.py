@@ -1,9 +1,11 @@
-from tqdm import tqdm
+import io
+from itertools import islice
 
 from pepys_import.file.highlighter.support.line import Line
 
 from ...utils.text_formatting_utils import custom_print_formatted_text, format_error_message
 from .support.char import Char
+from .support.char_store import CharStore
 from .support.export import export_report
 from .support.token import SubToken
 
@@ -14,19 +16,22 @@ class HighlightedFile:
     then export a highlighted version of the file that indicates extraction
     """
 
-    def __init__(self, filename: str, number_of_lines=None, datafile=None):
+    def __init__(self, filename: str, number_of_lines=None, datafile=None, file_contents=None):
         """
         Constructor for this object
         Args:
             filename (str): The name of the file to be parsed/reported upon
             number_of_lines(int) Number of lines that should be shown
                    in the output (all lines if None)
+            file_contents(bytes) Contents of the file, if it has already been read,
+                   so that the file doesn't need to be read again (optional)
         """
-        self.chars = []
+        self.char_store = CharStore()
         self.filename = filename
         self.dict_color = {}
         self.number_of_lines = number_of_lines
         self.datafile = datafile
+        self._file_byte_contents = file_contents
 
         self.importer_highlighting_levels = {}
 
@@ -42,13 +47,26 @@ class HighlightedFile:
     def chars_debug(self):
         """
         Debug method, to check contents of chars
+
+        Returns a list with a Char object for each character in the file, built from
+        the usages recorded in the char store. This is a snapshot, so won't reflect
+        usages recorded after it is called.
         """
         self.fill_char_array_if_needed()
-        return self.chars
+        chars = []
+        for text, usage_ids in self.char_store.text_segments():
+            usages = self.char_store.usages_for_ids(usage_ids)
+            for letter in text:
+                char = Char(letter)
+                char.usages.extend(usages)
+                chars.append(char)
+        return chars
 
     def lines(self):
         """
         Slice the file into lines and return a list of Line objects
+
+        For large files, use `iter_lines` instead, which doesn't keep all the lines in memory
         """
         if self.number_of_lines is None:
             return self.not_limited_lines()
@@ -60,6 +78,41 @@ class HighlightedFile:
         else:
             return self.limited_lines()
 
+    def iter_lines(self):
+        """
+        Generator which yields a Line object for each line in the file, with appropriate
+        offsets into the file, stopping after self.number_of_lines lines if that is set.
+
+        The file is read a line at a time through a buffered reader, so only the current line
+        is held in memory, which allows very large files to be processed.
+        """
+        if self.number_of_lines is not None and self.number_of_lines <= 0:
+            custom_print_formatted_text(
+                format_error_message("Non-positive number of lines. Please provide positive number")
+            )
+            exit(1)
+
+        return islice(self._generate_lines(), self.number_of_lines)
+
+    def _generate_lines(self):
+        # Keeps track of which character in the file a line starts on
+        line_start_counter = 0
+
+        with self.open_text() as file:
+            for file_line in file:
+                # Split the line in the same way as str.splitlines would split the whole file,
+                # as that also splits on characters like form feeds which aren't line endings
+                # when reading the file line by line. The newline at the end of file_line will
+                # always be a single \n, as universal newlines mode translates \r\n to \n
+                for this_line in file_line.splitlines():
+                    line_span = (0, len(this_line))
+                    # Create SubToken object to keep track of the line length, the line itself
+                    # and the start character of the line in the file
+                    sub_token = SubToken(line_span, this_line, line_start_counter)
+                    yield Line([sub_token], self)
+                    # Update the starting character of the line ready for next time
+                    line_start_counter += len(this_line) + 1
+
     def export(self, filename: str, include_key=False):
         """
         Provide highlighted summary for this file
@@ -68,17 +121,12 @@ class HighlightedFile:
         include_key (bool): Whether to include a key at the bottom of the output
         showing what each colour refers to
         """
-        if len(self.chars) > 0:
-            export_report(filename, self.chars, self.dict_color, include_key)
+        if self.char_store.has_text():
+            export_report(filename, self.char_store, self.dict_color, include_key)
 
     def limited_contents(self):
-        with open(self.filename, "r") as file:
-            whole_file_contents = file.read()
-
-        lines_list = whole_file_contents.splitlines()
-
-        lines_list = lines_list[0 : self.number_of_lines]
-        limited_contents = "\n".join(str(e) for e in lines_list)
+        lines_list = [line.text for line in self.iter_lines()]
+        limited_contents = "\n".join(lines_list)
 
         return limited_contents, lines_list
 
@@ -88,78 +136,56 @@ class HighlightedFile:
         producing only self.number_of_lines objects (to limit length
         of output for very large files)
         """
-
-        limited_contents, lines_list = self.limited_contents()
-
-        lines = self.create_lines(limited_contents, lines_list)
-        return lines
+        return list(self.iter_lines())
 
     def not_limited_lines(self):
         """
         Return a list of Line objects for each line in the file
         """
-        with open(self.filename, "r") as file:
-            file_contents = file.read()
+        return list(self.iter_lines())
+
+    def open_text(self):
+        """
+        Opens the file for reading as text, using the contents of the file
+        if they have already been read rather than opening the file again
+        """
+        if self._file_byte_contents is not None:
+            # This decodes the bytes and translates line endings in the same way as open does
+            return io.TextIOWrapper(io.BytesIO(self._file_byte_contents))
+        return open(self.filename, "r")
 
-        lines_list = file_contents.splitlines()
-        lines = self.create_lines(file_contents, lines_list)
+    @property
+    def file_byte_contents(self):
+        """
+        The contents of the file as bytes, read the first time they are needed.
 
-        return lines
+        These are used when recording an XML element, to convert from
+        bytes offsets to character offsets
+        """
+        if self._file_byte_contents is None:
+            with open(self.filename, "rb") as f:
+                self._file_byte_contents = f.read()
+        return self._file_byte_contents
 
     def fill_char_array_if_needed(self):
-        if len(self.chars) > 0:
-            # Char array already filled, so no need to do anything
+        if self.char_store.has_text():
+            # Char store already filled, so no need to do anything
             return
 
         if self.number_of_lines is None:
-            with open(self.filename, "r") as file:
-                file_contents = file.read()
+            # Give the char store the file to read the text from when exporting, rather than
+            # decoding the whole file into memory now
+            self.char_store.set_source(self.open_text)
         elif self.number_of_lines <= 0:
             raise ValueError("Non-positive number of lines. Please provide positive number")
         else:
+            # Give the text to the char store, so the usages recorded against
+            # character ranges can be matched up with the text when exporting
             file_contents, _ = self.limited_contents()
-
-        # We need to store the contents of the file as bytes so that
-        # the record call on an XML element can convert from bytes offsets to character offsets
-        with open(self.filename, "rb") as f:
-            self.file_byte_contents = f.read()
-
-        # Initialise the char index (self.chars), with one Char entry for
-        # each character in the file. (Note: a reference to this char array is
-        # given to each SubToken)
-        # We do this as a list comprehension as it's more efficient, but we have to
-        # add it to list that already exists in self.chars, as references have already
-        # been made to this list
-        self.chars += [Char(c) for c in tqdm(file_contents)]
+            self.char_store.set_text(file_contents)
 
     def set_usages_for_slice(self, start, end, usage):
-        for i in range(start, end):
-            self.chars[i].usages.append(usage)
+        usage_id = self.char_store.add_usage(usage)
+        self.char_store.add_interval(start, end, usage_id)
 
         return (start, end)
-
-    def create_lines(self, file_contents, lines_list):
-        """
-        Create individual Line objects
-        for each line, with appropriate references to the character array
-        """
-        # Keeps track of which character in the file a line starts on
-        line_start_counter = 0
-        lines = []
-
-        # For each line in the file create a Line object with a SubToken
-        # object as its child, keeping track of the length of the line
-        # and which character of the file this line starts on
-        for this_line in lines_list:
-            line_length = len(this_line)
-            line_span = (0, len(this_line))
-            # Create SubToken object to keep track of the line length, the line itself
-            # the start character of the line in the file, and a reference to the overall
-            # list of characters
-            sub_token = SubToken(line_span, this_line, int(line_start_counter), self.chars)
-            new_l = Line([sub_token], self)
-            lines.append(new_l)
-            # Update the starting character of the line ready for next time
-            line_start_counter += line_length + 1
-
-        return lines
@@ -0,0 +1,99 @@
+import io
+
+from .support.line import Line, split_tokens
+
+
+class PlainToken(str):
+    """
+    A token from a PlainLine, which is just the string of the token.
+
+    Has the same `text` and `record` members as a Token, so it can be used by importers
+    in the same way, but recording a usage does nothing.
+    """
+
+    __slots__ = ()
+
+    @property
+    def text(self):
+        """Returns the text of the token"""
+        return str(self)
+
+    @property
+    def text_space_separated(self):
+        """Returns the text of the token"""
+        return str(self)
+
+    def record(self, tool: str, field: str, value: str, units: str = None):
+        """Does nothing, as no provenance is recorded for a PlainFile"""
+
+
+class PlainLine:
+    """
+    A line from a PlainFile, with the same `text`, `tokens` and `record` members as a Line,
+    but returning PlainToken objects and not recording any usages.
+    """
+
+    WHITESPACE_TOKENISER = Line.WHITESPACE_TOKENISER
+    CSV_TOKENISER = Line.CSV_TOKENISER
+    QUOTED_NAME_REGEX = Line.QUOTED_NAME_REGEX
+
+    __slots__ = ("text",)
+
+    def __init__(self, text):
+        self.text = text
+
+    def __repr__(self):
+        return "PlainLine: " + self.text
+
+    def tokens(self, reg_exp=WHITESPACE_TOKENISER, strip_char="", quoted_name=QUOTED_NAME_REGEX):
+        """Returns a list of PlainToken objects for each token in the line, split
+        in the same way as `Line.tokens`"""
+        return [
+            PlainToken(token_str)
+            for _, token_str, _ in split_tokens(self.text, reg_exp, strip_char, quoted_name)
+        ]
+
+    def record(self, tool: str, field: str, value: str, units: str = None):
+        """Does nothing, as no provenance is recorded for a PlainFile"""
+
+
+class PlainFile:
+    """
+    Replacement for HighlightedFile used when importing without provenance.
+
+    Gives importers the lines and tokens of the file as plain strings (via PlainLine and
+    PlainToken objects), without keeping track of where they came from in the file.
+    No usages are recorded, no extractions are written to the database and
+    no highlighted file is exported.
+    """
+
+    def __init__(self, filename: str, datafile=None, file_contents=None):
+        self.filename = filename
+        self.datafile = datafile
+        self.file_contents = file_contents
+
+        self.importer_highlighting_levels = {}
+
+    def reinitialise(self, filename, datafile):
+        """Re-initialise the file object, to set a new filename as the source of data"""
+        self.__init__(filename=filename, datafile=datafile)
+
+    def lines(self):
+        """Returns a list of PlainLine objects for each line in the file"""
+        return list(self.iter_lines())
+
+    def iter_lines(self):
+        """Generator which yields a PlainLine object for each line in the file"""
+        if self.file_contents is not None:
+            # Use the contents of the file that have already been read
+            file = io.TextIOWrapper(io.BytesIO(self.file_contents))
+        else:
+            file = open(self.filename, "r")
+
+        with file:
+            for file_line in file:
+                for this_line in file_line.splitlines():
+                    yield PlainLine(this_line)
+
+    def export(self, filename: str, include_key=False):
+        """Does nothing, as there are no usages to export"""
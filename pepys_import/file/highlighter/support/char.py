@@ -4,9 +4,8 @@ class Char:
 
     Stores the character letter itself, plus a list of usages of the character.
 
-    A list of these is kept in HighlightedFile.chars (and also available through
-    SubToken.chars), and iterating through this list is used to create the final
-    highlighted file.
+    A list of these is built from the char store by HighlightedFile.chars_debug, to allow
+    checking the usages recorded for each character.
     """
 
     # For efficiency, define the attributes that are allowed to be used on this
@@ -0,0 +1,179 @@
+import heapq
+import operator
+import sys
+from array import array
+from itertools import islice
+
+# Maximum number of characters to read from the source file at once
+READ_CHUNK_SIZE = 1000000
+
+
+class CharStore:
+    """
+    Compact store of the characters of a file and the usages recorded against them.
+
+    Rather than keeping an object for each character in the file, the usages are kept as
+    a list of character intervals. Each interval is stored in three parallel arrays, holding
+    the start and end index of the interval and the id of the usage recorded against it.
+    The usage id is an index into self.usages, so a single SingleUsage object can be shared
+    between all the intervals of a (possibly combined) token.
+
+    A single CharStore is kept in HighlightedFile.char_store, and is written to by the
+    `record` methods on Token, Line and MyElement, and read by `export_report`.
+
+    The text that the usages refer to is either given directly with `set_text`, or
+    is read back from the file given by `set_source` when it is needed, so that the contents
+    of large files don't have to be held in memory while they are being imported.
+    """
+
+    def __init__(self):
+        self.text = None
+        self.open_source = None
+        self.usages = []
+        self.starts = array("q")
+        self.ends = array("q")
+        self.usage_ids = array("q")
+
+    def has_text(self):
+        """Returns True if the text (or the file to read it from) has been set"""
+        return self.text is not None or self.open_source is not None
+
+    def set_text(self, text):
+        """Sets the text of the file that usages will be recorded against"""
+        self.text = text
+        self.open_source = None
+
+    def set_source(self, open_source):
+        """Sets the file to read the text that usages will be recorded against from
+
+        :param open_source: Function taking no arguments that opens the file, returning
+            a text file object
+        :type open_source: Callable
+        """
+        self.text = None
+        self.open_source = open_source
+
+    def add_usage(self, usage):
+        """Adds a SingleUsage object to the store, returning the id to use for it
+        when calling `add_interval`"""
+        self.usages.append(usage)
+        return len(self.usages) - 1
+
+    def add_interval(self, start, end, usage_id):
+        """Records that the characters from start (inclusive) to end (exclusive) have been used
+        as described by the usage with the given id"""
+        if end <= start:
+            # Nothing to record for an empty interval
+            return
+        self.starts.append(start)
+        self.ends.append(end)
+        self.usage_ids.append(usage_id)
+
+    def segments(self, text_length=None):
+        """
+        Yields (start, end, usage_ids) tuples covering the whole text, where each segment is a
+        run of characters which all have the same usages recorded against them.
+
+        The usage ids in each segment are sorted, so they are given in the order that the usages
+        were recorded. Segments with no usages recorded have an empty list of usage ids.
+
+        :param text_length: Length of the text to cover. Defaults to the length of self.text,
+            or if the text is being read from a file then the segments carry on past the last
+            interval with a final segment ending at sys.maxsize
+        :type text_length: int
+        """
+        starts = self.starts
+        ends = self.ends
+        usage_ids = self.usage_ids
+        interval_count = len(starts)
+
+        # Go through the intervals in order of their start index. Tokens are nearly always
+        # recorded in the order they appear in the file, so only sort if we need to
+        if all(map(operator.le, starts, islice(starts, 1, None))):
+            order = range(interval_count)
+        else:
+            order = sorted(range(interval_count), key=starts.__getitem__)
+
+        if text_length is None:
+            text_length = len(self.text) if self.text is not None else sys.maxsize
+        # Counts of the usage ids covering the current position, and a heap
+        # of the end indexes of the intervals that cover the current position
+        active = {}
+        active_ends = []
+        position = 0
+        next_interval = 0
+
+        while position < text_length:
+            if not active_ends:
+                # Nothing covers this position, so there's a gap up to the next interval
+                if next_interval == interval_count:
+                    yield position, text_length, []
+                    return
+                index = order[next_interval]
+                if starts[index] > position:
+                    yield position, min(starts[index], text_length), []
+                    position = starts[index]
+                    continue
+
+                # Fast path for the usual case of an interval that doesn't overlap any
+                # other intervals, which can be given as a segment on its own
+                end = ends[index]
+                if next_interval + 1 == interval_count or starts[order[next_interval + 1]] >= end:
+                    next_interval += 1
+                    end = min(end, text_length)
+                    yield position, end, [usage_ids[index]]
+                    position = end
+                    continue
+
+            # Close any intervals that end here
+            while active_ends and active_ends[0][0] <= position:
+                _, usage_id = heapq.heappop(active_ends)
+                active[usage_id] -= 1
+                if active[usage_id] == 0:
+                    del active[usage_id]
+            # Open any intervals that start here
+            while next_interval < interval_count and starts[order[next_interval]] <= position:
+                index = order[next_interval]
+                next_interval += 1
+                if ends[index] <= position:
+                    continue
+                usage_id = usage_ids[index]
+                active[usage_id] = active.get(usage_id, 0) + 1
+                heapq.heappush(active_ends, (ends[index], usage_id))
+
+            # The segment runs until the next interval starts or ends
+            end = text_length
+            if next_interval < interval_count:
+                end = min(end, starts[order[next_interval]])
+            if active_ends:
+                end = min(end, active_ends[0][0])
+
+            yield position, end, sorted(active)
+            position = end
+
+    def text_segments(self):
+        """
+        Yields (text, usage_ids) tuples for each of the segments given by `segments`, with the
+        text for each segment either sliced from self.text or read in order from the source file.
+        """
+        if self.open_source is None:
+            for start, end, usage_ids in self.segments():
+                yield self.text[start:end], usage_ids
+            return
+
+        with self.open_source() as file:
+            for start, end, usage_ids in self.segments():
+                # Read long segments (particularly the final one, which runs to the end of the
+                # file) in chunks, so we never read too much of the file into memory at once
+                length = end - start
+                while length > 0:
+                    text = file.read(min(length, READ_CHUNK_SIZE))
+                    if not text:
+                        # Reached the end of the file
+                        return
+                    yield text, usage_ids
+                    length -= len(text)
+
+    def usages_for_ids(self, usage_ids):
+        """Returns the list of SingleUsage objects for the given usage ids"""
+        return [self.usages[usage_id] for usage_id in usage_ids]
@@ -1,5 +1,3 @@
-import itertools
-
 # Set of 30 distinct colours generated from https://mokole.com/palette.html
 DISTINCT_COLORS_30 = [
     (128, 128, 128),
@@ -34,15 +32,14 @@ DISTINCT_COLORS_30 = [
     (135, 206, 250),
 ]
 
-# This creates an iterator which iterates over the list of distinct colours,
-# looping around as necessary
-COLORS = itertools.cycle(DISTINCT_COLORS_30)
-
 
 def color_for(hash_code, color_dict):
     """
     Get a color for a specific 'hash code' by either taking one we've already recorded for
-    this hash code, or generating a new random one.
+    this hash code, or taking the next one from the list of distinct colours.
+
+    The colours are taken in order for each color_dict, looping around as necessary, so the
+    colours used for a file don't depend on which other files have been exported before it.
     """
     # do we have it already?
     if hash_code in color_dict:
@@ -50,7 +47,7 @@ def color_for(hash_code, color_dict):
         return color_dict[hash_code]
     else:
         # no, get one from the list of distinct colours
-        color = next(COLORS)
+        color = DISTINCT_COLORS_30[len(color_dict) % len(DISTINCT_COLORS_30)]
 
         color_dict[hash_code] = color
         return color
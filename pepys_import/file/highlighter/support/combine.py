@@ -1,3 +1,4 @@
+from ..plain_file import PlainToken
 from .token import Token
 
 
@@ -5,7 +6,13 @@ def combine_tokens(*tokens):
     """
     Combine multiple tokens into one new Token, so that one single usage can be given
     for these tokens.
+
+    If the tokens are PlainToken objects (when importing without provenance), the result is
+    just a PlainToken of the combined text.
     """
+    if isinstance(tokens[0], PlainToken):
+        return PlainToken("".join(tokens))
+
     res = []
     for token in tokens:
         children = token.children
@@ -4,100 +4,112 @@ from tqdm import tqdm
 
 from .color_picker import color_for, html_color_for, mean_color_for
 
+# Number of strings to collect before writing them out to the file
+WRITE_BUFFER_SIZE = 10000
 
-def export_report(filename, chars, dict_colors, include_key=False):
+
+def export_report(filename, char_store, dict_colors, include_key=False):
     """
     Export a HTML report showing all the extraction usages for the file.
 
     :param filename: Output filename
-    :param chars: Characters array (should be HighlightedFile.chars)
+    :param char_store: Store of characters and usages (should be HighlightedFile.char_store)
     :param dict_colors: Dictionary specifying colors to use (should be HighlightedFile.dict_colors)
     :param include_key: Whether to include a key at the bottom defining the usages of the colors
 
-    This basically loops through all of the characters in the characters array, and then creates
-    the relevant <span> tags for each character based on the usages stored for that character.
+    This loops through the segments of the char store (runs of characters with the same usages)
+    in order, and writes each run of text to the file as it goes, wrapped in a <span> tag
+    whenever the usages for the text change. The text is read from the char store's source
+    file as it is needed, so the memory used doesn't grow with the size of the file.
     """
-
-    output_strings = []
-
     html_header = """<html>
     <head>
     </head>
     <body style="font-family: Courier">
     """
 
-    output_strings.append(html_header)
-
-    last_hash = ""
-
-    for char in tqdm(chars):
-        letter = char.letter
-        this_hash = ""
-        this_message = ""
-        colors = []
-        multi_usages = len(char.usages) > 1
-        for usage in char.usages:
-            this_hash += usage.tool_field
-            needs_new_line = this_message != ""
-            colors.append(color_for(usage.tool_field, dict_colors))
-            if needs_new_line:
-                this_message += "&#013;"
-            if multi_usages:
-                this_message += "-"
-            this_message += usage.tool_field + ", " + usage.message
-
-        # do we have anything to shade?
-        if this_hash != "":
-            # generate/retrieve a color for this hash
-            new_color = mean_color_for(colors)
-            hex_color = html_color_for(new_color)
-
-            # are we already in hash?
-            if last_hash != "":
-                # is it the different to this one?
-                if last_hash != this_hash:
-                    # ok, close the span
-                    output_strings.append("</span>")
-
-                    # start a new span
-                    output_strings.append(
-                        f"<span title='{this_message}' style=\"background-color:{hex_color}\">"
-                    )
-            else:
-                output_strings.append(
-                    f"<span title='{this_message}' style=\"background-color:{hex_color}\">"
-                )
-        elif last_hash != "":
-            output_strings.append("</span>")
-
-        # just check if it's newline
-        if letter == "\n":
-            output_strings.append("<br>")
-        else:
-            # Escape the letter as otherwise the XML from XML files gets
-            # interpreted by browsers as (invalid) HTML
-            output_strings.append(html.escape(letter))
-
-        last_hash = this_hash
-
-    if last_hash != "":
-        output_strings.append("</span>")
-
-    # also provide a key
-    if include_key:
-        output_strings.append("<hr/><h3>Color Key</h3><ul>")
-        for key in dict_colors:
-            color = dict_colors[key]
-            hex_color = html_color_for(color)
-            output_strings.append(
-                f'<li><span style="background-color:{hex_color}">{key}</span></li>'
-            )
-        output_strings.append("</ul>")
-
-    html_footer = """</body>
+    # Cache of the background color to use for each combination of usages, so
+    # we only calculate the mean color once for each combination
+    hex_colors = {}
+
+    with open(filename, "w") as f:
+        f.write(html_header)
+
+        # Output is collected into a small buffer which is written out to the file
+        # every WRITE_BUFFER_SIZE strings, rather than writing every string separately
+        buffer = []
+        chars_in_buffer = 0
+        last_hash = ()
+        usages = char_store.usages
+
+        # We only know the number of characters up front if the text is held in memory
+        total = len(char_store.text) if char_store.text is not None else None
+
+        with tqdm(total=total, unit="char", unit_scale=True) as progress_bar:
+            for text, usage_ids in char_store.text_segments():
+                this_hash = tuple(usages[usage_id].tool_field for usage_id in usage_ids)
+
+                # have the usages changed since the last segment?
+                if this_hash != last_hash:
+                    # if we're already in a span, close it
+                    if last_hash:
+                        buffer.append("</span>")
+
+                    # do we have anything to shade?
+                    if this_hash:
+                        hex_color = hex_colors.get(this_hash)
+                        if hex_color is None:
+                            # generate/retrieve a color for this hash
+                            colors = [
+                                color_for(tool_field, dict_colors) for tool_field in this_hash
+                            ]
+                            hex_color = html_color_for(mean_color_for(colors))
+                            hex_colors[this_hash] = hex_color
+
+                        message = message_for(char_store.usages_for_ids(usage_ids))
+                        buffer.append(
+                            f"<span title='{message}' style=\"background-color:{hex_color}\">"
+                        )
+
+                # Escape the text as otherwise the XML from XML files gets
+                # interpreted by browsers as (invalid) HTML, and show newlines as breaks
+                buffer.append(html.escape(text).replace("\n", "<br>"))
+                chars_in_buffer += len(text)
+
+                last_hash = this_hash
+
+                if len(buffer) >= WRITE_BUFFER_SIZE:
+                    f.write("".join(buffer))
+                    buffer.clear()
+                    progress_bar.update(chars_in_buffer)
+                    chars_in_buffer = 0
+
+            if last_hash:
+                buffer.append("</span>")
+            f.write("".join(buffer))
+            progress_bar.update(chars_in_buffer)
+
+        # also provide a key
+        if include_key:
+            f.write("<hr/><h3>Color Key</h3><ul>")
+            for key in dict_colors:
+                color = dict_colors[key]
+                hex_color = html_color_for(color)
+                f.write(f'<li><span style="background-color:{hex_color}">{key}</span></li>')
+            f.write("</ul>")
+
+        html_footer = """</body>
     </html>"""
 
-    output_strings.append(html_footer)
+        f.write(html_footer)
 
-    with open(filename, "w") as f:
-        f.write("".join(output_strings))
+
+def message_for(usages):
+    """
+    Create the message shown when hovering over text with the given usages,
+    listing the tool, field and message for each usage on a separate line.
+    """
+    if len(usages) == 1:
+        return usages[0].tool_field + ", " + usages[0].message
+
+    return "&#013;".join(["-" + usage.tool_field + ", " + usage.message for usage in usages])
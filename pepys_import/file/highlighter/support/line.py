@@ -1,7 +1,8 @@
-from re import finditer, search
-
 from pepys_import.file.highlighter.level import HighlightLevel
-from pepys_import.file.highlighter.support.utils import merge_adjacent_text_locations
+from pepys_import.file.highlighter.support.utils import (
+    compile_pattern,
+    merge_adjacent_text_locations,
+)
 
 from .token import SubToken, Token
 from .usages import SingleUsage
@@ -69,53 +70,17 @@ class Line:
         capacity (currently at least) for extracting particular groups of the regular expression. Use can be made of look-ahead
         and look-behind expressions in the regex to constrain it so that the entire match covers just the token and nothing else.
         (For a good example of this see the SLASH_TOKENISER in the Nisida importer)
+        The compiled regular expressions are cached, so a compiled pattern can be passed instead of a string, but
+        doesn't need to be.
         """
-        tokens_array = []
-
-        for child in self.children:
-            # Search and match values between quotation marks if there is any
-            quoted_text_match = search(quoted_name, child.text)
-            start, end = None, None
-            if quoted_text_match:
-                original_name = quoted_text_match.group()
-                start, end = quoted_text_match.span()
-                # Remove quotation marks and then strip the text
-                quoted_sensor_name = original_name[1:-1].strip()
-                subtoken_sensor_name = SubToken(
-                    (start, end), quoted_sensor_name, int(child.line_start), child.chars
-                )
-                subtokens_sensor_name = [subtoken_sensor_name]
-
-            for match in finditer(reg_exp, child.text):
-                token_str = match.group()
-                token_start, token_end = match.span()
-                # If quoted text exists and it contains the split token, continue or
-                # add the quoted text's Token object
-                if start and end and token_start >= start and token_end <= end:
-                    # Since quoted text might contain a few tokens and it should be added to the
-                    # token arrays in the correct position, the following if clause used. It adds
-                    # the quoted text if token's end is equal to the quoted text's end.
-                    if token_end == end:
-                        tokens_array.append(Token(subtokens_sensor_name, self.highlighted_file))
-                    continue
-
-                # special handling, we may need to strip a leading delimiter
-                if strip_char != "":
-                    char_index = token_str.find(strip_char)
-                    if char_index == 0:
-                        token_str = token_str[1:]
-                        token_start += 1
-                    # and ditch any new whitespace
-                    token_str = token_str.strip()
-
-                subtoken = SubToken(
-                    (token_start, token_end), token_str, int(child.line_start), child.chars
-                )
-                # the token object expects an array of SubTokens, as it could be a composite object
-                list_of_subtokens = [subtoken]
-                tokens_array.append(Token(list_of_subtokens, self.highlighted_file))
-
-        return tokens_array
+        # the token object expects an array of SubTokens, as it could be a composite object
+        return [
+            Token([SubToken(span, token_str, line_start)], self.highlighted_file)
+            for child in self.children
+            for span, token_str, line_start in split_tokens(
+                child.text, reg_exp, strip_char, quoted_name, child.line_start
+            )
+        ]
 
     def record(self, tool: str, field: str, value: str, units: str = None):
         """
@@ -131,8 +96,8 @@ class Line:
 
         Technical details:
         ------------------
-        Adds a SingleUsage object to each of the relevant characters in the
-        char array referenced by each SubToken child.
+        Adds a SingleUsage object to the char store of the HighlightedFile, and records
+        it against the character range of each SubToken child.
         """
         recording_level = self.highlighted_file.importer_highlighting_levels.get(tool, None)
         if recording_level == HighlightLevel.NONE:
@@ -146,6 +111,9 @@ class Line:
         else:
             message = "Value:" + str(value)
 
+        char_store = self.highlighted_file.char_store
+        usage_id = char_store.add_usage(SingleUsage(tool_field, message))
+
         text_locations = []
 
         for child in self.children:
@@ -154,20 +122,73 @@ class Line:
 
             text_locations.append((start, end))
 
-            for i in range(start, end):
-                usage = SingleUsage(tool_field, message)
-                child.chars[i].usages.append(usage)
+            char_store.add_interval(start, end, usage_id)
 
         if recording_level == HighlightLevel.DATABASE:
             merged_text_locations = merge_adjacent_text_locations(text_locations)
             text_location_str = ",".join([f"{low}-{high}" for low, high in merged_text_locations])
 
-            self.highlighted_file.datafile.pending_extracted_tokens.append(
-                {
-                    "text": self.text,
-                    "interpreted_value": str(value),
-                    "text_location": text_location_str,
-                    "importer": tool,
-                    "field": field,
-                }
+            self.highlighted_file.datafile.extraction_buffer.record(
+                self.text, str(value), text_location_str, tool, field
             )
+
+
+def split_tokens(text, reg_exp, strip_char="", quoted_name=Line.QUOTED_NAME_REGEX, line_start=0):
+    """Splits the given text into tokens, as described in `Line.tokens`
+
+    :param text: Text to split
+    :type text: String
+    :param reg_exp: Regular expression (string or compiled) matching each token
+    :type reg_exp: String
+    :param strip_char: Characters to strip after splitting, defaults to ""
+    :type strip_char: String, optional
+    :param quoted_name: Regular expression matching quoted text to keep as a single token
+    :type quoted_name: String, optional
+    :param line_start: Index into the file's characters that the text starts at
+    :type line_start: int, optional
+    :return: List of (span, token text, line_start) tuples, one for each token
+    :rtype: List
+    """
+    token_parts = []
+    pattern = compile_pattern(reg_exp)
+    start, end = None, None
+    # Search and match values between quotation marks if there is any. The default quoted name
+    # regex can only match if there are quote characters in the text, so we can skip searching
+    # for it when there aren't any
+    if quoted_name != Line.QUOTED_NAME_REGEX or '"' in text or "'" in text:
+        quoted_text_match = compile_pattern(quoted_name).search(text)
+        if quoted_text_match:
+            original_name = quoted_text_match.group()
+            start, end = quoted_text_match.span()
+            # Remove quotation marks and then strip the text
+            quoted_sensor_name = original_name[1:-1].strip()
+
+    if not (start and end) and strip_char == "":
+        # Fast path for the common case where the tokens need no further processing
+        return [(match.span(), match.group(), line_start) for match in pattern.finditer(text)]
+
+    for match in pattern.finditer(text):
+        token_str = match.group()
+        token_start, token_end = match.span()
+        # If quoted text exists and it contains the split token, continue or
+        # add the quoted text's Token object
+        if start and end and token_start >= start and token_end <= end:
+            # Since quoted text might contain a few tokens and it should be added to the
+            # token arrays in the correct position, the following if clause used. It adds
+            # the quoted text if token's end is equal to the quoted text's end.
+            if token_end == end:
+                token_parts.append(((start, end), quoted_sensor_name, line_start))
+            continue
+
+        # special handling, we may need to strip a leading delimiter
+        if strip_char != "":
+            char_index = token_str.find(strip_char)
+            if char_index == 0:
+                token_str = token_str[1:]
+                token_start += 1
+            # and ditch any new whitespace
+            token_str = token_str.strip()
+
+        token_parts.append(((token_start, token_end), token_str, line_start))
+
+    return token_parts
@@ -1,5 +1,5 @@
+from pepys_import.core.store.extraction_buffer import ExtractionBuffer
 from pepys_import.file.highlighter.highlighter import HighlightedFile
-from pepys_import.file.highlighter.support.char import Char
 from pepys_import.file.highlighter.support.line import Line
 from pepys_import.file.highlighter.support.token import SubToken
 
@@ -15,14 +15,12 @@ def create_test_line_object(line_str):
     # Create a highlighted file object but with no filename attached
     test_hf = HighlightedFile(None)
 
-    # Fill the chars array manually
-    for char in line_str:
-        char_obj = Char(char)
-        test_hf.chars.append(char_obj)
+    # Fill the char store manually
+    test_hf.char_store.set_text(line_str)
 
     # Create a line object ready to return
     line_span = (0, len(line_str))
-    sub_token = SubToken(line_span, line_str, 0, test_hf.chars)
+    sub_token = SubToken(line_span, line_str, 0)
     new_line = Line([sub_token], test_hf)
 
     return new_line
@@ -30,7 +28,7 @@ def create_test_line_object(line_str):
 
 class FakeDatafile:
     def __init__(self):
-        self.pending_extracted_tokens = []
+        self.extraction_buffer = ExtractionBuffer()
 
 
 def delete_entries(d, keys_to_delete):
@@ -13,27 +13,25 @@ class SubToken:
     there will be multiple SubToken children.
 
     Each SubToken object keeps track of the span (start and end characters) of the SubToken,
-    the text that is contained within the SubToken, the character index that the line starts at
-    and a reference to the overall character array created by HighlightedFile.
+    the text that is contained within the SubToken and the character index that the line starts at.
     """
 
-    __slots__ = ("span", "text", "line_start", "chars")
+    __slots__ = ("span", "text", "line_start")
 
-    def __init__(self, span, text, line_start, chars):
+    def __init__(self, span, text, line_start):
         self.span = span
         self.text = text
         self.line_start = line_start
-        self.chars = chars
 
     def start(self):
         """
-        Returns the index into the character array that this SubToken starts at
+        Returns the index into the file's characters that this SubToken starts at
         """
         return self.line_start + int(self.span[0])
 
     def end(self):
         """
-        Returns the index into the character array that this SubToken ends at
+        Returns the index into the file's characters that this SubToken ends at
         """
         return self.line_start + int(self.span[1])
 
@@ -104,8 +102,9 @@ class Token:
 
         Technical details
         -----------------
-        This adds SingleUsage objects to each of the relevant characters in the
-        character array stored by the SubToken objects that are children of this object.
+        This adds a SingleUsage object to the char store of the HighlightedFile, and records
+        it against the character range of each of the SubToken objects that are children
+        of this object.
         """
         recording_level = self.highlighted_file.importer_highlighting_levels.get(tool, None)
         if recording_level == HighlightLevel.NONE:
@@ -119,7 +118,8 @@ class Token:
         else:
             message = "Value:" + str(value)
 
-        usage = SingleUsage(tool_field, message)
+        char_store = self.highlighted_file.char_store
+        usage_id = char_store.add_usage(SingleUsage(tool_field, message))
 
         text_locations = []
 
@@ -130,24 +130,12 @@ class Token:
 
             text_locations.append((start, end))
 
-            for i in range(start, end):
-                # Note: subtoken.chars is a reference to a single char array
-                # that was originally created by the HighlightedFile class
-                # So each time round the loop we're actually altering the same
-                # char array, even though it is accessed via different SubToken
-                # objects
-                subtoken.chars[i].usages.append(usage)
+            char_store.add_interval(start, end, usage_id)
 
         if recording_level == HighlightLevel.DATABASE:
             merged_text_locations = merge_adjacent_text_locations(text_locations)
             text_location_str = ",".join([f"{low}-{high}" for low, high in merged_text_locations])
 
-            self.highlighted_file.datafile.pending_extracted_tokens.append(
-                {
-                    "text": self.text_space_separated,
-                    "interpreted_value": str(value),
-                    "text_location": text_location_str,
-                    "importer": tool,
-                    "field": field,
-                }
+            self.highlighted_file.datafile.extraction_buffer.record(
+                self.text_space_separated, str(value), text_location_str, tool, field
             )
@@ -1,3 +1,19 @@
+import re
+
+# Cache of compiled regular expressions, keyed by the pattern string
+_compiled_patterns = {}
+
+
+def compile_pattern(pattern):
+    """Returns the compiled version of the given regular expression, compiling it
+    the first time each pattern is used. Compiled patterns are returned unchanged."""
+    compiled = _compiled_patterns.get(pattern)
+    if compiled is None:
+        compiled = re.compile(pattern)
+        _compiled_patterns[pattern] = compiled
+    return compiled
+
+
 def merge_adjacent_text_locations(text_locations):
     if len(text_locations) == 0:
         return []
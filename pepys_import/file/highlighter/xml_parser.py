@@ -28,6 +28,7 @@ except AttributeError:
 from xml.etree.ElementTree import Comment, Element, ProcessingInstruction, XMLParser
 from xml.etree.ElementTree import parse as original_parse
 
+from pepys_import.file.highlighter.plain_file import PlainFile
 from pepys_import.file.highlighter.support.usages import SingleUsage
 
 
@@ -91,6 +92,10 @@ class MyElement(Element):
         if self.highlighted_file is None:
             raise ValueError("No HighlightedFile instance is associated with this Element")
 
+        if isinstance(self.highlighted_file, PlainFile):
+            # Importing without provenance, so there is nothing to record
+            return None
+
         self.highlighted_file.fill_char_array_if_needed()
 
         tool_field = tool + "/" + field
@@ -131,14 +136,8 @@ class MyElement(Element):
         text_location_str = f"{start_in_chars}-{end_in_chars}"
         text = self.highlighted_file.file_byte_contents[start:end].decode()
 
-        self.highlighted_file.datafile.pending_extracted_tokens.append(
-            {
-                "text": text,
-                "interpreted_value": str(value),
-                "text_location": text_location_str,
-                "importer": tool,
-                "field": field,
-            }
+        self.highlighted_file.datafile.extraction_buffer.record(
+            text, str(value), text_location_str, tool, field
         )
 
         # This return returns the start and end index, mainly for use for testing
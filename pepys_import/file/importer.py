@@ -1,4 +1,5 @@
 import os
+import re
 from abc import ABC, abstractmethod
 
 import sqlalchemy
@@ -14,6 +15,26 @@ CANCEL_IMPORT = "CANCEL"
 
 
 class Importer(ABC):
+    # Declarations of the files this importer can load, which are used by the FileProcessor to
+    # index the importers, so files are only checked against the importers that might load them.
+    # Importers can override the can_load_this_type, can_load_this_filename and
+    # can_load_this_header methods instead, for checks that can't be declared like this.
+
+    # File suffixes this importer can load (e.g. (".rep", ".dsf")), in any case,
+    # or None for any suffix
+    SUFFIXES = None
+    # Regular expression searched for in the filename (without its suffix), or None for any filename
+    FILENAME_PATTERN = None
+    # Regular expression searched for in the first line of the file, or None for any first line
+    HEADER_PATTERN = None
+
+    # Whether the FileProcessor can parse files with this importer in a worker process, when
+    # importing with more than one worker. The importer is then given a StagingDataStore,
+    # so it must only use the DataStore to look up platforms and sensors (through
+    # get_cached_platform and get_cached_sensor) and comment types, and must not ask the user
+    # for anything while parsing.
+    PARSE_IN_WORKER = False
+
     def __init__(self, name, validation_level, short_name, datafile_type, default_privacy=None):
         super().__init__()
         self.name = name
@@ -39,35 +60,47 @@ class Importer(ABC):
         - DATABASE: Produce a highlighted html file and record extractions to the database"""
         self.highlighting_level = level
 
-    @abstractmethod
     def can_load_this_type(self, suffix) -> bool:
         """Whether this importer can load files with the specified suffix.
 
+        By default this checks the suffix against SUFFIXES
+
         :param suffix: File suffix (e.g. ".doc")
         :type suffix: String
         :return: True/False
         :rtype: bool
         """
+        if self.SUFFIXES is None:
+            return True
+        return suffix.upper() in {this_suffix.upper() for this_suffix in self.SUFFIXES}
 
-    @abstractmethod
     def can_load_this_filename(self, filename) -> bool:
         """Whether this importer can load a file with the provided filename
 
+        By default this checks the filename against FILENAME_PATTERN
+
         :param filename: Full filename
         :type filename: String
         :return: True/False
         :rtype: bool
         """
+        if self.FILENAME_PATTERN is None:
+            return True
+        return re.search(self.FILENAME_PATTERN, filename) is not None
 
-    @abstractmethod
     def can_load_this_header(self, header) -> bool:
         """Whether this importer can load a file with this first line of text
 
+        By default this checks the first line against HEADER_PATTERN
+
         :param header: The initial line of text
         :type header: String
         :return: True/False
         :rtype: bool
         """
+        if self.HEADER_PATTERN is None:
+            return True
+        return re.search(self.HEADER_PATTERN, header) is not None
 
     @abstractmethod
     def can_load_this_file(self, file_contents) -> bool:
@@ -107,7 +140,7 @@ class Importer(ABC):
         datafile.measurements[self.short_name] = dict()
 
         datafile.current_measurement_object = None
-        datafile.pending_extracted_tokens = []
+        datafile.extraction_buffer.discard_pending()
 
         # Initialise the platform->sensor mapping here
         # so that we get a separate mapping for each file that we process
@@ -139,7 +172,7 @@ class Importer(ABC):
         which will occur when importing this file
         :type change_id: integer or UUID
         """
-        for line_number, line in enumerate(tqdm(file_object.lines()), 1):
+        for line_number, line in enumerate(tqdm(file_object.iter_lines()), 1):
             result = self._load_this_line(data_store, line_number, line, datafile, change_id)
             if result == CANCEL_IMPORT:
                 custom_print_formatted_text(
@@ -176,8 +209,6 @@ class Importer(ABC):
         :param data_store: DataStore instance :type data_Store: DataStore :param platform_id: ID of
         the platform for which you want to get the sensor :type platform_id: int
         """
-        Platform = data_store.db_classes.Platform
-
         if sensor_name is None and sensor_type is None:
             # Only look in the cache if the user hasn't specified any names or types
             sensor_from_cache = self.platform_sensor_mapping.get(platform_id)
@@ -185,14 +216,8 @@ class Importer(ABC):
                 return sensor_from_cache
 
             # Otherwise, resolve it
-            platform_obj = (
-                data_store.session.query(Platform)
-                .filter(Platform.platform_id == platform_id)
-                .first()
-            )
-
-            resolved_sensor = platform_obj.get_sensor(
-                data_store=data_store,
+            resolved_sensor = data_store.get_sensor(
+                platform_id,
                 sensor_name=sensor_name,
                 sensor_type=sensor_type,
                 change_id=change_id,
@@ -207,14 +232,8 @@ class Importer(ABC):
             self.platform_sensor_mapping[platform_id] = resolved_sensor
         else:
             # sensor_name or sensor_type aren't None, so just resolve it and don't store in cache
-            platform_obj = (
-                data_store.session.query(Platform)
-                .filter(Platform.platform_id == platform_id)
-                .first()
-            )
-
-            resolved_sensor = platform_obj.get_sensor(
-                data_store=data_store,
+            resolved_sensor = data_store.get_sensor(
+                platform_id,
                 sensor_name=sensor_name,
                 sensor_type=sensor_type,
                 change_id=change_id,
@@ -0,0 +1,143 @@
+import os
+import re
+
+from pepys_import.file.importer import Importer
+
+
+def _overrides(importer, method_name):
+    """Whether the importer's class overrides the given method of the Importer base class"""
+    return getattr(type(importer), method_name) is not getattr(Importer, method_name)
+
+
+def _compile(pattern):
+    if pattern is None or isinstance(pattern, re.Pattern):
+        return pattern
+    return re.compile(pattern)
+
+
+class ImporterIndex:
+    """
+    Index of a list of importers, used to find the importers which might be able to load a file.
+
+    Importers which declare the suffixes, filename pattern and header pattern that they can load
+    (see the SUFFIXES, FILENAME_PATTERN and HEADER_PATTERN attributes of Importer) are indexed by
+    those declarations, so the importers for a file suffix are found with a single dictionary
+    lookup, without calling each importer's checks. Importers which override the
+    can_load_this_type, can_load_this_filename or can_load_this_header methods instead
+    have those methods called as before.
+
+    All the indices returned refer to positions in the list of importers given.
+    """
+
+    def __init__(self, importers):
+        """
+        :param importers: List of importers to index
+        :type importers: List
+        """
+        self.importers = list(importers)
+
+        # Map of upper-case suffix to the indices of the importers which declare that suffix
+        self.suffix_importers = {}
+        # Indices of importers which can load any suffix, or which check the suffix themselves
+        self.any_suffix_importers = []
+        # Indices of importers whose can_load_this_type method needs to be called
+        self.type_methods = set()
+        # Maps of importer index to the compiled pattern for that importer, or to None
+        # if the importer's own can_load_this_filename/can_load_this_header method must be called
+        self.filename_checks = {}
+        self.header_checks = {}
+
+        for index, importer in enumerate(self.importers):
+            if _overrides(importer, "can_load_this_type"):
+                self.type_methods.add(index)
+                self.any_suffix_importers.append(index)
+            elif importer.SUFFIXES is None:
+                self.any_suffix_importers.append(index)
+            else:
+                for suffix in {suffix.upper() for suffix in importer.SUFFIXES}:
+                    self.suffix_importers.setdefault(suffix, []).append(index)
+
+            if _overrides(importer, "can_load_this_filename"):
+                self.filename_checks[index] = None
+            elif importer.FILENAME_PATTERN is not None:
+                self.filename_checks[index] = _compile(importer.FILENAME_PATTERN)
+
+            if _overrides(importer, "can_load_this_header"):
+                self.header_checks[index] = None
+            elif importer.HEADER_PATTERN is not None:
+                self.header_checks[index] = _compile(importer.HEADER_PATTERN)
+
+        # Cache of the candidate importers for each suffix seen, in importer order
+        self._suffix_candidates = {}
+
+    def importers_for_suffix(self, suffix):
+        """Indices of the importers which may be able to load files with the given suffix,
+        based on the suffix alone
+
+        :param suffix: File suffix (e.g. ".doc")
+        :type suffix: String
+        :return: List of importer indices
+        :rtype: List
+        """
+        key = suffix.upper()
+        candidates = self._suffix_candidates.get(key)
+        if candidates is None:
+            candidates = sorted(self.suffix_importers.get(key, []) + self.any_suffix_importers)
+            self._suffix_candidates[key] = candidates
+
+        if not self.type_methods:
+            return candidates
+        return [
+            index
+            for index in candidates
+            if index not in self.type_methods or self.importers[index].can_load_this_type(suffix)
+        ]
+
+    def importers_for_name(self, basename):
+        """Indices of the importers which may be able to load a file with the given name,
+        based on its suffix and filename. The file itself isn't opened.
+
+        :param basename: Name of the file, without the folder
+        :type basename: String
+        :return: List of importer indices
+        :rtype: List
+        """
+        filename, suffix = os.path.splitext(basename)
+        return [
+            index
+            for index in self.importers_for_suffix(suffix)
+            if self._check(index, self.filename_checks, "can_load_this_filename", filename)
+        ]
+
+    def needs_header(self, indices):
+        """Whether any of the given importers check the header of the file
+
+        :param indices: Importer indices
+        :type indices: List
+        :rtype: bool
+        """
+        return any(index in self.header_checks for index in indices)
+
+    def filter_by_header(self, indices, header):
+        """Indices of the given importers which can load a file with the given first line
+
+        :param indices: Importer indices
+        :type indices: List
+        :param header: The initial line of text
+        :type header: String
+        :return: List of importer indices
+        :rtype: List
+        """
+        return [
+            index
+            for index in indices
+            if self._check(index, self.header_checks, "can_load_this_header", header)
+        ]
+
+    def _check(self, index, checks, method_name, value):
+        if index not in checks:
+            return True
+        pattern = checks[index]
+        if pattern is None:
+            return getattr(self.importers[index], method_name)(value)
+        return pattern.search(value) is not None
@@ -0,0 +1,388 @@
+import os
+import sys
+import uuid
+from contextlib import contextmanager, redirect_stderr, redirect_stdout
+from io import StringIO
+
+import sqlalchemy
+from prompt_toolkit.application import create_app_session
+from prompt_toolkit.output import create_output
+
+from pepys_import.utils.sqlalchemy_utils import get_primary_key_for_table
+
+
+@contextmanager
+def capture_output():
+    """Captures everything printed to stdout and stderr, including the text printed with
+    prompt_toolkit, while in the context
+
+    :return: Pair of StringIO objects, for the text printed to stdout and to stderr
+    :rtype: tuple
+    """
+    stdout = StringIO()
+    stderr = StringIO()
+    with redirect_stdout(stdout), redirect_stderr(stderr):
+        with create_app_session(output=create_output(stdout=stdout)):
+            yield stdout, stderr
+
+
+def print_captured_output(output):
+    """Prints output captured with capture_output
+
+    :param output: Pair of the text printed to stdout and to stderr
+    :type output: tuple
+    """
+    stdout_text, stderr_text = output
+    sys.stdout.write(stdout_text)
+    sys.stdout.flush()
+    sys.stderr.write(stderr_text)
+    sys.stderr.flush()
+
+
+class StagingSession:
+    """Stands in for the session of a StagingDataStore. The placeholder objects it returns
+    aren't in a session, so there's nothing to expunge."""
+
+    def expunge(self, instance):
+        pass
+
+
+class StagingDataStore:
+    """
+    Stands in for a :class:`DataStore` while a file is parsed in a worker process, where there
+    is no connection to the database and the user can't be asked for any missing details.
+
+    Importers look up platforms, sensors and comment types in the usual way, but each request
+    is recorded and given a placeholder object with a new ID. The requests are made again
+    against the real DataStore, in the same order, when the file is imported in the main
+    process (see :meth:`StagedFile.load`), and the placeholder IDs are replaced by the IDs
+    of the real objects.
+
+    Only the methods below are provided, so an importer which uses any other part of the
+    DataStore gets an AttributeError, and the file is parsed in the main process instead.
+    """
+
+    def __init__(self, db_classes):
+        self.db_classes = db_classes
+        self.session = StagingSession()
+        # The requests made, in order, as (method name, placeholder ID, keyword arguments)
+        self.requests = []
+        # Placeholder objects, keyed by their IDs
+        self.placeholders = dict()
+        # Placeholder objects for requests that always give the same object for the same
+        # arguments, keyed by the method name and arguments
+        self._placeholders_by_request = dict()
+        # Measurements created in the staging Datafile, in order, as (parser name, measurement)
+        self.created_measurements = []
+
+    def _placeholder(self, method_name, arguments, create, repeatable):
+        key = (method_name, tuple(arguments.items()))
+        if repeatable and key in self._placeholders_by_request:
+            return self._placeholders_by_request[key]
+
+        placeholder_id = uuid.uuid4()
+        placeholder = create(placeholder_id)
+        self.requests.append((method_name, placeholder_id, arguments))
+        self.placeholders[placeholder_id] = placeholder
+        if repeatable:
+            self._placeholders_by_request[key] = placeholder
+        return placeholder
+
+    def create_datafile(self):
+        """Creates the Datafile to parse the file into, with a placeholder ID. The order the
+        measurements are created in is kept in created_measurements.
+
+        :return: Datafile with a placeholder ID
+        :rtype: Datafile
+        """
+        datafile = self.db_classes.Datafile(datafile_id=uuid.uuid4())
+        add_measurement_to_dict = datafile.add_measurement_to_dict
+
+        def add_and_keep_order(measurement, parser_name):
+            add_measurement_to_dict(measurement, parser_name)
+            self.created_measurements.append((parser_name, measurement))
+
+        datafile.add_measurement_to_dict = add_and_keep_order
+        return datafile
+
+    def get_platform(
+        self,
+        platform_name=None,
+        identifier=None,
+        nationality=None,
+        platform_type=None,
+        privacy=None,
+        trigraph=None,
+        quadgraph=None,
+        change_id=None,
+        unknown=False,
+    ):
+        """Records a request for :meth:`DataStore.get_platform`
+
+        The placeholder Platform has the requested name. If there isn't a name it's given a
+        unique name, as importers may use the name to look the platform up again, and each
+        of these requests is made again separately.
+
+        :return: Placeholder Platform
+        :rtype: Platform
+        """
+        arguments = dict(
+            platform_name=platform_name,
+            identifier=identifier,
+            nationality=nationality,
+            platform_type=platform_type,
+            privacy=privacy,
+            trigraph=trigraph,
+            quadgraph=quadgraph,
+            unknown=unknown,
+        )
+        return self._placeholder(
+            "get_platform",
+            arguments,
+            lambda placeholder_id: self.db_classes.Platform(
+                platform_id=placeholder_id,
+                name=platform_name if platform_name is not None else str(placeholder_id),
+            ),
+            repeatable=platform_name is not None,
+        )
+
+    def get_sensor(self, platform_id, sensor_name=None, sensor_type=None, change_id=None):
+        """Records a request for :meth:`DataStore.get_sensor`
+
+        :return: Placeholder Sensor
+        :rtype: Sensor
+        """
+        if platform_id not in self.placeholders:
+            raise ValueError(f"Can't get a sensor for platform {platform_id} while staging")
+        arguments = dict(platform_id=platform_id, sensor_name=sensor_name, sensor_type=sensor_type)
+        return self._placeholder(
+            "get_sensor",
+            arguments,
+            lambda placeholder_id: self.db_classes.Sensor(
+                sensor_id=placeholder_id, name=sensor_name, host=platform_id
+            ),
+            repeatable=sensor_name is not None,
+        )
+
+    def add_to_comment_types(self, name, change_id):
+        """Records a request for :meth:`DataStore.add_to_comment_types`
+
+        :return: Placeholder CommentType
+        :rtype: CommentType
+        """
+        return self._placeholder(
+            "add_to_comment_types",
+            dict(name=name),
+            lambda placeholder_id: self.db_classes.CommentType(
+                comment_type_id=placeholder_id, name=name
+            ),
+            repeatable=True,
+        )
+
+
+class StagedFile:
+    """
+    A file that has been parsed (and usually validated) in a worker process, against a
+    :class:`StagingDataStore`. Everything is kept as plain values, so it's quick to send
+    back to the main process, where :meth:`load` creates the measurements in the real Datafile.
+
+    :param data_store: StagingDataStore the file was parsed against
+    :type data_store: StagingDataStore
+    :param datafile: Datafile the file was parsed into
+    :type datafile: Datafile
+    :param importers: Importers that parsed the file
+    :type importers: List
+    :param output: Text printed to stdout and stderr while parsing the file
+    :type output: tuple
+    :param highlighted_path: Path of the highlighted file written for the file, or None
+    :type highlighted_path: String
+    """
+
+    def __init__(self, data_store, datafile, importers, output, highlighted_path):
+        self.requests = data_store.requests
+        self.datafile_id = datafile.datafile_id
+        self.output = output
+        self.highlighted_path = highlighted_path
+        self.importer_errors = [importer.errors for importer in importers]
+        # Output of the validation of each importer's measurements, keyed by importer short
+        # name, for the importers whose measurements passed validation (see validated)
+        self.validation_outputs = dict()
+
+        # Measurements of each importer, as a list of (class name, column values,
+        # placeholder IDs of the related objects) in the order they were created, and the
+        # number of lists they were split into in the Datafile
+        self.measurements = dict()
+        self.list_counts = dict()
+        # Index of each measurement in its importer's list, keyed by id() of the measurement
+        indices = dict()
+        for importer in importers:
+            parser = importer.short_name
+            created = [
+                measurement
+                for parser_name, measurement in data_store.created_measurements
+                if parser_name == parser
+            ]
+            lists = datafile.measurements[parser]
+            if len(created) != sum(len(objects) for objects in lists.values()):
+                raise ValueError(f"Measurements of {parser} weren't all created in the Datafile")
+            rows = []
+            for index, measurement in enumerate(created):
+                rows.append(self._measurement_row(data_store, measurement))
+                indices[id(measurement)] = (parser, index)
+            self.measurements[parser] = rows
+            self.list_counts[parser] = len(lists)
+
+        buffer = datafile.extraction_buffer
+        self.extraction_columns = {
+            column: getattr(buffer, column)[: buffer.assigned_count] for column in buffer.COLUMNS
+        }
+        self.extraction_assignments = [
+            (*indices[id(measurement)], start, stop)
+            for measurement, start, stop in buffer.assignments
+        ]
+
+    @staticmethod
+    def _measurement_row(data_store, measurement):
+        mapper = sqlalchemy.inspect(type(measurement))
+        values = measurement.__dict__
+        columns = {
+            attribute.key: values[attribute.key]
+            for attribute in mapper.column_attrs
+            if attribute.key in values
+        }
+        related = dict()
+        for relationship in mapper.relationships:
+            if relationship.key not in values:
+                continue
+            obj = values[relationship.key]
+            if obj is None:
+                related[relationship.key] = None
+                continue
+            placeholder_id = getattr(obj, get_primary_key_for_table(obj))
+            if data_store.placeholders.get(placeholder_id) is not obj:
+                raise ValueError(f"{relationship.key} of {measurement} isn't a placeholder")
+            related[relationship.key] = placeholder_id
+        return type(measurement).__name__, columns, related
+
+    def _resolve(self, data_store, change_id):
+        """Makes the recorded requests against the real DataStore, in order
+
+        :return: The objects returned, keyed by the placeholder IDs
+        :rtype: dict
+        """
+        resolved = dict()
+        sensors = dict()
+        for method_name, placeholder_id, arguments in self.requests:
+            if method_name == "get_sensor":
+                platform_id = resolved[arguments["platform_id"]].platform_id
+                key = (platform_id, arguments["sensor_name"], arguments["sensor_type"])
+                # Different placeholder platforms may be the same platform
+                obj = sensors.get(key)
+                if obj is None:
+                    obj = data_store.get_sensor(
+                        platform_id,
+                        sensor_name=arguments["sensor_name"],
+                        sensor_type=arguments["sensor_type"],
+                        change_id=change_id,
+                    )
+                    sensors[key] = obj
+            else:
+                obj = getattr(data_store, method_name)(**arguments, change_id=change_id)
+
+            if method_name != "add_to_comment_types":
+                # As in Importer.get_cached_platform and Importer.get_cached_sensor
+                try:
+                    data_store.session.expunge(obj)
+                except sqlalchemy.exc.InvalidRequestError:
+                    pass
+            resolved[placeholder_id] = obj
+        return resolved
+
+    def load(self, data_store, datafile, importers, change_id):
+        """Creates the measurements and extractions parsed in the worker process in the given
+        Datafile, after getting the platforms, sensors and comment types they refer to from
+        the DataStore. The importers' errors are set to those found while parsing.
+
+        :param data_store: DataStore the file is being imported into
+        :type data_store: DataStore
+        :param datafile: Datafile the file is being imported as
+        :type datafile: Datafile
+        :param importers: Importers that parsed the file, in the same order as when it was staged
+        :type importers: List
+        :param change_id: ID of the :class:`Change` object for the import
+        :type change_id: UUID
+        """
+        print_captured_output(self.output)
+
+        resolved = self._resolve(data_store, change_id)
+        real_ids = {
+            placeholder_id: getattr(obj, get_primary_key_for_table(obj))
+            for placeholder_id, obj in resolved.items()
+        }
+        real_ids[self.datafile_id] = datafile.datafile_id
+
+        measurements = dict()
+        for importer, errors in zip(importers, self.importer_errors):
+            importer.errors = errors
+            parser = importer.short_name
+            datafile.measurements[parser] = dict()
+            parser_measurements = []
+            for class_name, columns, related in self.measurements[parser]:
+                values = {
+                    key: real_ids.get(value, value) if isinstance(value, uuid.UUID) else value
+                    for key, value in columns.items()
+                }
+                values.update(
+                    {
+                        key: resolved[placeholder_id] if placeholder_id is not None else None
+                        for key, placeholder_id in related.items()
+                    }
+                )
+                measurement = getattr(data_store.db_classes, class_name)(**values)
+                datafile.add_measurement_to_dict(measurement, parser)
+                parser_measurements.append(measurement)
+            measurements[parser] = parser_measurements
+
+        buffer = datafile.extraction_buffer
+        for column, values in self.extraction_columns.items():
+            getattr(buffer, column).extend(values)
+        buffer.assignments = [
+            (measurements[parser][index], start, stop)
+            for parser, index, start, stop in self.extraction_assignments
+        ]
+        buffer.assigned_count = len(buffer)
+        datafile.current_measurement_object = None
+
+    def validated(self, parser, datafile):
+        """Whether the measurements of the given importer passed validation in the worker
+        process, and would be validated in the same way in the given Datafile. This isn't the
+        case if placeholder platforms turned out to be the same platform, as their
+        measurements are then validated together.
+
+        :param parser: Short name of the importer
+        :type parser: String
+        :param datafile: Datafile the measurements were loaded into
+        :type datafile: Datafile
+        :return: True if the measurements don't need to be validated again
+        :rtype: bool
+        """
+        return (
+            parser in self.validation_outputs
+            and len(datafile.measurements[parser]) == self.list_counts[parser]
+        )
+
+    def save_highlighted_file(self, path):
+        """Moves the highlighted file written in the worker process to the given path"""
+        if self.highlighted_path is not None:
+            os.replace(self.highlighted_path, path)
+            self.highlighted_path = None
+
+    def discard(self):
+        """Removes the highlighted file written in the worker process, if the file
+        isn't going to be imported"""
+        if self.highlighted_path is not None:
+            try:
+                os.remove(self.highlighted_path)
+            except OSError:
+                pass
+            self.highlighted_path = None
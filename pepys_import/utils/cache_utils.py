@@ -0,0 +1,125 @@
+from collections import OrderedDict
+
+from tabulate import tabulate
+
+# Default maximum number of entries in each cache
+DEFAULT_CACHE_SIZE = 10000
+
+
+class LRUCache:
+    """
+    Dictionary-like cache which holds at most `max_size` entries. When a new entry is added to a
+    full cache, the least recently used entry is evicted.
+
+    The number of hits, misses and evictions are counted, so the effectiveness of each cache can
+    be reported (see `statistics`). Only `get` and `[]` lookups are counted as hits or misses:
+    `in` checks don't count, and don't change the order of the entries.
+    """
+
+    def __init__(self, name, max_size=DEFAULT_CACHE_SIZE):
+        """
+        :param name: Name of the cache, used when reporting statistics
+        :type name: String
+        :param max_size: Maximum number of entries. If None or 0 then the size of the cache
+            isn't limited
+        :type max_size: int
+        """
+        if max_size is not None and max_size < 0:
+            raise ValueError(f"Invalid size for cache '{name}': {max_size}")
+        self.name = name
+        self.max_size = max_size or None
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key, default=None):
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def __getitem__(self, key):
+        try:
+            value = self._entries[key]
+        except KeyError:
+            self.misses += 1
+            raise
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def __setitem__(self, key, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        if self.max_size is not None and len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def __delitem__(self, key):
+        del self._entries[key]
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def pop(self, key, default=None):
+        return self._entries.pop(key, default)
+
+    def clear(self):
+        """Removes all the entries from the cache. The statistics are kept."""
+        self._entries.clear()
+
+    def statistics(self):
+        """
+        Returns the statistics for this cache
+
+        :return: Dictionary with the name, current size, maximum size (None if unlimited), and
+            the number of hits, misses and evictions
+        :rtype: Dict
+        """
+        return {
+            "name": self.name,
+            "size": len(self._entries),
+            "max_size": self.max_size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def reset_statistics(self):
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+def report_cache_statistics(statistics):
+    """Produce a pretty-printed report of cache statistics, leaving out caches which haven't
+    been used.
+
+    :param statistics: List of cache statistics, as returned by DataStore.get_cache_statistics
+    :type statistics: List
+    :return: String of text
+    """
+    headers = ["Cache", "Size", "Max size", "Hits", "Misses", "Evictions"]
+    rows = [
+        (
+            stats["name"],
+            stats["size"],
+            "-" if stats["max_size"] is None else stats["max_size"],
+            stats["hits"],
+            stats["misses"],
+            stats["evictions"],
+        )
+        for stats in statistics
+        if stats["size"] or stats["hits"] or stats["misses"]
+    ]
+    if not rows:
+        return "No lookups have been cached\n"
+    return tabulate(rows, headers=headers, tablefmt="grid") + "\n"
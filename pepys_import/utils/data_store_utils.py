@@ -3,6 +3,7 @@ import json
 import os
 import sys
 import uuid
+from functools import wraps
 from inspect import getfullargspec
 from math import ceil
 
@@ -193,7 +194,7 @@ def is_schema_created(engine, db_type):
             return True
     else:
         table_names = inspector.get_table_names(schema="pepys")
-        if len(table_names) == 41:
+        if len(table_names) == 44:
             return True
 
     if len(table_names) == 0:
@@ -226,7 +227,10 @@ def create_spatial_tables_for_postgres(engine):
 def create_stored_procedures_for_postgres(engine):
     stored_procedure_files = [
         os.path.join(STORED_PROC_PATH, "dashboard_metadata.sql"),
+        # The coverage summary tables must exist before dashboard_stats, which uses them
+        os.path.join(STORED_PROC_PATH, "dashboard_coverage.sql"),
         os.path.join(STORED_PROC_PATH, "dashboard_stats.sql"),
+        os.path.join(STORED_PROC_PATH, "dashboard_changes.sql"),
         os.path.join(STORED_PROC_PATH, "Comments_for.sql"),
         os.path.join(STORED_PROC_PATH, "Contacts_for.sql"),
         os.path.join(STORED_PROC_PATH, "Datafiles_for.sql"),
@@ -340,17 +344,26 @@ def create_alembic_version_table(engine, db_type):
 
 
 def cache_results_if_not_none(cache_attribute):
+    """
+    Decorator for DataStore search methods which take a single name (or ID), caching the results
+    which aren't None in the cache held in the given attribute of the DataStore. Cached objects
+    are expunged from the session.
+
+    :param cache_attribute: Name of the DataStore attribute holding the cache
+    :type cache_attribute: String
+    """
+
     def real_decorator(f):
+        @wraps(f)
         def helper(self, name):
-            cache = eval("self." + cache_attribute)
-            if name not in cache:
+            cache = getattr(self, cache_attribute)
+            result = cache.get(name)
+            if result is None:
                 result = f(self, name)
                 if result:
                     self.session.expunge(result)
                     cache[name] = result
-                return result
-            else:
-                return cache[name]
+            return result
 
         return helper
 
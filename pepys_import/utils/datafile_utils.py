@@ -1,19 +1,165 @@
 import hashlib
+import json
+import os
 
-BUFFER_SIZE = 8000000  # 1 MB
+# Number of bytes hashed by versions of Pepys before the whole file was hashed
+BUFFER_SIZE = 8000000  # 8 MB
+# Number of bytes read at a time when hashing a file
+READ_CHUNK_SIZE = 1048576  # 1 MB
 
+HASH_ALGORITHMS = ("md5", "xxhash")
 
-def hash_file(path):
+
+def new_hasher(algorithm="md5"):
+    """
+    Creates a new hash object for the given algorithm
+
+    :param algorithm: Name of the hash algorithm, one of HASH_ALGORITHMS. "md5" is the default, and
+        "xxhash" is a much faster non-cryptographic hash, which needs the xxhash package to be installed
+    :type algorithm: String
+    :return: Hash object, with `update` and `hexdigest` methods
+    """
+    if algorithm == "md5":
+        return hashlib.md5()
+    elif algorithm == "xxhash":
+        try:
+            import xxhash
+        except ImportError:
+            raise ValueError(
+                "The xxhash hash algorithm needs the xxhash package to be installed "
+                "(pip install xxhash)"
+            )
+        # The 128-bit digest is the same length as a MD5 digest, so fits in the Datafiles table
+        return xxhash.xxh3_128()
+    raise ValueError(
+        f"Invalid hash algorithm '{algorithm}'. Must be one of {', '.join(HASH_ALGORITHMS)}"
+    )
+
+
+def hash_file(path, algorithm="md5"):
+    """
+    Hashes the whole file, reading it in chunks so it is never all in memory at once
+
+    :param path: Full path of the file
+    :type path: String
+    :param algorithm: Name of the hash algorithm (see `new_hasher`)
+    :type algorithm: String
+    :return: Hashed value in hexadecimal format
+    :rtype: String
+    """
+    hasher = new_hasher(algorithm)
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(READ_CHUNK_SIZE), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+
+def hash_contents(data, algorithm="md5"):
+    """
+    Hashes the contents of a file in the same way as `hash_file`, for when
+    the file has already been read
+
+    :param data: Contents of the file
+    :type data: bytes
+    :param algorithm: Name of the hash algorithm (see `new_hasher`)
+    :type algorithm: String
+    :return: Hashed value in hexadecimal format
+    :rtype: String
+    """
+    hasher = new_hasher(algorithm)
+    hasher.update(data)
+    return hasher.hexdigest()
+
+
+def hash_file_start(path):
     """
-    Hashes the file using its first megabyte
+    Hashes the first BUFFER_SIZE bytes of the file with MD5, which is how files were hashed by
+    older versions of Pepys. This can be used to recognise files imported by those versions.
 
     :param path: Full path of the file
     :type path: String
     :return: Hashed value in hexadecimal format
     :rtype: String
     """
-    md5 = hashlib.md5()
     with open(path, "rb") as file:
         data = file.read(BUFFER_SIZE)
-        md5.update(data)
-    return md5.hexdigest()
+    return hashlib.md5(data).hexdigest()
+
+
+class HashCache:
+    """
+    Cache of file hashes, stored in a JSON file, so that files which haven't changed since they
+    were last hashed don't need to be read again.
+
+    Each entry is keyed by the full path of the file, and is only used if the modification time
+    and size of the file, and the hash algorithm, are the same as when the hash was stored.
+    """
+
+    def __init__(self, cache_path):
+        """
+        :param cache_path: Path of the JSON file to store the cache in. The file is created
+            when the cache is saved if it doesn't exist.
+        :type cache_path: String
+        """
+        self.cache_path = cache_path
+        self.entries = {}
+        self.changed = False
+
+        if os.path.exists(cache_path):
+            try:
+                with open(cache_path, "r") as file:
+                    self.entries = json.load(file)
+            except (OSError, ValueError):
+                # If the cache can't be read then start again with an empty cache, as all
+                # the hashes can be recalculated
+                self.entries = {}
+
+    def get(self, path, algorithm="md5"):
+        """
+        Gets the hash of the given file, reading the file only if its hash isn't in the cache
+
+        :param path: Full path of the file
+        :type path: String
+        :param algorithm: Name of the hash algorithm (see `new_hasher`)
+        :type algorithm: String
+        :return: Hashed value in hexadecimal format
+        :rtype: String
+        """
+        key = os.path.abspath(path)
+        stat = os.stat(key)
+        entry = self.entries.get(key)
+        if entry is not None and entry[:3] == [stat.st_mtime_ns, stat.st_size, algorithm]:
+            return entry[3]
+
+        file_hash = hash_file(key, algorithm)
+        self.entries[key] = [stat.st_mtime_ns, stat.st_size, algorithm, file_hash]
+        self.changed = True
+        return file_hash
+
+    def set(self, path, file_hash, algorithm="md5"):
+        """
+        Stores a hash that has already been calculated for the given file
+
+        :param path: Full path of the file
+        :type path: String
+        :param file_hash: Hash of the file
+        :type file_hash: String
+        :param algorithm: Name of the hash algorithm the hash was calculated with
+        :type algorithm: String
+        """
+        key = os.path.abspath(path)
+        stat = os.stat(key)
+        self.entries[key] = [stat.st_mtime_ns, stat.st_size, algorithm, file_hash]
+        self.changed = True
+
+    def save(self):
+        """Writes the cache to its JSON file, if anything has changed"""
+        if not self.changed:
+            return
+        # Write to a temporary file and then move it into place, so the cache
+        # file is never left half-written
+        temp_path = self.cache_path + ".tmp"
+        with open(temp_path, "w") as file:
+            json.dump(self.entries, file)
+        os.replace(temp_path, self.cache_path)
+        self.changed = False
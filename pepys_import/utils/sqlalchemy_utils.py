@@ -1,8 +1,14 @@
+import io
 import json
+import struct
 import uuid
+from datetime import date, datetime
 
-from sqlalchemy import func, types
+from geoalchemy2 import Geometry
+from geoalchemy2.elements import WKBElement, WKTElement
+from sqlalchemy import func, inspect, types
 from sqlalchemy.dialects import mssql, postgresql
+from sqlalchemy.orm.attributes import set_committed_value
 
 
 #
@@ -101,6 +107,378 @@ def get_primary_key_for_table(obj):
     return primary_key
 
 
+# Marks that no value has been converted yet in _convert_column
+_NO_VALUE = object()
+
+# Marks a column whose default is given by the database (or a SQL expression), which can't be
+# filled in before the INSERT is run
+_DATABASE_DEFAULT = object()
+
+
+def _column_default(column):
+    """Returns a function giving the default value for the given column, None if the column
+    doesn't have a default, or _DATABASE_DEFAULT if the default can't be calculated in Python"""
+    default = column.default
+    if default is not None and default.is_callable:
+        # SQLAlchemy wraps callable defaults so they take the execution context as an argument
+        return default.arg
+    if default is not None and default.is_scalar:
+        return lambda context, value=default.arg: value
+    if default is not None or column.server_default is not None:
+        return _DATABASE_DEFAULT
+    return None
+
+
+# Defaults for the columns of each table which have them, keyed by table
+_table_defaults_cache = {}
+# Details needed to insert objects of each class with insert_objects, keyed by class
+_insert_details_cache = {}
+
+
+def _table_defaults(table):
+    """Returns a list of (column key, default function) tuples for the columns of the table which
+    have defaults that can be calculated in Python"""
+    defaults = _table_defaults_cache.get(table)
+    if defaults is None:
+        defaults = []
+        for column in table.columns:
+            default = _column_default(column)
+            if default is not None and default is not _DATABASE_DEFAULT:
+                defaults.append((column.key, default))
+        _table_defaults_cache[table] = defaults
+    return defaults
+
+
+def _insert_details(class_):
+    """Returns the table, the primary key attribute name and column key, and a list of
+    (attribute name, column key, default) tuples for the other columns of the given class"""
+    details = _insert_details_cache.get(class_)
+    if details is None:
+        mapper = inspect(class_)
+        table = mapper.local_table
+        primary_key_column = table.primary_key.columns.values()[0]
+        primary_key_attr = mapper.get_property_by_column(primary_key_column).key
+        columns = [
+            (prop.key, prop.columns[0].key, _column_default(prop.columns[0]))
+            for prop in mapper.column_attrs
+            if prop.columns[0] is not primary_key_column
+        ]
+        details = (table, primary_key_attr, primary_key_column.key, columns)
+        _insert_details_cache[class_] = details
+    return details
+
+
+def insert_rows(session, table, rows, use_copy=False):
+    """Inserts rows into a table with a single Core executemany INSERT, or a single
+    COPY if use_copy is True.
+
+    The Python-side defaults of any columns missing from the rows (such as UUID primary keys)
+    are filled in before the INSERT is run, as this is much quicker than SQLAlchemy running
+    the defaults separately for each row.
+
+    :param session: Session to run the INSERT in
+    :type session: sqlalchemy.orm.Session
+    :param table: Table to insert the rows into
+    :type table: sqlalchemy.Table
+    :param rows: List of dicts, keyed by column key, which must all have the same keys
+    :type rows: List
+    :param use_copy: Whether to write the rows with COPY, which is only supported on PostgreSQL
+    :type use_copy: bool
+    """
+    if not rows:
+        return
+    for key, default in _table_defaults(table):
+        if key not in rows[0]:
+            for row in rows:
+                row[key] = default(None)
+    _write_rows(session, table, rows, use_copy)
+
+
+def insert_columns(session, table, columns, use_copy=False):
+    """Inserts rows into a table from lists of the values for each column, with a single
+    executemany INSERT, or a single COPY if use_copy is True.
+
+    This is quicker than insert_rows for large numbers of rows, as no dict is created for each
+    row, and the values are converted for the database by the column types directly, rather
+    than for each row by the Core INSERT. Columns often repeat the same value for many rows in a
+    row (for example, the ID of the object that the rows refer to), so each run of the same
+    value is only converted once.
+
+    The Python-side defaults of primary key columns missing from the columns (such as UUIDs)
+    are generated for each row, and the defaults of other missing columns (such as created
+    dates) are generated once for all the rows.
+
+    :param session: Session to run the INSERT in
+    :type session: sqlalchemy.orm.Session
+    :param table: Table to insert the rows into
+    :type table: sqlalchemy.Table
+    :param columns: Dict of lists of values, keyed by column key. The lists must all be the
+        same length, with one value for each row
+    :type columns: Dict
+    :param use_copy: Whether to write the rows with COPY, which is only supported on PostgreSQL
+    :type use_copy: bool
+    """
+    number_of_rows = len(next(iter(columns.values()), []))
+    if number_of_rows == 0:
+        return
+    columns = dict(columns)
+    for key, default in _table_defaults(table):
+        if key not in columns:
+            if table.c[key].primary_key:
+                columns[key] = [default(None) for _ in range(number_of_rows)]
+            else:
+                columns[key] = [default(None)] * number_of_rows
+
+    if use_copy:
+        copy_columns(session, table, columns)
+        return
+
+    connection = session.connection()
+    dialect = connection.dialect
+    compiled = table.insert().compile(dialect=dialect, column_keys=list(columns))
+    processed = {
+        key: _convert_column(
+            values, table.c[key].type.dialect_impl(dialect).bind_processor(dialect)
+        )
+        for key, values in columns.items()
+    }
+    if compiled.positional:
+        parameters = list(zip(*(processed[key] for key in compiled.positiontup)))
+    else:
+        keys = list(processed)
+        parameters = [dict(zip(keys, values)) for values in zip(*processed.values())]
+    connection.exec_driver_sql(compiled.string, parameters)
+
+
+def _convert_column(values, convert):
+    """Converts each value in the list with the given function. Runs of the same value
+    are only converted once."""
+    if convert is None:
+        return values
+    result = []
+    previous_value = previous_converted = _NO_VALUE
+    for value in values:
+        if value is not previous_value:
+            previous_value = value
+            previous_converted = convert(value)
+        result.append(previous_converted)
+    return result
+
+
+def insert_objects(session, objects, use_copy=False):
+    """Inserts new ORM objects into their tables, with one Core executemany INSERT (or one COPY,
+    if use_copy is True) per table, rather than through bulk_save_objects.
+
+    UUID primary keys are generated here for any objects which don't have one, and are set
+    on the objects, so nothing needs to be fetched back from the database after each INSERT.
+    As with bulk_save_objects, the objects aren't added to the session, and columns which
+    haven't been set on an object are given their default values. Defaults computed in Python
+    are also set on the objects.
+
+    :param session: Session to run the INSERTs in
+    :type session: sqlalchemy.orm.Session
+    :param objects: New objects to insert, which can be of different classes
+    :type objects: List
+    :param use_copy: Whether to write the rows with COPY, which is only supported on PostgreSQL
+    :type use_copy: bool
+    :return: The primary key of each object, in the same order as the objects
+    :rtype: List
+    """
+    primary_keys = []
+    # Rows to insert, keyed by the table and the columns in the rows, as each executemany
+    # INSERT needs the same columns in every row
+    rows_by_insert = {}
+    for obj in objects:
+        table, primary_key_attr, primary_key_column, columns = _insert_details(type(obj))
+        values = obj.__dict__
+
+        primary_key = values.get(primary_key_attr)
+        if primary_key is None:
+            primary_key = uuid.uuid4()
+            # The key is set without recording it as a change, as the object is inserted here
+            set_committed_value(obj, primary_key_attr, primary_key)
+        primary_keys.append(primary_key)
+
+        row = {primary_key_column: primary_key}
+        for attr, column_key, default in columns:
+            value = values.get(attr)
+            if value is None and default is not None:
+                if default is _DATABASE_DEFAULT:
+                    continue
+                value = default(None)
+                # Keep the default on the object too (e.g. created_date), as the ORM would
+                set_committed_value(obj, attr, value)
+            row[column_key] = value
+        rows_by_insert.setdefault((table, tuple(row)), []).append(row)
+
+    for (table, _), rows in rows_by_insert.items():
+        _write_rows(session, table, rows, use_copy)
+    return primary_keys
+
+
+def _write_rows(session, table, rows, use_copy):
+    if use_copy:
+        copy_rows(session, table, rows)
+    else:
+        session.execute(table.insert(), rows)
+
+
+# Characters which must be escaped in the text format used by COPY
+_COPY_ESCAPES = str.maketrans({"\\": "\\\\", "\t": "\\t", "\n": "\\n", "\r": "\\r"})
+
+
+def _encode_text(value):
+    return str(value).translate(_COPY_ESCAPES)
+
+
+# Functions to convert values of each type to the text format used by COPY. Values of any
+# other type are converted to strings with _encode_text
+_COPY_ENCODERS = {
+    str: _encode_text,
+    bool: lambda value: "t" if value else "f",
+    int: str,
+    float: repr,
+    uuid.UUID: str,
+    datetime: datetime.isoformat,
+    date: date.isoformat,
+}
+
+
+def _ewkb_hex(wkb, srid):
+    """Converts Well-Known Binary to hex-encoded Extended Well-Known Binary with the given SRID,
+    if it doesn't already include an SRID"""
+    byte_order = "<" if wkb[0] == 1 else ">"
+    (geometry_type,) = struct.unpack(byte_order + "I", wkb[1:5])
+    if not geometry_type & 0x20000000:
+        wkb = wkb[:1] + struct.pack(byte_order + "II", geometry_type | 0x20000000, srid) + wkb[5:]
+    return wkb.hex()
+
+
+def _encode_geometry(value, srid):
+    """Converts a value for a Geometry column to EWKT or hex-encoded EWKB, which PostGIS
+    accepts as the text of a geometry in COPY"""
+    if isinstance(value, WKBElement):
+        data = value.data
+        wkb = bytes.fromhex(data) if isinstance(data, str) else bytes(data)
+        return _ewkb_hex(wkb, value.srid if value.srid > 0 else srid)
+    if isinstance(value, WKTElement):
+        if value.extended:
+            return value.data
+        return f"SRID={value.srid if value.srid > 0 else srid};{value.data}"
+    value = str(value)
+    if value.upper().startswith("SRID="):
+        return value
+    return f"SRID={srid};{value}"
+
+
+def rows_to_copy_text(table, rows):
+    """Converts rows to the text format read by a PostgreSQL COPY FROM STDIN
+
+    Geometries are written as EWKT (or EWKB), with the SRID of the column added if they
+    don't include one.
+
+    :param table: Table the rows are for
+    :type table: sqlalchemy.Table
+    :param rows: List of dicts, keyed by column key, which must all have the same keys
+    :type rows: List
+    :return: Text of the rows, with one line per row
+    :rtype: String
+    """
+    keys = list(rows[0])
+    geometry_srids = [
+        table.c[key].type.srid if isinstance(table.c[key].type, Geometry) else None for key in keys
+    ]
+
+    lines = []
+    for row in rows:
+        fields = []
+        for key, srid in zip(keys, geometry_srids):
+            fields.append(_encode_copy_value(row[key], srid))
+        lines.append("\t".join(fields))
+    lines.append("")
+    return "\n".join(lines)
+
+
+def _encode_copy_value(value, srid=None):
+    """Converts a value to the text format used by COPY. The SRID must be given for values
+    for Geometry columns."""
+    if value is None:
+        return "\\N"
+    elif srid is not None:
+        return _encode_geometry(value, srid)
+    return _COPY_ENCODERS.get(type(value), _encode_text)(value)
+
+
+def columns_to_copy_text(table, columns):
+    """Converts columns of values to the text format read by a PostgreSQL COPY FROM STDIN, in
+    the same way as rows_to_copy_text
+
+    :param table: Table the values are for
+    :type table: sqlalchemy.Table
+    :param columns: Dict of lists of values, keyed by column key, with one value for each row
+    :type columns: Dict
+    :return: Text of the rows, with one line per row
+    :rtype: String
+    """
+    encoded_columns = []
+    for key, values in columns.items():
+        column_type = table.c[key].type
+        srid = column_type.srid if isinstance(column_type, Geometry) else None
+        encoded_columns.append(
+            _convert_column(values, lambda value: _encode_copy_value(value, srid))
+        )
+    lines = ["\t".join(fields) for fields in zip(*encoded_columns)]
+    lines.append("")
+    return "\n".join(lines)
+
+
+def copy_rows(session, table, rows):
+    """Writes rows to a table with a PostgreSQL COPY FROM STDIN, which is much faster than
+    an INSERT for large numbers of rows.
+
+    The rows are sent in COPY's text format (see rows_to_copy_text). Columns missing from the
+    rows are given their database defaults, so any Python-side defaults must already be filled
+    in (as is done by insert_rows and insert_objects).
+
+    :param session: Session to run the COPY in, which must be connected to PostgreSQL
+    :type session: sqlalchemy.orm.Session
+    :param table: Table to write the rows to
+    :type table: sqlalchemy.Table
+    :param rows: List of dicts, keyed by column key, which must all have the same keys
+    :type rows: List
+    """
+    if not rows:
+        return
+    _copy_text(session, table, list(rows[0]), rows_to_copy_text(table, rows))
+
+
+def copy_columns(session, table, columns):
+    """Writes columns of values to a table with a PostgreSQL COPY FROM STDIN, in the same way as
+    copy_rows
+
+    :param session: Session to run the COPY in, which must be connected to PostgreSQL
+    :type session: sqlalchemy.orm.Session
+    :param table: Table to write the values to
+    :type table: sqlalchemy.Table
+    :param columns: Dict of lists of values, keyed by column key, with one value for each row
+    :type columns: Dict
+    """
+    _copy_text(session, table, list(columns), columns_to_copy_text(table, columns))
+
+
+def _copy_text(session, table, keys, text):
+    connection = session.connection()
+    preparer = connection.dialect.identifier_preparer
+
+    column_names = ", ".join(preparer.quote(table.c[key].name) for key in keys)
+    sql = f"COPY {preparer.format_table(table)} ({column_names}) FROM STDIN"
+    cursor = connection.connection.cursor()
+    try:
+        cursor.copy_expert(sql, io.StringIO(text))
+    finally:
+        cursor.close()
+
+
 def get_lowest_privacy(data_store):
     min_privacy_query = data_store.session.query(func.min(data_store.db_classes.Privacy.level))
 
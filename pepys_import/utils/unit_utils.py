@@ -128,6 +128,99 @@ def convert_distance(distance, units, line_number, errors, error_type):
     return True, distance
 
 
+# Conversion factors used by magnitude_in_units, keyed by the units of the value and the
+# arguments describing what it is converted to. A value of None means the units can't be
+# converted by multiplying by a factor (eg. temperatures), so they are converted by pint each time
+_CONVERSION_FACTORS = dict()
+
+
+def _conversion_factor(value, units, name, dimensionality, angular):
+    """Checks the units of the given Quantity, raising the same errors as the property setters
+    of the measurement classes always have, and returns the factor to convert it to units"""
+    dimensionality_text = dimensionality or "'' (ie. nothing)"
+    if not value.check(dimensionality):
+        raise ValueError(
+            f"{name} must be a Quantity with a dimensionality of {dimensionality_text}"
+        )
+    if angular and not (value.units == unit_registry.degree or value.units == unit_registry.radian):
+        raise ValueError(f"{name} must be a Quantity with angular units (degree or radian)")
+
+    factor = unit_registry.Quantity(1.0, value.units).to(units).magnitude
+    if unit_registry.Quantity(0.0, value.units).to(units).magnitude != 0:
+        return None
+    return factor
+
+
+def magnitude_in_units(value, units, name, dimensionality, angular=False):
+    """
+    Converts the given Quantity to a number in the given units, checking that it has the given
+    dimensionality. This is used by the property setters of the measurement classes (eg. speed
+    and heading on State).
+
+    The checks and the conversion factor are worked out with pint the first time a Quantity
+    with each set of units is given, and are cached, so converting lots of values with the same
+    units (such as a column of values from a file) only does the checks once.
+
+    :param value: Value to convert, or None
+    :type value: Quantity
+    :param units: Units to convert to, as a string (eg. "metre / second")
+    :type units: String
+    :param name: Name of the value, used in error messages
+    :type name: String
+    :param dimensionality: Dimensionality the value must have (eg. "[length]/[time]"),
+        or "" for dimensionless values such as angles
+    :type dimensionality: String
+    :param angular: Whether the value must be in degrees or radians
+    :type angular: bool
+    :return: The magnitude of the value in the given units, or None if value is None
+    :rtype: float
+    """
+    if value is None:
+        return None
+    try:
+        key = (value.units, units, dimensionality, angular)
+    except AttributeError:
+        raise TypeError(f"{name} must be a Quantity")
+
+    try:
+        factor = _CONVERSION_FACTORS[key]
+    except KeyError:
+        try:
+            factor = _conversion_factor(value, units, name, dimensionality, angular)
+        except AttributeError:
+            raise TypeError(f"{name} must be a Quantity")
+        _CONVERSION_FACTORS[key] = factor
+
+    if factor is None:
+        return value.to(units).magnitude
+    return value.magnitude * factor
+
+
+def magnitudes_in_units(values, units, name, dimensionality, angular=False):
+    """
+    Converts a list of Quantities (such as all the speeds read from a file) to numbers in the
+    given units, in the same way as :func:`magnitude_in_units`. The numbers can be given to the
+    measurement classes with their set_raw_values method, which skips the unit checks done
+    by their property setters.
+
+    :param values: Values to convert, which can include None
+    :type values: List
+    :param units: Units to convert to, as a string (eg. "metre / second")
+    :type units: String
+    :param name: Name of the values, used in error messages
+    :type name: String
+    :param dimensionality: Dimensionality the values must have (eg. "[length]/[time]"),
+        or "" for dimensionless values such as angles
+    :type dimensionality: String
+    :param angular: Whether the values must be in degrees or radians
+    :type angular: bool
+    :return: List of the magnitudes of the values in the given units, with None for any
+        values which are None
+    :rtype: List
+    """
+    return [magnitude_in_units(value, units, name, dimensionality, angular) for value in values]
+
+
 def extract_points(location):
     """Convert decimal degrees to radians and return
 
@@ -2,12 +2,18 @@ import traceback
 
 from flask import Blueprint, current_app, render_template, request
 
-from pepys_timeline.db import get_config_options, get_dashboard_metadata, get_dashboard_stats
-from pepys_timeline.utils import make_error_response
+from pepys_timeline.db import (
+    get_config_options,
+    get_dashboard_metadata,
+    get_dashboard_stats_changes,
+    get_dashboard_stats_with_watermark,
+)
+from pepys_timeline.utils import NDJSON_MIMETYPE, make_error_response, make_ndjson_response
 
 api = Blueprint("api", __name__, url_prefix="")
 
 MISSING_PARAMS_MSG = "missing parameter(s)"
+INVALID_PARAMS_MSG = "invalid parameter(s)"
 
 
 @api.app_errorhandler(Exception)
@@ -43,5 +49,28 @@ def dashboard_stats():
         return MISSING_PARAMS_MSG, 400
     serial_participants = data.get("serial_participants")
     range_types = data.get("range_types")
-    stats = get_dashboard_stats(serial_participants, range_types)
-    return {"dashboard_stats": stats}
+    since = data.get("since")
+    # With a watermark from an earlier response, only the stats of the serial participants
+    # which have changed since then are returned, to be merged into the earlier stats
+    if since is None:
+        watermark, stats = get_dashboard_stats_with_watermark(serial_participants, range_types)
+        summary = {"watermark": watermark, "delta": False}
+    else:
+        try:
+            since = int(since)
+        except (TypeError, ValueError):
+            return INVALID_PARAMS_MSG, 400
+        watermark, changed_participants, stats = get_dashboard_stats_changes(
+            serial_participants, range_types, since
+        )
+        summary = {
+            "watermark": watermark,
+            "delta": True,
+            "changed_participants": changed_participants,
+        }
+
+    # Large responses can be streamed, if asked for as newline delimited JSON
+    response_type = request.accept_mimetypes.best_match(["application/json", NDJSON_MIMETYPE])
+    if response_type == NDJSON_MIMETYPE:
+        return make_ndjson_response(summary, stats)
+    return {"dashboard_stats": stats, **summary}
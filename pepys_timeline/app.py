@@ -18,10 +18,12 @@ def create_app(config_path: str = None):
 
 
 def register_extensions(app):
-    from pepys_timeline.extensions import cache_buster, cors
+    from pepys_timeline.extensions import cache_buster, cors, db_pool, query_cache
 
     cors.init_app(app)
     cache_buster.init_app(app)
+    db_pool.init_app(app)
+    query_cache.init_app(app)
 
 
 def register_blueprints(app):
@@ -0,0 +1,106 @@
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from time import monotonic
+
+
+class QueryCache:
+    """Flask extension caching query results for a limited time, keyed by the query and its
+    parameters, so that dashboards polling with the same parameters share one database query.
+
+    Results are kept for QUERY_CACHE_TTL_SECS seconds by default. At most
+    QUERY_CACHE_MAX_ENTRIES results are kept, with the least recently used result evicted first.
+    A time to live of 0 turns caching off. Config options are kept for longer, for
+    CONFIG_OPTIONS_CACHE_SECS seconds, as they rarely change.
+
+    Requests for a key which is already being computed (even with caching turned off) wait for
+    that computation and share its result, rather than running the same query again.
+    """
+
+    def __init__(self, app=None):
+        self.ttl = 10
+        self.config_options_ttl = 300
+        self.max_entries = 1000
+        # Map of key to (expiry time, result)
+        self._entries = OrderedDict()
+        # Map of key to a Future for the result, for the keys being computed
+        self._in_flight = dict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.ttl = app.config.get("QUERY_CACHE_TTL_SECS", self.ttl)
+        self.config_options_ttl = app.config.get(
+            "CONFIG_OPTIONS_CACHE_SECS", self.config_options_ttl
+        )
+        self.max_entries = app.config.get("QUERY_CACHE_MAX_ENTRIES", self.max_entries)
+        self.clear()
+        app.extensions["query_cache"] = self
+
+    def get_or_set(self, key, compute, ttl=None):
+        """Returns the cached result for the key, calling `compute` to get the result (and
+        caching it) if there isn't an unexpired result cached
+
+        :param key: Key for the result, such as the query and its parameters
+        :type key: Hashable
+        :param compute: Function called with no arguments to get the result
+        :type compute: Callable
+        :param ttl: Number of seconds to keep the result for, defaulting to the cache's ttl
+        :type ttl: float
+        :return: The result
+        """
+        if ttl is None:
+            ttl = self.ttl
+
+        now = monotonic()
+        with self._lock:
+            if ttl:
+                entry = self._entries.get(key)
+                if entry is not None and entry[0] > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                self.misses += 1
+            in_flight = self._in_flight.get(key)
+            if in_flight is None:
+                in_flight = self._in_flight[key] = Future()
+                computing = True
+            else:
+                self.coalesced += 1
+                computing = False
+
+        if not computing:
+            return in_flight.result()
+
+        try:
+            result = compute()
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[key]
+            in_flight.set_exception(e)
+            raise
+
+        with self._lock:
+            if ttl:
+                self._entries[key] = (now + ttl, result)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+            del self._in_flight[key]
+        in_flight.set_result(result)
+        return result
+
+    def invalidate(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self):
+        return len(self._entries)
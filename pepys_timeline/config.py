@@ -4,6 +4,30 @@ ROOT_DIR = os.path.dirname(os.path.abspath(__file__))
 STATIC_DIR = os.path.join(ROOT_DIR, "static")
 TEMPLATES_DIR = os.path.join(ROOT_DIR, "templates")
 
+# The server handles connections in one event loop, and runs requests on SERVER_THREADS worker
+# threads. Each thread uses at most one database connection at a time, so SERVER_THREADS should
+# be no more than DB_POOL_MAX_CONNECTIONS. At most SERVER_CONNECTION_LIMIT connections are
+# accepted at once, and connections idle for SERVER_CHANNEL_TIMEOUT_SECS are closed. When run
+# through run_timeline_server.py, the TIMELINE_SERVER_THREADS environment variable overrides
+# SERVER_THREADS.
+SERVER_THREADS = 8
+SERVER_CONNECTION_LIMIT = 100
+SERVER_CHANNEL_TIMEOUT_SECS = 120
+
+# Database connections are shared between requests, with at most DB_POOL_MAX_CONNECTIONS open
+# at once. Requests wait up to DB_POOL_TIMEOUT_SECS for a connection to become free.
+DB_POOL_MIN_CONNECTIONS = 1
+DB_POOL_MAX_CONNECTIONS = 10
+DB_POOL_TIMEOUT_SECS = 30
+
+# Query results are cached for QUERY_CACHE_TTL_SECS, so dashboards refreshing at the same time
+# with the same parameters share one query. Config options rarely change, so are kept for
+# CONFIG_OPTIONS_CACHE_SECS. Set either to 0 to turn that caching off: identical queries which
+# are running at the same time still share one database query.
+QUERY_CACHE_TTL_SECS = 10
+QUERY_CACHE_MAX_ENTRIES = 1000
+CONFIG_OPTIONS_CACHE_SECS = 300
+
 LOG_CONFIG = {
     "version": 1,
     "formatters": {
@@ -6,10 +6,13 @@ from psycopg2.extras import RealDictCursor
 
 import config
 from pepys_timeline.exceptions import DatabaseConnectionError, DatabaseQueryError
+from pepys_timeline.extensions import db_pool, query_cache
 from pepys_timeline.queries import (
     CONFIG_OPTIONS_QUERY,
+    DASHBOARD_CHANGES_QUERY,
     DASHBOARD_METADATA_QUERY,
     DASHBOARD_STATS_QUERY,
+    WATERMARK_QUERY,
 )
 
 
@@ -24,34 +27,105 @@ def get_db_conn_kwargs():
     return db_params
 
 
-def get_query_result(query, vars_=None):
-    db_conn_kwargs = get_db_conn_kwargs()
+def get_query_results(queries):
+    """Runs the queries one after another on the same connection, returning their results
+
+    :param queries: Queries to run, each given as a tuple of the query and its parameters
+    :type queries: List[Tuple[str, Optional[tuple]]]
+    :return: List of the rows returned by each query
+    """
+    results = []
     try:
-        with psycopg2.connect(**db_conn_kwargs) as conn:
+        with db_pool.connection() as conn:
             try:
                 with conn.cursor(cursor_factory=RealDictCursor) as curs:
-                    curs.execute(query, vars_)
-                    result = curs.fetchall()
+                    for query, vars_ in queries:
+                        curs.execute(query, vars_)
+                        results.append(curs.fetchall())
             except psycopg2.Error as e:
                 raise DatabaseQueryError("Error querying database.") from e
     except psycopg2.Error as e:
         raise DatabaseConnectionError("Error connecting to database.") from e
-    return result
+    return results
+
+
+def get_query_result(query, vars_=None):
+    return get_query_results([(query, vars_)])[0]
+
+
+def get_query_result_with_watermark(query, vars_=None):
+    """Returns the database's watermark (see WATERMARK_QUERY) and the result of the query. The
+    watermark is read first, so the result includes all the changes made before it."""
+    watermark_rows, result = get_query_results([(WATERMARK_QUERY, None), (query, vars_)])
+    return watermark_rows[0]["watermark"], result
+
+
+def get_cached_query_result(query, vars_=None, ttl=None):
+    """Returns the result of the query, from the query cache if the same query has been run
+    with the same parameters within the cache's time to live (or the given ttl)"""
+    return query_cache.get_or_set((query, vars_), lambda: get_query_result(query, vars_), ttl)
 
 
 def get_config_options():
-    res = get_query_result(CONFIG_OPTIONS_QUERY)
-    for row in res:
-        if row["name"] == "TimelineRefreshSecs":
-            row["value"] = int(row["value"])
-    return res
+    def load_config_options():
+        res = get_query_result(CONFIG_OPTIONS_QUERY)
+        for row in res:
+            if row["name"] == "TimelineRefreshSecs":
+                row["value"] = int(row["value"])
+        return res
+
+    return query_cache.get_or_set(
+        (CONFIG_OPTIONS_QUERY, None), load_config_options, query_cache.config_options_ttl
+    )
 
 
 def get_dashboard_metadata(from_date: str, to_date: str):
-    return get_query_result(DASHBOARD_METADATA_QUERY, (from_date, to_date))
+    return get_cached_query_result(DASHBOARD_METADATA_QUERY, (from_date, to_date))
 
 
 def get_dashboard_stats(serial_participants: List[Dict], range_types: List[str]):
-    return get_query_result(
-        DASHBOARD_STATS_QUERY, (json.dumps(serial_participants), json.dumps(range_types))
+    return get_dashboard_stats_with_watermark(serial_participants, range_types)[1]
+
+
+def get_dashboard_stats_with_watermark(serial_participants: List[Dict], range_types: List[str]):
+    """Returns the watermark the stats are up to date with, and the stats. These are cached
+    together, so the watermark is never newer than the stats."""
+    # The parameters are serialised with sorted keys, so the same request always gives
+    # the same cache key
+    vars_ = (json.dumps(serial_participants, sort_keys=True), json.dumps(range_types))
+    return query_cache.get_or_set(
+        (DASHBOARD_STATS_QUERY, vars_),
+        lambda: get_query_result_with_watermark(DASHBOARD_STATS_QUERY, vars_),
+    )
+
+
+def get_dashboard_stats_changes(
+    serial_participants: List[Dict], range_types: List[str], since: int
+):
+    """Returns the stats for the serial participants which may have changed since the
+    watermark of an earlier request.
+
+    Serial participants with the same platform and serial are returned together, as their stats
+    can't be told apart.
+
+    :param since: Watermark returned with the stats the dashboard already has
+    :type since: int
+    :return: Tuple of the new watermark, the serial participants which have changed and their
+        stats
+    """
+    vars_ = (json.dumps(serial_participants, sort_keys=True), since)
+    watermark, changes = query_cache.get_or_set(
+        (DASHBOARD_CHANGES_QUERY, vars_),
+        lambda: get_query_result_with_watermark(DASHBOARD_CHANGES_QUERY, vars_),
     )
+
+    def key(participant):
+        return participant["serial_id"], participant["platform_id"]
+
+    changed_keys = {key(serial_participants[row["resp_ser_idx"] - 1]) for row in changes}
+    changed_participants = [p for p in serial_participants if key(p) in changed_keys]
+    if not changed_participants:
+        return watermark, [], []
+
+    stats_watermark, stats = get_dashboard_stats_with_watermark(changed_participants, range_types)
+    return min(watermark, stats_watermark), changed_participants, stats
@@ -1,6 +1,13 @@
 from flask_cachebuster import CacheBuster
 from flask_cors import CORS
 
+from pepys_timeline.cache import QueryCache
+from pepys_timeline.pool import ConnectionPool
+
 cors = CORS()
 
 cache_buster = CacheBuster(config={"extensions": [".js", ".css", ".csv"], "hash_size": 5})
+
+db_pool = ConnectionPool()
+
+query_cache = QueryCache()
@@ -0,0 +1,85 @@
+import threading
+from contextlib import contextmanager
+
+import psycopg2
+from psycopg2.pool import PoolError, ThreadedConnectionPool
+
+from pepys_timeline.exceptions import DatabaseConnectionError
+
+
+class ConnectionPool:
+    """Flask extension holding a bounded pool of database connections, shared by all requests.
+
+    The pool is only created when the first connection is needed, so the app can be created
+    without a database being available. At most DB_POOL_MAX_CONNECTIONS connections are open at
+    once: requests which need a connection when they are all in use wait for up to
+    DB_POOL_TIMEOUT_SECS for one to be returned.
+    """
+
+    def __init__(self, app=None):
+        self.min_connections = 1
+        self.max_connections = 10
+        self.timeout = 30
+        self._pool = None
+        self._slots = None
+        self._lock = threading.Lock()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.close()
+        self.min_connections = app.config.get("DB_POOL_MIN_CONNECTIONS", self.min_connections)
+        self.max_connections = app.config.get("DB_POOL_MAX_CONNECTIONS", self.max_connections)
+        self.timeout = app.config.get("DB_POOL_TIMEOUT_SECS", self.timeout)
+        app.extensions["db_pool"] = self
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                from pepys_timeline.db import get_db_conn_kwargs
+
+                try:
+                    self._pool = ThreadedConnectionPool(
+                        self.min_connections, self.max_connections, **get_db_conn_kwargs()
+                    )
+                except psycopg2.Error as e:
+                    raise DatabaseConnectionError("Error connecting to database.") from e
+                self._slots = threading.BoundedSemaphore(self.max_connections)
+            return self._pool, self._slots
+
+    @contextmanager
+    def connection(self):
+        """Context manager giving a connection from the pool, which is returned to the pool
+        afterwards. Any transaction left open is rolled back, and connections which have been
+        closed or broken are discarded rather than reused.
+        """
+        pool, slots = self._get_pool()
+        if not slots.acquire(timeout=self.timeout):
+            raise DatabaseConnectionError(
+                f"No database connection became free within {self.timeout} seconds."
+            )
+        try:
+            try:
+                conn = pool.getconn()
+            except (psycopg2.Error, PoolError) as e:
+                raise DatabaseConnectionError("Error connecting to database.") from e
+            try:
+                yield conn
+            finally:
+                try:
+                    if not conn.closed:
+                        conn.rollback()
+                    discard = bool(conn.closed)
+                except psycopg2.Error:
+                    discard = True
+                pool.putconn(conn, close=discard)
+        finally:
+            slots.release()
+
+    def close(self):
+        """Closes all the connections in the pool. A new pool is created when next needed."""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.closeall()
+                self._pool = None
+                self._slots = None
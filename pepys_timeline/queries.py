@@ -1,3 +1,7 @@
 CONFIG_OPTIONS_QUERY = """select * from pepys."ConfigOptions";"""
 DASHBOARD_METADATA_QUERY = "select * from pepys.dashboard_metadata(%s, %s);"
 DASHBOARD_STATS_QUERY = "select * from pepys.dashboard_stats(%s, %s);"
+DASHBOARD_CHANGES_QUERY = "select * from pepys.dashboard_changes(%s, %s);"
+# Every transaction with an ID below this had finished when the query ran, so its changes are
+# included in the results of any query run after it
+WATERMARK_QUERY = "select txid_snapshot_xmin(txid_current_snapshot()) as watermark;"
@@ -0,0 +1,46 @@
+from waitress import create_server
+
+
+def create_timeline_server(app, host="0.0.0.0", port=5000):
+    """Creates a server for the timeline app, without starting it.
+
+    Connections are handled by a single event loop, which hands each request to a pool of
+    SERVER_THREADS worker threads, so slow database queries don't hold up other clients. At most
+    SERVER_CONNECTION_LIMIT connections are accepted at once, and idle connections are closed
+    after SERVER_CHANNEL_TIMEOUT_SECS.
+
+    :param app: Timeline Flask app
+    :type app: Flask
+    :param host: Address to listen on
+    :type host: str
+    :param port: Port to listen on, or 0 for any free port
+    :type port: int
+    :return: Server, which starts serving when its run method is called
+    :rtype: waitress.server.BaseWSGIServer
+    """
+    return create_server(
+        app,
+        host=host,
+        port=port,
+        threads=app.config["SERVER_THREADS"],
+        connection_limit=app.config["SERVER_CONNECTION_LIMIT"],
+        channel_timeout=app.config["SERVER_CHANNEL_TIMEOUT_SECS"],
+    )
+
+
+def serve_timeline(app, host="0.0.0.0", port=5000):
+    """Serves the timeline app until interrupted. See :func:`create_timeline_server`.
+
+    :param app: Timeline Flask app
+    :type app: Flask
+    :param host: Address to listen on
+    :type host: str
+    :param port: Port to listen on
+    :type port: int
+    """
+    server = create_timeline_server(app, host=host, port=port)
+    server.print_listen("Serving on http://{}:{}")
+    try:
+        server.run()
+    finally:
+        server.close()
@@ -12,6 +12,7 @@ const DEFAULT_CONFIG = {
   filterSerials: "all"
 };
 const SERVER_ERROR_MESSAGE = "Error connecting to server";
+const NDJSON_CONTENT_TYPE = "application/x-ndjson";
 
 const now = moment();
 const NEWLY_CREATED_STAT_LIMIT = now.diff(moment(now).subtract(15, 'minutes'));
@@ -22,6 +23,10 @@ let charts;
 let chartOptions;
 let serialsMeta;
 let serialsStats;
+// Watermark returned with serialsStats, and the request it was for. Later requests for the same
+// serial participants send the watermark, and only get the stats which have changed since.
+let statsWatermark;
+let statsRequestKey;
 
 const today = new Date();
 const yesterday = new Date();
@@ -125,6 +130,8 @@ function resetState() {
     chartOptions = [];
     serialsMeta = [];
     serialsStats = [];
+    statsWatermark = null;
+    statsRequestKey = null;
 }
 
 
@@ -180,6 +187,7 @@ function beforeRequest() {
 }
 
 function onFetchError(error) {
+  statsWatermark = null;
   hideLoadingSpinner();
   console.error(error);
   setBackendError({message: SERVER_ERROR_MESSAGE, description: error});
@@ -253,6 +261,72 @@ function fetchSerialsMeta() {
       .catch(onFetchError)
 }
 
+function readNdjson(response) {
+  // Parses the lines of a streamed newline delimited JSON response as they arrive
+  const reader = response.body.getReader();
+  const decoder = new TextDecoder();
+  const objects = [];
+  let buffered = "";
+
+  const parseLines = () => {
+    const lines = buffered.split("\n");
+    buffered = lines.pop();
+    lines.filter(line => line.trim()).forEach(line => objects.push(JSON.parse(line)));
+  };
+  const read = () => reader.read().then(({ done, value }) => {
+    if (done) {
+      buffered += decoder.decode() + "\n";
+      parseLines();
+      return objects;
+    }
+    buffered += decoder.decode(value, { stream: true });
+    parseLines();
+    return read();
+  });
+  return read();
+}
+
+function readStatsResponse(response) {
+  // Errors are sent as JSON, and stats as newline delimited JSON: a summary line followed by
+  // a line for each stat
+  const contentType = response.headers.get("Content-Type") || "";
+  if (!contentType.startsWith(NDJSON_CONTENT_TYPE)) {
+    return response.json();
+  }
+  return readNdjson(response).then(([summary, ...stats]) => ({...summary, dashboard_stats: stats}));
+}
+
+function statKey(platformId, serialName) {
+  return `${platformId}|${serialName}`;
+}
+
+function mergeSerialsStats(response) {
+  const {
+    dashboard_stats: dashboardStats,
+    delta,
+    changed_participants: changedParticipants,
+    watermark
+  } = response;
+
+  if (delta) {
+    // Replace the stats of the changed serial participants, keeping the rest
+    const serialNames = Object.fromEntries(
+      serialsMeta.filter(m => m.record_type === "SERIALS").map(s => [s.serial_id, s.name])
+    );
+    const changedKeys = new Set(
+      changedParticipants.map(p => statKey(p.platform_id, serialNames[p.serial_id]))
+    );
+    console.log(`Updating stats for ${changedKeys.size} changed serial participants.`);
+    serialsStats = serialsStats
+      .filter(s => !changedKeys.has(statKey(s.resp_platform_id, s.resp_serial_id)))
+      .concat(dashboardStats);
+  }
+  else {
+    serialsStats = dashboardStats;
+  }
+  statsWatermark = watermark;
+}
+
 function fetchSerialsStats() {
   // TODO: we need to multiple gap_seconds by 5
   const stripParticipant = (  // extract only needed fields
@@ -266,28 +340,40 @@ function fetchSerialsStats() {
     .map(stripParticipant);
   const rangeTypes = ["G", "C"];
 
+  // Only ask for the changes if the stats we have are for the same request
+  const requestKey = JSON.stringify([
+    serialParticipants,
+    rangeTypes,
+    serialsMeta.filter(m => m.record_type === "SERIALS").map(s => [s.serial_id, s.name]),
+  ]);
+  const since = requestKey === statsRequestKey ? statsWatermark : null;
+
   const url = new URL(window.location + "dashboard_stats");
 
   fetch(url, {
     method: "POST",
     headers: {
-      "Content-Type": "application/json"
+      "Content-Type": "application/json",
+      "Accept": `${NDJSON_CONTENT_TYPE}, application/json`
     },
     body: JSON.stringify({
       serial_participants: serialParticipants,
       range_types: rangeTypes,
+      ...(since !== null && {since}),
     })
   })
-    .then(response => response.json())
+    .then(readStatsResponse)
     .then(response => {
-        const { dashboard_stats: dashboardStats, error } = response;
+        const { error } = response;
         if (error) {
           console.log("Error fetching serials: ", error);
+          statsWatermark = null;
           setBackendError(error);
           hideLoadingSpinner();
         }
         else {
-          serialsStats = dashboardStats;
+          mergeSerialsStats(response);
+          statsRequestKey = requestKey;
           renderCharts();
         }
     })
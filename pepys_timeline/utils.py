@@ -1,6 +1,12 @@
 import json
 from datetime import datetime
 
+from flask import Response
+from flask import json as flask_json
+from flask import stream_with_context
+
+NDJSON_MIMETYPE = "application/x-ndjson"
+
 
 class PepysEncoder(json.JSONEncoder):
     def default(self, o):
@@ -11,3 +17,16 @@ class PepysEncoder(json.JSONEncoder):
 
 def make_error_response(message: str, description: str = None, http_status_code: str = 500):
     return {"error": {"message": message, "description": description}}, http_status_code
+
+
+def make_ndjson_response(header: dict, rows: list, batch_size: int = 1000):
+    """Returns a response streaming newline delimited JSON: the header on the first line, and
+    then each of the rows on a line of its own. The rows are serialised and sent in batches, so
+    large results don't have to be held in memory as one JSON document."""
+
+    def generate():
+        yield flask_json.dumps(header) + "\n"
+        for start in range(0, len(rows), batch_size):
+            yield "".join(flask_json.dumps(row) + "\n" for row in rows[start : start + batch_size])
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
@@ -6,6 +6,9 @@ from pepys_timeline.app import create_app
 
 app = create_app()
 
+# Requests run on the reactor's thread pool, sized like the waitress server's worker threads
+reactor.suggestThreadPoolSize(app.config["SERVER_THREADS"])
+
 resource = WSGIResource(reactor, reactor.getThreadPool(), app)
 site = Site(resource)
 reactor.listenTCP(5000, site)
@@ -2,6 +2,8 @@ import os
 
 import config
 from pepys_timeline.app import create_app
+from pepys_timeline.extensions import db_pool
+from pepys_timeline.server import serve_timeline
 
 if __name__ == "__main__":
     # If we've got the DB_XXX env vars configured (eg. on Heroku) then 'monkey-patch'
@@ -14,5 +16,10 @@ if __name__ == "__main__":
     config.DB_PASSWORD = os.environ.get("DB_PASSWORD", config.DB_PASSWORD)
 
     app = create_app()
+    # Each worker thread needs its own database connection, so the pool grows with the threads
+    threads = int(os.environ.get("TIMELINE_SERVER_THREADS", app.config["SERVER_THREADS"]))
+    app.config["SERVER_THREADS"] = threads
+    app.config["DB_POOL_MAX_CONNECTIONS"] = max(threads, app.config["DB_POOL_MAX_CONNECTIONS"])
+    db_pool.init_app(app)
     port = int(os.environ.get("PORT", 5000))
-    app.run(host="0.0.0.0", port=port)
+    serve_timeline(app, host="0.0.0.0", port=port)
@@ -0,0 +1,275 @@
+"""Generators of synthetic data files for each of the bundled importers, which can be scaled to
+any number of rows. They are used by the import benchmark suite (see import_benchmark_suite.py).
+
+Each generator writes `rows` measurements (States, or Comments for JChat) in the layout of the
+sample files in tests/sample_data, for a small number of platforms moving along straight tracks.
+The data is deterministic, so runs with the same number of rows import the same data.
+"""
+import math
+import os
+from datetime import datetime, timedelta
+
+# Number of platforms that the rows are shared between, for formats that can hold more than one
+PLATFORM_COUNT = 4
+PLATFORM_NAMES = ["ALPHA", "BRAVO", "CHARLIE", "DELTA"]
+START_TIME = datetime(2021, 3, 5, 10, 0, 0)
+
+# Semi-major axis and eccentricity squared of the WGS-84 ellipsoid, used to convert positions
+# to the Earth-Centred Earth-Fixed coordinates in EAG files
+WGS84_A = 6378137.0
+WGS84_E2 = 6.69437999014e-3
+
+
+def _track(rows, interval=timedelta(seconds=1), platforms=PLATFORM_COUNT):
+    """Yields (platform index, timestamp, latitude, longitude, course, speed) for each row
+
+    The platforms take it in turns, so every platform has a position at each time step.
+    """
+    for row in range(rows):
+        platform = row % platforms
+        step = row // platforms
+        timestamp = START_TIME + step * interval
+        latitude = 50.0 + platform * 0.5 + step * 0.0001
+        longitude = -5.0 + platform * 0.5 + step * 0.0002
+        course = (45.0 + platform * 10) % 360
+        speed = 5.0 + platform
+        yield platform, timestamp, latitude, longitude, course, speed
+
+
+def _dms(value, degree_digits):
+    """Converts decimal degrees to (degrees, minutes, seconds, hemisphere) strings"""
+    if degree_digits == 2:
+        hemisphere = "N" if value >= 0 else "S"
+    else:
+        hemisphere = "E" if value >= 0 else "W"
+    value = abs(value)
+    degrees = int(value)
+    minutes = int((value - degrees) * 60)
+    seconds = ((value - degrees) * 60 - minutes) * 60
+    return f"{degrees:0{degree_digits}d}", f"{minutes:02d}", f"{seconds:05.2f}", hemisphere
+
+
+def _degrees_minutes(value, degree_digits):
+    """Converts decimal degrees to a DDMM.mmmm string (DDDMM.mmmm for longitudes)
+    and a hemisphere"""
+    if degree_digits == 2:
+        hemisphere = "N" if value >= 0 else "S"
+    else:
+        hemisphere = "E" if value >= 0 else "W"
+    value = abs(value)
+    degrees = int(value)
+    minutes = (value - degrees) * 60
+    return f"{degrees:0{degree_digits}d}{minutes:07.4f}", hemisphere
+
+
+def generate_rep(file, rows):
+    for platform, timestamp, latitude, longitude, course, speed in _track(rows):
+        lat_d, lat_m, lat_s, lat_h = _dms(latitude, 2)
+        lon_d, lon_m, lon_s, lon_h = _dms(longitude, 3)
+        file.write(
+            f"{timestamp:%y%m%d %H%M%S} {PLATFORM_NAMES[platform]} VC "
+            f"{lat_d} {lat_m} {lat_s} {lat_h} {lon_d} {lon_m} {lon_s} {lon_h} "
+            f"{course:.2f} {speed:.2f} 0.00\n"
+        )
+
+
+def generate_nmea(file, rows):
+    # NMEA files only hold a single platform
+    file.write("$POSL,DUMMY,DUMMY DATAFILE TO TEST NMEA IMPORT\n")
+    for _, timestamp, latitude, longitude, course, speed in _track(rows, platforms=1):
+        latitude, lat_h = _degrees_minutes(latitude, 2)
+        longitude, lon_h = _degrees_minutes(longitude, 3)
+        file.write(f"$POSL,DZA,{timestamp:%Y%m%d},{timestamp:%H%M%S}.000,a,b,c,d\n")
+        file.write(f"$POSL,VEL,SPL,a,b,c,{speed:.1f},a,b,c,d\n")
+        file.write(f"$POSL,HDG,{course:.1f},a,b,c,d\n")
+        file.write(f"$POSL,POS,GPS,{latitude},{lat_h},{longitude},{lon_h},a,b,c,d\n")
+
+
+def generate_wecdis(file, rows):
+    # The VER and CHART lines distinguish WECDIS files from general NMEA files
+    file.write("$POSL,DZA,20210305,100000.000,012345678*21\n")
+    file.write("$POSL,CHART,LOAD,A:/File/Path,1234,SOURCE,1,05 Mar 2021, 6 Mar 2021*A01\n")
+    file.write("$POSL,VER,Some text,License,2020 Jun 08, S123*0D\n")
+    file.write("$POSL,VNM,NONSUCH*5C\n")
+    for _, timestamp, latitude, longitude, course, speed in _track(rows, platforms=1):
+        latitude, lat_h = _degrees_minutes(latitude, 2)
+        longitude, lon_h = _degrees_minutes(longitude, 3)
+        file.write(f"$POSL,DZA,{timestamp:%Y%m%d},{timestamp:%H%M%S}.000,012345678*18\n")
+        file.write(f"$POSL,VEL,SPL,,{speed:.1f},,*00\n")
+        file.write(f"$POSL,HDG,{course:.1f},a,b,c,d*CA\n")
+        file.write(
+            f"$POSL,POS,GPS,{latitude},{lat_h},{longitude},{lon_h},10.01,,Some text,N,,,,,*45\n"
+        )
+
+
+def generate_gpx(file, rows):
+    file.write(
+        '<?xml version="1.0" encoding="UTF-8"?>\n'
+        '<p:gpx xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance"\n'
+        '\txsi:schemaLocation="http://www.topografix.com/GPX/1/0 '
+        'http://www.topografix.com/GPX/1/0/gpx.xsd"\n'
+        '\txmlns:p="http://www.topografix.com/GPX/1/0" creator="test" version="1.0">\n'
+    )
+    # GPX files are written one track at a time, so work out each platform's points first
+    points = [[] for _ in range(PLATFORM_COUNT)]
+    for platform, timestamp, latitude, longitude, course, speed in _track(rows):
+        points[platform].append((timestamp, latitude, longitude, course, speed))
+    for platform, platform_points in enumerate(points):
+        if not platform_points:
+            continue
+        file.write(f"\t<p:trk>\n\t\t<p:name>{PLATFORM_NAMES[platform]}</p:name>\n\t\t<p:trkseg>\n")
+        for timestamp, latitude, longitude, course, speed in platform_points:
+            file.write(
+                f'\t\t\t<p:trkpt lat="{latitude:.7f}" lon="{longitude:.7f}">\n'
+                "\t\t\t\t<p:ele>0.000</p:ele>\n"
+                f"\t\t\t\t<p:time>{timestamp:%Y-%m-%dT%H:%M:%S}+00:00</p:time>\n"
+                f"\t\t\t\t<p:course>{course:.1f}</p:course>\n"
+                f"\t\t\t\t<p:speed>{speed:.1f}</p:speed>\n"
+                "\t\t\t</p:trkpt>\n"
+            )
+        file.write("\t\t</p:trkseg>\n\t</p:trk>\n")
+    file.write("</p:gpx>\n")
+
+
+def generate_e_trac(file, rows):
+    file.write(
+        "!Target,MMSI  ,      Date     ,Time    ,    Lng    ,    Lat   ,      SOG  ,COG , Hdg ,"
+        "  Rot ,   Alt , Pass,Nav,PosAcc,Reg,RM,Com,Index,  prev, Name Export:seaPro  "
+        "Date:Fri 05 Mar 21 10:00:00\n"
+    )
+    for platform, timestamp, latitude, longitude, course, speed in _track(rows):
+        file.write(
+            f"4,{143732300 + platform},  {timestamp:%Y/%m/%d},{timestamp:%H:%M:%S},  "
+            f"{latitude:.7f}, {longitude:.7f},{speed:.0f},{course:.0f},511,  -128,0,0,15,"
+            f"  -1,  -1,  -1,56,16250, 16238 {PLATFORM_NAMES[platform]}\n"
+        )
+
+
+def generate_nisida(file, rows):
+    # Nisida timestamps only hold the day and time, so a new UNIT line is needed each month.
+    # Rows are a minute apart, as the timestamps don't include seconds.
+    unit_month = None
+    for _, timestamp, latitude, longitude, course, speed in _track(
+        rows, interval=timedelta(minutes=1), platforms=1
+    ):
+        if (timestamp.year, timestamp.month) != unit_month:
+            unit_month = (timestamp.year, timestamp.month)
+            file.write(f"UNIT/ADRI/{timestamp:%b%y}/SRF/\nPOS/\n".upper())
+        latitude, lat_h = _degrees_minutes(latitude, 2)
+        longitude, lon_h = _degrees_minutes(longitude, 3)
+        file.write(
+            f"{timestamp:%d%H%M}Z/{latitude[:7]}{lat_h}/{longitude[:8]}{lon_h}/GPS/"
+            f"{course:03.0f}/{speed:02.0f}/-/\n"
+        )
+
+
+def generate_link16(file, rows):
+    # The date and hour come from the filename, and the times in the file are MM:SS.s
+    file.write("PPLI,TOD,STN,Slot,TOA usec,TQ,PQ,Long,Lat,AQ, Alt,Hdg,Speed,AI,NPS\n")
+    for platform, timestamp, latitude, longitude, course, speed in _track(rows):
+        time = f"{timestamp:%M:%S}.0"
+        file.write(
+            f"SomeStr,{time},{400 + platform},{time},0.951574339,10,17,"
+            f"{longitude:.9f},{latitude:.9f},7,16,"
+            f"{course:.0f},{speed:.0f},0,1\n"
+        )
+
+
+def generate_eag(file, rows):
+    # Times are milliseconds since the previous Sunday, and positions are ECEF coordinates
+    last_sunday = START_TIME.date() - timedelta(days=(START_TIME.weekday() + 1) % 7)
+    last_sunday = datetime(last_sunday.year, last_sunday.month, last_sunday.day)
+    for platform, name in enumerate(PLATFORM_NAMES):
+        file.write(f"A {platform + 1} 0 0 0 0 {name}\n")
+    for platform, timestamp, latitude, longitude, course, _ in _track(rows):
+        milliseconds = (timestamp - last_sunday).total_seconds() * 1000
+        latitude = math.radians(latitude)
+        longitude = math.radians(longitude)
+        radius = WGS84_A / math.sqrt(1 - WGS84_E2 * math.sin(latitude) ** 2)
+        x = radius * math.cos(latitude) * math.cos(longitude)
+        y = radius * math.cos(latitude) * math.sin(longitude)
+        z = radius * (1 - WGS84_E2) * math.sin(latitude)
+        file.write(
+            f"{milliseconds:.0f}\t{platform + 1}\t123\t456\t{x:.2f}  {y:.2f}       {z:.2f}\t"
+            f"0\t0\t{course:.1f}\t{timestamp:%H:%M:%S}.00\n"
+        )
+
+
+def generate_jchat(file, rows):
+    file.write(
+        "<html>\n<head>\n"
+        '  <style type="text/css">\n'
+        "    <!--\n"
+        "      span.msgcontent { color: #0 }\n"
+        "    -->\n"
+        "  </style>\n"
+        "</head>\n<body>\n"
+    )
+    # JChat timestamps only hold the day and time, and the importer moves on to the next month
+    # when the day goes backwards, so stay within the first 28 days of each month
+    for row, (platform, timestamp, _, _, _, _) in enumerate(_track(rows)):
+        day = (timestamp - START_TIME).days % 28 + 1
+        file.write(
+            f'  <div id="{row}={row}">\n'
+            f"    <tt><font>[{day:02d}{timestamp:%H%M%S}A]</font></tt>"
+            f'<b><a href=""><font>{PLATFORM_NAMES[platform][:4]}_WE</font></a></b>'
+            f'<span class="msgcontent"><font><i>Message number {row}</i></font></span>\n'
+            "  </div>\n"
+        )
+    file.write("</body>\n</html>\n")
+
+
+def generate_aircraft_csv(file, rows):
+    file.write(
+        "Date(Uk),Time(Z),Lat(DD:MM.MM),Long(DDD:MM.MM),Lat(DegN),Long(DegE),Altitude(ft),"
+        "GndSpeed(kts),Course(deg)\n"
+    )
+    # Aircraft CSV files only hold a single platform
+    for _, timestamp, latitude, longitude, course, speed in _track(rows, platforms=1):
+        lat_dm, lat_h = _degrees_minutes(latitude, 2)
+        lon_dm, lon_h = _degrees_minutes(longitude, 3)
+        file.write(
+            f"{timestamp:%d/%m/%Y},{timestamp:%H:%M:%S},"
+            f"{lat_dm[:2]}:{float(lat_dm[2:]):05.2f}{lat_h},"
+            f"{lon_dm[:3]}:{float(lon_dm[3:]):05.2f}{lon_h},{latitude:.5f},{longitude:.5f},1215,"
+            f"{speed * 20:.1f},{course:.0f}\n"
+        )
+
+
+# Map of format name to (filename of the generated file, generator, name of the importer
+# which should load the file). Some importers read details from the filename, so it matters.
+GENERATORS = {
+    "rep": ("bench_track.rep", generate_rep, "Replay File Format Importer"),
+    "nmea": ("bench_nmea.log", generate_nmea, "NMEA File Format Importer"),
+    "gpx": ("bench_track.gpx", generate_gpx, "GPX Format Importer"),
+    "e_trac": ("bench_e_trac.txt", generate_e_trac, "E-Trac Format Importer"),
+    "nisida": ("bench_nisida.txt", generate_nisida, "Nisida Format Importer"),
+    "wecdis": ("bench_wecdis.log", generate_wecdis, "WECDIS File Format Importer"),
+    "link16": (
+        "V1_GEV_05-03-2021T10-00-00.raw-PPLI_201.csv",
+        generate_link16,
+        "Link-16 Format Importer",
+    ),
+    "eag": ("20210305_BENCH.eag.txt", generate_eag, "EAG Format Importer"),
+    "jchat": ("bench_jchat.html", generate_jchat, "JChat Format Importer"),
+    "aircraft_csv": ("bench_aircraft.csv", generate_aircraft_csv, "Aircraft CSV Format Importer"),
+}
+
+
+def generate_file(format_name, folder, rows):
+    """Writes a synthetic data file in the given format
+
+    :param format_name: Name of the format, one of the keys of GENERATORS
+    :type format_name: String
+    :param folder: Folder to write the file to
+    :type folder: String
+    :param rows: Number of measurements to write
+    :type rows: int
+    :return: Full path of the file
+    :rtype: String
+    """
+    filename, generator, _ = GENERATORS[format_name]
+    path = os.path.join(folder, filename)
+    with open(path, "w") as file:
+        generator(file, rows)
+    return path
@@ -0,0 +1,445 @@
+"""Import throughput benchmark suite, covering every bundled importer.
+
+For each format and row count requested, a synthetic file is generated (see data_generators.py)
+and imported into a new database, in a new process, so the peak memory use of each import is
+measured separately. The rows imported per second, the peak resident set size (RSS) of the
+process and the time spent in each phase of the import are reported:
+
+- detection: finding the importers that can load the file, and hashing it
+- parse: running the importers over the file
+- export: writing the highlighted version of the file to the output folder
+- validate: running the validators over the parsed measurements
+- commit: writing the measurements (and extractions) to the database
+- other: everything else, such as creating the datafile and reporting what was imported
+
+The results are appended to a JSON history file, and compared against the previous run with
+the same format, row count and database, so that any drop in throughput is reported.
+
+Run from the root of the repository, for example:
+
+    python -m tests.benchmarks.import_benchmark_suite --formats rep nmea --rows 1000 10000
+
+By default the imports are into SQLite databases. Pass ``--db postgres`` to import into a
+temporary local PostgreSQL server started with testing.postgresql, or also pass
+``--postgres-host`` etc. to use an existing server. The contents of that database are deleted
+before each run, so it should be a database kept for benchmarking.
+"""
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from collections import defaultdict
+from datetime import datetime
+from time import perf_counter
+
+from tabulate import tabulate
+
+from pepys_import import __version__
+from pepys_import.core.store.data_store import DataStore
+from pepys_import.file import file_processor
+from pepys_import.file.file_processor import FileProcessor
+from pepys_import.file.highlighter.highlighter import HighlightedFile
+from pepys_import.file.highlighter.plain_file import PlainFile
+from pepys_import.file.importer import Importer
+from tests.benchmarks.data_generators import GENERATORS, generate_file
+
+try:
+    import resource
+except ImportError:  # pragma: no cover (resource isn't available on Windows)
+    resource = None
+
+FILE_DIR = os.path.dirname(__file__)
+DEFAULT_HISTORY_PATH = os.path.join(FILE_DIR, "import_benchmark_history.json")
+DEFAULT_ROWS = [1000, 10000]
+DEFAULT_REGRESSION_THRESHOLD = 0.1
+PHASES = ["detection", "parse", "export", "validate", "commit", "other"]
+
+POSTGRES_DEFAULTS = {
+    "database": "benchmark",
+    "host": "localhost",
+    "user": "postgres",
+    "password": "postgres",
+    "port": 55528,
+}
+
+
+class PhaseTimer:
+    """Measures the total time spent in functions, grouped by phase.
+
+    Each function is replaced by a wrapper which adds the time taken by each call to the total
+    for its phase, until `restore` is called.
+    """
+
+    def __init__(self):
+        self.times = defaultdict(float)
+        self._originals = []
+
+    def wrap(self, owner, attribute, phase):
+        """
+        :param owner: Class or module that the function is an attribute of
+        :param attribute: Name of the function
+        :type attribute: String
+        :param phase: Name of the phase to add the time taken to
+        :type phase: String
+        """
+        original = getattr(owner, attribute)
+        times = self.times
+
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                times[phase] += perf_counter() - start
+
+        self._originals.append((owner, attribute, original))
+        setattr(owner, attribute, timed)
+
+    def restore(self):
+        for owner, attribute, original in reversed(self._originals):
+            setattr(owner, attribute, original)
+        self._originals = []
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, or None if it can't be measured"""
+    if resource is None:  # pragma: no cover
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS, and in kilobytes elsewhere
+    if sys.platform == "darwin":  # pragma: no cover
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+@contextlib.contextmanager
+def benchmark_data_store(db_type, folder, postgres_options):
+    """Creates an empty database to import into, yielding its DataStore"""
+    postgres = None
+    if db_type == "sqlite":
+        connection = dict(
+            db_username="",
+            db_password="",
+            db_host="",
+            db_port=0,
+            db_name=os.path.join(folder, "benchmark.db"),
+        )
+    elif postgres_options.get("existing"):
+        connection = dict(
+            db_username=postgres_options["user"],
+            db_password=postgres_options["password"],
+            db_host=postgres_options["host"],
+            db_port=postgres_options["port"],
+            db_name=postgres_options["database"],
+        )
+    else:
+        from testing.postgresql import Postgresql
+
+        postgres = Postgresql(
+            database=postgres_options["database"],
+            host=postgres_options["host"],
+            user=postgres_options["user"],
+            password=postgres_options["password"],
+            port=postgres_options["port"],
+        )
+        connection = dict(
+            db_username=postgres_options["user"],
+            db_password=postgres_options["password"],
+            db_host=postgres_options["host"],
+            db_port=postgres_options["port"],
+            db_name=postgres_options["database"],
+        )
+
+    try:
+        data_store = DataStore(**connection, db_type=db_type, welcome_text=None, show_status=False)
+        if db_type == "postgres" and postgres is None:
+            data_store.clear_db_schema()
+        data_store.initialise()
+        yield data_store
+    finally:
+        if postgres is not None:
+            postgres.stop()
+
+
+def count_measurements(data_store):
+    with data_store.session_scope():
+        return sum(
+            data_store.session.query(table).count()
+            for table in (
+                data_store.db_classes.State,
+                data_store.db_classes.Contact,
+                data_store.db_classes.Comment,
+            )
+        )
+
+
+def run_single_benchmark(format_name, rows, db_type, file_path, postgres_options):
+    """Imports the given file into a new database, timing each phase of the import.
+
+    This is run in a new process for each benchmark (see `run_benchmark`), so that the
+    peak RSS is for this import alone.
+
+    :return: Dictionary of results
+    :rtype: Dict
+    """
+    folder = os.path.dirname(file_path)
+    with benchmark_data_store(db_type, folder, postgres_options) as data_store:
+        datafile_class = data_store.db_classes.Datafile
+        timer = PhaseTimer()
+        timer.wrap(file_processor, "detect_importers", "detection")
+        timer.wrap(Importer, "load_this_file", "parse")
+        timer.wrap(HighlightedFile, "export", "export")
+        timer.wrap(PlainFile, "export", "export")
+        timer.wrap(datafile_class, "validate", "validate")
+        timer.wrap(datafile_class, "commit", "commit")
+
+        processor = FileProcessor(archive=False)
+        processor.load_importers_dynamically()
+        try:
+            # The import reports aren't of interest here, so hide them
+            with contextlib.redirect_stdout(io.StringIO()):
+                start = perf_counter()
+                processor.process(file_path, data_store, False)
+                total = perf_counter() - start
+        finally:
+            timer.restore()
+
+        measurements = count_measurements(data_store)
+
+    phases = {phase: timer.times[phase] for phase in PHASES if phase != "other"}
+    phases["other"] = max(total - sum(phases.values()), 0)
+    return {
+        "format": format_name,
+        "rows": rows,
+        "db_type": db_type,
+        "measurements": measurements,
+        "file_size": os.path.getsize(file_path),
+        "total_seconds": total,
+        "rows_per_second": measurements / total if total else None,
+        "peak_rss_mb": peak_rss_mb(),
+        "phases": phases,
+    }
+
+
+def run_benchmark(format_name, rows, db_type, postgres_options):
+    """Generates a file and runs a benchmark of importing it in a new process
+
+    :return: Dictionary of results
+    :rtype: Dict
+    """
+    with tempfile.TemporaryDirectory() as folder:
+        file_path = generate_file(format_name, folder, rows)
+        context = multiprocessing.get_context("spawn")
+        with context.Pool(1) as pool:
+            return pool.apply(
+                run_single_benchmark, (format_name, rows, db_type, file_path, postgres_options)
+            )
+
+
+def load_history(path):
+    if not os.path.exists(path):
+        return []
+    with open(path) as file:
+        return json.load(file)
+
+
+def save_history(path, history):
+    with open(path, "w") as file:
+        json.dump(history, file, indent=2)
+        file.write("\n")
+
+
+def find_regressions(history, results, threshold=DEFAULT_REGRESSION_THRESHOLD):
+    """Compares results against the most recent run in the history with the same format,
+    row count and database type
+
+    :param history: List of previous runs, oldest first
+    :type history: List
+    :param results: List of results from this run
+    :type results: List
+    :param threshold: Fractional drop in rows per second which counts as a regression
+    :type threshold: float
+    :return: List of (result, previous result) tuples for the results which have regressed
+    :rtype: List
+    """
+    regressions = []
+    for result in results:
+        key = (result["format"], result["rows"], result["db_type"])
+        previous = None
+        for run in reversed(history):
+            previous = next(
+                (
+                    previous_result
+                    for previous_result in run["results"]
+                    if (
+                        previous_result["format"],
+                        previous_result["rows"],
+                        previous_result["db_type"],
+                    )
+                    == key
+                ),
+                None,
+            )
+            if previous is not None:
+                break
+        if previous is None or not previous["rows_per_second"] or not result["rows_per_second"]:
+            continue
+        if result["rows_per_second"] < previous["rows_per_second"] * (1 - threshold):
+            regressions.append((result, previous))
+    return regressions
+
+
+def format_results(results):
+    """Produce a pretty-printed table of benchmark results
+
+    :param results: List of results, as returned by run_benchmark
+    :type results: List
+    :return: String of text
+    """
+    headers = ["Format", "DB", "Rows", "Measurements", "Rows/s", "Peak RSS (MB)", "Total (s)"]
+    headers += [f"{phase.capitalize()} (s)" for phase in PHASES]
+    table = [
+        [
+            result["format"],
+            result["db_type"],
+            result["rows"],
+            result["measurements"],
+            f"{result['rows_per_second']:.0f}" if result["rows_per_second"] else "-",
+            f"{result['peak_rss_mb']:.1f}" if result["peak_rss_mb"] is not None else "-",
+            f"{result['total_seconds']:.2f}",
+        ]
+        + [f"{result['phases'][phase]:.2f}" for phase in PHASES]
+        for result in results
+    ]
+    return tabulate(table, headers=headers, tablefmt="grid") + "\n"
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=FILE_DIR,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_arguments(arguments=None):
+    parser = argparse.ArgumentParser(
+        description="Benchmark the import of synthetic files by each of the bundled importers"
+    )
+    parser.add_argument(
+        "--formats",
+        nargs="+",
+        choices=list(GENERATORS),
+        default=list(GENERATORS),
+        help="Formats to benchmark (default: all)",
+    )
+    parser.add_argument(
+        "--rows",
+        nargs="+",
+        type=int,
+        default=DEFAULT_ROWS,
+        help="Number of rows in each generated file (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--db",
+        nargs="+",
+        choices=["sqlite", "postgres"],
+        default=["sqlite"],
+        help="Databases to import into (default: sqlite)",
+    )
+    parser.add_argument(
+        "--history",
+        default=DEFAULT_HISTORY_PATH,
+        help="JSON file that the results are appended to (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--no-history", action="store_true", help="Don't save the results to the history file"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_REGRESSION_THRESHOLD,
+        help="Fractional drop in rows per second reported as a regression (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--fail-on-regression",
+        action="store_true",
+        help="Exit with an error code if any benchmark has regressed",
+    )
+    parser.add_argument(
+        "--postgres-host",
+        help="Host of an existing PostgreSQL server to use, rather than starting a temporary one. "
+        "The contents of the database are deleted before each run",
+    )
+    parser.add_argument("--postgres-port", type=int, default=5432)
+    parser.add_argument("--postgres-user", default=POSTGRES_DEFAULTS["user"])
+    parser.add_argument("--postgres-password", default=POSTGRES_DEFAULTS["password"])
+    parser.add_argument("--postgres-database", default=POSTGRES_DEFAULTS["database"])
+    return parser.parse_args(arguments)
+
+
+def main(arguments=None):
+    args = parse_arguments(arguments)
+
+    if args.postgres_host:
+        postgres_options = {
+            "existing": True,
+            "host": args.postgres_host,
+            "port": args.postgres_port,
+            "user": args.postgres_user,
+            "password": args.postgres_password,
+            "database": args.postgres_database,
+        }
+    else:
+        postgres_options = dict(POSTGRES_DEFAULTS)
+
+    results = []
+    for db_type in args.db:
+        for format_name in args.formats:
+            for rows in args.rows:
+                print(f"Benchmarking {format_name} with {rows} rows on {db_type}")
+                results.append(run_benchmark(format_name, rows, db_type, postgres_options))
+
+    print(format_results(results))
+
+    history = load_history(args.history)
+    regressions = find_regressions(history, results, args.threshold)
+    for result, previous in regressions:
+        print(
+            f"Regression: {result['format']} with {result['rows']} rows on {result['db_type']} "
+            f"imported {result['rows_per_second']:.0f} rows/s, down from "
+            f"{previous['rows_per_second']:.0f} rows/s"
+        )
+
+    if not args.no_history:
+        history.append(
+            {
+                "timestamp": datetime.utcnow().isoformat(timespec="seconds"),
+                "version": __version__,
+                "git_revision": git_revision(),
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "results": results,
+            }
+        )
+        save_history(args.history, history)
+        print(f"Results saved to {args.history}")
+
+    if regressions and args.fail_on_regression:
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,83 @@
+import pytest
+
+from pepys_import.file.file_processor import FileProcessor, detect_importers
+from tests.benchmarks.data_generators import GENERATORS, generate_file
+from tests.benchmarks.import_benchmark_suite import PhaseTimer, find_regressions
+
+
+@pytest.fixture(scope="module")
+def processor():
+    processor = FileProcessor()
+    processor.load_importers_dynamically()
+    return processor
+
+
+@pytest.mark.parametrize("format_name", list(GENERATORS))
+def test_generated_file_detected(processor, tmp_path, format_name):
+    path = generate_file(format_name, str(tmp_path), 20)
+
+    detection = detect_importers(processor.importer_index, path)
+
+    assert detection is not None
+    importer_names = [processor.importers[index].name for index in detection[0]]
+    assert GENERATORS[format_name][2] in importer_names
+
+
+@pytest.mark.parametrize("rows", [0, 1, 7, 100])
+def test_generated_rows(tmp_path, rows):
+    path = generate_file("rep", str(tmp_path), rows)
+    with open(path) as file:
+        lines = file.readlines()
+    assert len(lines) == rows
+    # The rows are shared between several platforms
+    assert len({line.split()[2] for line in lines}) == min(rows, 4)
+
+
+def test_generated_file_deterministic(tmp_path):
+    (tmp_path / "first").mkdir()
+    (tmp_path / "second").mkdir()
+    first = generate_file("nmea", str(tmp_path / "first"), 50)
+    second = generate_file("nmea", str(tmp_path / "second"), 50)
+    with open(first) as first_file, open(second) as second_file:
+        assert first_file.read() == second_file.read()
+
+
+def _result(format_name, rows_per_second, db_type="sqlite"):
+    return {
+        "format": format_name,
+        "rows": 1000,
+        "db_type": db_type,
+        "rows_per_second": rows_per_second,
+    }
+
+
+def test_find_regressions():
+    history = [
+        {"results": [_result("rep", 1000), _result("nmea", 1000)]},
+        {"results": [_result("rep", 2000)]},
+    ]
+    results = [
+        _result("rep", 1900),
+        _result("nmea", 800),
+        _result("gpx", 10),
+        _result("rep", 10, db_type="postgres"),
+    ]
+
+    regressions = find_regressions(history, results, threshold=0.1)
+
+    # Each result is compared against the most recent run with the same format, rows and database
+    assert regressions == [(results[1], history[0]["results"][1])]
+
+
+def test_phase_timer():
+    class Example:
+        def method(self, value):
+            return value * 2
+
+    timer = PhaseTimer()
+    timer.wrap(Example, "method", "parse")
+    assert Example().method(2) == 4
+    assert timer.times["parse"] > 0
+
+    timer.restore()
+    assert Example.method.__name__ == "method"
@@ -0,0 +1,106 @@
+import os
+from re import finditer, search
+
+import pytest
+
+from pepys_import.file.highlighter.highlighter import HighlightedFile
+from pepys_import.file.highlighter.support.line import Line
+from pepys_import.file.highlighter.support.token import SubToken, Token
+from tests.benchmarks.benchmark_utils import running_on_ci
+
+DIR_PATH = os.path.dirname(os.path.abspath(__file__))
+
+NMEA_DELIM = "([^,]+|(?<=,)(?=,)|^(?=,)|(?<=,)$)"
+
+
+def uncached_tokens(line, reg_exp, strip_char="", quoted_name=Line.QUOTED_NAME_REGEX):
+    """Line.tokens as it was before the regular expressions were compiled once and cached,
+    kept as the baseline that the current version is benchmarked against"""
+    tokens_array = []
+
+    for child in line.children:
+        quoted_text_match = search(quoted_name, child.text)
+        start, end = None, None
+        if quoted_text_match:
+            original_name = quoted_text_match.group()
+            start, end = quoted_text_match.span()
+            quoted_sensor_name = original_name[1:-1].strip()
+            subtoken_sensor_name = SubToken((start, end), quoted_sensor_name, int(child.line_start))
+            subtokens_sensor_name = [subtoken_sensor_name]
+
+        for match in finditer(reg_exp, child.text):
+            token_str = match.group()
+            token_start, token_end = match.span()
+            if start and end and token_start >= start and token_end <= end:
+                if token_end == end:
+                    tokens_array.append(Token(subtokens_sensor_name, line.highlighted_file))
+                continue
+
+            if strip_char != "":
+                char_index = token_str.find(strip_char)
+                if char_index == 0:
+                    token_str = token_str[1:]
+                    token_start += 1
+                token_str = token_str.strip()
+
+            subtoken = SubToken((token_start, token_end), token_str, int(child.line_start))
+            tokens_array.append(Token([subtoken], line.highlighted_file))
+
+    return tokens_array
+
+
+TOKENISERS = pytest.mark.parametrize(
+    "tokenise", [Line.tokens, uncached_tokens], ids=["current", "uncached"]
+)
+
+
+def tokenise_lines(lines, tokenise, reg_exp, strip_char, tokens_used):
+    # Access the tokens by index, as the importers do, so the creation of
+    # Token objects is included in the timing
+    for line in lines:
+        tokens = tokenise(line, reg_exp, strip_char)
+        for index in range(min(len(tokens), tokens_used)):
+            tokens[index].text
+
+
+def run_tokeniser_benchmark(
+    benchmark, tokenise, filename, reg_exp, strip_char, time_threshold, tokens_used=100
+):
+    lines = HighlightedFile(os.path.join(DIR_PATH, "benchmark_data", filename)).lines()
+
+    benchmark(tokenise_lines, lines, tokenise, reg_exp, strip_char, tokens_used)
+
+    lines_per_second = len(lines) / benchmark.stats.stats.mean
+    benchmark.extra_info["lines_per_second"] = lines_per_second
+    print(f"Tokenised {filename} with {tokenise.__qualname__} at {lines_per_second:.0f} lines/sec")
+
+    if running_on_ci() and tokenise is Line.tokens:
+        if benchmark.stats.stats.mean > time_threshold:
+            pytest.fail(
+                f"Mean benchmark run time of {benchmark.stats.stats.mean}s exceeded maximum time of {time_threshold}s"
+            )
+
+
+# Each benchmark is run with both the current and the uncached tokeniser, and they are
+# grouped together, so pytest-benchmark reports the speed of one relative to the other
+@TOKENISERS
+@pytest.mark.benchmark(group="whitespace", min_time=0.1, max_time=2.0, min_rounds=5, warmup=False)
+def test_whitespace_tokeniser_benchmark(benchmark, tokenise):
+    run_tokeniser_benchmark(
+        benchmark, tokenise, "bulk_data.rep", Line.WHITESPACE_TOKENISER, "", 1.5
+    )
+
+
+@TOKENISERS
+@pytest.mark.benchmark(group="csv", min_time=0.1, max_time=2.0, min_rounds=5, warmup=False)
+def test_csv_tokeniser_benchmark(benchmark, tokenise):
+    run_tokeniser_benchmark(benchmark, tokenise, "NMEA_out.txt", Line.CSV_TOKENISER, ",", 2.5)
+
+
+@TOKENISERS
+@pytest.mark.benchmark(group="nmea", min_time=0.1, max_time=2.0, min_rounds=5, warmup=False)
+def test_nmea_tokeniser_benchmark(benchmark, tokenise):
+    # NMEA importers only look at the message type, and then at the tokens for that message
+    run_tokeniser_benchmark(
+        benchmark, tokenise, "NMEA_out.txt", NMEA_DELIM, ",", 2.5, tokens_used=4
+    )
@@ -0,0 +1,87 @@
+import random
+
+from pepys_import.file.highlighter.support.char_store import CharStore
+from pepys_import.file.highlighter.support.usages import SingleUsage
+
+
+def create_char_store(text, intervals):
+    char_store = CharStore()
+    char_store.set_text(text)
+    for start, end in intervals:
+        usage_id = char_store.add_usage(SingleUsage("TOOL/FIELD", f"Value:{start}-{end}"))
+        char_store.add_interval(start, end, usage_id)
+    return char_store
+
+
+def test_segments_no_usages():
+    char_store = create_char_store("abcdef", [])
+
+    assert list(char_store.segments()) == [(0, 6, [])]
+
+
+def test_segments_separate_usages():
+    char_store = create_char_store("abcdefghij", [(2, 4), (6, 10)])
+
+    assert list(char_store.segments()) == [
+        (0, 2, []),
+        (2, 4, [0]),
+        (4, 6, []),
+        (6, 10, [1]),
+    ]
+
+
+def test_segments_overlapping_usages():
+    char_store = create_char_store("abcdefghij", [(5, 8), (0, 10), (5, 6)])
+
+    assert list(char_store.segments()) == [
+        (0, 5, [1]),
+        (5, 6, [0, 1, 2]),
+        (6, 8, [0, 1]),
+        (8, 10, [1]),
+    ]
+
+
+def test_segments_usage_shared_between_intervals():
+    char_store = CharStore()
+    char_store.set_text("abcdefghij")
+    usage_id = char_store.add_usage(SingleUsage("TOOL/FIELD", "Value:Combined"))
+    char_store.add_interval(0, 2, usage_id)
+    char_store.add_interval(4, 6, usage_id)
+
+    assert list(char_store.segments()) == [
+        (0, 2, [0]),
+        (2, 4, []),
+        (4, 6, [0]),
+        (6, 10, []),
+    ]
+    assert char_store.usages_for_ids([0])[0].message == "Value:Combined"
+
+
+def test_segments_ignores_empty_intervals():
+    char_store = create_char_store("abcdef", [(3, 3)])
+
+    assert list(char_store.segments()) == [(0, 6, [])]
+
+
+def test_segments_match_usages_of_each_character():
+    random.seed(1234)
+    text = "x" * 200
+    intervals = []
+    for _ in range(60):
+        start = random.randint(0, 199)
+        intervals.append((start, min(200, start + random.randint(1, 15))))
+    char_store = create_char_store(text, intervals)
+
+    expected_usage_ids = [[] for _ in text]
+    for usage_id, (start, end) in enumerate(intervals):
+        for index in range(start, end):
+            expected_usage_ids[index].append(usage_id)
+
+    position = 0
+    for start, end, usage_ids in char_store.segments():
+        assert start == position
+        assert end > start
+        for index in range(start, end):
+            assert usage_ids == expected_usage_ids[index]
+        position = end
+    assert position == len(text)
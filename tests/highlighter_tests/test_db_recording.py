@@ -34,9 +34,10 @@ def test_pending_extractions_generation():
     lines[0].record("Test Importer", "Test Field", "Test Value", "Test Units")
     lines[1].record("Test Importer", "Test Field 2", "Test Value")
 
-    assert len(hf.datafile.pending_extracted_tokens) == 2
+    assert len(hf.datafile.extraction_buffer) == 2
 
-    assert hf.datafile.pending_extracted_tokens[0] == {
+    pending_rows = hf.datafile.extraction_buffer.pending_rows()
+    assert pending_rows[0] == {
         "field": "Test Field",
         "importer": "Test Importer",
         "interpreted_value": "Test Value",
@@ -44,7 +45,7 @@ def test_pending_extractions_generation():
         "text_location": "0-55",
     }
 
-    assert hf.datafile.pending_extracted_tokens[1] == {
+    assert pending_rows[1] == {
         "field": "Test Field 2",
         "importer": "Test Importer",
         "interpreted_value": "Test Value",
@@ -53,7 +54,7 @@ def test_pending_extractions_generation():
     }
 
 
-def test_extraction_into_measurement_object_tokens_dict():
+def test_extraction_assigned_to_measurement_object():
     ds = DataStore("", "", "", 0, ":memory:", db_type="sqlite")
     ds.initialise()
 
@@ -66,27 +67,29 @@ def test_extraction_into_measurement_object_tokens_dict():
     lines[0].record("Test Importer", "Test Field", "Test Value", "Test Units")
     lines[1].record("Test Importer", "Test Field 2", "Test Value")
 
-    hf.datafile.current_measurement_object = "TEST"
+    state = ds.db_classes.State()
+    hf.datafile.current_measurement_object = state
 
     hf.datafile.flush_extracted_tokens()
 
-    assert len(hf.datafile.measurement_object_to_tokens_list) == 1
-    assert hf.datafile.measurement_object_to_tokens_list["TEST"] == [
-        {
-            "field": "Test Field",
-            "importer": "Test Importer",
-            "interpreted_value": "Test Value",
-            "text": "951212 050000.000 MONDEO_44   @C   269.7   10.0      10",
-            "text_location": "0-55",
-        },
-        {
-            "field": "Test Field 2",
-            "importer": "Test Importer",
-            "interpreted_value": "Test Value",
-            "text": "// EVENT 951212 050300.000 BRAVO",
-            "text_location": "56-88",
-        },
-    ]
+    assert hf.datafile.extraction_buffer.pending_count == 0
+    assert hf.datafile.extraction_buffer.assignments == [(state, 0, 2)]
+
+    # The ID of the state is only looked up when the columns are created
+    state.state_id = "TEST"
+    assert hf.datafile.extraction_buffer.columns("DATAFILE") == {
+        "field": ["Test Field", "Test Field 2"],
+        "importer": ["Test Importer", "Test Importer"],
+        "interpreted_value": ["Test Value", "Test Value"],
+        "text": [
+            "951212 050000.000 MONDEO_44   @C   269.7   10.0      10",
+            "// EVENT 951212 050300.000 BRAVO",
+        ],
+        "text_location": ["0-55", "56-88"],
+        "entry_id": ["TEST", "TEST"],
+        "destination_table": ["States", "States"],
+        "datafile_id": ["DATAFILE", "DATAFILE"],
+    }
 
 
 def test_recording_to_database_single_file():
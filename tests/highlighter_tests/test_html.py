@@ -35,3 +35,27 @@ class TestHTML(unittest.TestCase):
 
         assert "<html>" in output_contents
         assert '<body style="font-family: Courier">' in output_contents
+
+    def test_html_spans(self):
+        dataFile = HighlightedFile(DATA_FILE, 1)
+
+        lines = dataFile.lines()
+        tokens = lines[0].tokens()
+        tokens[0].record("Test Name", "Date", "Test Value")
+        lines[0].record("Test Name", "Line", "Test Value")
+
+        output_file = os.path.join(OUTPUT_FOLDER, "test_highlighted.html")
+
+        dataFile.export(output_file, False)
+
+        with open(output_file, "r") as f:
+            output_contents = f.read()
+
+        # The date token has two usages, and the rest of the line has one, so there
+        # should be a span for each, with the text of each run inside a single span
+        assert (
+            "<span title='-Test Name/Date, Value:Test Value&#013;-Test Name/Line, Value:Test Value'"
+            in output_contents
+        )
+        assert ">951212</span><span title='Test Name/Line, Value:Test Value'" in output_contents
+        assert " 050000.000 MONDEO_44   @C   269.7   10.0      10</span>" in output_contents
@@ -55,6 +55,53 @@ class SimpleTest(unittest.TestCase):
         lines = data_file.lines()
         self.assertEqual(len(lines), 7)
 
+    def test_iter_lines_matches_lines(self):
+        data_file = HighlightedFile(DATA_FILE)
+
+        lines = data_file.lines()
+        iterated_lines = list(data_file.iter_lines())
+
+        self.assertEqual(len(lines), len(iterated_lines))
+        for line, iterated_line in zip(lines, iterated_lines):
+            self.assertEqual(line.text, iterated_line.text)
+            self.assertEqual(line.children[0].line_start, iterated_line.children[0].line_start)
+
+    def test_iter_lines_offsets(self):
+        with open(DATA_FILE, "r") as f:
+            file_contents = f.read()
+
+        data_file = HighlightedFile(DATA_FILE)
+
+        for line in data_file.iter_lines():
+            line_start = line.children[0].line_start
+            self.assertEqual(file_contents[line_start : line_start + len(line.text)], line.text)
+
+    def test_iter_lines_from_file_contents(self):
+        with open(DATA_FILE, "rb") as f:
+            file_contents = f.read()
+
+        lines = HighlightedFile(DATA_FILE).lines()
+        lines_from_contents = HighlightedFile(DATA_FILE, file_contents=file_contents).lines()
+
+        self.assertEqual(
+            [(line.text, line.children[0].line_start) for line in lines],
+            [(line.text, line.children[0].line_start) for line in lines_from_contents],
+        )
+
+    def test_iter_lines_is_lazy(self):
+        data_file = HighlightedFile(DATA_FILE)
+
+        iterator = data_file.iter_lines()
+        first_line = next(iterator)
+
+        self.assertEqual(first_line.children[0].line_start, 0)
+        self.assertEqual(len(list(iterator)), 6)
+
+    def test_iter_lines_number_of_lines(self):
+        data_file = HighlightedFile(DATA_FILE, 2)
+
+        self.assertEqual(len(list(data_file.iter_lines())), 2)
+
     def test_zero_number(self):
         with self.assertRaises(SystemExit) as cm:
             data_file = HighlightedFile(DATA_FILE, 0)
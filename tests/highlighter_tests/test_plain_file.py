@@ -0,0 +1,75 @@
+import os
+
+from pepys_import.file.highlighter.highlighter import HighlightedFile
+from pepys_import.file.highlighter.plain_file import PlainFile, PlainToken
+from pepys_import.file.highlighter.support.combine import combine_tokens
+from pepys_import.file.highlighter.support.line import Line
+from pepys_import.file.highlighter.xml_parser import parse
+
+DIR_PATH = os.path.dirname(os.path.abspath(__file__))
+DATA_FILE = os.path.join(DIR_PATH, "sample_files/file.txt")
+COMMA_FILE = os.path.join(DIR_PATH, "sample_files/file_comma.txt")
+GPX_FILE = os.path.join(DIR_PATH, "..", "sample_data", "track_files", "gpx", "gpx_1_0.gpx")
+
+
+def test_plain_lines_match_highlighted_lines():
+    plain_lines = PlainFile(DATA_FILE).lines()
+    highlighted_lines = HighlightedFile(DATA_FILE).lines()
+
+    assert [line.text for line in plain_lines] == [line.text for line in highlighted_lines]
+
+
+def test_plain_tokens_match_highlighted_tokens():
+    for filename, reg_exp, strip_char in [
+        (DATA_FILE, Line.WHITESPACE_TOKENISER, ""),
+        (COMMA_FILE, Line.CSV_TOKENISER, ","),
+    ]:
+        plain_lines = PlainFile(filename).lines()
+        highlighted_lines = HighlightedFile(filename).lines()
+
+        for plain_line, highlighted_line in zip(plain_lines, highlighted_lines):
+            plain_tokens = plain_line.tokens(reg_exp, strip_char)
+            highlighted_tokens = highlighted_line.tokens(reg_exp, strip_char)
+            assert [token.text for token in plain_tokens] == [
+                token.text for token in highlighted_tokens
+            ]
+
+
+def test_plain_tokens_quoted_name():
+    line = PlainFile(DATA_FILE).lines()[0]
+    line.text = '951212 050000.000 "FRIGATE NAME" @C 269.7 10.0 10'
+
+    tokens = line.tokens()
+
+    assert tokens[2] == "FRIGATE NAME"
+    assert len(tokens) == 7
+
+
+def test_plain_tokens_are_strings():
+    tokens = PlainFile(DATA_FILE).lines()[0].tokens()
+
+    assert tokens[0] == "951212"
+    assert tokens[0].text == "951212"
+    assert isinstance(tokens[0], str)
+
+    # Recording does nothing, but mustn't fail
+    tokens[0].record("Tool", "Field", "Value")
+
+
+def test_combine_plain_tokens():
+    tokens = PlainFile(DATA_FILE).lines()[0].tokens()
+
+    combined = combine_tokens(tokens[0], tokens[1])
+
+    assert isinstance(combined, PlainToken)
+    assert combined.text == "951212050000.000"
+    combined.record("Tool", "Field", "Value")
+
+
+def test_record_xml_element_with_plain_file():
+    plain_file = PlainFile(GPX_FILE)
+
+    doc = parse(GPX_FILE, highlighted_file=plain_file)
+    element = doc.getroot()
+
+    assert element.record("Tool", "Field", "Value") is None
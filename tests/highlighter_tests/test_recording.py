@@ -96,6 +96,7 @@ class UsageRecordingTests(unittest.TestCase):
 
         # make another recordd
         first_line.record(tool, field, value, units)
+        first_entry = data_file.chars_debug()[0]
         self.assertEqual(2, len(first_entry.usages))
         second_usage = first_entry.usages[1]
         self.assertTrue(second_usage is not None, "should have a usage")
@@ -164,9 +165,9 @@ class UsageRecordingTests(unittest.TestCase):
 
         tokens[0].record("Test Importer", "Test", "Test")
 
-        # Assert that no initialisation of the chars array took place
+        # Assert that no initialisation of the char store took place
         # and therefore the record calls did nothing
-        assert len(data_file.chars) == 0
+        assert not data_file.char_store.has_text()
 
     def test_setting_no_db_highlighting(self):
         hf = HighlightedFile(DATA_FILE)
@@ -184,7 +185,7 @@ class UsageRecordingTests(unittest.TestCase):
 
         # Assert that no initialisation of the chars array took place
         # and therefore the record calls did nothing
-        assert len(hf.datafile.pending_extracted_tokens) == 0
+        assert len(hf.datafile.extraction_buffer) == 0
 
     def test_setting_with_db_highlighting(self):
         hf = HighlightedFile(DATA_FILE)
@@ -202,7 +203,7 @@ class UsageRecordingTests(unittest.TestCase):
 
         # Assert that no initialisation of the chars array took place
         # and therefore the record calls did nothing
-        assert len(hf.datafile.pending_extracted_tokens) == 2
+        assert len(hf.datafile.extraction_buffer) == 2
 
 
 def test_merge_adjacent_text_locations():
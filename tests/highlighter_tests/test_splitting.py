@@ -1,4 +1,5 @@
 import os
+import re
 import unittest
 
 from pepys_import.file.highlighter.highlighter import HighlightedFile
@@ -82,3 +83,14 @@ class SimpleTests(unittest.TestCase):
         self.assertEqual("951212", tokens[2].text)
         self.assertEqual("050300.000", tokens[3].text)
         self.assertEqual("BRAVO", tokens[4].text)
+
+    def test_tokens_with_compiled_regex(self):
+        data_file = HighlightedFile(DATA_FILE)
+
+        first_line = data_file.lines()[0]
+
+        tokens = first_line.tokens(re.compile(first_line.WHITESPACE_TOKENISER))
+
+        self.assertEqual(
+            [token.text for token in first_line.tokens()], [token.text for token in tokens]
+        )
@@ -0,0 +1,78 @@
+import pytest
+
+from pepys_import.utils.cache_utils import LRUCache, report_cache_statistics
+
+
+def test_least_recently_used_entry_evicted():
+    cache = LRUCache("test", max_size=2)
+    cache["a"] = 1
+    cache["b"] = 2
+    # Using "a" makes "b" the least recently used entry
+    assert cache.get("a") == 1
+    cache["c"] = 3
+
+    assert "a" in cache
+    assert "b" not in cache
+    assert "c" in cache
+    assert len(cache) == 2
+    assert cache.evictions == 1
+
+
+def test_hits_and_misses_counted():
+    cache = LRUCache("test")
+    assert cache.get("a") is None
+    cache["a"] = 1
+    assert cache.get("a") == 1
+    assert cache["a"] == 1
+    with pytest.raises(KeyError):
+        cache["b"]
+    # Checking whether a key is present isn't counted
+    assert "b" not in cache
+
+    assert cache.statistics() == {
+        "name": "test",
+        "size": 1,
+        "max_size": 10000,
+        "hits": 2,
+        "misses": 2,
+        "evictions": 0,
+    }
+
+    cache.reset_statistics()
+    assert cache.hits == cache.misses == 0
+
+
+def test_unlimited_size():
+    cache = LRUCache("test", max_size=0)
+    for i in range(100):
+        cache[i] = i
+
+    assert len(cache) == 100
+    assert cache.evictions == 0
+    assert cache.statistics()["max_size"] is None
+
+
+def test_invalid_size():
+    with pytest.raises(ValueError, match="Invalid size for cache 'test': -1"):
+        LRUCache("test", max_size=-1)
+
+
+def test_clear_keeps_statistics():
+    cache = LRUCache("test")
+    cache["a"] = 1
+    cache.get("a")
+    cache.clear()
+
+    assert len(cache) == 0
+    assert cache.hits == 1
+
+
+def test_report_leaves_out_unused_caches():
+    used_cache = LRUCache("used", max_size=0)
+    used_cache.get("a")
+    unused_cache = LRUCache("unused")
+
+    report = report_cache_statistics([used_cache.statistics(), unused_cache.statistics()])
+    assert "used" in report
+    assert "unused" not in report
+    assert report_cache_statistics([unused_cache.statistics()]) == "No lookups have been cached\n"
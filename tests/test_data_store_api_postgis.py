@@ -10,6 +10,7 @@ from unittest.mock import patch
 import pytest
 from testing.postgresql import Postgresql
 
+from pepys_import.core.formats.location import Location
 from pepys_import.core.store import constants
 from pepys_import.core.store.data_store import DataStore
 from pepys_import.core.store.db_status import TableTypes
@@ -997,6 +998,54 @@ class MeasurementsTestCase(TestCase):
                 comments = self.store.session.query(self.store.db_classes.Comment).all()
                 self.assertEqual(len(comments), 1)
 
+    def test_commit_logs_measurements(self):
+        """Test whether measurements committed with COPY keep their ids and locations, and are
+        logged with those ids"""
+        with self.store.session_scope():
+            states = []
+            for i in range(3):
+                state = self.file.create_state(
+                    self.store,
+                    self.platform,
+                    self.sensor,
+                    self.current_time,
+                    parser_name=self.parser.short_name,
+                )
+                state.location = Location()
+                state.location.set_latitude_decimal_degrees(50 + i)
+                state.location.set_longitude_decimal_degrees(-1)
+                states.append(state)
+            comment = self.file.create_comment(
+                self.store,
+                self.platform,
+                self.current_time,
+                "Comment",
+                self.comment_type,
+                parser_name=self.parser.short_name,
+            )
+
+            if self.file.validate():
+                self.file.commit(self.store, self.change_id)
+
+            db_states = self.store.session.query(self.store.db_classes.State).all()
+            self.assertEqual(
+                {state.state_id for state in db_states}, {state.state_id for state in states}
+            )
+            latitudes = sorted(state.location.latitude for state in db_states)
+            self.assertEqual(latitudes, [50, 51, 52])
+            self.assertTrue(all(state.created_date is not None for state in db_states))
+
+            logs = self.store.session.query(self.store.db_classes.Log).all()
+            self.assertEqual(
+                {
+                    (log.table, log.id)
+                    for log in logs
+                    if log.table in (constants.STATE, constants.COMMENT)
+                },
+                {(constants.STATE, state.state_id) for state in states}
+                | {(constants.COMMENT, comment.comment_id)},
+            )
+
 
 @pytest.mark.postgres
 class FirstConnectionTestCase(TestCase):
@@ -8,6 +8,7 @@ from unittest.mock import patch
 
 import pytest
 
+from pepys_import.core.formats.location import Location
 from pepys_import.core.store import constants
 from pepys_import.core.store.data_store import DataStore
 from pepys_import.core.store.db_status import TableTypes
@@ -51,6 +52,28 @@ class DataStoreCacheTestCase(TestCase):
             # there must be only one entity at the beginning
             self.assertEqual(len(comment_types), 1)
 
+    def test_cache_statistics(self):
+        """Test whether the hits and misses of the search caches are counted, and the caches
+        can be cleared"""
+        with self.store.session_scope():
+            self.store.add_to_privacies("Private", 0, self.change_id)
+            self.store.clear_caches(reset_statistics=True)
+
+            self.store.search_privacy("Private")
+            self.store.search_privacy("Private")
+            self.store.search_privacy("Missing")
+
+        statistics = {stats["name"]: stats for stats in self.store.get_cache_statistics()}
+        self.assertEqual(statistics["search_privacy"]["hits"], 1)
+        self.assertEqual(statistics["search_privacy"]["misses"], 2)
+        self.assertEqual(statistics["search_privacy"]["size"], 1)
+        self.assertEqual(statistics["search_privacy"]["max_size"], self.store.cache_size)
+
+        self.store.clear_caches()
+        statistics = {stats["name"]: stats for stats in self.store.get_cache_statistics()}
+        self.assertEqual(statistics["search_privacy"]["size"], 0)
+        self.assertEqual(statistics["search_privacy"]["hits"], 1)
+
     def test_cached_platform_types(self):
         """Test whether a new platform type entity cached and returned"""
         with self.store.session_scope():
@@ -554,6 +577,73 @@ class PlatformAndDatafileTestCase(TestCase):
             self.assertEqual(platform.platform_id, found_platform.platform_id)
             self.assertEqual(found_platform.name, "Test Platform")
 
+    def test_find_platform_cached_between_sessions(self):
+        """Test whether find_platform uses its cache when the same platform is searched for again,
+        for example when importing the next file"""
+        with self.store.session_scope():
+            platform = self.store.get_platform(
+                platform_name="Test Platform",
+                nationality=self.nationality,
+                identifier="123",
+                platform_type=self.platform_type,
+                privacy=self.privacy,
+                change_id=self.change_id,
+            )
+            self.store.add_to_synonyms(
+                table=constants.PLATFORM,
+                name="TEST",
+                entity=platform.platform_id,
+                change_id=self.change_id,
+            )
+            self.store.find_platform("TEST")
+            self.store.find_platform("Test Platform", self.nationality, "123")
+
+        with self.store.session_scope():
+            with patch.object(self.store, "synonym_search") as synonym_search, patch.object(
+                self.store, "search_platform"
+            ) as search_platform:
+                self.assertEqual(self.store.find_platform("test").platform_id, platform.platform_id)
+                found_platform = self.store.find_platform(
+                    "TEST PLATFORM", self.nationality.upper(), "123"
+                )
+                self.assertEqual(found_platform.platform_id, platform.platform_id)
+            synonym_search.assert_not_called()
+            search_platform.assert_not_called()
+
+    def test_find_platform_cache_cleared_on_merge(self):
+        """Test whether find_platform finds the master platform after platforms are merged"""
+        with self.store.session_scope():
+            platform = self.store.get_platform(
+                platform_name="Platform 1",
+                nationality=self.nationality,
+                identifier="123",
+                platform_type=self.platform_type,
+                privacy=self.privacy,
+                change_id=self.change_id,
+            )
+            master_platform = self.store.get_platform(
+                platform_name="Platform 2",
+                nationality=self.nationality,
+                identifier="123",
+                platform_type=self.platform_type,
+                privacy=self.privacy,
+                change_id=self.change_id,
+            )
+            self.store.add_to_synonyms(
+                table=constants.PLATFORM,
+                name="TEST",
+                entity=platform.platform_id,
+                change_id=self.change_id,
+            )
+            self.assertEqual(self.store.find_platform("TEST").platform_id, platform.platform_id)
+
+            self.store.merge_generic(
+                constants.PLATFORM, [platform.platform_id], master_platform.platform_id
+            )
+
+            self.assertEqual(len(self.store._platform_cache), 0)
+            self.assertIsNone(self.store.find_platform("Platform 1", self.nationality, "123"))
+
 
 class DataStoreStatusTestCase(TestCase):
     def setUp(self):
@@ -846,6 +936,158 @@ class MeasurementsTestCase(TestCase):
                 comments = self.store.session.query(self.store.db_classes.Comment).all()
                 self.assertEqual(len(comments), 1)
 
+    def test_commit_logs_measurements(self):
+        """Test whether committed measurements keep their ids, and are logged with those ids"""
+        with self.store.session_scope():
+            states = []
+            for i in range(3):
+                state = self.file.create_state(
+                    self.store,
+                    self.platform,
+                    self.sensor,
+                    self.current_time,
+                    parser_name=self.parser.short_name,
+                )
+                state.location = Location()
+                state.location.set_latitude_decimal_degrees(50 + i)
+                state.location.set_longitude_decimal_degrees(-1)
+                states.append(state)
+            comment = self.file.create_comment(
+                self.store,
+                self.platform,
+                self.current_time,
+                "Comment",
+                self.comment_type,
+                parser_name=self.parser.short_name,
+            )
+
+            if self.file.validate():
+                self.file.commit(self.store, self.change_id)
+
+            db_states = self.store.session.query(self.store.db_classes.State).all()
+            self.assertEqual(
+                {state.state_id for state in db_states}, {state.state_id for state in states}
+            )
+            latitudes = sorted(state.location.latitude for state in db_states)
+            self.assertEqual(latitudes, [50, 51, 52])
+            self.assertTrue(all(state.created_date is not None for state in db_states))
+
+            logs = self.store.session.query(self.store.db_classes.Log).all()
+            self.assertEqual(
+                {
+                    (log.table, log.id)
+                    for log in logs
+                    if log.table in (constants.STATE, constants.COMMENT)
+                },
+                {(constants.STATE, state.state_id) for state in states}
+                | {(constants.COMMENT, comment.comment_id)},
+            )
+
+    def test_get_measurement_status(self):
+        """Test whether the measurement status of a datafile counts its measurements"""
+        with self.store.session_scope():
+            for _ in range(2):
+                self.file.create_state(
+                    self.store,
+                    self.platform,
+                    self.sensor,
+                    self.current_time,
+                    parser_name=self.parser.short_name,
+                )
+            self.file.create_comment(
+                self.store,
+                self.platform,
+                self.current_time,
+                "Comment",
+                self.comment_type,
+                parser_name=self.parser.short_name,
+            )
+            if self.file.validate():
+                self.file.commit(self.store, self.change_id)
+
+            status = self.file.get_measurement_status(self.store)
+            summaries = {summary.table_name: summary for summary in status.table_summaries}
+            self.assertEqual(summaries[constants.STATE].number_of_rows, 2)
+            self.assertEqual(summaries[constants.COMMENT].number_of_rows, 1)
+            self.assertEqual(summaries[constants.CONTACT].number_of_rows, 0)
+            last_state = (
+                self.store.session.query(self.store.db_classes.State)
+                .order_by(self.store.db_classes.State.created_date.desc())
+                .first()
+            )
+            self.assertEqual(summaries[constants.STATE].created_date, str(last_state.created_date))
+
+
+class RemoveLoggedRowsTestCase(TestCase):
+    def setUp(self):
+        self.store = DataStore("", "", "", 0, ":memory:", db_type="sqlite")
+        self.store.initialise()
+        with self.store.session_scope():
+            self.change_id = self.store.add_to_changes("TEST", datetime.utcnow(), "TEST").change_id
+            self.store.add_to_nationalities("UK", self.change_id)
+            self.store.add_to_platform_types("Naval - frigate", self.change_id)
+            self.store.add_to_sensor_types("GPS", self.change_id)
+            self.store.add_to_privacies("Public", 0, self.change_id)
+            self.existing_platform = self.store.add_to_platforms(
+                "Existing", "123", "UK", "Naval - frigate", "Public", change_id=self.change_id
+            )
+
+    def test_remove_logged_metadata(self):
+        """Test whether the platforms and sensors added under a change are removed, along with
+        their Logs entries, leaving everything else"""
+        Log = self.store.db_classes.Log
+        Platform = self.store.db_classes.Platform
+        Sensor = self.store.db_classes.Sensor
+        with self.store.session_scope():
+            import_change_id = self.store.add_to_changes(
+                "TEST", datetime.utcnow(), "Import"
+            ).change_id
+            for i in range(3):
+                platform = self.store.add_to_platforms(
+                    f"Platform {i}", str(i), "UK", "Naval - frigate", "Public", import_change_id
+                )
+                platform.get_sensor(
+                    self.store,
+                    sensor_name="GPS",
+                    sensor_type="GPS",
+                    privacy="Public",
+                    change_id=import_change_id,
+                )
+            # A sensor added to an existing platform
+            self.existing_platform.get_sensor(
+                self.store,
+                sensor_name="GPS",
+                sensor_type="GPS",
+                privacy="Public",
+                change_id=import_change_id,
+            )
+            self.store.session.commit()
+
+            self.store.remove_logged_rows(import_change_id, TableTypes.METADATA)
+            self.store.session.commit()
+
+            platforms = self.store.session.query(Platform).all()
+            self.assertEqual([platform.name for platform in platforms], ["Existing"])
+            self.assertEqual(self.store.session.query(Sensor).count(), 0)
+            self.assertEqual(
+                self.store.session.query(Log).filter(Log.change_id == import_change_id).count(), 0
+            )
+            self.assertGreater(
+                self.store.session.query(Log).filter(Log.change_id == self.change_id).count(), 0
+            )
+
+    def test_remove_logs_only(self):
+        """Test whether only the Logs entries are removed when delete_rows is False"""
+        Log = self.store.db_classes.Log
+        Platform = self.store.db_classes.Platform
+        with self.store.session_scope():
+            self.store.remove_logged_rows(self.change_id, TableTypes.METADATA, delete_rows=False)
+
+            self.assertEqual(self.store.session.query(Platform).count(), 1)
+            self.assertEqual(
+                self.store.session.query(Log).filter(Log.change_id == self.change_id).count(), 0
+            )
+
 
 class SynonymsTestCase(TestCase):
     def setUp(self):
@@ -64,7 +64,7 @@ class DataStoreInitialisePostGISTestCase(TestCase):
         schema_names = inspector.get_schema_names()
 
         # 35 tables + alembic_version table must be created to default schema
-        self.assertEqual(len(table_names), 41)
+        self.assertEqual(len(table_names), 44)
         self.assertIn("Platforms", table_names)
         self.assertIn("States", table_names)
         self.assertIn("Datafiles", table_names)
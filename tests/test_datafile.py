@@ -3,6 +3,7 @@ import shutil
 import unittest
 from contextlib import redirect_stdout
 from io import StringIO
+from unittest.mock import patch
 
 from importers.replay_importer import ReplayImporter
 from pepys_import.core.store.data_store import DataStore
@@ -87,6 +88,49 @@ class DuplicatedFilesTestCase(unittest.TestCase):
         # Delete the copy file
         os.remove(copied_file_path)
 
+    def test_importing_loaded_file_skips_detection(self):
+        """Test that files which have already been loaded are skipped
+        before the importers are checked against them"""
+        self.processor.process(REP_FILE_PATH, self.store, False)
+
+        temp_output = StringIO()
+        with patch("pepys_import.file.file_processor.detect_importers") as detect_importers:
+            with redirect_stdout(temp_output):
+                self.processor.process(REP_FILE_PATH, self.store, False)
+
+        detect_importers.assert_not_called()
+        assert "'rep_test1.rep' was already loaded" in temp_output.getvalue()
+
+    def _process_copies_in_one_folder(self, processor):
+        temp_folder = os.path.join(CURRENT_DIR, "duplicated_files_test")
+        os.makedirs(temp_folder, exist_ok=True)
+        shutil.copyfile(REP_FILE_PATH, os.path.join(temp_folder, "rep_test1.rep"))
+        shutil.copyfile(REP_FILE_PATH, os.path.join(temp_folder, "rep_test1_copy.rep"))
+
+        temp_output = StringIO()
+        with redirect_stdout(temp_output):
+            processor.process(temp_folder, self.store, False)
+        shutil.rmtree(temp_folder)
+        return temp_output.getvalue()
+
+    def test_importing_copies_of_file_in_one_folder(self):
+        """Test that a copy of a file is skipped when it is in the same folder
+        as the original, so both files are processed in the same run"""
+        output = self._process_copies_in_one_folder(self.processor)
+
+        assert "Files got processed: 1 times" in output
+        assert "'rep_test1.rep' was already loaded" in output
+
+    def test_importing_copies_of_file_in_one_folder_with_workers(self):
+        """Test that a copy of a file in the same folder as the original is also skipped
+        when both files are checked by the workers before either is imported"""
+        processor = FileProcessor(workers=2)
+        processor.register_importer(ReplayImporter())
+        output = self._process_copies_in_one_folder(processor)
+
+        assert "Files got processed: 1 times" in output
+        assert "'rep_test1.rep' was already loaded" in output
+
     def test_importing_modified_file(self):
         """Test whether process method imports the datafile when some lines removed from it"""
         copied_file_path = os.path.join(REP_DATA_PATH, "modified_rep_test1.rep")
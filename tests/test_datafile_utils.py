@@ -0,0 +1,117 @@
+import hashlib
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from pepys_import.utils.datafile_utils import (
+    BUFFER_SIZE,
+    HashCache,
+    hash_contents,
+    hash_file,
+    hash_file_start,
+    new_hasher,
+)
+
+DIRECTORY_PATH = os.path.dirname(__file__)
+REP_FILE_PATH = os.path.join(
+    DIRECTORY_PATH, "sample_data", "track_files", "rep_data", "rep_test1.rep"
+)
+
+
+def write_large_file(path, tail):
+    with open(path, "wb") as file:
+        file.write(b"x" * BUFFER_SIZE)
+        file.write(tail)
+
+
+def test_hash_file_is_md5_of_whole_file():
+    with open(REP_FILE_PATH, "rb") as file:
+        contents = file.read()
+
+    assert hash_file(REP_FILE_PATH) == hashlib.md5(contents).hexdigest()
+    assert hash_contents(contents) == hash_file(REP_FILE_PATH)
+
+
+def test_hash_file_same_as_hash_file_start_for_small_files():
+    assert hash_file(REP_FILE_PATH) == hash_file_start(REP_FILE_PATH)
+
+
+def test_hash_file_includes_end_of_large_file(tmp_path):
+    first_path = os.path.join(tmp_path, "first.txt")
+    second_path = os.path.join(tmp_path, "second.txt")
+    write_large_file(first_path, b"end of first file")
+    write_large_file(second_path, b"end of other file")
+
+    # The files only differ after the first BUFFER_SIZE bytes
+    assert hash_file_start(first_path) == hash_file_start(second_path)
+    assert hash_file(first_path) != hash_file(second_path)
+
+
+def test_invalid_hash_algorithm():
+    with pytest.raises(ValueError, match="Invalid hash algorithm 'sha1'"):
+        new_hasher("sha1")
+
+
+def test_xxhash_algorithm():
+    xxhash = pytest.importorskip("xxhash")
+
+    file_hash = hash_file(REP_FILE_PATH, "xxhash")
+
+    with open(REP_FILE_PATH, "rb") as file:
+        assert file_hash == xxhash.xxh3_128(file.read()).hexdigest()
+    assert len(file_hash) == 32
+    assert file_hash != hash_file(REP_FILE_PATH)
+
+
+class TestHashCache:
+    def test_unchanged_file_not_read_again(self, tmp_path):
+        cache_path = os.path.join(tmp_path, "hashes.json")
+        cache = HashCache(cache_path)
+        file_hash = cache.get(REP_FILE_PATH)
+        cache.save()
+
+        # Load the cache again, as would happen the next time files are imported
+        cache = HashCache(cache_path)
+        with patch("pepys_import.utils.datafile_utils.hash_file") as patched_hash_file:
+            assert cache.get(REP_FILE_PATH) == file_hash
+        patched_hash_file.assert_not_called()
+
+    def test_changed_file_hashed_again(self, tmp_path):
+        data_path = os.path.join(tmp_path, "data.txt")
+        with open(data_path, "w") as file:
+            file.write("first contents")
+
+        cache = HashCache(os.path.join(tmp_path, "hashes.json"))
+        first_hash = cache.get(data_path)
+
+        with open(data_path, "w") as file:
+            file.write("second contents, which are longer")
+
+        assert cache.get(data_path) != first_hash
+        assert cache.get(data_path) == hash_file(data_path)
+
+    def test_different_algorithm_hashed_again(self, tmp_path):
+        cache = HashCache(os.path.join(tmp_path, "hashes.json"))
+        cache.set(REP_FILE_PATH, "made up hash", "xxhash")
+
+        assert cache.get(REP_FILE_PATH, "md5") == hash_file(REP_FILE_PATH)
+
+    def test_set_hash(self, tmp_path):
+        cache = HashCache(os.path.join(tmp_path, "hashes.json"))
+        cache.set(REP_FILE_PATH, "stored hash")
+
+        assert cache.get(REP_FILE_PATH) == "stored hash"
+
+    def test_invalid_cache_file_ignored(self, tmp_path):
+        cache_path = os.path.join(tmp_path, "hashes.json")
+        with open(cache_path, "w") as file:
+            file.write("not json")
+
+        cache = HashCache(cache_path)
+        assert cache.get(REP_FILE_PATH) == hash_file(REP_FILE_PATH)
+        cache.save()
+
+        with open(cache_path) as file:
+            assert os.path.abspath(REP_FILE_PATH) in json.load(file)
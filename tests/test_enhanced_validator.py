@@ -1,10 +1,11 @@
 import unittest
 from contextlib import redirect_stdout
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 from io import StringIO
 
 from pepys_import.core.formats import unit_registry
 from pepys_import.core.formats.location import Location
+from pepys_import.core.store import sqlite_db
 from pepys_import.core.store.data_store import DataStore
 from pepys_import.core.validators import constants
 from pepys_import.core.validators.enhanced_validator import EnhancedValidator
@@ -269,5 +270,140 @@ class EnhancedValidatorTestCase(unittest.TestCase):
         )
 
 
+class ValidateTrackTestCase(unittest.TestCase):
+    def setUp(self):
+        self.platform = sqlite_db.Platform(name="Test Platform")
+        self.other_platform = sqlite_db.Platform(name="Other Platform")
+        self.sensor = sqlite_db.Sensor(name="gps")
+        self.start_time = datetime(2021, 1, 1)
+
+    def create_state(self, platform, seconds, latitude=None, longitude=None, **values):
+        state = sqlite_db.State(
+            time=self.start_time + timedelta(seconds=seconds),
+            sensor=self.sensor,
+            platform=platform,
+        )
+        if latitude is not None:
+            location = Location()
+            location.set_latitude_decimal_degrees(latitude)
+            location.set_longitude_decimal_degrees(longitude)
+            state.location = location
+        for name, value in values.items():
+            setattr(state, name, value)
+        return state
+
+    def validate_each(self, objects):
+        ev = EnhancedValidator()
+        object_errors = {}
+        prev_objects = {}
+        for index, current_object in enumerate(objects):
+            errors = []
+            prev_object = prev_objects.get(current_object.platform_name)
+            if not ev.validate(current_object, errors, "Test Parser", prev_object):
+                object_errors[index] = errors
+            prev_objects[current_object.platform_name] = current_object
+        return object_errors
+
+    def test_same_errors_as_validate(self):
+        knots = unit_registry.knot
+        degree = unit_registry.degree
+        objects = [
+            self.create_state(self.platform, 0, 50, -1, heading=0 * degree, speed=5 * knots),
+            # Moving north at about 5 knots, on the right heading
+            self.create_state(self.platform, 60, 50.0025, -1, heading=1 * degree, speed=5 * knots),
+            # The other platform's states are checked against each other, not the platform's
+            self.create_state(self.other_platform, 70, 10, 10, course=90 * degree),
+            # Heading and course far from the bearing, and speed far too high
+            self.create_state(
+                self.platform,
+                120,
+                50.005,
+                -1,
+                heading=180 * degree,
+                course=200 * degree,
+                speed=200 * knots,
+            ),
+            sqlite_db.Comment(time=self.start_time, platform=self.platform),
+            # Not checked, as the previous object for the platform has no location
+            self.create_state(self.platform, 180, 60, 10, heading=180 * degree),
+            self.create_state(self.other_platform, 130, 10, 10.01, course=270 * degree),
+            # Not checked, as both course and speed are zero
+            self.create_state(
+                self.other_platform,
+                140,
+                20,
+                20,
+                course=0 * degree,
+                speed=0 * knots,
+            ),
+            # Doesn't move, but has a speed
+            self.create_state(self.other_platform, 150, 20, 20, speed=1 * knots),
+        ]
+
+        with redirect_stdout(StringIO()):
+            track_errors = EnhancedValidator().validate_track(objects, "Test Parser")
+
+        assert sorted(track_errors) == [3, 6, 8]
+        assert track_errors == self.validate_each(objects)
+        assert len(track_errors[3]) == 3
+        assert "Heading (180.000 degree)" in str(track_errors[3][0])
+
+    def test_raw_wkt_locations(self):
+        # Locations set as raw values can be Well-Known Text, with or without an SRID
+        knots = unit_registry.knot
+        objects = [
+            self.create_state(self.platform, 0, speed=5 * knots),
+            self.create_state(self.platform, 60, speed=5 * knots),
+            self.create_state(self.platform, 120, speed=5 * knots),
+        ]
+        objects[0]._location = "POINT(-1 50)"
+        objects[1]._location = "SRID=4326;POINT(-1 50.0025)"
+        # Far too far for the speed
+        objects[2]._location = "POINT Z(-1 51 0)"
+
+        with redirect_stdout(StringIO()):
+            track_errors = EnhancedValidator().validate_track(objects, "Test Parser")
+
+        assert sorted(track_errors) == [2]
+        assert track_errors == self.validate_each(objects)
+
+    def test_timezone_aware_times(self):
+        # The times are one minute apart once converted to UTC, so the speed is about right
+        knots = unit_registry.knot
+        objects = [
+            self.create_state(self.platform, 0, 50, -1, speed=5 * knots),
+            self.create_state(self.platform, 60, 50.0025, -1, speed=5 * knots),
+            self.create_state(self.platform, 120, 50.0050, -1, speed=5 * knots),
+        ]
+        objects[0].time = datetime(2021, 1, 1, 12, 0, tzinfo=timezone.utc)
+        objects[1].time = datetime(2021, 1, 1, 13, 1, tzinfo=timezone(timedelta(hours=1)))
+        objects[2].time = datetime(2021, 1, 1, 7, 2, tzinfo=timezone(timedelta(hours=-5)))
+
+        with redirect_stdout(StringIO()):
+            track_errors = EnhancedValidator().validate_track(objects, "Test Parser")
+
+        assert track_errors == {}
+
+    def test_course_and_speed_are_exactly_zero(self):
+        objects = [
+            self.create_state(self.platform, 0, 50, -1),
+            self.create_state(
+                self.platform,
+                60,
+                60,
+                -1,
+                course=0.0 * unit_registry.radian,
+                speed=0.0 * (unit_registry.metre / unit_registry.second),
+            ),
+        ]
+        temp_output = StringIO()
+        with redirect_stdout(temp_output):
+            assert EnhancedValidator().validate_track(objects, "Test Parser") == {}
+
+        assert "Both course and speed are exactly zero for 1 measurements" in (
+            temp_output.getvalue()
+        )
+
+
 if __name__ == "__main__":
     unittest.main()
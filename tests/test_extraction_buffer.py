@@ -0,0 +1,70 @@
+from pepys_import.core.store import sqlite_db
+from pepys_import.core.store.extraction_buffer import ExtractionBuffer
+
+
+def record(buffer, field):
+    buffer.record(f"{field} text", f"{field} value", "0-10", "Test Importer", field)
+
+
+def test_extractions_assigned_to_measurement_objects():
+    buffer = ExtractionBuffer()
+    state = sqlite_db.State()
+    contact = sqlite_db.Contact()
+
+    record(buffer, "speed")
+    record(buffer, "course")
+    buffer.assign(state)
+    record(buffer, "bearing")
+    buffer.assign(contact)
+    # Assigning with nothing recorded does nothing
+    buffer.assign(contact)
+
+    assert len(buffer) == 3
+    assert buffer.pending_count == 0
+    assert buffer.assignments == [(state, 0, 2), (contact, 2, 3)]
+
+    state.state_id = "STATE ID"
+    contact.contact_id = "CONTACT ID"
+    columns = buffer.columns("DATAFILE ID")
+
+    assert columns == {
+        "text": ["speed text", "course text", "bearing text"],
+        "interpreted_value": ["speed value", "course value", "bearing value"],
+        "text_location": ["0-10", "0-10", "0-10"],
+        "importer": ["Test Importer", "Test Importer", "Test Importer"],
+        "field": ["speed", "course", "bearing"],
+        "entry_id": ["STATE ID", "STATE ID", "CONTACT ID"],
+        "destination_table": ["States", "States", "Contacts"],
+        "datafile_id": ["DATAFILE ID", "DATAFILE ID", "DATAFILE ID"],
+    }
+
+
+def test_extractions_without_measurement_object_discarded():
+    buffer = ExtractionBuffer()
+    state = sqlite_db.State()
+
+    record(buffer, "speed")
+    buffer.assign(None)
+    record(buffer, "course")
+
+    assert buffer.pending_count == 1
+    assert [row["field"] for row in buffer.pending_rows()] == ["course"]
+
+    buffer.assign(state)
+    record(buffer, "depth")
+    buffer.discard_pending()
+
+    assert len(buffer) == 1
+    assert buffer.columns(None)["field"] == ["course"]
+
+
+def test_clear():
+    buffer = ExtractionBuffer()
+    record(buffer, "speed")
+    buffer.assign(sqlite_db.State())
+    record(buffer, "course")
+    buffer.clear()
+
+    assert len(buffer) == 0
+    assert buffer.assignments == []
+    assert buffer.columns(None)["field"] == []
@@ -0,0 +1,103 @@
+import os
+from unittest.mock import patch
+
+from importers.eag_importer import EAGImporter
+from importers.jchat_importer import JChatImporter
+from importers.nmea_importer import NMEAImporter
+from importers.replay_importer import ReplayImporter
+from pepys_import.file.file_processor import FileProcessor, detect_importers
+from pepys_import.file.importer import Importer
+from pepys_import.file.importer_index import ImporterIndex
+
+DIRECTORY_PATH = os.path.dirname(__file__)
+REP_FILE_PATH = os.path.join(
+    DIRECTORY_PATH, "sample_data", "track_files", "rep_data", "rep_test1.rep"
+)
+
+
+class SuffixCheckingImporter(Importer):
+    def __init__(self):
+        super().__init__("Suffix Importer", "", "Suffix", "")
+        self.suffixes_checked = []
+
+    def can_load_this_type(self, suffix):
+        self.suffixes_checked.append(suffix)
+        return suffix == ".abc"
+
+    def can_load_this_file(self, file_contents):
+        return True
+
+
+def test_declared_suffixes():
+    index = ImporterIndex([ReplayImporter(), NMEAImporter(), JChatImporter()])
+
+    # JChat files can have any suffix, so it is a candidate for every file
+    assert index.importers_for_name("track.REP") == [0, 2]
+    assert index.importers_for_name("track.rep") == [0, 2]
+    assert index.importers_for_name("nmea.log") == [1, 2]
+    assert index.importers_for_name("image.png") == [2]
+
+
+def test_declared_filename_pattern():
+    index = ImporterIndex([EAGImporter()])
+
+    assert index.importers_for_name("20200305_ROBIN_EAG.txt") == [0]
+    assert index.importers_for_name("20200305_robin_eag.TXT") == [0]
+    assert index.importers_for_name("ROBIN_EAG.txt") == []
+    assert index.importers_for_name("20200305_ROBIN_EAG_old.txt") == []
+
+
+def test_declared_header_pattern():
+    index = ImporterIndex([ReplayImporter(), NMEAImporter(), JChatImporter()])
+
+    assert index.needs_header([1, 2])
+    assert not index.needs_header([0])
+    assert index.filter_by_header([0, 1, 2], "$POSL,POS,GPS,...\n") == [0, 1]
+    assert index.filter_by_header([0, 1, 2], "<html>\n") == [0, 2]
+    assert index.filter_by_header([0, 1, 2], "") == [0]
+
+
+def test_importer_methods_use_declarations():
+    assert ReplayImporter().can_load_this_type(".Rep")
+    assert not ReplayImporter().can_load_this_type(".txt")
+    assert EAGImporter().can_load_this_filename("20200305_ROBIN_EAG")
+    assert not EAGImporter().can_load_this_filename("ROBIN_EAG")
+    assert NMEAImporter().can_load_this_header("$POSL,POS,GPS")
+    assert not NMEAImporter().can_load_this_header(";;Replay")
+
+
+def test_overridden_methods_called():
+    importer = SuffixCheckingImporter()
+    index = ImporterIndex([ReplayImporter(), importer])
+
+    assert index.importers_for_name("file.abc") == [1]
+    assert index.importers_for_name("file.rep") == [0]
+    assert importer.suffixes_checked == [".abc", ".rep"]
+
+
+def test_file_with_unknown_suffix_not_opened():
+    with patch("builtins.open") as patched_open:
+        assert detect_importers([ReplayImporter(), NMEAImporter()], "missing.png") is None
+    patched_open.assert_not_called()
+
+
+def test_whole_file_not_read_if_header_does_not_match(tmp_path):
+    path = os.path.join(tmp_path, "data.log")
+    with open(path, "w") as file:
+        file.write("Not a NMEA file\n$POSL,POS,GPS\n")
+
+    with patch.object(FileProcessor, "read_file_bytes") as patched_read_file_bytes:
+        assert detect_importers([NMEAImporter()], path) is None
+    patched_read_file_bytes.assert_not_called()
+
+
+def test_missing_file_skipped():
+    assert detect_importers([NMEAImporter()], "missing.log") is None
+
+
+def test_file_processor_index_updated():
+    processor = FileProcessor()
+    processor.register_importer(ReplayImporter())
+
+    assert processor.importer_index.importers == processor.importers
+    assert detect_importers(processor.importer_index, REP_FILE_PATH)[0] == [0]
@@ -1,5 +1,6 @@
 import os
 import platform
+import re
 import shutil
 import stat
 import unittest
@@ -16,11 +17,13 @@ from importers.replay_importer import ReplayImporter
 from pepys_import import __version__
 from pepys_import.core.store.data_store import DataStore
 from pepys_import.core.validators import constants as validation_constants
-from pepys_import.file.file_processor import FileProcessor
+from pepys_import.file.file_processor import FileProcessor, detect_importers
 from pepys_import.file.highlighter.level import HighlightLevel
 from pepys_import.file.importer import Importer
+from pepys_import.file.staging import StagedFile, capture_output
 from pepys_import.resolvers.command_line_resolver import CommandLineResolver
 from pepys_import.resolvers.default_resolver import DefaultResolver
+from pepys_import.utils.datafile_utils import hash_file
 from pepys_import.utils.import_utils import sort_files
 
 FILE_PATH = os.path.dirname(__file__)
@@ -1140,5 +1143,140 @@ def test_changes_table_entry_contains_version():
         assert False
 
 
+class ParallelImportTest(unittest.TestCase):
+    def tearDown(self) -> None:
+        for db_name in ["serial_import_test.db", "parallel_import_test.db"]:
+            db_path = os.path.join(CURRENT_DIR, db_name)
+            if os.path.exists(db_path):
+                os.remove(db_path)
+        if os.path.exists(OUTPUT_PATH):
+            shutil.rmtree(OUTPUT_PATH)
+
+    @staticmethod
+    def _import(db_name, workers):
+        processor = FileProcessor(db_name, archive=False, workers=workers)
+        processor.output_path = OUTPUT_PATH
+        processor.load_importers_dynamically()
+        data_store = DataStore("", "", "", 0, db_name, db_type="sqlite")
+        data_store.initialise()
+
+        # Text printed with prompt_toolkit is captured too, as the reports are printed with it
+        with patch.object(FileProcessor, "display_import_summary") as display_import_summary:
+            with capture_output() as (output, _):
+                processor.process(REP_DATA_PATH, data_store, True)
+
+        # Locations of the reports contain the timestamped output folder, so make them relative
+        import_summary = display_import_summary.call_args[0][0]
+        for details in import_summary["failed"]:
+            details["report_location"] = os.path.relpath(
+                details["report_location"], processor.output_path
+            )
+        reports = {}
+        for name in os.listdir(processor.directory_path):
+            with open(os.path.join(processor.directory_path, name)) as file:
+                reports[name] = file.read()
+
+        with data_store.session_scope():
+            rows = {
+                table: sorted(
+                    str(getattr(row, column))
+                    for row in data_store.session.query(getattr(data_store.db_classes, table))
+                )
+                for table, column in [
+                    ("Platform", "name"),
+                    ("Sensor", "name"),
+                    ("CommentType", "name"),
+                    ("State", "time"),
+                    ("Contact", "time"),
+                    ("Comment", "content"),
+                    ("Extraction", "text"),
+                ]
+            }
+        # The reports give the times the measurements were added
+        output = re.sub(r"\d{4}-\d\d-\d\d \d\d:\d\d:\d\d\.\d+", "<time>", output.getvalue())
+        return import_summary, reports, output.replace(processor.output_path, "<output>"), rows
+
+    @patch("pepys_import.core.store.common_db.prompt", return_value="2")
+    def test_import_same_with_workers(self, patched_prompt):
+        serial = self._import("serial_import_test.db", 1)
+        with patch.object(StagedFile, "load", autospec=True, side_effect=StagedFile.load) as load:
+            parallel = self._import("parallel_import_test.db", 2)
+
+        # The REP files should have been parsed in the worker processes
+        assert load.call_count > 0
+        serial_summary, serial_reports, serial_output, serial_rows = serial
+        parallel_summary, parallel_reports, parallel_output, parallel_rows = parallel
+        assert serial_summary["failed"]
+        assert serial_summary == parallel_summary
+        assert serial_reports.keys() == parallel_reports.keys()
+        for name in serial_reports:
+            assert serial_reports[name] == parallel_reports[name], name
+        assert serial_output == parallel_output
+        assert serial_rows == parallel_rows
+
+    def test_detect_importers(self):
+        importers = [NMEAImporter(), ReplayImporter()]
+
+        importer_indices, file_size, file_hash, file_contents = detect_importers(
+            importers, SINGLE_REP_FILE
+        )
+
+        assert importer_indices == [1]
+        assert file_size == os.path.getsize(SINGLE_REP_FILE)
+        assert file_hash == hash_file(SINGLE_REP_FILE)
+        assert file_contents is None
+
+    def test_detect_importers_keep_contents(self):
+        detection = detect_importers([ReplayImporter()], SINGLE_REP_FILE, keep_contents=True)
+
+        with open(SINGLE_REP_FILE, "rb") as file:
+            assert detection[3] == file.read()
+
+    def test_decode_file_contents(self):
+        for path in [SINGLE_REP_FILE, SINGLE_REP_FILE_2]:
+            file_bytes = FileProcessor.read_file_bytes(path)
+
+            assert FileProcessor.decode_file_contents(file_bytes) == (
+                FileProcessor.get_file_contents(path)
+            )
+
+    def test_decode_file_contents_line_endings(self):
+        assert FileProcessor.decode_file_contents(b"a\r\nb\rc\nd") == ["a", "b", "c", "d"]
+
+    def test_detect_importers_no_importers(self):
+        assert detect_importers([NMEAImporter()], SINGLE_REP_FILE) is None
+
+
+class NoProvenanceImportTest(unittest.TestCase):
+    @patch("pepys_import.core.store.common_db.prompt", return_value="2")
+    def test_import_without_provenance(self, patched_prompt):
+        state_counts = []
+        for no_provenance in [False, True]:
+            data_store = DataStore("", "", "", 0, ":memory:", db_type="sqlite")
+            data_store.initialise()
+
+            processor = FileProcessor(archive=False, no_provenance=no_provenance)
+            processor.load_importers_dynamically()
+            processor.process(SINGLE_REP_FILE, data_store, False)
+
+            with data_store.session_scope():
+                state_counts.append(
+                    len(data_store.session.query(data_store.db_classes.State).all())
+                )
+                extractions = data_store.session.query(data_store.db_classes.Extraction).all()
+
+            highlighted_files = [
+                name for name in os.listdir(processor.directory_path) if name.endswith(".html")
+            ]
+            if no_provenance:
+                assert len(extractions) == 0
+                assert highlighted_files == []
+            else:
+                assert highlighted_files == ["rep_test1_highlighted.html"]
+
+        # The same data should be imported either way
+        assert state_counts[0] == state_counts[1]
+
+
 if __name__ == "__main__":
     unittest.main()
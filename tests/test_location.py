@@ -154,6 +154,32 @@ def test_set_from_wkb():
     assert loc.longitude == -1.35
 
 
+@pytest.mark.parametrize(
+    "wkt",
+    [
+        "SRID=4326;POINT(-1.35 50.23)",
+        "POINT(-1.35 50.23)",
+        "point (-1.35 50.23)",
+        "POINT Z(-1.35 50.23 10)",
+    ],
+)
+def test_set_from_wkt_string(wkt):
+    loc = Location()
+    loc.set_from_wkt_string(wkt)
+
+    assert loc.latitude == 50.23
+    assert loc.longitude == -1.35
+
+
+@pytest.mark.parametrize(
+    "wkt",
+    ["SRID=3857;POINT(-150000 6500000)", "LINESTRING(0 0, 1 1)", "POINT EMPTY", "POINT(1)"],
+)
+def test_set_from_wkt_string_invalid(wkt):
+    with pytest.raises(ValueError):
+        Location().set_from_wkt_string(wkt)
+
+
 def test_set_from_geometry():
     loc = Location().from_geometry(None)
 
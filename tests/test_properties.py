@@ -1214,6 +1214,38 @@ class TestActivationRightArcProperty(unittest.TestCase):
         assert hasattr(self.store.db_classes.Activation.right_arc, "expression")
 
 
+class TestSetRawValues(unittest.TestCase):
+    def setUp(self):
+        self.store = DataStore("", "", "", 0, ":memory:", db_type="sqlite")
+        self.store.initialise()
+
+    def test_state_set_raw_values(self):
+        state = self.store.db_classes.State()
+
+        state.set_raw_values(speed=2.5, heading=0.5, course=None, elevation=10)
+
+        assert state.speed == 2.5 * (unit_registry.metre / unit_registry.second)
+        assert state.heading.to(unit_registry.radian).magnitude == pytest.approx(0.5)
+        assert state.course is None
+        assert state.elevation == 10 * unit_registry.metre
+
+    def test_contact_set_raw_values(self):
+        contact = self.store.db_classes.Contact()
+
+        contact.set_raw_values(range=1500.0, freq=100.0)
+
+        assert contact.range == 1500 * unit_registry.metre
+        assert contact.freq == 100 * unit_registry.hertz
+
+    def test_set_raw_values_invalid_name(self):
+        state = self.store.db_classes.State()
+
+        with pytest.raises(AttributeError) as exception:
+            state.set_raw_values(bearing=1.0)
+
+        assert "State has no measurement property 'bearing'" in str(exception.value)
+
+
 class TestGeometryGeometryProperty(unittest.TestCase):
     def setUp(self):
         self.store = DataStore("", "", "", 0, ":memory:", db_type="sqlite")
@@ -4,6 +4,7 @@ from datetime import datetime
 
 from pepys_admin.snapshot_helpers import (
     export_all_measurement_tables,
+    export_measurement_table_with_filter,
     export_measurement_tables_filtered_by_location,
     export_measurement_tables_filtered_by_serial_participation,
     export_measurement_tables_filtered_by_time,
@@ -103,6 +104,16 @@ class TestSnapshots(unittest.TestCase):
             ]
         )
 
+    def test_export_in_batches(self):
+        # Batches smaller than the tables, with a part-filled batch at the end
+        with self.source_store.session_scope():
+            with self.destination_store.session_scope():
+                for table in ["State", "Comment"]:
+                    export_measurement_table_with_filter(
+                        self.source_store, self.destination_store, table, batch_size=4
+                    )
+        self._check_tables_equal(["State", "Comment"])
+
     def test_export_filtered_by_time_with_time_field_1(self):
         # Start is part-way through measurements, so only some should be exported
         export_measurement_tables_filtered_by_time(
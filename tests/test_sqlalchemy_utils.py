@@ -1,11 +1,38 @@
 import json
+from datetime import datetime
+from uuid import uuid4
 
 import pytest
+from geoalchemy2 import Geometry
+from geoalchemy2.elements import WKBElement, WKTElement
+from sqlalchemy import (
+    REAL,
+    Boolean,
+    Column,
+    DateTime,
+    MetaData,
+    String,
+    Table,
+    Text,
+    create_engine,
+    select,
+)
+from sqlalchemy.dialects.postgresql import DOUBLE_PRECISION, TIMESTAMP, UUID
+from sqlalchemy.orm import Session, declarative_base, deferred
+from testing.postgresql import Postgresql
 
 from pepys_import.core.store.data_store import DataStore
 from pepys_import.utils.sqlalchemy_utils import (
+    UUIDType,
+    columns_to_copy_text,
+    copy_columns,
+    copy_rows,
     get_lowest_privacy,
     get_primary_key_for_table,
+    insert_columns,
+    insert_objects,
+    insert_rows,
+    rows_to_copy_text,
     sqlalchemy_object_to_json,
 )
 
@@ -72,3 +99,228 @@ def test_get_primary_key_for_table(table_name, pri_key_name):
     table_obj = getattr(ds.db_classes, table_name)
 
     assert get_primary_key_for_table(table_obj) == pri_key_name
+
+
+def test_insert_objects_and_rows():
+    Base = declarative_base()
+
+    class Measurement(Base):
+        __tablename__ = "Measurements"
+        measurement_id = Column(UUIDType, primary_key=True, default=uuid4)
+        _value = deferred(Column("value", REAL))
+        remarks = Column(Text)
+        valid = Column(Boolean, default=True)
+        created_date = Column(DateTime, default=datetime.utcnow)
+
+    class MeasurementLog(Base):
+        __tablename__ = "MeasurementLogs"
+        log_id = Column(UUIDType, primary_key=True, default=uuid4)
+        id = Column(UUIDType, nullable=False)
+        created_date = Column(DateTime, default=datetime.utcnow)
+
+    engine = create_engine("sqlite://", future=True)
+    Base.metadata.create_all(engine)
+    existing_id = uuid4()
+    measurements = [
+        Measurement(_value=1.5),
+        Measurement(measurement_id=existing_id, remarks="Remarks", valid=False),
+        Measurement(_value=2.5),
+    ]
+
+    with Session(engine, future=True) as session:
+        primary_keys = insert_objects(session, measurements)
+        insert_rows(session, MeasurementLog.__table__, [dict(id=key) for key in primary_keys])
+        session.commit()
+
+        assert primary_keys[1] == existing_id
+        assert primary_keys == [measurement.measurement_id for measurement in measurements]
+        assert measurements[0] not in session
+
+        rows = session.execute(Measurement.__table__.select()).fetchall()
+        assert [tuple(row)[:4] for row in rows] == [
+            (primary_keys[0], 1.5, None, True),
+            (primary_keys[1], None, "Remarks", False),
+            (primary_keys[2], 2.5, None, True),
+        ]
+        assert all(row.created_date is not None for row in rows)
+        # The defaults are set on the objects as well
+        assert [measurement.created_date for measurement in measurements] == [
+            row.created_date for row in rows
+        ]
+        assert measurements[0].valid is True
+
+        logs = session.execute(MeasurementLog.__table__.select()).fetchall()
+        assert [log.id for log in logs] == primary_keys
+        assert len({log.log_id for log in logs}) == 3
+
+
+def test_insert_columns():
+    metadata = MetaData()
+    table = Table(
+        "Extractions",
+        metadata,
+        Column("extraction_id", UUIDType, primary_key=True, default=uuid4),
+        Column("entry_id", UUIDType),
+        Column("text", Text),
+        Column("created_date", DateTime, default=datetime.utcnow),
+    )
+    engine = create_engine("sqlite://", future=True)
+    metadata.create_all(engine)
+    first_id = uuid4()
+    second_id = uuid4()
+
+    with Session(engine, future=True) as session:
+        insert_columns(
+            session,
+            table,
+            {
+                "entry_id": [first_id, first_id, second_id, None],
+                "text": ["one", "two", "three", None],
+            },
+        )
+        # Nothing is written if there are no rows
+        insert_columns(session, table, {"entry_id": [], "text": []})
+        session.commit()
+
+        rows = session.execute(table.select()).fetchall()
+        assert [(row.entry_id, row.text) for row in rows] == [
+            (first_id, "one"),
+            (first_id, "two"),
+            (second_id, "three"),
+            (None, None),
+        ]
+        # Primary keys are generated for each row, and other defaults once for all the rows
+        assert len({row.extraction_id for row in rows}) == 4
+        assert len({row.created_date for row in rows}) == 1
+
+
+def test_columns_to_copy_text():
+    table = Table(
+        "Measurements",
+        MetaData(),
+        Column("measurement_id", UUIDType),
+        Column("location", Geometry(geometry_type="POINT", srid=4326)),
+        Column("remarks", Text),
+    )
+    measurement_id = uuid4()
+    rows = [
+        dict(measurement_id=measurement_id, location="POINT(1 2)", remarks="Tab\t"),
+        dict(measurement_id=measurement_id, location="POINT(1 2)", remarks=None),
+    ]
+    columns = {key: [row[key] for row in rows] for key in rows[0]}
+
+    assert columns_to_copy_text(table, columns) == rows_to_copy_text(table, rows)
+
+
+def test_rows_to_copy_text():
+    metadata = MetaData()
+    table = Table(
+        "Measurements",
+        metadata,
+        Column("measurement_id", UUIDType),
+        Column("location", Geometry(geometry_type="POINT", srid=4326)),
+        Column("remarks", Text),
+        Column("value", REAL),
+        Column("valid", Boolean),
+        Column("time", DateTime),
+    )
+    measurement_id = uuid4()
+    rows = [
+        dict(
+            measurement_id=measurement_id,
+            location="SRID=4326;POINT(-1.5 50.5)",
+            remarks="Tab\tnewline\nbackslash\\",
+            value=1.25,
+            valid=True,
+            time=datetime(2021, 2, 3, 4, 5, 6, 789000),
+        ),
+        dict(
+            measurement_id=measurement_id,
+            location=WKTElement("POINT(1 2)", srid=4326),
+            remarks=None,
+            value=None,
+            valid=False,
+            time=None,
+        ),
+    ]
+
+    assert rows_to_copy_text(table, rows) == (
+        f"{measurement_id}\tSRID=4326;POINT(-1.5 50.5)\tTab\\tnewline\\nbackslash\\\\"
+        "\t1.25\tt\t2021-02-03T04:05:06.789000\n"
+        f"{measurement_id}\tSRID=4326;POINT(1 2)\t\\N\t\\N\tf\t\\N\n"
+    )
+
+
+def test_rows_to_copy_text_wkb_geometry():
+    table = Table("Geometries", MetaData(), Column("geometry", Geometry(srid=4326)))
+    # Little-endian WKB of POINT(1 2)
+    wkb = bytes.fromhex("0101000000000000000000f03f0000000000000040")
+
+    text = rows_to_copy_text(table, [dict(geometry=WKBElement(wkb))])
+
+    # The SRID flag is set in the geometry type, and the SRID follows it
+    assert text == "0101000020e6100000000000000000f03f0000000000000040\n"
+
+
+@pytest.mark.postgres
+def test_copy_matches_insert_on_postgres():
+    """Writes the same rows with COPY and with INSERT, checking PostgreSQL reads the same values
+    back, for the types of the non-geometry columns of the measurement tables"""
+    metadata = MetaData()
+    tables = [
+        Table(
+            name,
+            metadata,
+            Column("measurement_id", UUID(as_uuid=True), primary_key=True),
+            Column("value", DOUBLE_PRECISION),
+            Column("name", String(150)),
+            Column("remarks", Text),
+            Column("time", TIMESTAMP),
+            Column("created_date", DateTime),
+        )
+        for name in ("Copied", "Inserted")
+    ]
+    values = [
+        (1.25, "Tab\tnewline\nreturn\rbackslash\\", "\\N", datetime(2021, 2, 3, 4, 5, 6, 789)),
+        (0.5, "", "Ünïcödé 💡", datetime(1999, 12, 31, 23, 59, 59)),
+        (1e-300, "'quotes\" and ; semicolons", "\\\\N\\t", datetime(2021, 1, 1)),
+        (float("inf"), "  spaces  ", "end with backslash\\", datetime(2021, 1, 1)),
+        (None, None, None, None),
+    ]
+    rows = [
+        dict(
+            measurement_id=uuid4(),
+            value=value,
+            name=name,
+            remarks=remarks,
+            time=time,
+            created_date=datetime(2022, 6, 7, 8, 9, 10, 111213),
+        )
+        for value, name, remarks, time in values
+    ]
+
+    with Postgresql() as postgresql:
+        engine = create_engine(postgresql.url())
+        metadata.create_all(engine)
+        copied, inserted = tables
+        with Session(engine) as session:
+            copy_rows(session, copied, [dict(row) for row in rows])
+            columns = {key: [row[key] for row in rows] for key in rows[0]}
+            columns["measurement_id"] = [uuid4() for _ in rows]
+            copy_columns(session, copied, columns)
+            insert_rows(session, inserted, [dict(row) for row in rows])
+            session.commit()
+
+            copied_values = _select_values_without_ids(session, copied)
+            inserted_values = _select_values_without_ids(session, inserted)
+        engine.dispose()
+
+    expected = sorted(repr(tuple(row.values())[1:]) for row in rows)
+    assert inserted_values == expected
+    # Each row was copied twice, by copy_rows and copy_columns
+    assert copied_values == sorted(expected * 2)
+
+
+def _select_values_without_ids(session, table):
+    columns = [column for column in table.c if not column.primary_key]
+    return sorted(repr(tuple(row)) for row in session.execute(select(*columns)))
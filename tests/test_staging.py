@@ -0,0 +1,119 @@
+import os
+import shutil
+import tempfile
+import unittest
+import uuid
+
+from importers.nmea_importer import NMEAImporter
+from importers.replay_importer import ReplayImporter
+from pepys_import.core.store import sqlite_db
+from pepys_import.file.file_processor import FileProcessor
+from pepys_import.file.staging import StagingDataStore
+
+FILE_PATH = os.path.dirname(__file__)
+SINGLE_REP_FILE = os.path.join(FILE_PATH, "sample_data", "track_files", "rep_data", "rep_test1.rep")
+NMEA_FILE = os.path.join(FILE_PATH, "sample_data", "track_files", "other_data", "NMEA_bad.log")
+
+
+class StagingDataStoreTestCase(unittest.TestCase):
+    def setUp(self):
+        self.data_store = StagingDataStore(sqlite_db)
+
+    def test_same_platform_for_same_name(self):
+        platform = self.data_store.get_platform("SUBJECT")
+
+        assert self.data_store.get_platform("SUBJECT") is platform
+        assert platform.name == "SUBJECT"
+        assert self.data_store.requests == [
+            (
+                "get_platform",
+                platform.platform_id,
+                dict(
+                    platform_name="SUBJECT",
+                    identifier=None,
+                    nationality=None,
+                    platform_type=None,
+                    privacy=None,
+                    trigraph=None,
+                    quadgraph=None,
+                    unknown=False,
+                ),
+            )
+        ]
+
+    def test_new_platform_for_each_request_without_name(self):
+        first = self.data_store.get_platform(unknown=True)
+        second = self.data_store.get_platform(unknown=True)
+
+        assert first.platform_id != second.platform_id
+        assert first.name != second.name
+        assert len(self.data_store.requests) == 2
+
+    def test_sensor_of_placeholder_platform(self):
+        platform = self.data_store.get_platform("SUBJECT")
+
+        sensor = self.data_store.get_sensor(platform.platform_id, sensor_name="TA")
+
+        assert sensor.host == platform.platform_id
+        assert self.data_store.get_sensor(platform.platform_id, sensor_name="TA") is sensor
+        # Unnamed sensors are requested again each time, as the importers cache them
+        assert self.data_store.get_sensor(platform.platform_id) is not self.data_store.get_sensor(
+            platform.platform_id
+        )
+
+    def test_sensor_of_other_platform(self):
+        with self.assertRaises(ValueError):
+            self.data_store.get_sensor(uuid.uuid4(), "TA")
+
+    def test_other_data_store_methods(self):
+        with self.assertRaises(AttributeError):
+            self.data_store.add_to_sensor_types("GPS", None)
+
+
+class StageFileTestCase(unittest.TestCase):
+    def setUp(self):
+        self.directory_path = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory_path)
+
+    def _processor(self, importer):
+        processor = FileProcessor(archive=False)
+        processor.register_importer(importer)
+        processor.directory_path = self.directory_path
+        return processor
+
+    def test_stage_file(self):
+        processor = self._processor(ReplayImporter())
+
+        detection, staged_file = processor.stage_file(SINGLE_REP_FILE, sqlite_db)
+
+        # The contents aren't sent back, as the file has been parsed already
+        assert detection[3] is None
+        assert len(staged_file.measurements["REP Importer"]) == 8
+        assert [request[0] for request in staged_file.requests] == [
+            "get_platform",
+            "get_sensor",
+            "get_platform",
+            "get_sensor",
+        ]
+        assert staged_file.importer_errors == [[]]
+        assert "REP Importer" in staged_file.validation_outputs
+        assert os.path.exists(staged_file.highlighted_path)
+
+        staged_file.discard()
+        assert os.listdir(self.directory_path) == []
+
+    def test_stage_file_other_importers(self):
+        processor = self._processor(NMEAImporter())
+
+        detection, staged_file = processor.stage_file(NMEA_FILE, sqlite_db)
+
+        # The file is parsed in the main process, so its contents are sent back
+        assert staged_file is None
+        with open(NMEA_FILE, "rb") as file:
+            assert detection[3] == file.read()
+
+
+if __name__ == "__main__":
+    unittest.main()
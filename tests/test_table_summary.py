@@ -3,7 +3,8 @@ from datetime import datetime
 from unittest import TestCase
 
 from pepys_import.core.store.data_store import DataStore
-from pepys_import.core.store.table_summary import TableSummary, TableSummarySet
+from pepys_import.core.store.db_status import TableTypes
+from pepys_import.core.store.table_summary import AddedRowsSummary, TableSummary, TableSummarySet
 
 
 class TableSummarySetTestCase(TestCase):
@@ -164,5 +165,121 @@ class TableSummaryTestCase(TestCase):
         assert "| Sensors      |                1 |" in result
 
 
+class AddedRowsSummaryTestCase(TestCase):
+    def test_report_added_metadata_shows_names(self):
+        table_summary_set = TableSummarySet(
+            [
+                AddedRowsSummary("Platforms", 2, datetime(2021, 1, 2), ["Platform2", "Platform1"]),
+                AddedRowsSummary("Sensors", 0),
+                AddedRowsSummary("Privacies", 1, datetime(2021, 1, 2)),
+            ]
+        )
+        result = table_summary_set.report_added_metadata()
+
+        assert "| Platforms    | Platform1,Platform2 |" in result
+        assert "Sensors" not in result
+        assert "Privacies" not in result
+
+    def test_report_added_metadata_more_than_6_names(self):
+        names = [f"Platform{i}" for i in range(7)]
+        table_summary_set = TableSummarySet(
+            [
+                AddedRowsSummary("Platforms", 7, datetime(2021, 1, 2), names),
+                AddedRowsSummary("Sensors", 0),
+                AddedRowsSummary("Privacies", 1, datetime(2021, 1, 2)),
+            ]
+        )
+        result = table_summary_set.report_added_metadata()
+
+        assert "| Platforms    |                7 | 2021-01-02 00:00:00 |" in result
+        assert "| Privacies    |                1 | 2021-01-02 00:00:00 |" in result
+        assert "Sensors" not in result
+
+
+class GetAddedStatusTestCase(TestCase):
+    def setUp(self):
+        self.store = DataStore("", "", "", 0, ":memory:", db_type="sqlite")
+        self.store.initialise()
+        with self.store.session_scope():
+            self.store.populate_reference()
+            self.change_id = self.store.add_to_changes("TEST", datetime.utcnow(), "TEST").change_id
+            self.store.add_to_platforms(
+                "Platform1", "123", "United Kingdom", "Warship", "Public", change_id=self.change_id
+            )
+
+    def test_get_added_status(self):
+        with self.store.session_scope():
+            change_id = self.store.add_to_changes("TEST", datetime.utcnow(), "TEST").change_id
+            with self.store.recording_added_rows(change_id):
+                platform = self.store.add_to_platforms(
+                    "Platform2", "234", "United Kingdom", "Warship", "Public", change_id=change_id
+                )
+                self.store.add_to_sensors(
+                    name="TestSensor",
+                    sensor_type="GPS",
+                    host_id=platform.platform_id,
+                    host_name=None,
+                    host_nationality=None,
+                    host_identifier=None,
+                    privacy="Public",
+                    change_id=change_id,
+                )
+                added_status = self.store.get_added_status(TableTypes.METADATA, change_id)
+
+        summaries = {summary.table_name: summary for summary in added_status.table_summaries}
+        # Only the rows added under the second change are included
+        assert summaries["Platforms"].number_of_rows == 1
+        assert summaries["Platforms"].names == ["Platform2"]
+        assert summaries["Platforms"].created_date != "-"
+        assert summaries["Sensors"].names == ["TestSensor"]
+        assert summaries["Privacies"].number_of_rows == 0
+        assert "| Platforms    | Platform2   |" in added_status.report_added_metadata()
+
+    def test_get_added_status_excludes_edits(self):
+        with self.store.session_scope():
+            change_id = self.store.add_to_changes("TEST", datetime.utcnow(), "TEST").change_id
+            with self.store.recording_added_rows(change_id):
+                platform = self.store.add_to_platforms(
+                    "Platform2", "234", "United Kingdom", "Warship", "Public", change_id=change_id
+                )
+                self.store.add_to_logs(
+                    "Platforms", platform.platform_id, field="name", change_id=change_id
+                )
+                added_status = self.store.get_added_status(
+                    TableTypes.METADATA, change_id, exclude=["Privacies"]
+                )
+
+        table_names = [summary.table_name for summary in added_status.table_summaries]
+        assert "Privacies" not in table_names
+        platforms = added_status.table_summaries[table_names.index("Platforms")]
+        assert platforms.number_of_rows == 1
+
+    def test_rows_only_recorded_while_recording(self):
+        # The platform added in setUp wasn't added while recording, so isn't kept track of
+        assert self.store.added_row_ids == {}
+        with self.store.session_scope():
+            added_status = self.store.get_added_status(TableTypes.METADATA, self.change_id)
+        summaries = {summary.table_name: summary for summary in added_status.table_summaries}
+        assert summaries["Platforms"].number_of_rows == 0
+
+    def test_recorded_rows_forgotten_after_exception(self):
+        with self.store.session_scope():
+            change_id = self.store.add_to_changes("TEST", datetime.utcnow(), "TEST").change_id
+            with self.assertRaises(ValueError):
+                with self.store.recording_added_rows(change_id):
+                    self.store.add_to_platforms(
+                        "Platform2",
+                        "234",
+                        "United Kingdom",
+                        "Warship",
+                        "Public",
+                        change_id=change_id,
+                    )
+                    assert change_id in self.store.added_row_ids
+                    raise ValueError("Import failed")
+
+        assert self.store.added_row_ids == {}
+
+
 if __name__ == "__main__":
     unittest.main()
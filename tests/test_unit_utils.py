@@ -170,3 +170,54 @@ def test_bearing_between_two_points():
     result = unit_utils.bearing_between_two_points(loc1, loc2)
 
     assert result == pytest.approx(341.3645)
+
+
+@pytest.mark.parametrize(
+    "value,units,dimensionality",
+    [
+        pytest.param(5 * unit_registry.knots, "metre / second", "[length]/[time]", id="knots"),
+        pytest.param(2.5 * unit_registry.kilometre, "metre", "[length]", id="kilometres"),
+        pytest.param(90 * unit_registry.degree, "radian", "", id="degrees"),
+        pytest.param(1.5 * unit_registry.radian, "radian", "", id="radians"),
+    ],
+)
+def test_magnitude_in_units(value, units, dimensionality):
+    expected = value.to(units).magnitude
+
+    # The second conversion uses the cached conversion factor
+    for _ in range(2):
+        result = unit_utils.magnitude_in_units(value, units, "Test", dimensionality)
+        assert result == pytest.approx(expected)
+
+
+def test_magnitude_in_units_errors():
+    assert unit_utils.magnitude_in_units(None, "metre", "Range", "[length]") is None
+
+    with pytest.raises(TypeError, match="Range must be a Quantity"):
+        unit_utils.magnitude_in_units(5, "metre", "Range", "[length]")
+
+    # The errors are raised each time, as only valid units are cached
+    for _ in range(2):
+        with pytest.raises(ValueError, match="Range must be a Quantity with a dimensionality of"):
+            unit_utils.magnitude_in_units(5 * unit_registry.knots, "metre", "Range", "[length]")
+
+    with pytest.raises(ValueError, match="Heading must be a Quantity with angular units"):
+        unit_utils.magnitude_in_units(
+            5 * unit_registry.dimensionless, "radian", "Heading", "", angular=True
+        )
+
+
+def test_magnitude_in_units_offset_units():
+    value = unit_registry.Quantity(20, unit_registry.degC)
+
+    for _ in range(2):
+        result = unit_utils.magnitude_in_units(value, "kelvin", "Temperature", "[temperature]")
+        assert result == pytest.approx(293.15)
+
+
+def test_magnitudes_in_units():
+    values = [1 * unit_registry.knots, None, 10 * unit_registry.knots]
+
+    result = unit_utils.magnitudes_in_units(values, "metre / second", "Speed", "[length]/[time]")
+
+    assert result == [pytest.approx(0.514444), None, pytest.approx(5.14444)]
@@ -1,5 +1,6 @@
 import os
 
+from pepys_import.core.store.extraction_buffer import ExtractionBuffer
 from pepys_import.file.highlighter.highlighter import HighlightedFile
 from pepys_import.file.highlighter.xml_parser import parse
 
@@ -91,7 +92,7 @@ def _check_element_record(el, file_contents):
 
 class FakeDatafile:
     def __init__(self):
-        self.pending_extracted_tokens = []
+        self.extraction_buffer = ExtractionBuffer()
 
 
 # To test with unicode we need to actually call the record method
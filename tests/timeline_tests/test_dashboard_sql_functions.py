@@ -198,6 +198,14 @@
         CTE: inner_gaps, inner_coverage, gaps_at_serial_start, gaps_at_serial_end, act_with_same_part_and_gap_start,
         act_with_same_part_and_gap_end, inner_coverage, coverage_at_serial_start, coverage_at_serial_end
 
+        Summarised participations
+
+            pepys."DashboardCoverage" (see "dashboard_coverage.sql") holds the runs of pepys."States"
+            records for each platform within each hour. When none of the hours of a participation
+            are waiting to be refreshed, the ends of its runs are used in place of its pepys."States"
+            records (coverage_involved and coverage_points CTEs), and the *gaps* between the runs
+            are added to inner_gaps. The scenarios above are then handled in the same way.
+
 
 
     B. HOW THIS TEST CASE VALIDATES THE ABOVE LOGIC
@@ -216,10 +224,21 @@ import testing.postgresql
 
 import paths
 
+COVERAGE_SQL_FILE_LOCATION = os.path.join(
+    paths.PEPYS_IMPORT_DIRECTORY,
+    "database",
+    "postgres_stored_procedures",
+    "dashboard_coverage.sql",
+)
+
 SQL_FILE_LOCATION = os.path.join(
     paths.PEPYS_IMPORT_DIRECTORY, "database", "postgres_stored_procedures", "dashboard_stats.sql"
 )
 
+CHANGES_SQL_FILE_LOCATION = os.path.join(
+    paths.PEPYS_IMPORT_DIRECTORY, "database", "postgres_stored_procedures", "dashboard_changes.sql"
+)
+
 META_SQL_FILE_LOCATION = os.path.join(
     paths.PEPYS_IMPORT_DIRECTORY, "database", "postgres_stored_procedures", "dashboard_metadata.sql"
 )
@@ -251,77 +270,212 @@ class TestDashboardStatsQuery(unittest.TestCase):
             populate_data(cursor, TIMELIST)
             populate_additional_data(cursor)
 
-            # Sample Tests
-            rows = fetchrows(cursor, "12:12:12", "15:12:12")
-            assert validateStartTimes(rows, ["G"], ["12:12:12"])
-            assert validateEndTimes(rows, ["G"], ["15:12:12"])
-            rows = fetchrows(cursor, "08:00:00", "15:12:12")
-            assert validateStartTimes(rows, ["G", "C", "G"], ["08:00:00", "09:00:00", "09:00:00"])
-            assert validateEndTimes(rows, ["G", "C", "G"], ["09:00:00", "09:00:00", "15:12:12"])
-
-            # Tests for scenario 1[SC1]: No records between SERIAL_START_TIME and SERIAL_END_TIME
-            rows = fetchrows(cursor, "06:00:00", "08:00:00")
-            assert validateStartTimes(rows, ["G"], ["06:00:00"])
-            assert validateEndTimes(rows, ["G"], ["08:00:00"])
-
-            # Tests for scenario 2[SC2]: One record between SERIAL_START_TIME and SERIAL_END_TIME
-            # a) In the same point as SERIAL_START_TIME
-            rows = fetchrows(cursor, "09:00:00", "10:00:00")
-            assert validateStartTimes(rows, ["C", "G"], ["09:00:00", "09:00:00"])
-            assert validateEndTimes(rows, ["C", "G"], ["09:00:00", "10:00:00"])
-            rows = fetchrows(cursor, "09:00:00", "09:02:00")
-            assert validateStartTimes(rows, ["C"], ["09:00:00"])
-            assert validateEndTimes(rows, ["C"], ["09:02:00"])
-            # b) In the same point as SERIAL_END_TIME
-            rows = fetchrows(cursor, "08:00:00", "09:00:00")
-            assert validateStartTimes(rows, ["G", "C"], ["08:00:00", "09:00:00"])
-            assert validateEndTimes(rows, ["G", "C"], ["09:00:00", "09:00:00"])
-            rows = fetchrows(cursor, "08:58:00", "09:00:00")
-            assert validateStartTimes(rows, ["C"], ["08:58:00"])
-            assert validateEndTimes(rows, ["C"], ["09:00:00"])
-            # c) At a point greater than SERIAL_START_TIME and lesser
-            # than SERIAL_END_TIME such that the durations between
-            # SERIAL_START_TIME and pepys."States".time, and
-            # pepys."States".time and SERIAL_END_TIME are
-            # i)   both lesser than GAP_SECONDS
-            rows = fetchrows(cursor, "08:58:00", "09:01:00")
+            # The new States haven't been summarised yet, so are queried directly
+            assert not is_summarised(cursor)
+            check_query_logic(cursor)
+
+    def test_query_logic_summarised(self):
+        with psycopg2.connect(**self.postgresql.dsn()) as conn:
+            cursor = conn.cursor()
+            populate_data(cursor, TIMELIST)
+            populate_additional_data(cursor)
+            cursor.execute("select pepys.refresh_dashboard_coverage()")
+            # The States are more than 5 seconds apart, so each is a run of its own
+            assert cursor.fetchone()[0] == len(TIMELIST)
+
+            assert is_summarised(cursor)
+            check_query_logic(cursor)
+
+    def test_summary_refreshed_after_changes(self):
+        with psycopg2.connect(**self.postgresql.dsn()) as conn:
+            cursor = conn.cursor()
+            populate_data(cursor, TIMELIST)
+            cursor.execute("select pepys.refresh_dashboard_coverage()")
+
+            # Fill in the gap after 09:00, so the period is covered throughout
+            for time in ["09:02:00", "09:04:00", "09:06:00", "09:08:00"]:
+                cursor.execute(
+                    """insert into pepys."States" values('{}', '{}{}', '{}')""".format(
+                        SOME_UUID, DATEVAL, time, CREATED
+                    )
+                )
+            # Until the summary is refreshed, the States are used for this period
+            assert not is_summarised(cursor)
+            rows = fetchrows(cursor, "08:58:00", "09:09:00")
             assert validateStartTimes(rows, ["C"], ["08:58:00"])
-            assert validateEndTimes(rows, ["C"], ["09:01:00"])
-            # ii)  lesser, and greater, respectively, than GAP_SECONDS
+            assert validateEndTimes(rows, ["C"], ["09:09:00"])
+
+            cursor.execute("select pepys.refresh_dashboard_coverage()")
+            assert is_summarised(cursor)
             rows = fetchrows(cursor, "08:58:00", "09:09:00")
-            assert validateStartTimes(rows, ["C", "G"], ["08:58:00", "09:00:00"])
-            assert validateEndTimes(rows, ["C", "G"], ["09:00:00", "09:09:00"])
-            # iii) greater, and lesser, respectively, than GAP_SECONDS
-            rows = fetchrows(cursor, "08:55:00", "09:01:00")
-            assert validateStartTimes(rows, ["G", "C"], ["08:55:00", "09:00:00"])
-            assert validateEndTimes(rows, ["G", "C"], ["09:00:00", "09:01:00"])
-            # iv)  both greater than GAP_SECONDS
+            assert validateStartTimes(rows, ["C"], ["08:58:00"])
+            assert validateEndTimes(rows, ["C"], ["09:09:00"])
+
+            # Removing the States brings the gap back
+            cursor.execute(
+                'delete from pepys."States" where time > %s and time < %s',
+                (DATEVAL + "09:00:00", DATEVAL + "10:00:00"),
+            )
+            cursor.execute("select pepys.refresh_dashboard_coverage()")
             rows = fetchrows(cursor, "08:55:00", "09:05:00")
             assert validateStartTimes(rows, ["G", "C", "G"], ["08:55:00", "09:00:00", "09:00:00"])
             assert validateEndTimes(rows, ["G", "C", "G"], ["09:00:00", "09:00:00", "09:05:00"])
-            # Tests for Scenario 3 [SC3] with 2 or more record
-            rows = fetchrows(cursor, "16:55:00", "17:05:00")
-            assert validateStartTimes(rows, ["G", "C", "G"], ["16:55:00", "17:00:00", "17:02:00"])
-            assert validateEndTimes(rows, ["G", "C", "G"], ["17:00:00", "17:02:00", "17:05:00"])
-            rows = fetchrows(cursor, "17:00:00", "17:05:00")
-            assert validateStartTimes(rows, ["C", "G"], ["17:00:00", "17:02:00"])
-            assert validateEndTimes(rows, ["C", "G"], ["17:02:00", "17:05:00"])
-            rows = fetchrows(cursor, "17:01:00", "17:05:00")
-            assert validateStartTimes(rows, ["C", "G"], ["17:01:00", "17:02:00"])
-            assert validateEndTimes(rows, ["C", "G"], ["17:02:00", "17:05:00"])
-
-            # Tests for dashboard_metadata function
-            rows = fetchrowsMeta(cursor, DATEVAL + "08:00:00", DATEVAL + "20:00:00")
-            assert validateForIncludeInTimeline(rows)
-
-            # Tests for #1019 (https://github.com/debrief/pepys-import/issues/1019)
-            # There should be only one gap for SC1 as defined above
-            # Tests for scenario 1[SC1]: No records between SERIAL_START_TIME and SERIAL_END_TIME
-            rows = fetchrows(cursor, "06:00:00", "08:00:00")
-            # The following asserts would fail without the fix
-            assert len(rows) == 1
-            assert validateStartTimes(rows, ["G"], ["06:00:00"])
-            assert validateEndTimes(rows, ["G"], ["08:00:00"])
+
+    def test_summary_matches_states(self):
+        with psycopg2.connect(**self.postgresql.dsn()) as conn:
+            cursor = conn.cursor()
+            # States every 2 seconds, running over the hour, followed by a 4 minute gap
+            times = [f"09:58:{second:02}" for second in range(0, 60, 2)]
+            times += [f"09:59:{second:02}" for second in range(50, 60, 2)]
+            times += [f"10:00:{second:02}" for second in range(0, 12, 2)]
+            times += [f"10:04:{second:02}" for second in range(0, 60, 2)]
+            times += [f"10:05:{second:02}" for second in range(0, 20, 2)]
+            populate_data(cursor, times)
+            ranges = [
+                ("09:58:05", "09:58:15"),
+                ("09:59:55", "10:00:05"),
+                ("09:58:10", "10:04:30"),
+                ("09:50:00", "10:10:00"),
+                ("10:00:10", "10:05:18"),
+                ("10:04:03", "10:04:09"),
+            ]
+
+            expected = [fetchrows(cursor, start, end) for start, end in ranges]
+            cursor.execute("select pepys.refresh_dashboard_coverage()")
+            assert is_summarised(cursor)
+            assert [fetchrows(cursor, start, end) for start, end in ranges] == expected
+
+    def test_changes_since_watermark(self):
+        with psycopg2.connect(**self.postgresql.dsn()) as conn:
+            cursor = conn.cursor()
+            populate_data(cursor, TIMELIST)
+            cursor.execute("select pepys.refresh_dashboard_coverage()")
+            conn.commit()
+            ranges = [("06:00:00", "08:00:00"), ("16:00:00", "18:00:00")]
+
+            cursor.execute("select txid_snapshot_xmin(txid_current_snapshot())")
+            watermark = cursor.fetchone()[0]
+            assert fetchchanges(cursor, ranges, watermark) == []
+
+            cursor.execute(
+                """insert into pepys."States" values('{}', '{}{}', '{}')""".format(
+                    SOME_UUID, DATEVAL, "17:03:00", CREATED
+                )
+            )
+            # Hours waiting to be summarised are treated as changed
+            assert fetchchanges(cursor, ranges, watermark) == [2]
+            cursor.execute("select pepys.refresh_dashboard_coverage()")
+            conn.commit()
+            assert fetchchanges(cursor, ranges, watermark) == [2]
+
+            # Removing all the States of an hour is a change as well
+            cursor.execute("select txid_snapshot_xmin(txid_current_snapshot())")
+            watermark = cursor.fetchone()[0]
+            cursor.execute('delete from pepys."States" where time >= %s', (DATEVAL + "17:00:00",))
+            cursor.execute("select pepys.refresh_dashboard_coverage()")
+            conn.commit()
+            assert fetchchanges(cursor, ranges, watermark) == [2]
+
+    def test_refresh_skipped_while_locked(self):
+        with psycopg2.connect(**self.postgresql.dsn()) as conn:
+            cursor = conn.cursor()
+            populate_data(cursor, TIMELIST)
+            conn.commit()
+            cursor.execute("select pepys.refresh_dashboard_coverage()")
+
+            # Another import refreshing the summary while this transaction holds the lock
+            # returns straight away, rather than waiting for this one to commit
+            with psycopg2.connect(**self.postgresql.dsn()) as other_conn:
+                other_cursor = other_conn.cursor()
+                other_cursor.execute("set statement_timeout = 5000")
+                other_cursor.execute(
+                    """insert into pepys."States" values('{}', '{}{}', '{}')""".format(
+                        SOME_UUID, DATEVAL, "17:03:00", CREATED
+                    )
+                )
+                other_cursor.execute("select pepys.refresh_dashboard_coverage()")
+                assert other_cursor.fetchone()[0] == 0
+            conn.commit()
+
+            # The hour it changed is left to be summarised by the next refresh
+            assert not is_summarised(cursor)
+            cursor.execute("select pepys.refresh_dashboard_coverage()")
+            assert cursor.fetchone()[0] == 4
+            assert is_summarised(cursor)
+
+
+def check_query_logic(cursor):
+    # Sample Tests
+    rows = fetchrows(cursor, "12:12:12", "15:12:12")
+    assert validateStartTimes(rows, ["G"], ["12:12:12"])
+    assert validateEndTimes(rows, ["G"], ["15:12:12"])
+    rows = fetchrows(cursor, "08:00:00", "15:12:12")
+    assert validateStartTimes(rows, ["G", "C", "G"], ["08:00:00", "09:00:00", "09:00:00"])
+    assert validateEndTimes(rows, ["G", "C", "G"], ["09:00:00", "09:00:00", "15:12:12"])
+
+    # Tests for scenario 1[SC1]: No records between SERIAL_START_TIME and SERIAL_END_TIME
+    rows = fetchrows(cursor, "06:00:00", "08:00:00")
+    assert validateStartTimes(rows, ["G"], ["06:00:00"])
+    assert validateEndTimes(rows, ["G"], ["08:00:00"])
+
+    # Tests for scenario 2[SC2]: One record between SERIAL_START_TIME and SERIAL_END_TIME
+    # a) In the same point as SERIAL_START_TIME
+    rows = fetchrows(cursor, "09:00:00", "10:00:00")
+    assert validateStartTimes(rows, ["C", "G"], ["09:00:00", "09:00:00"])
+    assert validateEndTimes(rows, ["C", "G"], ["09:00:00", "10:00:00"])
+    rows = fetchrows(cursor, "09:00:00", "09:02:00")
+    assert validateStartTimes(rows, ["C"], ["09:00:00"])
+    assert validateEndTimes(rows, ["C"], ["09:02:00"])
+    # b) In the same point as SERIAL_END_TIME
+    rows = fetchrows(cursor, "08:00:00", "09:00:00")
+    assert validateStartTimes(rows, ["G", "C"], ["08:00:00", "09:00:00"])
+    assert validateEndTimes(rows, ["G", "C"], ["09:00:00", "09:00:00"])
+    rows = fetchrows(cursor, "08:58:00", "09:00:00")
+    assert validateStartTimes(rows, ["C"], ["08:58:00"])
+    assert validateEndTimes(rows, ["C"], ["09:00:00"])
+    # c) At a point greater than SERIAL_START_TIME and lesser
+    # than SERIAL_END_TIME such that the durations between
+    # SERIAL_START_TIME and pepys."States".time, and
+    # pepys."States".time and SERIAL_END_TIME are
+    # i)   both lesser than GAP_SECONDS
+    rows = fetchrows(cursor, "08:58:00", "09:01:00")
+    assert validateStartTimes(rows, ["C"], ["08:58:00"])
+    assert validateEndTimes(rows, ["C"], ["09:01:00"])
+    # ii)  lesser, and greater, respectively, than GAP_SECONDS
+    rows = fetchrows(cursor, "08:58:00", "09:09:00")
+    assert validateStartTimes(rows, ["C", "G"], ["08:58:00", "09:00:00"])
+    assert validateEndTimes(rows, ["C", "G"], ["09:00:00", "09:09:00"])
+    # iii) greater, and lesser, respectively, than GAP_SECONDS
+    rows = fetchrows(cursor, "08:55:00", "09:01:00")
+    assert validateStartTimes(rows, ["G", "C"], ["08:55:00", "09:00:00"])
+    assert validateEndTimes(rows, ["G", "C"], ["09:00:00", "09:01:00"])
+    # iv)  both greater than GAP_SECONDS
+    rows = fetchrows(cursor, "08:55:00", "09:05:00")
+    assert validateStartTimes(rows, ["G", "C", "G"], ["08:55:00", "09:00:00", "09:00:00"])
+    assert validateEndTimes(rows, ["G", "C", "G"], ["09:00:00", "09:00:00", "09:05:00"])
+    # Tests for Scenario 3 [SC3] with 2 or more record
+    rows = fetchrows(cursor, "16:55:00", "17:05:00")
+    assert validateStartTimes(rows, ["G", "C", "G"], ["16:55:00", "17:00:00", "17:02:00"])
+    assert validateEndTimes(rows, ["G", "C", "G"], ["17:00:00", "17:02:00", "17:05:00"])
+    rows = fetchrows(cursor, "17:00:00", "17:05:00")
+    assert validateStartTimes(rows, ["C", "G"], ["17:00:00", "17:02:00"])
+    assert validateEndTimes(rows, ["C", "G"], ["17:02:00", "17:05:00"])
+    rows = fetchrows(cursor, "17:01:00", "17:05:00")
+    assert validateStartTimes(rows, ["C", "G"], ["17:01:00", "17:02:00"])
+    assert validateEndTimes(rows, ["C", "G"], ["17:02:00", "17:05:00"])
+
+    # Tests for dashboard_metadata function
+    rows = fetchrowsMeta(cursor, DATEVAL + "08:00:00", DATEVAL + "20:00:00")
+    assert validateForIncludeInTimeline(rows)
+
+    # Tests for #1019 (https://github.com/debrief/pepys-import/issues/1019)
+    # There should be only one gap for SC1 as defined above
+    # Tests for scenario 1[SC1]: No records between SERIAL_START_TIME and SERIAL_END_TIME
+    rows = fetchrows(cursor, "06:00:00", "08:00:00")
+    # The following asserts would fail without the fix
+    assert len(rows) == 1
+    assert validateStartTimes(rows, ["G"], ["06:00:00"])
+    assert validateEndTimes(rows, ["G"], ["08:00:00"])
 
 
 class FilterInputJSON:
@@ -368,6 +522,8 @@ def populate_data(cursor, TIMELIST):
     cursor.execute(
         'create table pepys."ForceTypes"(force_type_id uuid, name varchar(150), color varchar(10))'
     )
+    with open(COVERAGE_SQL_FILE_LOCATION, "r") as coveragesqlfile:
+        cursor.execute(coveragesqlfile.read())
 
     cursor.execute(
         """insert into pepys."Sensors" values('{}', '{}')""".format(SOME_UUID, SOME_UUID)
@@ -420,6 +576,9 @@ def populate_data(cursor, TIMELIST):
     with open(META_SQL_FILE_LOCATION, "r") as metasqlfile:
         cursor.execute(metasqlfile.read())
 
+    with open(CHANGES_SQL_FILE_LOCATION, "r") as changessqlfile:
+        cursor.execute(changessqlfile.read())
+
 
 def populate_additional_data(cursor):
     cursor.execute(
@@ -427,6 +586,12 @@ def populate_additional_data(cursor):
     )
 
 
+def is_summarised(cursor):
+    """Returns True if no States are waiting to be summarised"""
+    cursor.execute('select count(*) from pepys."DashboardCoverageDirty"')
+    return cursor.fetchone()[0] == 0
+
+
 def fetchrows(cursor, start, end):
     cursor.execute(get_query("stats"), get_test_case_data(start, end))
     return cursor.fetchall()
@@ -444,6 +609,22 @@ def get_test_case_data(start, end):
     )
 
 
+def fetchchanges(cursor, ranges, since):
+    """Returns the positions of the participations in the given ranges which have changed"""
+    participations = []
+    for start, end in ranges:
+        fij = FilterInputJSON()
+        fij.serial_id = fij.platform_id = SOME_UUID
+        fij.start = DATEVAL + start
+        fij.end = DATEVAL + end
+        fij.gap_seconds = GAP_SECONDS
+        participations.append(fij)
+    cursor.execute(
+        "select * from pepys.dashboard_changes(%s, %s)", (get_data(participations), since)
+    )
+    return [row[0] for row in cursor.fetchall()]
+
+
 def fetchrowsMeta(cursor, start, end):
     cursor.execute(get_query("metadata"), (start, end))
     return cursor.fetchall()
@@ -0,0 +1,123 @@
+import json
+from unittest.mock import patch
+
+import pytest
+
+from pepys_timeline.app import create_app
+from pepys_timeline.extensions import query_cache
+from pepys_timeline.queries import DASHBOARD_CHANGES_QUERY, DASHBOARD_STATS_QUERY, WATERMARK_QUERY
+from pepys_timeline.utils import NDJSON_MIMETYPE
+
+PARTICIPANTS = [
+    {"serial_id": "s1", "platform_id": "p1", "start": "2021-01-01", "end": "2021-01-02"},
+    {"serial_id": "s1", "platform_id": "p2", "start": "2021-01-01", "end": "2021-01-02"},
+    {"serial_id": "s1", "platform_id": "p2", "start": "2021-01-03", "end": "2021-01-04"},
+]
+
+
+def stat_row(platform_id):
+    return {
+        "resp_range_type": "C",
+        "resp_start_time": "2021-01-01 10:00:00",
+        "resp_end_time": "2021-01-01 11:00:00",
+        "resp_created": "2021-01-01 12:00:00",
+        "resp_platform_id": platform_id,
+        "resp_serial_id": "Serial 1",
+    }
+
+
+@pytest.fixture
+def database():
+    """Replaces the database with one returning stats for each participant requested, changes
+    for the participant positions in `changed`, and the watermarks in `watermarks` in turn"""
+    state = {"changed": [], "watermarks": [10, 20], "stats_requests": []}
+
+    def get_query_results(queries):
+        results = []
+        for query, vars_ in queries:
+            if query == WATERMARK_QUERY:
+                results.append([{"watermark": state["watermarks"].pop(0)}])
+            elif query == DASHBOARD_CHANGES_QUERY:
+                results.append([{"resp_ser_idx": index} for index in state["changed"]])
+            elif query == DASHBOARD_STATS_QUERY:
+                participants = json.loads(vars_[0])
+                state["stats_requests"].append(participants)
+                results.append([stat_row(p["platform_id"]) for p in participants])
+        return results
+
+    with patch("pepys_timeline.db.get_query_results", side_effect=get_query_results):
+        app = create_app()
+        # Each request should query the database
+        query_cache.ttl = 0
+        yield app.test_client(), state
+
+
+def post_stats(client, headers=None, **data):
+    return client.post(
+        "/dashboard_stats",
+        json={"serial_participants": PARTICIPANTS, "range_types": ["G", "C"], **data},
+        headers=headers,
+    )
+
+
+def test_full_stats(database):
+    client, _ = database
+
+    response = post_stats(client).get_json()
+
+    assert response["delta"] is False
+    assert response["watermark"] == 10
+    assert [row["resp_platform_id"] for row in response["dashboard_stats"]] == ["p1", "p2", "p2"]
+
+
+def test_changed_stats(database):
+    client, state = database
+    state["changed"] = [2]
+
+    response = post_stats(client, since=5).get_json()
+
+    assert response["delta"] is True
+    # Both participations of the changed platform are sent, as their stats can't be told apart
+    assert response["changed_participants"] == PARTICIPANTS[1:]
+    assert state["stats_requests"] == [PARTICIPANTS[1:]]
+    assert [row["resp_platform_id"] for row in response["dashboard_stats"]] == ["p2", "p2"]
+    # The watermark the changes were found at is older than the one for the stats
+    assert response["watermark"] == 10
+
+
+def test_no_changed_stats(database):
+    client, state = database
+
+    response = post_stats(client, since=5).get_json()
+
+    assert response == {
+        "dashboard_stats": [],
+        "changed_participants": [],
+        "delta": True,
+        "watermark": 10,
+    }
+    assert state["stats_requests"] == []
+
+
+def test_invalid_watermark(database):
+    client, _ = database
+
+    response = post_stats(client, since="yesterday")
+
+    assert response.status_code == 400
+
+
+def test_streamed_stats(database):
+    client, state = database
+    state["changed"] = [1]
+
+    response = post_stats(client, headers={"Accept": NDJSON_MIMETYPE}, since=5)
+
+    assert response.mimetype == NDJSON_MIMETYPE
+    lines = [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+    assert lines[0] == {
+        "changed_participants": PARTICIPANTS[:1],
+        "delta": True,
+        "watermark": 10,
+    }
+    assert lines[1:] == [stat_row("p1")]
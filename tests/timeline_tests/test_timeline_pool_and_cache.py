@@ -0,0 +1,207 @@
+import threading
+from time import sleep
+from unittest.mock import MagicMock, patch
+
+import psycopg2
+import pytest
+
+from pepys_timeline import db
+from pepys_timeline.app import create_app
+from pepys_timeline.cache import QueryCache
+from pepys_timeline.exceptions import DatabaseConnectionError, DatabaseQueryError
+from pepys_timeline.extensions import db_pool, query_cache
+from pepys_timeline.pool import ConnectionPool
+from pepys_timeline.queries import CONFIG_OPTIONS_QUERY, WATERMARK_QUERY
+
+
+@pytest.fixture
+def fake_pool():
+    """Replaces psycopg2's connection pool with one giving mock connections, whose cursors
+    return a single config option row, or a watermark"""
+    connection = MagicMock(closed=0)
+    cursor = connection.cursor.return_value.__enter__.return_value
+    results = {
+        CONFIG_OPTIONS_QUERY: [{"name": "TimelineRefreshSecs", "value": "30"}],
+        WATERMARK_QUERY: [{"watermark": 100}],
+    }
+    cursor.fetchall.side_effect = lambda: results.get(cursor.execute.call_args.args[0], [])
+    with patch("pepys_timeline.pool.ThreadedConnectionPool") as pool_class:
+        pool_class.return_value.getconn.return_value = connection
+        app = create_app()
+        with app.app_context():
+            yield pool_class, cursor
+        db_pool.close()
+
+
+def test_pool_created_once_and_connections_returned(fake_pool):
+    pool_class, cursor = fake_pool
+
+    db.get_query_result("select 1;")
+    db.get_query_result("select 2;")
+
+    pool_class.assert_called_once()
+    pool = pool_class.return_value
+    assert pool.getconn.call_count == 2
+    assert pool.putconn.call_count == 2
+    assert pool.putconn.call_args.kwargs == {"close": False}
+
+
+def test_query_errors_reported(fake_pool):
+    _, cursor = fake_pool
+    cursor.execute.side_effect = psycopg2.ProgrammingError("bad query")
+
+    with pytest.raises(DatabaseQueryError):
+        db.get_query_result("select bad;")
+
+
+def test_dashboard_stats_cached(fake_pool):
+    _, cursor = fake_pool
+    participants = [{"serial_id": "1", "platform_id": "2", "gap_seconds": 150}]
+
+    # Each query reads the watermark and then the stats
+    for _ in range(50):
+        db.get_dashboard_stats(participants, ["G", "C"])
+    assert cursor.execute.call_count == 2
+
+    # Different parameters need a new query
+    db.get_dashboard_stats(participants, ["G"])
+    assert cursor.execute.call_count == 4
+
+
+def test_config_options_cached(fake_pool):
+    _, cursor = fake_pool
+
+    assert db.get_config_options() == [{"name": "TimelineRefreshSecs", "value": 30}]
+    assert db.get_config_options() == [{"name": "TimelineRefreshSecs", "value": 30}]
+    assert cursor.execute.call_count == 1
+
+    query_cache.clear()
+    db.get_config_options()
+    assert cursor.execute.call_count == 2
+
+
+def test_cached_results_expire():
+    cache = QueryCache()
+    cache.ttl = 10
+    compute = MagicMock(side_effect=[1, 2])
+
+    with patch("pepys_timeline.cache.monotonic", return_value=100):
+        assert cache.get_or_set("key", compute) == 1
+    with patch("pepys_timeline.cache.monotonic", return_value=109):
+        assert cache.get_or_set("key", compute) == 1
+    with patch("pepys_timeline.cache.monotonic", return_value=111):
+        assert cache.get_or_set("key", compute) == 2
+    assert cache.hits == 1
+    assert cache.misses == 2
+
+
+def test_cache_size_bounded():
+    cache = QueryCache()
+    cache.max_entries = 2
+
+    for key in ("a", "b", "c"):
+        cache.get_or_set(key, lambda: key)
+    assert len(cache) == 2
+    assert cache.get_or_set("a", lambda: "new a") == "new a"
+
+
+def test_cache_turned_off():
+    cache = QueryCache()
+    compute = MagicMock(return_value=1)
+
+    cache.get_or_set("key", compute, ttl=0)
+    cache.get_or_set("key", compute, ttl=0)
+    assert compute.call_count == 2
+    assert len(cache) == 0
+
+
+def wait_until(condition, timeout=5):
+    for _ in range(int(timeout / 0.01)):
+        if condition():
+            return
+        sleep(0.01)
+    raise AssertionError("Timed out waiting")
+
+
+def test_concurrent_requests_coalesced():
+    cache = QueryCache()
+    release = threading.Event()
+    compute = MagicMock(side_effect=lambda: release.wait() and "result")
+    results = []
+
+    def request():
+        results.append(cache.get_or_set("key", compute, ttl=0))
+
+    threads = [threading.Thread(target=request) for _ in range(5)]
+    threads[0].start()
+    wait_until(lambda: compute.called)
+    for thread in threads[1:]:
+        thread.start()
+    # The other requests wait for the first one's query rather than running their own
+    wait_until(lambda: cache.coalesced == 4)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == ["result"] * 5
+    assert compute.call_count == 1
+    # Caching is turned off, so the next request runs the query again
+    cache.get_or_set("key", compute, ttl=0)
+    assert compute.call_count == 2
+
+
+def test_coalesced_requests_get_errors():
+    cache = QueryCache()
+    release = threading.Event()
+
+    def compute():
+        release.wait()
+        raise DatabaseQueryError("Error running query.")
+
+    errors = []
+
+    def request():
+        try:
+            cache.get_or_set("key", compute)
+        except DatabaseQueryError as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=request) for _ in range(2)]
+    threads[0].start()
+    wait_until(lambda: "key" in cache._in_flight)
+    threads[1].start()
+    wait_until(lambda: cache.coalesced == 1)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert len(errors) == 2
+    # Errors aren't cached
+    assert cache.get_or_set("key", lambda: "result") == "result"
+
+
+def test_pool_waits_for_free_connection():
+    pool = ConnectionPool()
+    pool.max_connections = 1
+    pool.timeout = 0.01
+    with patch("pepys_timeline.pool.ThreadedConnectionPool") as pool_class:
+        pool_class.return_value.getconn.return_value = MagicMock(closed=0)
+        with pool.connection():
+            with pytest.raises(DatabaseConnectionError):
+                with pool.connection():
+                    pass
+        # The connection has been returned, so can be used again
+        with pool.connection():
+            pass
+
+
+def test_broken_connection_discarded():
+    pool = ConnectionPool()
+    connection = MagicMock(closed=0)
+    with patch("pepys_timeline.pool.ThreadedConnectionPool") as pool_class:
+        pool_class.return_value.getconn.return_value = connection
+        with pytest.raises(psycopg2.OperationalError):
+            with pool.connection():
+                connection.closed = 2
+                raise psycopg2.OperationalError("server closed the connection")
+        pool_class.return_value.putconn.assert_called_once_with(connection, close=True)
@@ -0,0 +1,111 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from time import sleep
+from unittest.mock import patch
+from urllib.request import urlopen
+
+import psycopg2
+import pytest
+import testing.postgresql
+from waitress import wasyncore
+
+from pepys_timeline import db
+from pepys_timeline.app import create_app
+from pepys_timeline.extensions import db_pool, query_cache
+from pepys_timeline.server import create_timeline_server
+
+
+def test_server_uses_config_settings():
+    app = create_app()
+    app.config["SERVER_THREADS"] = 3
+    app.config["SERVER_CONNECTION_LIMIT"] = 20
+
+    server = create_timeline_server(app, host="127.0.0.1", port=0)
+    try:
+        assert server.adj.threads == 3
+        assert server.adj.connection_limit == 20
+        assert server.adj.channel_timeout == app.config["SERVER_CHANNEL_TIMEOUT_SECS"]
+    finally:
+        server.close()
+
+
+def run_until(server, stopped):
+    """Runs the server's event loop until `stopped` is set, then closes the server from the
+    loop's own thread, as waitress servers can't be closed while another thread is polling"""
+    while not stopped.is_set():
+        wasyncore.loop(timeout=0.05, map=server._map, count=1)
+    server.task_dispatcher.shutdown()
+    server.close()
+
+
+def wait_until(condition, timeout=10):
+    for _ in range(int(timeout / 0.01)):
+        if condition():
+            return
+        sleep(0.01)
+    raise AssertionError("Timed out waiting")
+
+
+@pytest.mark.postgres
+def test_identical_concurrent_requests_share_query():
+    """Serves the timeline from a stand-in Postgres, whose config options count how many times
+    they have been queried. The first request's query is held until the other requests are
+    waiting for it."""
+    with testing.postgresql.Postgresql() as postgresql:
+        with psycopg2.connect(**postgresql.dsn()) as conn:
+            cursor = conn.cursor()
+            cursor.execute("create schema pepys")
+            cursor.execute("create sequence pepys.config_options_reads")
+            cursor.execute(
+                """create view pepys."ConfigOptions" as
+                    select
+                        'TimelineRefreshSecs'::text as name,
+                        nextval('pepys.config_options_reads')::text as value"""
+            )
+        conn.close()
+
+        dsn = postgresql.dsn()
+        app = create_app()
+        app.config["CONFIG_OPTIONS_CACHE_SECS"] = 0
+        app.config["SERVER_THREADS"] = 4
+        query_cache.init_app(app)
+        coalesced = query_cache.coalesced
+
+        release = threading.Event()
+        get_query_result = db.get_query_result
+
+        def held_query_result(*args, **kwargs):
+            assert release.wait(timeout=10)
+            return get_query_result(*args, **kwargs)
+
+        with patch.multiple(
+            "config",
+            DB_HOST=dsn["host"],
+            DB_PORT=dsn["port"],
+            DB_NAME=dsn["database"],
+            DB_USERNAME=dsn["user"],
+            DB_PASSWORD="",
+        ), patch("pepys_timeline.db.get_query_result", side_effect=held_query_result) as query:
+            server = create_timeline_server(app, host="127.0.0.1", port=0)
+            stopped = threading.Event()
+            thread = threading.Thread(target=run_until, args=(server, stopped), daemon=True)
+            thread.start()
+            url = "http://127.0.0.1:{}/config".format(server.effective_port)
+            try:
+                with ThreadPoolExecutor(max_workers=4) as executor:
+                    futures = [executor.submit(lambda: json.load(urlopen(url))) for _ in range(4)]
+                    # Each worker thread is running a request: one querying, three waiting
+                    wait_until(lambda: query_cache.coalesced - coalesced == 3)
+                    release.set()
+                    responses = [future.result(timeout=10) for future in futures]
+            finally:
+                release.set()
+                stopped.set()
+                thread.join()
+                db_pool.close()
+
+        # All the requests were served by the first request's query
+        assert query.call_count == 1
+        assert all(response == responses[0] for response in responses)
+        assert responses[0]["config_options"] == [{"name": "TimelineRefreshSecs", "value": 1}]